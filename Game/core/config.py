@@ -22,17 +22,31 @@ DEFAULTS = {
         "music_volume": 0.8,
         "sfx_volume": 0.9
     },
-    "video":   {"fullscreen": False, "fps_cap": 60, "vsync": False},
+    "video":   {"fullscreen": False, "fps_cap": 60, "vsync": False, "scroll_reuse": True},
     "gameplay":{"language": "fr"},
+    "world": {
+        "chunk_backend": "numpy",
+        "chunk_workers": -1,
+        "disk_cache": True,
+        "disk_cache_mb": 512,
+        "smooth_chunk_seams": False,
+        "chunk_cache_mb": 128,
+        "prefetch_lookahead_frames": 20,
+        "prefetch_budget_ms": 4.0,
+        "planet_overview": True,
+        "overview_tiles_per_pixel": 16,
+    },
     "debug": {
         "perf_logs": True,
-        "perf_slow_frame_ms": 120
+        "perf_slow_frame_ms": 120,
+        "chunk_overlay": False
     },
     "controls": {
         "props_transparency": int(pygame.K_h),
         "inspect_mode": int(pygame.K_i),
         "focus_nearest": int(pygame.K_SPACE),
         "map_toggle": int(pygame.K_m),
+        "planet_map": int(pygame.K_p),
     }
 }
 
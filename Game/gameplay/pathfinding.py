@@ -0,0 +1,494 @@
+# pathfinding.py
+# Pathfinding hiérarchique (HPA*) sur la grille de chunks du ChunkedWorld.
+#
+# Principe :
+# - Entrées : sur chaque frontière entre deux chunks voisins, les segments où les deux
+#   côtés sont praticables donnent une transition (au milieu si le segment est court,
+#   aux deux extrémités sinon) = une paire de tuiles adjacentes, une de chaque côté ;
+#   au plus une tous les _ENTRANCE_SPACING par paire de composantes reliées.
+# - Connexité interne : composantes 8-connexes de chaque chunk (mêmes déplacements que
+#   l'A* de Phase1), étiquetées par segments de ligne + union-find. Deux entrées d'un
+#   même chunk sont reliées si elles sont dans la même composante (coût octile).
+# - Recherche : A* sur ce graphe abstrait (départ et arrivée raccordés aux entrées de
+#   leur composante) -> liste de points de passage, affinés ensuite tronçon par tronçon
+#   par l'A* sur tuiles, au fil de la marche. La recherche (RouteSearch) peut s'arrêter à
+#   une échéance et reprendre à la frame suivante ; une composante sans entrée ou une
+#   paire déjà reconnue sans issue (même état du monde) est rejetée sans recherche.
+# - Mise à jour incrémentale : étiquettes, frontières et arêtes sont validées par l'identité des
+#   couches de praticabilité (WalkabilityCache), qui ne changent que pour le chunk modifié
+#   (construction posée / retirée, sol ou biome modifié).
+
+from __future__ import annotations
+
+import heapq
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from Game.world.walkability import WalkabilityCache, walk_threshold
+
+_SQRT2 = 1.41421356237
+_OCTILE_K = _SQRT2 - 2.0
+# Segment de frontière au-delà duquel on place deux transitions (extrémités) au lieu d'une.
+_LONG_ENTRANCE = 6
+# Écart minimal entre deux transitions d'une même frontière reliant les mêmes composantes.
+_ENTRANCE_SPACING = 12
+
+
+def _octile(ax: int, ay: int, bx: int, by: int) -> float:
+    dx = abs(ax - bx)
+    dy = abs(ay - by)
+    return (dx + dy) + _OCTILE_K * min(dx, dy)
+
+
+def _runs(row: np.ndarray) -> tuple[list[int], list[int]]:
+    """Segments praticables [début, fin) d'une ligne booléenne."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], row, [False])).astype(np.int8)))
+    return edges[0::2].tolist(), edges[1::2].tolist()
+
+
+class HierarchicalPathfinder:
+    def __init__(self, walk: WalkabilityCache, water_walker: bool = False, max_chunks: int = 2048):
+        self.walk = walk
+        self.water_walker = bool(water_walker)
+        self.need = walk_threshold(water_walker)
+        self.chunk_size = walk.chunk_size
+        self.width = walk.width
+        self.height = walk.height
+        self.max_chunks = max(16, int(max_chunks))
+
+        # (cx, cy) -> (couche, étiquettes par tuile locale, 0 = bloqué)
+        self._labels: "OrderedDict[tuple[int, int], tuple[bytes, list[int]]]" = OrderedDict()
+        # (cx, cy, axe) -> (couche A, couche B, [(tuile A, tuile B)]) ; axe 0 = est, 1 = sud
+        self._borders: "OrderedDict[tuple[int, int, int], tuple[bytes, bytes, list]]" = OrderedDict()
+        # (cx, cy) -> (couches du chunk et de ses 4 voisins, nœuds / arêtes du chunk)
+        self._nodes: "OrderedDict[tuple[int, int], tuple[tuple, tuple]]" = OrderedDict()
+        # (chunk départ, composante, chunk arrivée, composante) sans itinéraire, valable
+        # tant que le compteur de modifications du monde vaut _unreachable_epoch
+        self._unreachable: set[tuple] = set()
+        self._unreachable_epoch = -1
+
+        self.label_builds = 0
+        self.border_builds = 0
+        self.searches = 0
+        self.last_expanded = 0
+
+    # ------------------- connexité interne -------------------
+
+    def _chunk_grid(self, cx: int, cy: int, layer: bytes) -> np.ndarray:
+        cs = self.chunk_size
+        grid = np.frombuffer(layer, dtype=np.uint8).reshape(cs, cs) >= self.need
+        # Chunks en bord de carte : les tuiles hors monde ne sont pas praticables.
+        w = min(cs, self.width - cx * cs)
+        h = min(cs, self.height - cy * cs)
+        if w < cs or h < cs:
+            grid = grid.copy()
+            grid[h:, :] = False
+            grid[:, w:] = False
+        return grid
+
+    def _build_labels(self, cx: int, cy: int, layer: bytes) -> list[int]:
+        """Composantes 8-connexes du chunk : segments par ligne reliés par union-find."""
+        self.label_builds += 1
+        cs = self.chunk_size
+        grid = self._chunk_grid(cx, cy, layer)
+        parent: list[int] = []
+
+        def find(a: int) -> int:
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        rows = []
+        prev: list[tuple[int, int, int]] = []
+        for y in range(cs):
+            starts, ends = _runs(grid[y])
+            cur = []
+            p = 0
+            for s, e in zip(starts, ends):
+                rid = len(parent)
+                parent.append(rid)
+                # Segments de la ligne précédente qui touchent [s-1, e] (diagonales comprises)
+                while p < len(prev) and prev[p][1] < s:
+                    p += 1
+                q = p
+                while q < len(prev) and prev[q][0] <= e:
+                    ra = find(prev[q][2])
+                    rb = find(rid)
+                    if ra != rb:
+                        parent[rb] = ra
+                    q += 1
+                cur.append((s, e, rid))
+            rows.append(cur)
+            prev = cur
+
+        labels = np.zeros((cs, cs), dtype=np.int32)
+        for y, cur in enumerate(rows):
+            for s, e, rid in cur:
+                labels[y, s:e] = find(rid) + 1
+        return labels.ravel().tolist()
+
+    def _chunk_labels(self, cx: int, cy: int) -> Optional[list[int]]:
+        layer = self.walk.layer(cx, cy)
+        if layer is None:
+            return None
+        key = (cx, cy)
+        entry = self._labels.get(key)
+        if entry is not None and entry[0] is layer:
+            self._labels.move_to_end(key)
+            return entry[1]
+        labels = self._build_labels(cx, cy, layer)
+        self._labels[key] = (layer, labels)
+        self._trim(self._labels)
+        return labels
+
+    # ------------------- entrées -------------------
+
+    def _border(self, cx: int, cy: int, axis: int) -> list:
+        """Transitions entre (cx, cy) et son voisin est (axe 0) ou sud (axe 1)."""
+        cs = self.chunk_size
+        nx, ny = (cx + 1, cy) if axis == 0 else (cx, cy + 1)
+        if cx < 0 or cy < 0 or nx * cs >= self.width or ny * cs >= self.height:
+            return []
+        layer_a = self.walk.layer(cx, cy)
+        layer_b = self.walk.layer(nx, ny)
+        if layer_a is None or layer_b is None:
+            return []
+        key = (cx, cy, axis)
+        entry = self._borders.get(key)
+        if entry is not None and entry[0] is layer_a and entry[1] is layer_b:
+            self._borders.move_to_end(key)
+            return entry[2]
+
+        self.border_builds += 1
+        labels_a = self._chunk_labels(cx, cy)
+        labels_b = self._chunk_labels(nx, ny)
+        grid_a = self._chunk_grid(cx, cy, layer_a)
+        grid_b = self._chunk_grid(nx, ny, layer_b)
+        if axis == 0:
+            open_ = grid_a[:, cs - 1] & grid_b[:, 0]
+        else:
+            open_ = grid_a[cs - 1, :] & grid_b[0, :]
+        starts, ends = _runs(open_)
+        transitions = []
+        # Dernière transition gardée par paire de composantes (A, B) : les segments hachés
+        # (arbres, rochers) ne donnent qu'une entrée tous les _ENTRANCE_SPACING.
+        last: dict[tuple[int, int], int] = {}
+        for s, e in zip(starts, ends):
+            if e - s < _LONG_ENTRANCE:
+                picks = ((s + e - 1) // 2,)
+            else:
+                picks = (s, e - 1)
+            for t in picks:
+                if axis == 0:
+                    a = ((cx + 1) * cs - 1, cy * cs + t)
+                    b = (a[0] + 1, a[1])
+                    pair = (labels_a[t * cs + cs - 1], labels_b[t * cs])
+                else:
+                    a = (cx * cs + t, (cy + 1) * cs - 1)
+                    b = (a[0], a[1] + 1)
+                    pair = (labels_a[(cs - 1) * cs + t], labels_b[t])
+                prev = last.get(pair)
+                if prev is not None and t - prev < _ENTRANCE_SPACING:
+                    continue
+                last[pair] = t
+                transitions.append((a, b))
+        self._borders[key] = (layer_a, layer_b, transitions)
+        self._trim(self._borders)
+        return transitions
+
+    def _chunk_nodes(self, cx: int, cy: int):
+        """
+        (étiquettes, entrées par composante, arêtes) du chunk ; arêtes : tuile d'entrée ->
+        [(tuile, coût)] vers les entrées de la même composante et de l'autre côté de la
+        frontière. Recalculé seulement si la couche du chunk ou d'un voisin a changé.
+        """
+        layers, info = self._cached_nodes(cx, cy)
+        if info is not None or layers[0] is None:
+            return info
+        key = (cx, cy)
+
+        labels = self._chunk_labels(cx, cy)
+        cs = self.chunk_size
+        ox = cx * cs
+        oy = cy * cs
+        by_label: dict[int, list[tuple[int, int]]] = {}
+        edges: dict[tuple[int, int], list[tuple[tuple[int, int], float]]] = {}
+        cross: list[tuple[tuple[int, int], tuple[int, int]]] = []
+
+        def add(tile, other):
+            if tile not in edges:
+                edges[tile] = []
+                lab = labels[(tile[1] - oy) * cs + (tile[0] - ox)]
+                by_label.setdefault(lab, []).append(tile)
+            cross.append((tile, other))
+
+        for a, b in self._border(cx, cy, 0):
+            add(a, b)
+        for a, b in self._border(cx, cy, 1):
+            add(a, b)
+        for a, b in self._border(cx - 1, cy, 0):
+            add(b, a)
+        for a, b in self._border(cx, cy - 1, 1):
+            add(b, a)
+
+        for group in by_label.values():
+            for tile in group:
+                x, y = tile
+                edges[tile] = [(other, _octile(x, y, other[0], other[1])) for other in group if other != tile]
+        for tile, other in cross:
+            edges[tile].append((other, 1.0))
+
+        info = (labels, by_label, edges)
+        self._nodes[key] = (layers, info)
+        self._trim(self._nodes)
+        return info
+
+    def _cached_nodes(self, cx: int, cy: int):
+        """(couches du chunk et de ses 4 voisins, nœuds en cache encore valides ou None)."""
+        walk = self.walk
+        layers = (
+            walk.layer(cx, cy),
+            walk.layer(cx - 1, cy), walk.layer(cx + 1, cy),
+            walk.layer(cx, cy - 1), walk.layer(cx, cy + 1),
+        )
+        key = (cx, cy)
+        entry = self._nodes.get(key)
+        if layers[0] is not None and entry is not None and all(x is y for x, y in zip(entry[0], layers)):
+            self._nodes.move_to_end(key)
+            return layers, entry[1]
+        return layers, None
+
+    def prepare(self, cx: int, cy: int, deadline: float | None = None) -> bool:
+        """
+        Construit à l'avance étiquettes, frontières et arêtes du chunk (ex. dès son arrivée).
+        Avec `deadline` (perf_counter), la construction se fait morceau par morceau (une
+        étiquette ou une frontière à la fois) et s'arrête à l'échéance : False si le chunk
+        n'est pas encore prêt (à reprendre), True sinon.
+        """
+        layers, info = self._cached_nodes(cx, cy)
+        if info is not None or layers[0] is None:
+            return True
+        if deadline is not None:
+            pieces = (
+                (self._chunk_labels, (cx, cy)),
+                (self._chunk_labels, (cx + 1, cy)), (self._border, (cx, cy, 0)),
+                (self._chunk_labels, (cx, cy + 1)), (self._border, (cx, cy, 1)),
+                (self._chunk_labels, (cx - 1, cy)), (self._border, (cx - 1, cy, 0)),
+                (self._chunk_labels, (cx, cy - 1)), (self._border, (cx, cy - 1, 1)),
+            )
+            for build, args in pieces:
+                if time.perf_counter() >= deadline:
+                    return False
+                build(*args)
+            if time.perf_counter() >= deadline:
+                return False
+        self._chunk_nodes(cx, cy)
+        return True
+
+    def _trim(self, cache: OrderedDict) -> None:
+        while len(cache) > self.max_chunks:
+            cache.popitem(last=False)
+
+    # ------------------- recherche -------------------
+
+    def start_route(
+        self,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        max_nodes: int = 20000,
+    ) -> "RouteSearch":
+        """Recherche d'itinéraire de start vers goal, à faire avancer par RouteSearch.step."""
+        self.searches += 1
+        self.last_expanded = 0
+        return RouteSearch(self, start, goal, max_nodes)
+
+    def find_route(
+        self,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        max_nodes: int = 20000,
+    ) -> Optional[list[tuple[int, int]]]:
+        """
+        Points de passage (tuiles) de start vers goal par les entrées de chunks, goal inclus
+        et start exclu. None si aucun itinéraire par chunks chargés n'existe (ou si départ /
+        arrivée ne sont pas praticables).
+        """
+        search = self.start_route(start, goal, max_nodes)
+        search.step()
+        return search.route
+
+    def _epoch(self) -> int:
+        return self.walk.world._change_epoch
+
+    def _known_unreachable(self, pair: tuple) -> bool:
+        if self._unreachable_epoch != self._epoch():
+            self._unreachable.clear()
+            self._unreachable_epoch = self._epoch()
+            return False
+        return pair in self._unreachable
+
+    def _mark_unreachable(self, pair: tuple, epoch: int) -> None:
+        # Monde modifié pendant la recherche : le résultat n'est plus sûr.
+        if epoch == self._epoch():
+            self._known_unreachable(pair)
+            self._unreachable.add(pair)
+
+    def stats(self) -> dict:
+        return {
+            "chunks": len(self._labels),
+            "borders": len(self._borders),
+            "nodes": sum(len(info[2]) for _layers, info in self._nodes.values()),
+            "label_builds": self.label_builds,
+            "border_builds": self.border_builds,
+            "searches": self.searches,
+            "last_expanded": self.last_expanded,
+        }
+
+
+class RouteSearch:
+    """
+    A* en cours sur le graphe par chunks (HierarchicalPathfinder.start_route). step(deadline)
+    le fait avancer jusqu'à l'échéance (perf_counter), graphes des chunks compris ; une fois
+    done, route contient les points de passage (goal inclus, start exclu) ou None si aucun
+    itinéraire n'existe.
+    """
+
+    def __init__(self, finder: HierarchicalPathfinder, start: tuple[int, int], goal: tuple[int, int], max_nodes: int):
+        self.finder = finder
+        self.max_nodes = int(max_nodes)
+        self.start = (int(start[0]), int(start[1]))
+        self.goal = (int(goal[0]), int(goal[1]))
+        self.done = False
+        self.route: Optional[list[tuple[int, int]]] = None
+        self.expanded = 0
+        self.openh: Optional[list] = None  # None : départ / arrivée pas encore examinés
+
+    def _begin(self, deadline: float | None) -> bool:
+        """Examine départ et arrivée et amorce l'A* ; False si leurs chunks ne sont pas encore prêts."""
+        finder = self.finder
+        cs = finder.chunk_size
+        sx, sy = self.start
+        gx, gy = self.goal
+        if not (0 <= sx < finder.width and 0 <= sy < finder.height and 0 <= gx < finder.width and 0 <= gy < finder.height):
+            return self._finish(None, exhausted=False)
+        self.start_chunk = (sx // cs, sy // cs)
+        goal_chunk = (gx // cs, gy // cs)
+        if not finder.prepare(*self.start_chunk, deadline) or not finder.prepare(*goal_chunk, deadline):
+            return False
+        start_info = finder._chunk_nodes(*self.start_chunk)
+        goal_info = finder._chunk_nodes(*goal_chunk)
+        if start_info is None or goal_info is None:
+            return self._finish(None, exhausted=False)
+        start_label = start_info[0][(sy % cs) * cs + (sx % cs)]
+        goal_label = goal_info[0][(gy % cs) * cs + (gx % cs)]
+        if not start_label or not goal_label:
+            return self._finish(None, exhausted=False)
+        if self.start_chunk == goal_chunk and start_label == goal_label:
+            return self._finish([self.goal])
+        # Composante sans entrée (îlot, enclos dans le chunk) : rien ne la relie à l'autre.
+        start_group = start_info[1].get(start_label, ())
+        goal_group = goal_info[1].get(goal_label, ())
+        if not start_group or not goal_group:
+            return self._finish(None, exhausted=False)
+        self.pair = (self.start_chunk, start_label, goal_chunk, goal_label)
+        if finder._known_unreachable(self.pair):
+            return self._finish(None, exhausted=False)
+
+        s = self.start
+        self.epoch = finder._epoch()
+        # Arrivée : reliée aux entrées de sa composante.
+        self.goal_links = {tile: _octile(tile[0], tile[1], gx, gy) for tile in goal_group}
+        self.start_edges = [(tile, _octile(sx, sy, tile[0], tile[1])) for tile in start_group if tile != s]
+        self.openh = [(_octile(sx, sy, gx, gy), 0.0, s)]
+        self.came: dict[tuple[int, int], Optional[tuple[int, int]]] = {s: None}
+        self.gscore = {s: 0.0}
+        return True
+
+    def step(self, deadline: float | None = None) -> bool:
+        """Avance la recherche jusqu'à `deadline` (None : jusqu'au bout) ; True si terminée."""
+        if self.done:
+            return True
+        if self.openh is None and (not self._begin(deadline) or self.done):
+            return self.done
+        finder = self.finder
+        cs = finder.chunk_size
+        s = self.start
+        g = self.goal
+        gx, gy = g
+        openh = self.openh
+        came = self.came
+        gscore = self.gscore
+        goal_links = self.goal_links
+        # Graphes revalidés à chaque reprise (le monde a pu changer entre deux frames) ;
+        # un chunk pas encore prêt est préparé ici, morceau par morceau, dans l'échéance.
+        memo: dict[tuple[int, int], object] = {}
+
+        def nodes_of(key: tuple[int, int]):
+            info = memo.get(key, False)
+            if info is False:
+                if not finder.prepare(key[0], key[1], deadline):
+                    return False
+                info = memo[key] = finder._chunk_nodes(key[0], key[1])
+            return info
+
+        while openh:
+            if deadline is not None and time.perf_counter() >= deadline:
+                finder.last_expanded = self.expanded
+                return False
+            item = heapq.heappop(openh)
+            _f, gc, cur = item
+            if gc != gscore.get(cur):
+                continue
+            if cur == g:
+                route = []
+                while cur is not None and cur != s:
+                    route.append(cur)
+                    cur = came[cur]
+                route.reverse()
+                return self._finish(route)
+            if self.expanded >= self.max_nodes:
+                return self._finish(None, exhausted=False)
+
+            info = nodes_of(self.start_chunk if cur == s else (cur[0] // cs, cur[1] // cs))
+            if info is False:
+                # Chunk pas encore prêt à l'échéance : nœud remis, repris à la frame suivante.
+                heapq.heappush(openh, item)
+                finder.last_expanded = self.expanded
+                return False
+            self.expanded += 1
+            if cur == s:
+                succ = list(self.start_edges)
+                if info is not None:
+                    succ.extend(info[2].get(s, ()))
+            else:
+                succ = info[2].get(cur, ()) if info is not None else ()
+            if cur in goal_links:
+                succ = list(succ)
+                succ.append((g, goal_links[cur]))
+
+            for nxt, cost in succ:
+                ng = gc + cost
+                if ng < gscore.get(nxt, 1e18):
+                    gscore[nxt] = ng
+                    came[nxt] = cur
+                    dx = abs(nxt[0] - gx)
+                    dy = abs(nxt[1] - gy)
+                    heapq.heappush(openh, (ng + dx + dy + _OCTILE_K * (dx if dx < dy else dy), ng, nxt))
+
+        return self._finish(None)
+
+    def _finish(self, route: Optional[list[tuple[int, int]]], exhausted: bool = True) -> bool:
+        self.done = True
+        self.route = route
+        self.finder.last_expanded = self.expanded
+        if route is None and exhausted:
+            self.finder._mark_unreachable(self.pair, self.epoch)
+        # Libère l'état de la recherche (gardée par l'entité jusqu'à la frame suivante).
+        self.openh = []
+        self.came = {}
+        self.gscore = {}
+        return True
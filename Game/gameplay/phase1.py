@@ -11,8 +11,10 @@ import hashlib
 import math
 import time
 from typing import Any, Optional
+import numpy as np
 from Game.ui.iso_render import IsoMapView, get_prop_sprite_name
-from Game.world.world_gen import BIOME_CORRUPT, load_world_params_from_preset, WorldGenerator
+from Game.ui.lighting import DayNightLighting
+from Game.world.world_gen import BIOME_CORRUPT, OV_OBJECT, load_world_params_from_preset, WorldGenerator
 from Game.world.tiles import get_ground_sprite_name
 from Game.species.fauna import PassiveFaunaFactory, PassiveFaunaDefinition
 from Game.species.species import Espece, ROLE_CLASS_LABELS
@@ -28,6 +30,10 @@ from Game.ui.hud.game_hud import (
 from Game.ui.hud.left_hud import LeftHUD
 from Game.ui.hud.notification import add_notification
 from Game.world.fog_of_war import FogOfWar
+from Game.world.chunk_service import create_chunk_service
+from Game.world.planet_overview import PlanetOverview, Q_ESTIMATED
+from Game.world.walkability import WalkabilityCache, walk_threshold
+from Game.gameplay.pathfinding import HierarchicalPathfinder, RouteSearch
 from Game.gameplay.craft import Craft
 from Game.world.day_night import DayNightCycle
 from Game.gameplay.event import EventManager
@@ -70,6 +76,25 @@ _AUTO_HARVESTABLE_PROP_IDS = {
 _SPECIES_CORPSE_PROP_ID = 150
 _SPECIES_GRAVESTONE_PROP_ID = 151
 _FOOD_STOCK_KEYS = ("food", "berries", "meat")
+# Ordres de déplacement au-delà de cette distance (tuiles) : itinéraire par chunks (HPA*)
+_HPA_MIN_DISTANCE = 64
+# Chunks traversés par tronçon d'itinéraire affiné en tuiles
+_HPA_REFINE_CHUNKS = 2
+# Temps par frame pour affiner les itinéraires (et générer les chunks qu'ils attendent)
+_HPA_FRAME_BUDGET_SEC = 0.004
+# Temps minimal d'un tronçon d'A*, même budget de frame épuisé (progression garantie)
+_HPA_LEG_MIN_SEC = 0.001
+# Chunks non générés demandés à la fois pour un ordre lointain (par tranches du trajet)
+_HPA_MAX_PENDING_CHUNKS = 48
+# Lissage des chemins : distance maximale (en cases du chemin) d'un test de ligne de vue
+_SMOOTH_LOOKAHEAD = 24
+# Fenêtre d'A* : marge (tuiles) autour du rectangle départ/arrivée, côté maximal
+_ASTAR_WINDOW_MARGIN = 16
+_ASTAR_MAX_WINDOW = 512
+# Valeur de couche de praticabilité -> 0 / 1, par seuil (walk_threshold)
+_ASTAR_WALK_TABLES = {
+    need: bytes(1 if v >= need else 0 for v in range(256)) for need in (walk_threshold(False), walk_threshold(True))
+}
 _WATER_STOCK_KEYS = ("water",)
 _GARDEN_CYCLE_MINUTES = 4.0
 _GARDEN_FOOD_PER_SEED = 3
@@ -106,6 +131,9 @@ _MINIMAP_BIOME_COLORS: dict[int, tuple[int, int, int]] = {
     23: (96, 82, 126),   # mystic
     24: (132, 42, 42),   # corrupt
 }
+_MINIMAP_BIOME_LUT = np.array(
+    [_MINIMAP_BIOME_COLORS.get(bid, (72, 86, 72)) for bid in range(256)], dtype=np.int16
+)
 
 
 # --------------- CLASSE PRINCIPALE ---------------
@@ -123,6 +151,25 @@ class Phase1:
         self.params = None
         self.world = None
         self.fog=None
+        # Pool de génération de chunks en arrière-plan (None = génération synchrone)
+        self.chunk_service = None
+        # Cache de chunks : épinglage + télémétrie (F3 = overlay debug)
+        self._chunk_cache_world = None
+        self._chunk_pin_cd = 0.0
+        self._chunk_stats_log_cd = 5.0
+        self._chunk_debug_overlay = False
+        # Aperçu de planète (raster basse résolution calculé en arrière-plan) + carte plein écran
+        self.planet_overview: PlanetOverview | None = None
+        self.planet_map_visible = False
+        self._planet_map_surface: pygame.Surface | None = None
+        self._planet_map_rev = -1
+        self._chunk_overlay_font = None
+        # Praticabilité par chunk (pathfinding), liée au monde courant
+        self._walk_cache: WalkabilityCache | None = None
+        # Itinéraires par chunks (HPA*), un graphe par mode de déplacement (terre / eau)
+        self._path_finders: dict[bool, HierarchicalPathfinder] = {}
+        # Fin du budget d'affinage des itinéraires de la frame (perf_counter)
+        self._route_deadline = 0.0
         
         # Système jour/nuit
         self.day_night = DayNightCycle(cycle_duration=600)
@@ -210,6 +257,11 @@ class Phase1:
         self._minimap_cache_center: tuple[int, int] | None = None
         self._minimap_base_surface: pygame.Surface | None = None
         self._minimap_scaled_surface: pygame.Surface | None = None
+        # Image de la minimap (x, y, rgb) sur une grille de pixels globale : un déplacement du
+        # centre décale l'image et ne calcule que les lignes / colonnes découvertes.
+        self._minimap_rgb: np.ndarray | None = None
+        self._minimap_origin: tuple[int, int] | None = None
+        self._minimap_step = 0.0
 
 
         # Transparence des props (activée via touche H)
@@ -273,6 +325,8 @@ class Phase1:
         # Sources de lumière (feux de camp)
         self._campfire_tiles: set[tuple[int, int]] = set()
         self._campfire_probe_cd = 0.0
+        # Éclairage jour/nuit : tampons persistants + sprites de lumière en cache
+        self.lighting = DayNightLighting()
 
         # Repos en tanière (max 1 individu / tanière)
         self._shelter_occupants: dict[tuple[int, int], object] = {}
@@ -429,16 +483,8 @@ class Phase1:
         world = getattr(self, "world", None)
         if world is None:
             return 0
-        overrides = getattr(world, "_biome_overrides", None)
-        if isinstance(overrides, dict):
-            count = 0
-            for bid in overrides.values():
-                try:
-                    if int(bid) == int(BIOME_CORRUPT):
-                        count += 1
-                except Exception:
-                    continue
-            return count
+        if hasattr(world, "count_biome_overrides"):
+            return int(world.count_biome_overrides(BIOME_CORRUPT))
         return 0
 
     def _norm_world_xy(self, x: int, y: int) -> tuple[int, int]:
@@ -740,6 +786,12 @@ class Phase1:
         self._minimap_cache_center = None
         self._minimap_base_surface = None
         self._minimap_scaled_surface = None
+        self._minimap_rgb = None
+        self._minimap_origin = None
+        self._minimap_step = 0.0
+        self.planet_map_visible = False
+        self._planet_map_surface = None
+        self._planet_map_rev = -1
 
         self._stats_last_day = int(getattr(self.day_night, "jour", 0) or 0)
         self._daily_stats = []
@@ -1238,17 +1290,9 @@ class Phase1:
             int(getattr(getattr(self, "tech_tree", None), "innovations", 0) or 0),
         )
 
-    def _scan_warehouses_near_entities(self, radius: int = 96) -> int:
-        """
-        Scan borné autour des entités vivantes pour migration d'anciens saves.
-        Évite le scan global de la carte (trop coûteux).
-        """
-        if not self.world or not getattr(self.world, "overlay", None):
-            return 0
+    def _scan_centers_near_entities(self) -> list[tuple[int, int]]:
+        """Centres de scan : jusqu'à 6 individus vivants (hors faune), sinon le spawn."""
         w, h = int(self.world.width), int(self.world.height)
-        if w <= 0 or h <= 0:
-            return 0
-
         centers: list[tuple[int, int]] = []
         for ent in self.entities:
             if getattr(ent, "_dead_processed", False):
@@ -1264,29 +1308,56 @@ class Phase1:
                 centers.append((int(sx), int(sy)))
             except Exception:
                 centers.append((w // 2, h // 2))
+        return centers
 
-        found = 0
+    def _scan_overlay_near_entities(self, radius: int, prop_ids: tuple[int, ...]):
+        """
+        Scan borné autour des entités vivantes : lit chaque zone en une passe (get_region)
+        et ne renvoie que les tuiles candidates (i, j, cell) : overlay objet (dict) ou prop
+        entier dont l'id est dans prop_ids.
+        """
+        if not self.world or not getattr(self.world, "overlay", None):
+            return
+        w, h = int(self.world.width), int(self.world.height)
+        if w <= 0 or h <= 0:
+            return
+
+        wanted = np.array(prop_ids, dtype=np.uint16)
         seen: set[tuple[int, int]] = set()
         rad = max(8, int(radius))
-        for cx, cy in centers:
+        for cx, cy in self._scan_centers_near_entities():
             x0 = max(0, cx - rad)
             x1 = min(w - 1, cx + rad)
             y0 = max(0, cy - rad)
             y1 = min(h - 1, cy + rad)
-            for j in range(y0, y1 + 1):
-                row = self.world.overlay[j]
-                for i in range(x0, x1 + 1):
-                    if (i, j) in seen:
-                        continue
-                    seen.add((i, j))
-                    cell = row[i]
-                    if isinstance(cell, dict):
-                        if cell.get("state") == "built" and (
-                            cell.get("craft_id") == "Entrepot_primitif" or cell.get("pid") == 102
-                        ):
-                            found += 1
-                    elif isinstance(cell, int) and int(cell) == 102:
-                        found += 1
+            if x1 < x0 or y1 < y0:
+                continue
+            reg = self.world.get_region(x0, y0, x1 - x0 + 1, y1 - y0 + 1, fields=("prop", "override"))
+            candidates = (reg["override"] & OV_OBJECT) != 0
+            if wanted.size:
+                candidates |= ((reg["override"] & OV_OBJECT) == 0) & np.isin(reg["prop"], wanted)
+            for r, c in np.argwhere(candidates):
+                i = x0 + int(c)
+                j = y0 + int(r)
+                if (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                yield i, j, self.world.get_overlay(i, j)
+
+    def _scan_warehouses_near_entities(self, radius: int = 96) -> int:
+        """
+        Scan borné autour des entités vivantes pour migration d'anciens saves.
+        Évite le scan global de la carte (trop coûteux).
+        """
+        found = 0
+        for _i, _j, cell in self._scan_overlay_near_entities(radius, (102,)):
+            if isinstance(cell, dict):
+                if cell.get("state") == "built" and (
+                    cell.get("craft_id") == "Entrepot_primitif" or cell.get("pid") == 102
+                ):
+                    found += 1
+            elif isinstance(cell, int) and int(cell) == 102:
+                found += 1
         return found
 
     def has_built_warehouse(self, force_scan: bool = False) -> bool:
@@ -1303,141 +1374,36 @@ class Phase1:
         """
         Scan borné autour des entités vivantes pour retrouver les récupérateurs d'eau.
         """
-        if not self.world or not getattr(self.world, "overlay", None):
-            return set()
-        w, h = int(self.world.width), int(self.world.height)
-        if w <= 0 or h <= 0:
-            return set()
-
-        centers: list[tuple[int, int]] = []
-        for ent in self.entities:
-            if getattr(ent, "_dead_processed", False):
-                continue
-            if getattr(ent, "is_fauna", False):
-                continue
-            centers.append((int(getattr(ent, "x", 0)), int(getattr(ent, "y", 0))))
-            if len(centers) >= 6:
-                break
-        if not centers:
-            try:
-                sx, sy = self.world.spawn
-                centers.append((int(sx), int(sy)))
-            except Exception:
-                centers.append((w // 2, h // 2))
-
         out: set[tuple[int, int]] = set()
-        seen: set[tuple[int, int]] = set()
-        rad = max(8, int(radius))
-        for cx, cy in centers:
-            x0 = max(0, cx - rad)
-            x1 = min(w - 1, cx + rad)
-            y0 = max(0, cy - rad)
-            y1 = min(h - 1, cy + rad)
-            for j in range(y0, y1 + 1):
-                row = self.world.overlay[j]
-                for i in range(x0, x1 + 1):
-                    if (i, j) in seen:
-                        continue
-                    seen.add((i, j))
-                    cell = row[i]
-                    if isinstance(cell, dict) and cell.get("state") == "built":
-                        if cell.get("craft_id") == "Recuperateur_eau" or int(cell.get("pid", 0) or 0) == 115:
-                            out.add((int(i), int(j)))
+        for i, j, cell in self._scan_overlay_near_entities(radius, ()):
+            if isinstance(cell, dict) and cell.get("state") == "built":
+                if cell.get("craft_id") == "Recuperateur_eau" or int(cell.get("pid", 0) or 0) == 115:
+                    out.add((int(i), int(j)))
         return out
 
     def _scan_gardens_near_entities(self, radius: int = 42) -> set[tuple[int, int]]:
         """
         Scan borné autour des entités vivantes pour retrouver les jardins construits.
         """
-        if not self.world or not getattr(self.world, "overlay", None):
-            return set()
-        w, h = int(self.world.width), int(self.world.height)
-        if w <= 0 or h <= 0:
-            return set()
-
-        centers: list[tuple[int, int]] = []
-        for ent in self.entities:
-            if getattr(ent, "_dead_processed", False):
-                continue
-            if getattr(ent, "is_fauna", False):
-                continue
-            centers.append((int(getattr(ent, "x", 0)), int(getattr(ent, "y", 0))))
-            if len(centers) >= 6:
-                break
-        if not centers:
-            try:
-                sx, sy = self.world.spawn
-                centers.append((int(sx), int(sy)))
-            except Exception:
-                centers.append((w // 2, h // 2))
-
         out: set[tuple[int, int]] = set()
-        seen: set[tuple[int, int]] = set()
-        rad = max(8, int(radius))
-        for cx, cy in centers:
-            x0 = max(0, cx - rad)
-            x1 = min(w - 1, cx + rad)
-            y0 = max(0, cy - rad)
-            y1 = min(h - 1, cy + rad)
-            for j in range(y0, y1 + 1):
-                row = self.world.overlay[j]
-                for i in range(x0, x1 + 1):
-                    if (i, j) in seen:
-                        continue
-                    seen.add((i, j))
-                    cell = row[i]
-                    if isinstance(cell, dict) and cell.get("state") == "built" and cell.get("craft_id") == "Jardin":
-                        out.add((int(i), int(j)))
+        for i, j, cell in self._scan_overlay_near_entities(radius, ()):
+            if isinstance(cell, dict) and cell.get("state") == "built" and cell.get("craft_id") == "Jardin":
+                out.add((int(i), int(j)))
         return out
 
     def _scan_campfires_near_entities(self, radius: int = 48) -> set[tuple[int, int]]:
         """
         Scan borné autour des entités vivantes pour retrouver les feux de camp.
         """
-        if not self.world or not getattr(self.world, "overlay", None):
-            return set()
-        w, h = int(self.world.width), int(self.world.height)
-        if w <= 0 or h <= 0:
-            return set()
-
-        centers: list[tuple[int, int]] = []
-        for ent in self.entities:
-            if getattr(ent, "_dead_processed", False):
-                continue
-            if getattr(ent, "is_fauna", False):
-                continue
-            centers.append((int(getattr(ent, "x", 0)), int(getattr(ent, "y", 0))))
-            if len(centers) >= 6:
-                break
-        if not centers:
-            try:
-                sx, sy = self.world.spawn
-                centers.append((int(sx), int(sy)))
-            except Exception:
-                centers.append((w // 2, h // 2))
-
         out: set[tuple[int, int]] = set()
-        seen: set[tuple[int, int]] = set()
-        rad = max(8, int(radius))
-        for cx, cy in centers:
-            x0 = max(0, cx - rad)
-            x1 = min(w - 1, cx + rad)
-            y0 = max(0, cy - rad)
-            y1 = min(h - 1, cy + rad)
-            for j in range(y0, y1 + 1):
-                row = self.world.overlay[j]
-                for i in range(x0, x1 + 1):
-                    if (i, j) in seen:
-                        continue
-                    seen.add((i, j))
-                    cell = row[i]
-                    if isinstance(cell, dict):
-                        pid = int(cell.get("pid", 0) or 0)
-                        if pid == 101 or cell.get("craft_id") == "Feu_de_camp":
-                            if str(cell.get("state") or "") in ("built", "building"):
-                                out.add((int(i), int(j)))
-                    elif isinstance(cell, int) and int(cell) == 101:
+        for i, j, cell in self._scan_overlay_near_entities(radius, (101,)):
+            if isinstance(cell, dict):
+                pid = int(cell.get("pid", 0) or 0)
+                if pid == 101 or cell.get("craft_id") == "Feu_de_camp":
+                    if str(cell.get("state") or "") in ("built", "building"):
                         out.add((int(i), int(j)))
+            elif isinstance(cell, int) and int(cell) == 101:
+                out.add((int(i), int(j)))
         return out
 
     def _update_campfires(self, dt: float) -> None:
@@ -1715,6 +1681,168 @@ class Phase1:
                 self.tutorial_controller.leave()
             except Exception:
                 pass
+        self._shutdown_chunk_service()
+        self._close_planet_overview()
+
+    def _shutdown_chunk_service(self):
+        if self.chunk_service is not None:
+            self.chunk_service.shutdown()
+            self.chunk_service = None
+        self.view.chunk_service = None
+
+    def _configure_chunk_prefetch(self):
+        settings = getattr(self.app, "settings", None)
+        prefetcher = self.view.prefetcher
+        prefetcher.log_enabled = bool(self._perf_logs_enabled)
+        if settings is None:
+            return
+        try:
+            prefetcher.lookahead_frames = max(0, int(settings.get("world.prefetch_lookahead_frames", 20)))
+            prefetcher.budget_ms = max(0.0, float(settings.get("world.prefetch_budget_ms", 4.0)))
+        except (TypeError, ValueError):
+            pass
+
+    def _configure_view_render(self):
+        settings = getattr(self.app, "settings", None)
+        if settings is None:
+            return
+        self.view.scroll_reuse = bool(settings.get("video.scroll_reuse", True))
+
+    def _update_chunk_cache(self, dt: float):
+        """Budget mémoire, épinglage des chunks utiles et logs de télémétrie du cache de chunks."""
+        world = self.world
+        if world is None or not hasattr(world, "set_pinned_chunks"):
+            return
+        settings = getattr(self.app, "settings", None)
+        if self._chunk_cache_world is not world:
+            # Nouveau monde (chargement de sauvegarde compris) : applique le budget configuré.
+            self._chunk_cache_world = world
+            self._chunk_debug_overlay = bool(settings.get("debug.chunk_overlay", False)) if settings else False
+            if settings is not None:
+                try:
+                    budget = int(float(settings.get("world.chunk_cache_mb", 128)) * 1024 * 1024)
+                    # Ne jamais évincer ce qui vient d'être préchargé (petit monde préchargé en entier).
+                    world.set_cache_budget(max(budget, world.chunk_cache_stats()["resident_bytes"]))
+                except (TypeError, ValueError):
+                    pass
+            self._chunk_pin_cd = 0.0
+
+        self._chunk_pin_cd -= dt
+        if self._chunk_pin_cd <= 0.0:
+            self._chunk_pin_cd = 0.25
+            cs = int(getattr(world, "chunk_size", 64) or 64)
+            n_cx = max(1, (int(world.width) + cs - 1) // cs)
+            n_cy = max(1, (int(world.height) + cs - 1) // cs)
+            pinned = set(self.view.prefetcher.visible_chunks)
+            for ent in self.entities:
+                if getattr(ent, "_dead_processed", False):
+                    continue
+                cx = int(ent.x) // cs
+                cy = int(ent.y) // cs
+                for oy in (-1, 0, 1):
+                    if not 0 <= cy + oy < n_cy:
+                        continue
+                    for ox in (-1, 0, 1):
+                        # Longitude bouclée : les voisins de part et d'autre de la couture.
+                        pinned.add(((cx + ox) % n_cx, cy + oy))
+            world.set_pinned_chunks(pinned)
+
+        if self._perf_logs_enabled:
+            self._chunk_stats_log_cd -= dt
+            if self._chunk_stats_log_cd <= 0.0:
+                self._chunk_stats_log_cd = 5.0
+                st = world.chunk_cache_stats()
+                print(
+                    f"[Perf][Chunks] hits={st['hits']} misses={st['misses']} ({st['hit_rate'] * 100:.1f}%)"
+                    f" evictions={st['evictions']} generated={st['generated']} ({st['gen_time_ms_avg']:.1f}ms/chunk)"
+                    f" disk={st['disk_reads']} resident={st['resident_chunks']} chunks"
+                    f" {st['resident_bytes'] / 1048576:.1f}/{st['budget_bytes'] / 1048576:.1f} MB pinned={st['pinned']}"
+                )
+
+    def _update_planet_overview(self) -> None:
+        """Associe l'aperçu de planète au monde courant et y fusionne les chunks générés."""
+        world = self.world
+        overview = self.planet_overview
+        if overview is not None and overview.world is not world:
+            self._close_planet_overview()
+            overview = None
+        if overview is None:
+            settings = getattr(self.app, "settings", None)
+            enabled = bool(settings.get("world.planet_overview", True)) if settings is not None else True
+            if world is None or self.tutorial_mode or not enabled or not hasattr(world, "add_chunk_listener"):
+                return
+            try:
+                scale = int(settings.get("world.overview_tiles_per_pixel", 16)) if settings is not None else 16
+            except (TypeError, ValueError):
+                scale = 16
+            overview = self.planet_overview = PlanetOverview(world, tiles_per_pixel=scale).start()
+        overview.poll()
+
+    def _close_planet_overview(self) -> None:
+        if self.planet_overview is not None:
+            self.planet_overview.close()
+            self.planet_overview = None
+        self._planet_map_surface = None
+        self._planet_map_rev = -1
+
+    def _draw_chunk_debug_overlay(self, screen: pygame.Surface):
+        if not self._chunk_debug_overlay or self.world is None or not hasattr(self.world, "chunk_cache_stats"):
+            return
+        if self._chunk_overlay_font is None:
+            self._chunk_overlay_font = pygame.font.SysFont("consolas", 14)
+        st = self.world.chunk_cache_stats()
+        pf = self.view.prefetcher.stats()
+        lines = [
+            f"Chunks: {st['resident_chunks']} ({st['resident_bytes'] / 1048576:.1f}/{st['budget_bytes'] / 1048576:.1f} MB)",
+            f"hits {st['hits']}  misses {st['misses']}  ({st['hit_rate'] * 100:.1f}%)",
+            f"evictions {st['evictions']}  pinned {st['pinned']}",
+            f"generated {st['generated']} ({st['gen_time_ms_avg']:.1f} ms)  disk {st['disk_reads']}",
+            f"prefetch hit {pf['hit_rate'] * 100:.1f}%  sync miss {pf['sync_misses_per_s']:.2f}/s",
+        ]
+        sc = self.view.sprite_cache.stats()
+        lines.append(
+            f"sprites {sc['entries']} ({sc['bytes'] / 1048576:.1f}/{sc['budget_bytes'] / 1048576:.0f} MB)"
+            f"  hit {sc['hit_rate'] * 100:.1f}%  prescaled {sc['prescaled']}"
+        )
+        if self.chunk_service is not None:
+            sv = self.chunk_service.stats()
+            lines.append(f"workers {sv['workers']}  pending {sv['pending']}  {sv['avg_latency_ms']:.0f} ms")
+        font = self._chunk_overlay_font
+        h = font.get_linesize()
+        panel = pygame.Surface((360, h * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for idx, line in enumerate(lines):
+            panel.blit(font.render(line, True, (210, 230, 210)), (8, 6 + idx * h))
+        screen.blit(panel, (10, 10))
+
+    def _sync_chunk_service(self):
+        """Associe le pool de génération au monde courant (créé à la demande, jamais en tutoriel)."""
+        world = self.world
+        service = self.chunk_service
+        if getattr(self, "_chunk_settings_world", None) is not world:
+            # Nouveau monde (sauvegarde comprise) : réglages de la machine, pas ceux picklés.
+            self._chunk_settings_world = world
+            settings = getattr(self.app, "settings", None)
+            if settings is not None and hasattr(world, "apply_runtime_settings"):
+                world.apply_runtime_settings(
+                    chunk_backend=settings.get("world.chunk_backend", "numpy"),
+                    disk_cache=settings.get("world.disk_cache", True),
+                    disk_cache_mb=settings.get("world.disk_cache_mb", 512),
+                    smooth_chunk_seams=settings.get("world.smooth_chunk_seams", False),
+                )
+        if world is None or self.tutorial_mode:
+            if service is not None:
+                self._shutdown_chunk_service()
+            return
+        if service is not None and service.world is not world:
+            self._shutdown_chunk_service()
+            service = None
+        if service is None and not getattr(self, "_chunk_service_disabled", False):
+            service = create_chunk_service(world, self.app.settings.get("world.chunk_workers", -1))
+            self.chunk_service = service
+            # Réglage à 0 : on ne retente pas à chaque frame.
+            self._chunk_service_disabled = service is None
+        self.view.chunk_service = service
 
     def _tutorial_ground_walkable(self, i: int, j: int) -> bool:
         if not self.world:
@@ -1839,6 +1967,7 @@ class Phase1:
         if not hasattr(ent, "_move_from"):  ent._move_from = None       # (x,y) float
         if not hasattr(ent, "_move_to"):    ent._move_to = None         # (i,j) int
         if not hasattr(ent, "_move_t"):     ent._move_t = 0.0           # 0..1
+        if not hasattr(ent, "_path_route"): ent._path_route = None      # [move_path, points restants, dernière tuile, arrivée, chunks attendus, recherche en cours]
         if not hasattr(ent, "_combat_target"): ent._combat_target = None
         if not hasattr(ent, "_combat_attack_cd"): ent._combat_attack_cd = 0.0
         if not hasattr(ent, "_combat_repath_cd"): ent._combat_repath_cd = 0.0
@@ -3019,6 +3148,8 @@ class Phase1:
     def enter(self, **kwargs):
         self._perf_update_settings()
         self._perf_trace_frames = 120 if self._perf_logs_enabled else 0
+        self._configure_chunk_prefetch()
+        self._configure_view_render()
         tutorial_mode = bool(kwargs.get("tutorial_mode", False))
         requested_save_path = kwargs.get("save_path")
         load_save = bool(kwargs.get("load_save", False)) and not tutorial_mode
@@ -3033,6 +3164,11 @@ class Phase1:
         # ou de generer un nouveau monde.
         self._reset_session_state()
         self.tutorial_mode = tutorial_mode
+        incoming_service = kwargs.get("chunk_service")
+        if self.chunk_service is not None and self.chunk_service is not incoming_service:
+            self._shutdown_chunk_service()
+        self.chunk_service = incoming_service
+        self._chunk_service_disabled = False
         self._perf_enter_mark(perf, "Etat de session reset")
         if self.tutorial_mode:
             self._save_path = None
@@ -3272,6 +3408,7 @@ class Phase1:
             "inspect_mode": self._control_key("controls.inspect_mode", pygame.K_i),
             "focus_nearest": self._control_key("controls.focus_nearest", pygame.K_SPACE),
             "map_toggle": self._control_key("controls.map_toggle", pygame.K_m),
+            "planet_map": self._control_key("controls.planet_map", pygame.K_p),
         }
 
     def get_control_label(self, path: str, fallback: int) -> str:
@@ -3303,6 +3440,7 @@ class Phase1:
         key_inspect = controls["inspect_mode"]
         key_focus = controls["focus_nearest"]
         key_map = controls["map_toggle"]
+        key_planet_map = controls["planet_map"]
 
         if self.espece and self.espece.lvl_up.active:
             for e in events:
@@ -3350,7 +3488,9 @@ class Phase1:
 
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE:
-                    if self.paused and self._pause_achievements_open:
+                    if self.planet_map_visible:
+                        self.planet_map_visible = False
+                    elif self.paused and self._pause_achievements_open:
                         self._pause_achievements_open = False
                     else:
                         self.paused = not self.paused
@@ -3363,6 +3503,10 @@ class Phase1:
                     if self.minimap_visible:
                         self._minimap_refresh_cd = 0.0
                         self._update_minimap_cache(0.0, force=True)
+                elif e.key == key_planet_map:
+                    self.planet_map_visible = not self.planet_map_visible and self.planet_overview is not None
+                elif e.key == pygame.K_F3:
+                    self._chunk_debug_overlay = not self._chunk_debug_overlay
                 elif e.key == pygame.K_F6 and not self.tutorial_mode:
                     self._ensure_weather_system()
                     if self.weather_system:
@@ -3569,6 +3713,9 @@ class Phase1:
             t_last = now_t
 
         mark("Debut frame update")
+        self._sync_chunk_service()
+        self._update_chunk_cache(dt)
+        self._update_planet_overview()
         if self.espece and self.espece.lvl_up.active:
             mark("Sortie rapide lvl_up actif")
             if self._perf_trace_frames > 0:
@@ -3664,7 +3811,7 @@ class Phase1:
                 and not getattr(e, "is_fauna", False)
             ]
             self.fog.recompute(observers, get_radius, light_level)
-            mark(f"Fog recompute (observers={len(observers)})")
+            mark(f"Fog recompute (observers={len(observers)}, retamponnes={self.fog.restamped})")
         else:
             self.fog = FogOfWar(self.world.width, self.world.height, chunk_size=64)
             mark("Fog recreate")
@@ -3681,6 +3828,7 @@ class Phase1:
         mark("Group supply update")
 
         dead_entities: list = []
+        self._route_deadline = time.perf_counter() + _HPA_FRAME_BUDGET_SEC
         for e in list(self.entities):
             if getattr(e, "is_egg", False):
                 continue
@@ -3916,7 +4064,8 @@ class Phase1:
 
     # ---------- RENDER ----------
     def render(self, screen: pygame.Surface):
-        screen.fill((10, 12, 18))
+        if not self.view.covers_screen():
+            screen.fill((10, 12, 18))
         self.view.begin_hitframe()
         
         # 1) Rendu carte + entités
@@ -3934,21 +4083,11 @@ class Phase1:
             if not visible:
                 continue
 
-            renderer = getattr(ent, "renderer", None)
-            if renderer is None and hasattr(ent, "espece"):
-                renderer = getattr(ent.espece, "renderer", None)
-
-            sprite, rect = None, None
-            if renderer and hasattr(renderer, "get_draw_surface_and_rect"):
-                try:
-                    sprite, rect = renderer.get_draw_surface_and_rect(
-                        self.view, self.world, ent.x, ent.y
-                    )
-                except Exception:
-                    sprite, rect = None, None
-
-            if rect is None:
+            # Sprite déjà calculé par la vue pour ce frame (sinon calculé ici).
+            drawn = self.view._entity_sprite(ent)
+            if drawn is None:
                 continue
+            sprite, rect = drawn
 
             mask = self.view._mask_for_surface(sprite) if sprite is not None else None
             self.view.push_hit("entity", ent, rect, mask)
@@ -4005,6 +4144,11 @@ class Phase1:
         if self.tutorial_controller is not None:
             self.tutorial_controller.draw(screen)
 
+        if self.planet_map_visible and not self.paused:
+            self._draw_planet_map(screen)
+
+        self._draw_chunk_debug_overlay(screen)
+
 
     # ---------- SELECTION HELPERS ----------
     def _entity_screen_rect(self, ent) -> Optional[pygame.Rect]:
@@ -4632,12 +4776,35 @@ class Phase1:
             return True, True
 
     # ---------- PATHFINDING & COLLISIONS ----------
+    def _walkability(self) -> WalkabilityCache | None:
+        """Cache de praticabilité du monde courant (None si le monde n'est pas en chunks)."""
+        w = self.world
+        cache = self._walk_cache
+        if cache is not None and cache.world is w:
+            return cache
+        if w is None or not hasattr(w, "chunk_ground_revision"):
+            self._walk_cache = None
+            return None
+        cache = self._walk_cache = WalkabilityCache(w, _WATER_BIOME_IDS, self._is_species_corpse_overlay)
+        return cache
+
+    def _walk_probe(self, ent=None, generate: bool = False):
+        """Test (i, j) -> praticable pour `ent` le temps d'une recherche (A*, ligne de vue...)."""
+        walk = self._walkability()
+        if walk is not None:
+            return walk.probe(self._entity_can_walk_on_water(ent), generate)
+        return lambda i, j: self._is_walkable(i, j, generate=generate, ent=ent)
+
     def _is_walkable(self, i: int, j: int, generate: bool = True, ent=None) -> bool:
         w = self.world
         if not w: return False
         if i < 0 or j < 0 or i >= w.width or j >= w.height:
             return False
 
+        walk = self._walkability()
+        if walk is not None:
+            return walk.get(i, j, generate) >= walk_threshold(self._entity_can_walk_on_water(ent))
+
         if hasattr(w, "get_tile_snapshot"):
             snap = w.get_tile_snapshot(i, j, generate=generate)
             if snap is None:
@@ -4714,86 +4881,368 @@ class Phase1:
         gx, gy = goal
         if (sx, sy) == (gx, gy):
             return []
+        w = self.world
+        if not w:
+            return []
 
-        # Heuristique octile (8-connexe, coût diag = sqrt(2))
-        import math
-
-        sqrt2 = 1.41421356237
-        octile_k = sqrt2 - 2.0
-
-        def h(a, b):
-            dx = abs(a[0] - b[0])
-            dy = abs(a[1] - b[1])
-            return (dx + dy) + octile_k * min(dx, dy)
-
-        t0 = time.perf_counter()
-        openh: list[tuple[float, float, tuple[int, int]]] = []
-        heapq.heappush(openh, (h(start, goal), 0.0, start))
-        came: dict[tuple[int, int], tuple[int, int] | None] = {start: None}
-        gscore: dict[tuple[int, int], float] = {start: 0.0}
-
-        best = start
-        best_h = h(start, goal)
-        expanded = 0
+        walk = self._walkability()
+        ww, wh = (walk.width, walk.height) if walk is not None else (int(w.width), int(w.height))
+        deadline = None if time_budget_sec is None else time.perf_counter() + time_budget_sec
+        margin = _ASTAR_WINDOW_MARGIN + max(abs(gx - sx), abs(gy - sy)) // 4
+        window = self._astar_span(sx, gx, margin, ww) + self._astar_span(sy, gy, margin, wh)
+        while True:
+            path, retry = self._astar_window(start, goal, window, walk, ent, allow_partial, generate, max_nodes, deadline)
+            if not retry:
+                return path
+            # Recherche épuisée contre le bord de la fenêtre (détour) : fenêtre plus grande.
+            margin *= 4
+            wider = self._astar_span(sx, gx, margin, ww) + self._astar_span(sy, gy, margin, wh)
+            if wider == window:
+                return path
+            window = wider
 
+    def _astar_window(
+        self,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        window: tuple[int, int, int, int],
+        walk: WalkabilityCache | None,
+        ent,
+        allow_partial: bool,
+        generate: bool,
+        max_nodes: int,
+        deadline: float | None,
+    ) -> tuple[list[tuple[int, int]], bool]:
+        """
+        A* limité à la fenêtre (x0, x1, y0, y1). Rend (chemin, à refaire) : à refaire si la
+        recherche s'est épuisée contre le bord de la fenêtre sans trouver l'arrivée.
+        """
+        sx, sy = start
+        gx, gy = goal
+        x0, x1, y0, y1 = window
+        # Les cases sont indexées par un entier k = ligne * W + colonne, avec une bordure
+        # tout autour : les voisins restent dans le tableau sans test de bornes.
+        W = x1 - x0 + 2
+        H = y1 - y0 + 2
+        ox = 1 - x0
+        oy = 1 - y0
+        # 0 = bloqué, 1 = praticable, 2 = bord de fenêtre, 3 = pas encore lu
+        grid = bytearray(b"\x03") * (W * H)
+        grid[0:W] = b"\x02" * W
+        grid[W * (H - 1):] = b"\x02" * W
+        grid[0::W] = b"\x02" * H
+        grid[W - 1::W] = b"\x02" * H
+
+        if walk is not None:
+            # Case inconnue : on recopie d'un coup la partie du chunk dans la fenêtre.
+            cs = walk.chunk_size
+            table = _ASTAR_WALK_TABLES[walk_threshold(self._entity_can_walk_on_water(ent))]
+            layer_of = walk.layer
+
+            def fill(x: int, y: int) -> int:
+                kx = x // cs
+                ky = y // cs
+                ax = max(x0, kx * cs)
+                bx = min(x1, kx * cs + cs)
+                n = bx - ax
+                data = layer_of(kx, ky, generate)
+                src = data.translate(table) if data is not None else None
+                for yy in range(max(y0, ky * cs), min(y1, ky * cs + cs)):
+                    k = (yy + oy) * W + ax + ox
+                    if src is None:
+                        grid[k:k + n] = bytes(n)
+                    else:
+                        o = (yy - ky * cs) * cs + (ax - kx * cs)
+                        grid[k:k + n] = src[o:o + n]
+                return grid[(y + oy) * W + x + ox]
+        else:
+            walkable = self._walk_probe(ent, generate)
+
+            def fill(x: int, y: int) -> int:
+                v = grid[(y + oy) * W + x + ox] = 1 if walkable(x, y) else 0
+                return v
+
+        # Coûts entiers (1 = 10**6, diagonale = sqrt(2)) : les f égaux le sont exactement,
+        # le départage par g n'est pas brouillé par les arrondis flottants.
+        one = 1000000
+        sqrt2 = 1414214
+        octile_k = sqrt2 - 2 * one
+        gscore = [1 << 62] * (W * H)
+        came = [-1] * (W * H)
+        sk = (sy + oy) * W + sx + ox
+        goal_k = (gy + oy) * W + gx + ox if x0 <= gx < x1 and y0 <= gy < y1 else -1
+        # (dx, dy, décalage d'index, coût)
         neigh = [
-            (1, 0), (-1, 0), (0, 1), (0, -1),
-            (1, 1), (1, -1), (-1, 1), (-1, -1),
+            (1, 0, 1, one), (-1, 0, -1, one), (0, 1, W, one), (0, -1, -W, one),
+            (1, 1, W + 1, sqrt2), (1, -1, 1 - W, sqrt2), (-1, 1, W - 1, sqrt2), (-1, -1, -W - 1, sqrt2),
         ]
 
+        perf = time.perf_counter
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        dx0 = abs(sx - gx)
+        dy0 = abs(sy - gy)
+        best_h = one * (dx0 + dy0) + octile_k * (dx0 if dx0 < dy0 else dy0)
+        best = sk
+        gscore[sk] = 0
+        # À f égal, le nœud le plus avancé (g le plus grand) d'abord : évite d'explorer
+        # en largeur les nombreux chemins de même coût en terrain ouvert.
+        openh: list[tuple[int, int, int]] = [(best_h, 0, sk)]
+        expanded = 0
+        found = False
+        clipped = False
+
         while openh:
-            if time_budget_sec is not None and (time.perf_counter() - t0) >= time_budget_sec:
+            if deadline is not None and perf() >= deadline:
                 break
             if expanded >= max_nodes:
                 break
 
-            _f, gc, cur = heapq.heappop(openh)
-            if gc != gscore.get(cur):
+            _f, neg_g, cur = heappop(openh)
+            gc = -neg_g
+            if gc != gscore[cur]:
                 continue
-
-            if cur == goal:
-                path = []
-                while cur in came and cur is not None:
-                    path.append(cur)
-                    cur = came[cur]
-                path.reverse()
-                return path
+            if cur == goal_k:
+                found = True
+                break
 
             expanded += 1
-            cur_h = h(cur, goal)
+            cy, cx = divmod(cur, W)
+            cx -= ox
+            cy -= oy
+            hx = abs(cx - gx)
+            hy = abs(cy - gy)
+            cur_h = one * (hx + hy) + octile_k * (hx if hx < hy else hy)
             if cur_h < best_h:
                 best_h = cur_h
                 best = cur
 
-            for dx, dy in neigh:
-                nx, ny = cur[0] + dx, cur[1] + dy
-                if not self._is_walkable(nx, ny, generate=generate, ent=ent):
-                    continue
-                step_cost = sqrt2 if (dx != 0 and dy != 0) else 1.0
+            for dx, dy, dk, step_cost in neigh:
+                nk = cur + dk
+                v = grid[nk]
+                if v != 1:
+                    if v == 3:
+                        v = fill(cx + dx, cy + dy)
+                    if v != 1:
+                        if v == 2:
+                            clipped = True
+                        continue
                 ng = gc + step_cost
-                if ng < gscore.get((nx, ny), 1e18):
-                    gscore[(nx, ny)] = ng
-                    came[(nx, ny)] = cur
-                    heapq.heappush(openh, (ng + h((nx, ny), goal), ng, (nx, ny)))
-
-        if not allow_partial:
-            return []
-
-        if best == start or best not in came:
-            return []
+                if ng < gscore[nk]:
+                    gscore[nk] = ng
+                    came[nk] = cur
+                    hx = abs(cx + dx - gx)
+                    hy = abs(cy + dy - gy)
+                    heappush(openh, (ng + one * (hx + hy) + octile_k * (hx if hx < hy else hy), -ng, nk))
+
+        retry = not found and not openh and clipped
+        if found:
+            cur = goal_k
+        elif allow_partial and best != sk:
+            cur = best
+        else:
+            return [], retry
 
-        cur = best
         path: list[tuple[int, int]] = []
-        while cur in came and cur is not None:
-            path.append(cur)
+        while cur != sk:
+            py, px = divmod(cur, W)
+            path.append((px - ox, py - oy))
             cur = came[cur]
         path.reverse()
+        return path, retry
+
+    @staticmethod
+    def _astar_span(a: int, b: int, margin: int, size: int) -> tuple[int, int]:
+        """Intervalle [lo, hi) de la fenêtre d'A* sur un axe (départ a, arrivée b)."""
+        lo = max(0, min(a, b) - margin)
+        hi = min(size, max(a, b) + margin + 1)
+        if hi - lo > _ASTAR_MAX_WINDOW:
+            # Trajet trop long pour une fenêtre : on garde le départ, ouvert vers l'arrivée.
+            lo = a - (_ASTAR_MAX_WINDOW // 4 if b >= a else 3 * _ASTAR_MAX_WINDOW // 4)
+            lo = max(0, min(lo, size - _ASTAR_MAX_WINDOW))
+            hi = min(size, lo + _ASTAR_MAX_WINDOW)
+        return lo, hi
+
+    def _hpa_finder(self, ent=None) -> HierarchicalPathfinder | None:
+        """Graphe par chunks du mode de déplacement de `ent` (None si le monde n'est pas en chunks)."""
+        walk = self._walkability()
+        if walk is None:
+            return None
+        water = self._entity_can_walk_on_water(ent)
+        finder = self._path_finders.get(water)
+        if finder is None or finder.walk is not walk:
+            finder = self._path_finders[water] = HierarchicalPathfinder(walk, water)
+        return finder
+
+    def _hpa_search(self, start: tuple[int, int], goal: tuple[int, int], ent=None) -> RouteSearch | None:
+        """Recherche d'itinéraire par les entrées de chunks (HPA*), à faire avancer par step ; None si indisponible."""
+        finder = self._hpa_finder(ent)
+        if finder is None:
+            return None
+        return finder.start_route(start, goal)
+
+    def _refine_route(
+        self,
+        start: tuple[int, int],
+        route: list[tuple[int, int]],
+        ent=None,
+        deadline: float | None = None,
+    ) -> list[tuple[int, int]] | None:
+        """
+        Affine en tuiles (A*) les prochains points de passage de `route` jusqu'à avoir
+        traversé _HPA_REFINE_CHUNKS chunks ; les points affinés sont retirés de `route`.
+        Avec `deadline` (perf_counter), chaque tronçon est borné en temps : un tronçon
+        interrompu rend son chemin partiel, la suite est affinée à l'appel suivant.
+        None si un tronçon est devenu impraticable.
+        """
+        cs = int(getattr(self.world, "chunk_size", 64))
+        path: list[tuple[int, int]] = []
+        cur = (int(start[0]), int(start[1]))
+        crossed = 0
+        while route and crossed < _HPA_REFINE_CHUNKS:
+            nxt = route[0]
+            if nxt != cur:
+                budget = None
+                if deadline is not None:
+                    left = deadline - time.perf_counter()
+                    if path and left <= 0:
+                        break
+                    budget = max(left, _HPA_LEG_MIN_SEC)
+                seg = self._astar_path(
+                    cur, nxt, ent=ent, allow_partial=budget is not None, generate=False,
+                    max_nodes=4 * cs * cs, time_budget_sec=budget,
+                )
+                if seg and seg[0] == cur:
+                    seg = seg[1:]
+                if not seg:
+                    return None
+                path.extend(seg)
+                if seg[-1] != nxt:
+                    break  # tronçon interrompu : repris depuis la tuile atteinte
+                if (cur[0] // cs, cur[1] // cs) != (nxt[0] // cs, nxt[1] // cs):
+                    crossed += 1
+            cur = nxt
+            route.pop(0)
         return path
 
-    def _los_clear(self, a: tuple[float,float], b: tuple[float,float], ent=None) -> bool:
+    def _route_missing_chunks(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
+        """Chunks pas encore en mémoire le long du segment start -> goal, du départ vers l'arrivée."""
+        w = self.world
+        if w is None or not hasattr(w, "has_chunk"):
+            return []
+        cs = int(w.chunk_size)
+        sx, sy = int(start[0]), int(start[1])
+        gx, gy = int(goal[0]), int(goal[1])
+        steps = max(1, max(abs(gx - sx), abs(gy - sy)) * 4 // cs)
+        keys: list[tuple[int, int]] = []
+        prev = None
+        for k in range(steps + 1):
+            key = ((sx + (gx - sx) * k // steps) // cs, (sy + (gy - sy) * k // steps) // cs)
+            if prev is not None and key[0] != prev[0] and key[1] != prev[1]:
+                # Pas en diagonale : l'itinéraire par chunks passe par une frontière.
+                keys.append((key[0], prev[1]))
+            if key != prev:
+                keys.append(key)
+            prev = key
+        missing = [key for key in dict.fromkeys(keys) if not w.has_chunk(*key)]
+        return missing[:_HPA_MAX_PENDING_CHUNKS]
+
+    def _loaded_line_target(self, start: tuple[int, int], goal: tuple[int, int], ent=None) -> tuple[int, int] | None:
+        """Dernière case praticable du segment start -> goal avant le premier chunk absent (None si aucune)."""
+        w = self.world
+        cs = int(w.chunk_size)
+        walkable = self._walk_probe(ent, generate=False)
+        sx, sy = int(start[0]), int(start[1])
+        gx, gy = int(goal[0]), int(goal[1])
+        steps = max(1, abs(gx - sx), abs(gy - sy))
+        best = None
+        for k in range(1, steps + 1):
+            x = sx + (gx - sx) * k // steps
+            y = sy + (gy - sy) * k // steps
+            if not w.has_chunk(x // cs, y // cs):
+                break
+            if walkable(x, y):
+                best = (x, y)
+        return best
+
+    def _fetch_route_chunks(self, keys: list[tuple[int, int]], ent=None) -> list[tuple[int, int]]:
+        """
+        Demande les chunks attendus par un itinéraire (pool d'arrière-plan, sinon génération)
+        puis prépare leur graphe par chunks, dans le budget de la frame ; retourne ceux qui
+        ne sont pas encore prêts.
+        """
+        w = self.world
+        cs = int(w.chunk_size)
+        service = self.chunk_service
+        finder = self._hpa_finder(ent)
+        pending = []
+        for cx, cy in keys:
+            if time.perf_counter() >= self._route_deadline:
+                pending.append((cx, cy))
+                continue
+            if not w.has_chunk(cx, cy):
+                if service is not None:
+                    service.request_chunk(cx, cy)
+                else:
+                    w.ensure_chunk_at(cx * cs, cy * cs)
+                if not w.has_chunk(cx, cy) or time.perf_counter() >= self._route_deadline:
+                    pending.append((cx, cy))
+                    continue
+            if finder is not None and not finder.prepare(cx, cy, self._route_deadline):
+                pending.append((cx, cy))
+        return pending
+
+    def _extend_route(self, ent) -> None:
+        """Ajoute au tracé de `ent` le tronçon suivant de son itinéraire par chunks, dans le budget de la frame."""
+        state = ent._path_route
+        move_path, route, last, goal, waiting, search = state
+        # Tracé remplacé entre-temps (nouvel ordre, combat, arrêt) : itinéraire abandonné.
+        if move_path is not ent.move_path:
+            ent._path_route = None
+            return
+        if time.perf_counter() >= self._route_deadline:
+            return  # budget de la frame épuisé : repris à la frame suivante
+        if waiting:
+            # Ordre vers des chunks jamais générés : itinéraire calculé quand ils sont là.
+            waiting = state[4] = self._fetch_route_chunks(waiting, ent=ent)
+            if waiting:
+                return
+            search = state[5] = self._hpa_search(last, goal, ent=ent)
+            if search is None:
+                ent._path_route = None
+                return
+        if search is not None:
+            # Itinéraire calculé par morceaux, dans le budget de chaque frame.
+            if not search.step(self._route_deadline):
+                return
+            state[5] = None
+            route = state[1] = search.route
+            if not route:
+                # Ordre au-delà des chunks demandés : tranche suivante du trajet.
+                state[4] = self._route_missing_chunks(last, goal)
+                if not state[4]:
+                    ent._path_route = None
+                return
+        raw = self._refine_route(last, route, ent=ent, deadline=self._route_deadline)
+        if raw is None:
+            # Le monde a changé sur l'itinéraire (construction...) : on replanifie depuis
+            # la dernière tuile affinée, aux frames suivantes.
+            state[1] = []
+            state[5] = self._hpa_search(last, goal, ent=ent)
+            if state[5] is None:
+                ent._path_route = None
+            return
+        if not raw:
+            ent._path_route = None
+            return
+        move_path.extend(self._smooth_path(raw, ent=ent))
+        ent._path_route = [move_path, route, raw[-1], goal, [], None] if route else None
+
+    def _los_clear(self, a: tuple[float,float], b: tuple[float,float], ent=None, walkable=None) -> bool:
         """
         Line-of-sight grossière : on échantillonne la droite AB et on vérifie
         que chaque sample tombe sur une case walkable. Suffisant pour lisser.
+        `walkable` : test de praticabilité déjà obtenu (_walk_probe) pour une série de tests.
         """
         import math
         ax, ay = a; bx, by = b
@@ -4802,11 +5251,13 @@ class Phase1:
         if dist < 1e-6:
             return True
         steps = int(dist * 4) + 1  # sur-échantillonnage léger
+        if walkable is None:
+            walkable = self._walk_probe(ent, generate=False)
         for s in range(steps + 1):
             t = s / max(1, steps)
             x = ax + dx * t
             y = ay + dy * t
-            if not self._is_walkable(int(x), int(y), generate=False, ent=ent):
+            if not walkable(int(x), int(y)):
                 return False
         return True
 
@@ -4818,23 +5269,29 @@ class Phase1:
         """
         if not nodes:
             return []
-        # Les chemins longs rendent le lissage (LOS) très coûteux -> on garde le tracé brut.
-        if len(nodes) > 90:
-            return [(i + 0.5, j + 0.5) for (i, j) in nodes]
         # Convertit nodes -> centres flottants
         pts = [(i + 0.5, j + 0.5) for (i, j) in nodes]
+        walkable = self._walk_probe(ent, generate=False)
         smoothed = [pts[0]]
         i = 0
         while i < len(pts) - 1:
-            j = len(pts) - 1
+            # Visée limitée à _SMOOTH_LOOKAHEAD cases : coût linéaire en longueur de
+            # chemin, les tronçons affinés (jusqu'à deux chunks) sont lissés aussi.
+            j = min(len(pts) - 1, i + _SMOOTH_LOOKAHEAD)
             # recule tant que la LOS échoue
-            while j > i + 1 and not self._los_clear(pts[i], pts[j], ent=ent):
+            while j > i + 1 and not self._los_clear(pts[i], pts[j], ent=ent, walkable=walkable):
                 j -= 1
             smoothed.append(pts[j])
             i = j
         return smoothed
 
     def _update_entity_movement(self, ent, dt: float):
+        # Itinéraire long : affine le tronçon suivant avant d'arriver au bout du tracé.
+        if getattr(ent, "_path_route", None) is not None and len(ent.move_path) <= 2:
+            self._extend_route(ent)
+        # Tracé vide mais itinéraire en attente (budget, chunks) : pas encore arrivé.
+        if not ent.move_path and getattr(ent, "_path_route", None) is not None:
+            return
         # Rien à faire ?
         if getattr(ent, "move_path", None) and ent.move_path and ent.ia.get("etat") in ("recolte", "construction", "interaction", "demonte"):
             if hasattr(ent, "comportement"):
@@ -4906,13 +5363,15 @@ class Phase1:
         if self._is_walkable(tx, ty, ent=ent) and (tx, ty) not in forbidden:
             return target
 
+        walkable = self._walk_probe(ent, generate=True)
         best = None
         best_dist = 9999
         for r in range(1, max_radius + 1):
+            # Seul l'anneau de rayon r est nouveau : l'intérieur a déjà été rejeté.
             for dx in range(-r, r + 1):
-                for dy in range(-r, r + 1):
+                for dy in (range(-r, r + 1) if abs(dx) == r else (-r, r)):
                     nx, ny = tx + dx, ty + dy
-                    if not self._is_walkable(nx, ny, ent=ent):
+                    if not walkable(nx, ny):
                         continue
                     if (nx, ny) in forbidden:
                         continue
@@ -4929,14 +5388,39 @@ class Phase1:
         allow_partial = bool(etat == "se_deplace" and not objectif and not action_mode)
         if getattr(ent, "_shelter_resting", False):
             self._leave_shelter(ent)
-        raw_path = self._astar_path(
-            start_pos,
-            target,
-            ent=ent,
-            allow_partial=allow_partial,
-            generate=False,
-        )
-        if not raw_path and start_pos != target:
+        raw_path = None
+        route = None
+        waiting: list[tuple[int, int]] = []
+        search = None
+        if max(abs(target[0] - start_pos[0]), abs(target[1] - start_pos[1])) > _HPA_MIN_DISTANCE:
+            search = self._hpa_search(start_pos, target, ent=ent)
+            # Ordre donné hors de la mise à jour (budget de la frame déjà consommé) : au moins
+            # un pas de recherche, la suite est reprise aux frames suivantes.
+            deadline = max(self._route_deadline, time.perf_counter() + _HPA_LEG_MIN_SEC)
+            if search is not None and search.step(deadline):
+                route = search.route
+                search = None
+                if route:
+                    raw_path = self._refine_route(start_pos, route, ent=ent, deadline=deadline)
+                else:
+                    # Pas d'itinéraire par les chunks en mémoire : ceux du trajet sont demandés,
+                    # l'itinéraire sera calculé à leur arrivée (en avançant d'ici là vers la cible).
+                    waiting = self._route_missing_chunks(start_pos, target)
+        if not raw_path and search is None:
+            route = None
+            # En attente de chunks : A* partiel vers la dernière case chargée du trajet
+            # (l'arrivée, dans un chunk absent, ne peut pas être atteinte).
+            goal = self._loaded_line_target(start_pos, target, ent=ent) if waiting else target
+            raw_path = self._astar_path(
+                start_pos,
+                goal or start_pos,
+                ent=ent,
+                allow_partial=allow_partial or bool(waiting),
+                generate=False,
+                # En attente de chunks : juste de quoi partir vers la cible.
+                time_budget_sec=_HPA_FRAME_BUDGET_SEC if waiting else 0.02,
+            )
+        if not raw_path and start_pos != target and not waiting and search is None:
             return False
 
         if etat != "combat":
@@ -4964,6 +5448,15 @@ class Phase1:
         if waypoints is None:
             waypoints = []
         ent.move_path = waypoints
+        if route and raw_path:
+            ent._path_route = [waypoints, route, raw_path[-1], target, [], None]
+        elif waiting:
+            ent._path_route = [waypoints, None, raw_path[-1] if raw_path else start_pos, target, waiting, None]
+        elif search is not None:
+            # Itinéraire encore en calcul : l'entité part quand il est trouvé.
+            ent._path_route = [waypoints, [], start_pos, target, [], search]
+        else:
+            ent._path_route = None
         ent._move_from = (float(ent.x), float(ent.y))
         ent._move_to = waypoints[0] if waypoints else None
         ent._move_t = 0.0
@@ -5297,71 +5790,112 @@ class Phase1:
             return int(x) - int(cx)
         return int((int(x) - int(cx) + width // 2) % width) - width // 2
 
-    def _sample_minimap_color(self, snap) -> tuple[int, int, int]:
-        if snap is None:
-            return (12, 16, 22)
-        _lvl, _gid, overlay, bid = snap
-        try:
-            biome_id = int(bid)
-        except Exception:
-            biome_id = -1
-        base = _MINIMAP_BIOME_COLORS.get(biome_id, (72, 86, 72))
-        if overlay:
-            # Case occupée par une structure/prop: petit boost de luminosité
-            return (
-                min(255, base[0] + 14),
-                min(255, base[1] + 14),
-                min(255, base[2] + 14),
-            )
-        return base
+    def _minimap_lattice(self, center: tuple[int, int]) -> tuple[int, float, tuple[int, int]]:
+        """(taille en pixels, tuiles par pixel, pixel global du coin haut-gauche) pour `center`."""
+        sample = max(32, int(self._minimap_sample_size))
+        span = max(64, int(self._minimap_world_span))
+        step = span / float(sample)
+        half = span * 0.5
+        cx, cy = center
+        return sample, step, (int(round((cx - half) / step)), int(round((cy - half) / step)))
+
+    def _minimap_colors(self, cols: np.ndarray, rows: np.ndarray, step: float) -> np.ndarray:
+        """Couleurs [x, y, rgb] des pixels globaux cols x rows (pixel n = tuile floor((n + 0.5) * step))."""
+        world = self.world
+        xs = np.floor((cols + 0.5) * step).astype(np.int64)
+        ys = np.floor((rows + 0.5) * step).astype(np.int64)
+        grid = world.sample_grid(xs, ys, fields=("biome", "prop", "override", "loaded"), generate=False)
+
+        # Couleur par biome (LUT), petit boost de luminosité sur les cases occupées
+        # par une structure/prop, sombre pour les chunks pas encore générés.
+        rgb = _MINIMAP_BIOME_LUT[grid["biome"]]
+        occupied = (grid["prop"] > 0) | ((grid["override"] & OV_OBJECT) != 0)
+        rgb[occupied] = np.minimum(255, rgb[occupied] + 14)
+        unloaded = ~grid["loaded"]
+        rgb[unloaded] = (12, 16, 22)
+        if self.planet_overview is not None and unloaded.any():
+            # Hors chunks chargés : aperçu de planète, assombri.
+            biome, _level, quality = self.planet_overview.sample(xs, ys)
+            known = unloaded & (quality >= Q_ESTIMATED)
+            rgb[known] = _MINIMAP_BIOME_LUT[biome[known]] // 2
+        return rgb.astype(np.uint8).transpose(1, 0, 2)
 
     def _rebuild_minimap_cache(self, center: tuple[int, int]) -> None:
         world = self.world
         if world is None:
             return
-        sample = max(32, int(self._minimap_sample_size))
-        span = max(64, int(self._minimap_world_span))
-        half = span * 0.5
-        width = max(1, int(world.width))
-        height = max(1, int(world.height))
-        cx, cy = center
+        sample, step, origin = self._minimap_lattice(center)
+        span = np.arange(sample, dtype=np.int64)
+        self._minimap_rgb = self._minimap_colors(origin[0] + span, origin[1] + span, step)
+        self._minimap_origin = origin
+        self._minimap_step = step
+        self._present_minimap()
+
+    def _scroll_minimap_cache(self, center: tuple[int, int]) -> None:
+        """Décale l'image vers le nouveau centre ; seules les bandes découvertes sont échantillonnées."""
+        sample, step, origin = self._minimap_lattice(center)
+        rgb = self._minimap_rgb
+        if rgb is None or step != self._minimap_step or rgb.shape[0] != sample:
+            self._rebuild_minimap_cache(center)
+            return
+        sx = origin[0] - self._minimap_origin[0]
+        sy = origin[1] - self._minimap_origin[1]
+        if sx == 0 and sy == 0:
+            return
+        if abs(sx) >= sample or abs(sy) >= sample:
+            self._rebuild_minimap_cache(center)
+            return
 
-        base = pygame.Surface((sample, sample))
-        step = span / float(sample)
-        for py in range(sample):
-            wy = int(cy - half + (py + 0.5) * step)
-            wy = max(0, min(height - 1, wy))
-            for px in range(sample):
-                wx = int(cx - half + (px + 0.5) * step) % width
-                snap = world.get_tile_snapshot(wx, wy, generate=False) if hasattr(world, "get_tile_snapshot") else None
-                base.set_at((px, py), self._sample_minimap_color(snap))
+        rgb = np.roll(rgb, (-sx, -sy), axis=(0, 1))
+        cols = origin[0] + np.arange(sample, dtype=np.int64)
+        rows = origin[1] + np.arange(sample, dtype=np.int64)
+        if sx:
+            sl = slice(sample - sx, sample) if sx > 0 else slice(0, -sx)
+            rgb[sl, :] = self._minimap_colors(cols[sl], rows, step)
+        if sy:
+            sl = slice(sample - sy, sample) if sy > 0 else slice(0, -sy)
+            rgb[:, sl] = self._minimap_colors(cols, rows[sl], step)
+        self._minimap_rgb = rgb
+        self._minimap_origin = origin
+        self._present_minimap()
+
+    def _present_minimap(self) -> None:
+        """Copie l'image dans les surfaces de la minimap (réutilisées, pas réallouées)."""
+        rgb = self._minimap_rgb
+        sample = rgb.shape[0]
+        base = self._minimap_base_surface
+        if base is None or base.get_size() != (sample, sample):
+            base = self._minimap_base_surface = pygame.Surface((sample, sample))
+        pygame.surfarray.blit_array(base, rgb)
 
         display_size = max(120, int(self._minimap_display_size))
-        self._minimap_base_surface = base
-        self._minimap_scaled_surface = pygame.transform.scale(base, (display_size, display_size))
-        self._minimap_cache_center = (int(cx), int(cy))
+        scaled = self._minimap_scaled_surface
+        if scaled is None or scaled.get_size() != (display_size, display_size):
+            scaled = self._minimap_scaled_surface = pygame.Surface((display_size, display_size))
+        pygame.transform.scale(base, (display_size, display_size), scaled)
+
+        # Centre effectif de l'image (grille de pixels), repère des marqueurs d'entités
+        step = self._minimap_step
+        half = sample * step * 0.5
+        ox, oy = self._minimap_origin
+        self._minimap_cache_center = (
+            int(round(ox * step + half)) % max(1, int(self.world.width)),
+            int(round(oy * step + half)),
+        )
 
     def _update_minimap_cache(self, dt: float, force: bool = False) -> None:
         if not self.minimap_visible or self.world is None:
             return
 
         center = self._minimap_focus_tile()
-        need_rebuild = force or self._minimap_scaled_surface is None or self._minimap_cache_center is None
-        if not need_rebuild:
-            last_x, last_y = self._minimap_cache_center
-            dx = abs(self._wrap_dx(center[0], last_x, int(self.world.width)))
-            dy = abs(int(center[1]) - int(last_y))
-            if dx + dy >= 8:
-                need_rebuild = True
-
         self._minimap_refresh_cd -= float(dt)
-        if self._minimap_refresh_cd <= 0.0:
-            need_rebuild = True
-
-        if need_rebuild:
+        if force or self._minimap_scaled_surface is None or self._minimap_rgb is None or self._minimap_refresh_cd <= 0.0:
+            # Rééchantillonnage complet périodique : chunks chargés, props / constructions modifiés.
             self._rebuild_minimap_cache(center)
-            self._minimap_last_center = center
             self._minimap_refresh_cd = float(self._minimap_refresh_interval)
+        else:
+            self._scroll_minimap_cache(center)
+        self._minimap_last_center = center
 
     def _draw_species_minimap(self, screen: pygame.Surface) -> None:
         if not self.minimap_visible or self.world is None:
@@ -5419,6 +5953,69 @@ class Phase1:
 
         pygame.draw.rect(screen, (130, 150, 180), map_rect, 1)
 
+    def _planet_map_image(self) -> pygame.Surface | None:
+        """Image de l'aperçu de planète (1 pixel = tiles_per_pixel tuiles), refaite si l'aperçu a changé."""
+        overview = self.planet_overview
+        if overview is None:
+            return None
+        if self._planet_map_surface is not None and self._planet_map_rev == overview.revision:
+            return self._planet_map_surface
+        self._planet_map_rev = overview.revision
+        biome, level, quality = overview.biome_level()
+        # Relief : éclaircit avec le niveau ; pixels seulement estimés (passe grossière) assombris.
+        shade = 0.78 + 0.06 * level.astype(np.float32)
+        shade[quality < Q_ESTIMATED + 1] *= 0.8
+        rgb = _MINIMAP_BIOME_LUT[biome] * shade[:, :, None]
+        rgb[quality < Q_ESTIMATED] = (12, 16, 22)
+        rgb = np.clip(rgb, 0, 255).astype(np.uint8).transpose(1, 0, 2)
+        surf = self._planet_map_surface
+        if surf is None or surf.get_size() != rgb.shape[:2]:
+            surf = self._planet_map_surface = pygame.Surface(rgb.shape[:2])
+        pygame.surfarray.blit_array(surf, rgb)
+        return surf
+
+    def _draw_planet_map(self, screen: pygame.Surface) -> None:
+        image = self._planet_map_image()
+        if image is None or self.world is None:
+            return
+        sw, sh = screen.get_size()
+        screen.fill((10, 14, 20))
+
+        # Carte centrée, proportions du monde conservées.
+        margin = 40
+        iw, ih = image.get_size()
+        fit = min((sw - 2 * margin) / max(1, iw), (sh - 2 * margin - 24) / max(1, ih))
+        map_w, map_h = max(1, int(iw * fit)), max(1, int(ih * fit))
+        map_rect = pygame.Rect((sw - map_w) // 2, (sh - map_h) // 2 + 12, map_w, map_h)
+        screen.blit(pygame.transform.scale(image, (map_w, map_h)), map_rect.topleft)
+        pygame.draw.rect(screen, (130, 150, 180), map_rect, 1)
+
+        title = "Planète"
+        progress = self.planet_overview.progress()
+        if progress < 1.0:
+            title += f" (calcul {int(progress * 100)}%)"
+        screen.blit(self.font.render(title, True, (210, 220, 240)), (map_rect.x, map_rect.y - 24))
+
+        world_w = max(1, int(self.world.width))
+        world_h = max(1, int(self.world.height))
+
+        def to_map(x, y) -> tuple[int, int]:
+            px = map_rect.x + int((int(x) % world_w) / world_w * (map_rect.width - 1))
+            py = map_rect.y + int(max(0, min(world_h - 1, int(y))) / world_h * (map_rect.height - 1))
+            return px, py
+
+        for ent in self.entities:
+            if getattr(ent, "is_fauna", False) or getattr(ent, "is_egg", False):
+                continue
+            if getattr(ent, "espece", None) is not self.espece:
+                continue
+            px, py = to_map(ent.x, ent.y)
+            color = (255, 255, 255) if ent is self.joueur else (250, 238, 120)
+            pygame.draw.rect(screen, color, pygame.Rect(px - 1, py - 1, 3, 3))
+
+        cx, cy = to_map(*self._minimap_focus_tile())
+        pygame.draw.circle(screen, (245, 245, 255), (cx, cy), 6, 1)
+
     def _draw_group_supply_hud(self, screen: pygame.Surface) -> None:
         if self.paused or self.ui_menu_open:
             return
@@ -5479,53 +6076,35 @@ class Phase1:
         min_light = 0.08 + 0.30 * nv01  # 0.08 (très sombre) -> 0.38 (vision nocturne forte)
         light = self.day_night.get_light_level(min_light=min_light)
 
-        # 1) Brightness (gris) : 255 = normal, <255 = sombre
-        m = int(255 * light)
-        overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-        overlay.fill((m, m, m, 255))
-        surface.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-        # 1.5) Filtre noir additionnel (la vision nocturne l'atténue via 'light')
-        night_alpha = int(max(0.0, min(180.0, (1.0 - float(light)) * 180.0)))
-        if night_alpha > 0:
-            dark = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-            dark.fill((0, 0, 0, night_alpha))
-            surface.blit(dark, (0, 0))
-
-        # 1.75) Lumières locales (feux de camp)
-        self._apply_campfire_lights(surface, light_level=light)
-
-        # 2) Tint (couleur) léger par-dessus (optionnel mais joli)
-        r, g, b = self.day_night.get_ambient_color()
-        tint = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-
-        # alpha faible sinon ça “salit” l’image
-        tint.fill((r, g, b, 35))
-        surface.blit(tint, (0, 0))
+        # Luminosité, voile noir (atténué par la vision nocturne via 'light') et teinte
+        # ambiante fusionnés en une couleur MULT + une couleur ADD ; feux de camp entre les deux.
+        lights, radius, intensity = self._campfire_lights(surface, light_level=light)
+        self.lighting.apply(
+            surface, light, self.day_night.get_ambient_color(),
+            lights=lights, radius=radius, intensity=intensity,
+        )
 
-    def _apply_campfire_lights(self, surface: pygame.Surface, *, light_level: float) -> None:
+    def _campfire_lights(self, surface: pygame.Surface, *, light_level: float):
         """
-        Ajoute un éclairage local autour des feux de camp (pid=101).
-        Utilise un blend additif pour "casser" l'obscurité.
+        Centres écran des feux de camp (pid=101) à éclairer, rayon et intensité de leur lumière.
+        Rien à éclairer de jour (obscurité négligeable).
         """
         if not self._campfire_tiles:
-            return
+            return [], 0, 0.0
         try:
             light_level = float(light_level)
         except Exception:
             light_level = 1.0
         darkness = max(0.0, min(1.0, 1.0 - light_level))
         if darkness <= 0.02:
-            return
+            return [], 0, 0.0
 
         dx, dy, _wall_h = self.view._proj_consts()
         base_radius = max(48, int(8.5 * float(dy)))
         intensity = 0.35 + 0.85 * darkness
-        r0, g0, b0 = 255, 200, 120
-
-        layer = pygame.Surface(surface.get_size())
-        layer.fill((0, 0, 0))
+        sw, sh = surface.get_size()
 
+        centers = []
         for i, j in list(self._campfire_tiles):
             poly = self.view.tile_surface_poly(int(i), int(j))
             if not poly:
@@ -5534,19 +6113,11 @@ class Phase1:
             cy = int(sum(p[1] for p in poly) / len(poly) - float(dy) * 0.6)
 
             # Si hors-écran, on évite de dessiner
-            if cx < -base_radius or cy < -base_radius:
+            if cx < -base_radius or cy < -base_radius or cx > sw + base_radius or cy > sh + base_radius:
                 continue
-            sw, sh = surface.get_size()
-            if cx > sw + base_radius or cy > sh + base_radius:
-                continue
-
-            for k, falloff in enumerate((1.0, 0.70, 0.45, 0.25)):
-                radius = int(base_radius * falloff)
-                strength = intensity * (0.65 ** k)
-                color = (int(r0 * strength), int(g0 * strength), int(b0 * strength))
-                pygame.draw.circle(layer, color, (cx, cy), radius)
+            centers.append((cx, cy))
+        return centers, base_radius, intensity
 
-        surface.blit(layer, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
     def _draw_weather_hud(self, screen: pygame.Surface):
         if not self.weather_system or not self.joueur:
             return
@@ -1,10 +1,14 @@
 #Pour que le jeu se lance à la racine
 import sys
 import os
+import multiprocessing
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
-#Importation des modules
-from Game.core.app import App
-# Démarrage du jeu :)
-game=App()
-game.run()
\ No newline at end of file
+# Garde obligatoire : les workers de génération de chunks (spawn) ré-importent ce module.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    #Importation des modules
+    from Game.core.app import App
+    # Démarrage du jeu :)
+    game=App()
+    game.run()
@@ -8,6 +8,7 @@ from typing import Tuple, Sequence, Optional, Dict, List
 import pygame
 
 from Game.species.species import Espece, Individu
+from Game.ui.sprite_cache import shared_sprite_cache
 
 
 @dataclass(frozen=True)
@@ -243,9 +244,8 @@ class PassiveFaunaRenderer:
 
     def get_draw_surface_and_rect(self, view, world, tx: float, ty: float) -> Tuple[pygame.Surface, pygame.Rect]:
         base = self._current_frame()
-        zoom = getattr(view, "zoom", 1.0) or 1.0
-        scale = max(0.05, float(zoom) * self.base_scale)
-        sprite = pygame.transform.smoothscale(base, (int(base.get_width() * scale), int(base.get_height() * scale)))
+        zoom = max(0.05, float(getattr(view, "zoom", 1.0) or 1.0))
+        sprite = shared_sprite_cache().get("smooth", (base, self.base_scale), zoom)
 
         dx, dy, wall_h = view._proj_consts()
         z = 0
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 import pygame
 
 from Game.ui.hud.notification import add_notification
+from Game.ui.sprite_cache import shared_sprite_cache
 
 
 class EggRenderer:
@@ -23,11 +24,8 @@ class EggRenderer:
         return surf
 
     def get_draw_surface_and_rect(self, view, world, tx: float, ty: float):
-        sprite = self.assets.get_image("oeuf")
         zoom = getattr(view, "zoom", 1.0) or 1.0
-        if abs(zoom - 1.0) > 1e-6:
-            w, h = sprite.get_size()
-            sprite = pygame.transform.smoothscale(sprite, (int(w * zoom), int(h * zoom)))
+        sprite = shared_sprite_cache().get("smooth", (self.assets.get_image("oeuf"), 1.0), zoom)
 
         dx, dy, wall_h = view._proj_consts()
         z = 0
@@ -2,6 +2,8 @@
 import colorsys
 import pygame
 
+from Game.ui.sprite_cache import shared_sprite_cache
+
 DEFAULT_BLOB_COLOR = (70, 130, 220)
 
 class SpriteSheet:
@@ -62,7 +64,7 @@ class EspeceRenderer:
         # Caches
         self._sheet_cache = {}           # key -> SpriteSheet
         self._compose_cache = {}         # (variant, anim, frame_idx, overlays) -> (surface, anchor_x, anchor_y)
-        self._scaled_cache = {}          # (compose_id, zoom_eff) -> surface
+        # Les frames mises à l'échelle vont dans le cache partagé (niveaux de zoom, LRU)
 
         # Pour compat éventuelle avec le reste (si quelque part tu touches renderer.layers)
         self.layers = {}
@@ -198,9 +200,9 @@ class EspeceRenderer:
         if self.current_anim != name or reset:
             self.current_anim = name
             self._anim_start_ms = pygame.time.get_ticks()
-            # le rendu change => on invalide les caches de scale/compo
+            # le rendu change => on invalide le cache de compo (les anciennes frames
+            # mises à l'échelle sortent du cache partagé par LRU)
             self._compose_cache.clear()
-            self._scaled_cache.clear()
 
     def _current_frame_index(self, now_ms: int) -> int:
         anim = self.animations.get(self.current_anim, self.animations["idle"])
@@ -224,7 +226,6 @@ class EspeceRenderer:
         self.base_variant_key = self.sheet_key
         self.overlay_keys = []
         self._compose_cache.clear()
-        self._scaled_cache.clear()
 
         # self.espece peut être un Individu (runtime) ou une Espece (preview)
         manager = getattr(self.espece, "mutations", None)
@@ -287,23 +288,9 @@ class EspeceRenderer:
         self._compose_cache[cache_key] = (out, anchor_x, anchor_y, ss.fh)
         return out, anchor_x, anchor_y, ss.fh
 
-    def _get_scaled(self, composed_surf: pygame.Surface, zoom_eff: float):
-        # cache scaling (important si beaucoup d'entités)
-        key = (id(composed_surf), round(zoom_eff, 4))
-        if key in self._scaled_cache:
-            return self._scaled_cache[key]
-
-        if abs(zoom_eff - 1.0) < 1e-6:
-            scaled = composed_surf
-        else:
-            w, h = composed_surf.get_size()
-            scaled = pygame.transform.smoothscale(
-                composed_surf,
-                (max(1, int(w * zoom_eff)), max(1, int(h * zoom_eff)))
-            )
-
-        self._scaled_cache[key] = scaled
-        return scaled
+    def _get_scaled(self, composed_surf: pygame.Surface, zoom: float, factor: float):
+        # cache partagé (important si beaucoup d'entités) : zoom discret de la vue * échelle interne
+        return shared_sprite_cache().get("smooth", (composed_surf, round(factor, 4)), zoom)
 
     # --------- API utilisée par le reste du jeu ----------
     def get_draw_surface_and_rect(self, view, world, tx: float, ty: float):
@@ -316,7 +303,7 @@ class EspeceRenderer:
         # Ex: 24/32 pour base_blob_idle, 24/40 pour bipede_blob_idle
         internal_scale = float(self.BASE_SIZE[1]) / float(max(1, int(base_frame_h or 1)))
         zoom_eff = zoom * internal_scale * size_scale
-        sprite = self._get_scaled(composed, zoom_eff)
+        sprite = self._get_scaled(composed, zoom, internal_scale * size_scale)
 
         # 3) projection iso (identique à ton ancien code)
         dx, dy, wall_h = view._proj_consts()
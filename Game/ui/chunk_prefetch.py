@@ -0,0 +1,269 @@
+# chunk_prefetch.py
+# Préchargement prédictif des chunks piloté par la caméra.
+#
+# Principe :
+# - On suit la tuile au centre de l'écran (indépendante du zoom) et le zoom lui-même
+#   pour estimer une vitesse caméra (tuiles/s) et une vitesse de zoom.
+# - On extrapole la zone visible dans N frames et on génère à l'avance les chunks
+#   manquants de cette zone (+ un anneau de marge), les plus proches d'abord.
+# - Génération : soit via le ChunkGenerationService (arrière-plan), soit en synchrone
+#   dans un budget de temps fixe par frame.
+# - Statistiques : taux de "hit" (chunk déjà prêt quand il devient visible) et
+#   nombre de générations synchrones forcées par le rendu ("miss") par seconde.
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Optional
+
+# Coût supposé d'une génération synchrone tant que rien n'est mesuré (backend numpy,
+# ~12 ms par chunk d'après benchmarks/bench_chunk_gen.py) : prudent plutôt que nul.
+_DEFAULT_SYNC_COST_S = 0.012
+
+
+class ChunkPrefetcher:
+    def __init__(
+        self,
+        view,
+        lookahead_frames: int = 20,
+        budget_ms: float = 4.0,
+        ring_chunks: int = 1,
+        max_requests_per_frame: int = 16,
+    ):
+        self.view = view
+        self.lookahead_frames = max(0, int(lookahead_frames))
+        self.budget_ms = max(0.0, float(budget_ms))
+        self.ring_chunks = max(0, int(ring_chunks))
+        self.max_requests_per_frame = max(1, int(max_requests_per_frame))
+        self.enabled = True
+        self.log_enabled = False
+        self.log_interval_s = 5.0
+
+        # Suivi caméra (tuiles/s et log(zoom)/s, lissés)
+        self._last_t: Optional[float] = None
+        self._last_center: Optional[tuple[float, float]] = None
+        self._last_log_zoom: Optional[float] = None
+        self._vel_i = 0.0
+        self._vel_j = 0.0
+        self._vel_log_zoom = 0.0
+        self._frame_dt = 1.0 / 60.0
+        self.smoothing = 0.35
+        # Coût estimé d'une génération synchrone (s, lissé), None tant qu'inconnu
+        self._sync_cost_s: Optional[float] = None
+
+        # Statistiques
+        self._visible_prev: set[tuple[int, int]] = set()
+        self.hits = 0
+        self.misses = 0
+        self.sync_misses = 0
+        self.prefetched = 0
+        self._sync_miss_times: deque[float] = deque()
+        self._last_log_t = time.perf_counter()
+
+    def reset(self) -> None:
+        self._last_t = None
+        self._last_center = None
+        self._last_log_zoom = None
+        self._vel_i = self._vel_j = self._vel_log_zoom = 0.0
+        self._visible_prev = set()
+        self.hits = self.misses = self.sync_misses = self.prefetched = 0
+        self._sync_miss_times.clear()
+
+    @property
+    def visible_chunks(self) -> set[tuple[int, int]]:
+        """Chunks visibles à la dernière frame rendue."""
+        return self._visible_prev
+
+    # ------------------- géométrie -------------------
+
+    def _center_tile(self, dx: float, dy: float) -> tuple[float, float]:
+        """Tuile (flottante, z=0) sous le centre de l'écran."""
+        x = float(self.view.cam_x)
+        y = float(self.view.cam_y)
+        return (x / (2 * dx)) + (y / (2 * dy)), (y / (2 * dy)) - (x / (2 * dx))
+
+    def _chunk_range(self, ci: float, cj: float, zoom_ratio: float, dx: float, dy: float, pad_chunks: int):
+        """
+        Chunks couverts par l'écran centré sur (ci, cj) au zoom courant * zoom_ratio.
+        cx n'est pas ramené dans la carte (longitude bouclée : voir _wrap_cx), cy est borné.
+        """
+        world = self.view.world
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        zdx = dx * zoom_ratio
+        zdy = dy * zoom_ratio
+        # Demi-étendue en tuiles : projection inverse des coins de l'écran + marge de culling.
+        half = (self.view.screen_w / (4 * zdx)) + (self.view.screen_h / (4 * zdy))
+        half += int(self.view.cull_pad_tiles) + int(self.view.cull_prop_extra_tiles)
+        max_cy = (int(world.height) - 1) // cs
+        cx0 = int(math.floor((ci - half) / cs)) - pad_chunks
+        cx1 = int(math.floor((ci + half) / cs)) + pad_chunks
+        cy0 = max(0, int(math.floor((cj - half) / cs)) - pad_chunks)
+        cy1 = min(max_cy, int(math.floor((cj + half) / cs)) + pad_chunks)
+        return cx0, cx1, cy0, cy1
+
+    def _wrap_cx(self, cx: int) -> int:
+        """Colonne de chunk ramenée dans la carte (le monde boucle en longitude)."""
+        world = self.view.world
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        n_cx = max(1, (int(world.width) + cs - 1) // cs)
+        return cx % n_cx
+
+    # ------------------- suivi caméra -------------------
+
+    def _track_camera(self, now: float, dx: float, dy: float) -> tuple[float, float]:
+        ci, cj = self._center_tile(dx, dy)
+        log_zoom = math.log(max(1e-6, float(self.view.zoom)))
+        if self._last_t is not None:
+            dt = now - self._last_t
+            if 1e-4 < dt < 0.5:
+                a = self.smoothing
+                self._vel_i += a * (((ci - self._last_center[0]) / dt) - self._vel_i)
+                self._vel_j += a * (((cj - self._last_center[1]) / dt) - self._vel_j)
+                self._vel_log_zoom += a * (((log_zoom - self._last_log_zoom) / dt) - self._vel_log_zoom)
+                self._frame_dt += a * (dt - self._frame_dt)
+            elif dt >= 0.5:
+                # Pause / changement d'état : on repart de zéro.
+                self._vel_i = self._vel_j = self._vel_log_zoom = 0.0
+        self._last_t = now
+        self._last_center = (ci, cj)
+        self._last_log_zoom = log_zoom
+        return ci, cj
+
+    def predicted_chunks(self, dx: float, dy: float) -> list[tuple[int, int]]:
+        """Chunks à préparer : zone visible prédite dans N frames (+ anneau), triés par distance."""
+        ci, cj = self._last_center if self._last_center is not None else self._center_tile(dx, dy)
+        horizon = self._frame_dt * self.lookahead_frames
+        pi = ci + self._vel_i * horizon
+        pj = cj + self._vel_j * horizon
+        zoom = float(self.view.zoom)
+        pred_zoom = zoom * math.exp(self._vel_log_zoom * horizon)
+        pred_zoom = max(float(self.view.min_zoom), min(float(self.view.max_zoom), pred_zoom))
+        zoom_ratio = pred_zoom / max(zoom, 1e-6)
+
+        cs = int(getattr(self.view.world, "chunk_size", 64) or 64)
+        cx0, cx1, cy0, cy1 = self._chunk_range(pi, pj, zoom_ratio, dx, dy, self.ring_chunks)
+        pcx, pcy = pi / cs, pj / cs
+        coords = [(cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)]
+        coords.sort(key=lambda c: (c[0] + 0.5 - pcx) ** 2 + (c[1] + 0.5 - pcy) ** 2)
+        # Tri sur les colonnes non bouclées (distance réelle), puis clés de chunk bouclées ;
+        # un écran plus large que la planète ne garde que l'occurrence la plus proche.
+        wrapped = dict.fromkeys((self._wrap_cx(cx), cy) for cx, cy in coords)
+        return list(wrapped)
+
+    # ------------------- API rendu -------------------
+
+    def note_visible(self, i_min: int, i_max: int, j_min: int, j_max: int) -> None:
+        """
+        À appeler par le rendu AVANT de dessiner : compte les chunks qui deviennent
+        visibles et s'ils étaient déjà prêts (hit) ou non (miss).
+        """
+        world = self.view.world
+        if world is None or not hasattr(world, "load_stored_chunk"):
+            return
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        max_cy = (int(world.height) - 1) // cs
+        visible = {
+            (self._wrap_cx(cx), cy)
+            for cy in range(max(0, j_min // cs), min(max_cy, j_max // cs) + 1)
+            for cx in range(i_min // cs, i_max // cs + 1)
+        }
+        now = time.perf_counter()
+        synchronous = self.view.chunk_service is None
+        for key in visible - self._visible_prev:
+            # Un chunk présent dans le cache disque est chargé ici : ça compte comme un hit.
+            if world.load_stored_chunk(*key):
+                self.hits += 1
+            else:
+                self.misses += 1
+                if synchronous:
+                    # Le rendu va générer ce chunk lui-même, dans la frame.
+                    self.sync_misses += 1
+                    self._sync_miss_times.append(now)
+        self._visible_prev = visible
+
+    def update(self) -> None:
+        """À appeler une fois par frame, après le rendu (le temps restant sert au préchargement)."""
+        world = self.view.world
+        if not self.enabled or world is None or not hasattr(world, "has_chunk"):
+            return
+        now = time.perf_counter()
+        dx, dy, _ = self.view._proj_consts()
+        if dx <= 0 or dy <= 0:
+            return
+        self._track_camera(now, dx, dy)
+
+        service = self.view.chunk_service
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        deadline = now + self.budget_ms / 1000.0
+        requests = 0
+        for cx, cy in self.predicted_chunks(dx, dy):
+            if world.has_chunk(cx, cy):
+                continue
+            if service is not None:
+                if service.is_pending(cx, cy):
+                    continue
+                service.request_chunk(cx, cy)
+                self.prefetched += 1
+                requests += 1
+                if requests >= self.max_requests_per_frame:
+                    break
+            else:
+                # Pas de génération entamée si elle ne tient pas dans le temps restant.
+                t0 = time.perf_counter()
+                if deadline - t0 < self._sync_cost_estimate(world):
+                    break
+                world.ensure_chunk_at(cx * cs, cy * cs)
+                cost = time.perf_counter() - t0
+                prev = self._sync_cost_s
+                self._sync_cost_s = cost if prev is None else prev + self.smoothing * (cost - prev)
+                self.prefetched += 1
+
+        self._maybe_log(now)
+
+    def _sync_cost_estimate(self, world) -> float:
+        """
+        Durée attendue d'une génération synchrone : mesurée ici, sinon moyenne du monde,
+        sinon _DEFAULT_SYNC_COST_S (monde restauré d'une sauvegarde ou du cache disque).
+        """
+        if self._sync_cost_s is not None:
+            return self._sync_cost_s
+        stats = world.chunk_cache_stats() if hasattr(world, "chunk_cache_stats") else {}
+        if stats.get("generated"):
+            return float(stats.get("gen_time_ms_avg", 0.0)) / 1000.0
+        return _DEFAULT_SYNC_COST_S
+
+    # ------------------- stats -------------------
+
+    def sync_misses_per_second(self, window_s: float = 5.0) -> float:
+        now = time.perf_counter()
+        while self._sync_miss_times and now - self._sync_miss_times[0] > window_s:
+            self._sync_miss_times.popleft()
+        return len(self._sync_miss_times) / max(window_s, 1e-6)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return 1.0 if total == 0 else self.hits / total
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "sync_misses": self.sync_misses,
+            "sync_misses_per_s": self.sync_misses_per_second(),
+            "prefetched": self.prefetched,
+            "velocity_tiles_s": (self._vel_i, self._vel_j),
+        }
+
+    def _maybe_log(self, now: float) -> None:
+        if not self.log_enabled or now - self._last_log_t < self.log_interval_s:
+            return
+        self._last_log_t = now
+        s = self.stats()
+        print(
+            f"[Perf][Prefetch] hit_rate={s['hit_rate'] * 100:.1f}% ({s['hits']}/{s['hits'] + s['misses']})"
+            f" | sync_miss={s['sync_misses_per_s']:.2f}/s (total {s['sync_misses']})"
+            f" | prefetch={s['prefetched']}"
+        )
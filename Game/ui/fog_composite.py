@@ -0,0 +1,294 @@
+# fog_composite.py
+# Brouillard de guerre composité en une passe pour IsoMapView.
+#
+# Principe :
+# - Le monde est dessiné normalement (sprites en couleur), les tuiles jamais explorées
+#   ne sont pas dessinées (fond).
+# - Un masque écran (blanc = hors de vue, noir = visible) est construit en rejouant l'ordre
+#   de dessin avec les silhouettes des sprites : sol (ordre des blocs puis ordre iso),
+#   puis entités et props tuile par tuile. Chaque pixel prend donc l'état de la tuile dont
+#   le sprite l'a peint en dernier, comme l'ancien rendu par sprites gris.
+# - Composition : les pixels du masque sont remplacés par leur niveau de gris assombri
+#   (luminance * dim), en quelques opérations de surface (SIMD), sans variante grise
+#   des sprites dans le cache.
+# - Masque et silhouettes en 8 bits (palette, colorkey RLE) : les tampons sont de simples
+#   copies d'octets. Deux silhouettes par sprite (blanche = hors de vue, noire = visible),
+#   1 octet / pixel chacune, dans un dictionnaire faible qui suit les évictions du cache
+#   de sprites.
+
+from __future__ import annotations
+
+import math
+import time
+import weakref
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from Game.world.world_gen import OV_OBJECT
+
+# Index 0 = transparent (colorkey), 1 = visible (noir), 255 = hors de vue (blanc)
+_CLEAR = 1
+_FOG = 255
+_PALETTE = [(0, 0, 0)] * 255 + [(255, 255, 255)]
+
+
+class FogCompositor:
+    def __init__(self, view, dim: float = 0.4):
+        self.view = view
+        self.dim = min(1.0, max(0.0, float(dim)))
+        self._silhouettes = weakref.WeakKeyDictionary()
+        self._mask_buf: Optional[pygame.Surface] = None
+        self._dim_buf: Optional[pygame.Surface] = None
+        self._keep_buf: Optional[pygame.Surface] = None
+        self._gray_buf: Optional[pygame.Surface] = None
+        self._clip: Optional[pygame.Rect] = None
+
+        self.passes = 0
+        self.stamps = 0
+        self.time_s = 0.0
+
+    # ------------------- silhouettes -------------------
+
+    def silhouettes(self, surf: pygame.Surface) -> tuple[pygame.Surface, pygame.Surface]:
+        """(silhouette hors de vue, silhouette visible) des pixels opaques de `surf`."""
+        pair = self._silhouettes.get(surf)
+        if pair is None:
+            fog = self._palette_surface(surf.get_size())
+            self.view._mask_for_surface(surf).to_surface(fog, setcolor=(255, 255, 255), unsetcolor=(0, 0, 0))
+            clear = fog.copy()
+            bits = pygame.surfarray.pixels2d(clear)
+            bits[bits == _FOG] = _CLEAR
+            del bits
+            for sil in (fog, clear):
+                sil.set_colorkey(0, pygame.RLEACCEL)
+            pair = self._silhouettes[surf] = (fog, clear)
+        return pair
+
+    @staticmethod
+    def _palette_surface(size) -> pygame.Surface:
+        surf = pygame.Surface(size, depth=8)
+        surf.set_palette(_PALETTE)
+        return surf
+
+    def _buffers(self, size: tuple[int, int]):
+        w, h = size
+        for name in ("_mask_buf", "_dim_buf", "_keep_buf", "_gray_buf"):
+            buf = getattr(self, name)
+            if buf is None or buf.get_width() < w or buf.get_height() < h:
+                bw = max(w, buf.get_width() if buf is not None else 0)
+                bh = max(h, buf.get_height() if buf is not None else 0)
+                setattr(self, name, self._palette_surface((bw, bh)) if name == "_mask_buf" else pygame.Surface((bw, bh)))
+        rect = pygame.Rect(0, 0, w, h)
+        return tuple(getattr(self, name).subsurface(rect) for name in ("_mask_buf", "_dim_buf", "_keep_buf", "_gray_buf"))
+
+    # ------------------- passe -------------------
+
+    def apply(self, target: pygame.Surface, area, rects=None) -> None:
+        """Brouillard sur `rects` (None = toute la surface), monde déjà dessiné."""
+        rects = [target.get_rect()] if rects is None else rects
+        if self.build(area, rects, target.get_rect()):
+            for rect in rects:
+                self.composite(target, rect)
+
+    def build(self, area, rects, bounds: pygame.Rect) -> bool:
+        """
+        Construit le masque couvrant l'union de `rects` (zones à redessiner de la frame).
+        Ne dépend que de l'état monde / brouillard : peut précéder le dessin des zones.
+        Renvoie False s'il n'y a rien à assombrir.
+        """
+        self._clip = None
+        if area.fog is None or area.arrays is None:
+            return False
+        rects = [r.clip(bounds) for r in rects]
+        rects = [r for r in rects if r.width > 0 and r.height > 0]
+        if not rects:
+            return False
+        clip = rects[0].unionall(rects[1:])
+        t0 = time.perf_counter()
+        view = self.view
+        dx, dy, wall_h = area.dx, area.dy, area.wall_h
+        origin = area.origin
+        visible, explored = area.fog
+        drawable = area.arrays["loaded"] & explored
+
+        # Tuiles dont les sprites peuvent toucher une des zones (bandes iso de chaque zone).
+        ext = view._sprite_extents(dx, dy, wall_h)
+        touched = np.zeros(drawable.shape, dtype=bool)
+        for rect in rects:
+            bands = view._rect_bands(rect, origin, area.i0, area.i1, area.j0, area.j1, dx, dy, wall_h, ext)
+            if not bands:
+                continue
+            bi = np.concatenate([np.arange(i0, i1 + 1, dtype=np.int64) for i0, i1, _s in bands])
+            bs = np.concatenate([np.full(i1 - i0 + 1, s, dtype=np.int64) for i0, i1, s in bands])
+            touched[bs - bi - area.j0, bi - area.i0] = True
+        touched &= drawable
+        if not touched.any() or visible[touched].all():
+            return False  # aucune tuile hors de vue dans la zone
+        rr, cc = np.nonzero(touched)
+        ii = cc + area.i0
+        jj = rr + area.j0
+        fogged = ~visible[rr, cc]
+
+        ox = origin[0] - clip.x
+        oy = origin[1] - clip.y
+        zz = area.arrays["levels"][rr, cc].astype(np.float64)
+        sx = ox + np.floor((ii - jj) * dx).astype(np.int64)
+        sy = oy + np.floor((ii + jj) * dy - zz * wall_h).astype(np.int64)
+
+        # Sol : même ordre que la passe sol (blocs (bx+by, bx), puis (i+j, i) dans le bloc).
+        # Bloc pré-rendu dans un seul état (tout visible / tout hors de vue) : une silhouette.
+        gids = area.arrays["ground"][rr, cc]
+        gh = np.empty(gids.shape, dtype=np.int64)
+        gw = np.empty(gids.shape, dtype=np.int64)
+        gsil = {}
+        for gid in np.unique(gids).tolist():
+            gimg = view._get_scaled_ground(gid)
+            gsil[gid] = self.silhouettes(gimg)
+            sel = gids == gid
+            gw[sel] = gimg.get_width()
+            gh[sel] = gimg.get_height()
+        gx = sx - gw // 2
+        gy = np.floor(sy - gh + dy * 2).astype(np.int64)
+
+        world = view.world
+        cache = view.ground_cache
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        b = cache.block_tiles(dx, cs)
+        use_blocks = cache.enabled and hasattr(world, "chunk_ground_revision")
+        zkey = view._zoom_key()
+        bx, by = ii // b, jj // b
+        order = np.lexsort((ii, ii + jj, bx, bx + by))
+        obx, oby = bx[order], by[order]
+        starts = np.flatnonzero((obx[1:] != obx[:-1]) | (oby[1:] != oby[:-1])) + 1
+        bounds = zip([0] + starts.tolist(), starts.tolist() + [order.size])
+        o_gids, o_gx, o_gy, o_fog = gids[order].tolist(), gx[order].tolist(), gy[order].tolist(), fogged[order].tolist()
+        stamps = []
+        first = None  # premier tampon hors de vue : le masque est vide avant lui
+        for a0, a1 in bounds:
+            kbx, kby = int(obx[a0]), int(oby[a0])
+            if use_blocks:
+                blk = self._block(world, cache, kbx, kby, b, cs, zkey, area)
+                if blk is not None:
+                    if blk[1] and first is None:
+                        first = len(stamps)
+                    sil = self.silhouettes(blk[0].surface)[0 if blk[1] else 1]
+                    stamps.append((sil, (ox + blk[0].ox, oy + blk[0].oy)))
+                    continue
+            if first is None and True in o_fog[a0:a1]:
+                first = len(stamps) + o_fog[a0:a1].index(True)
+            stamps.extend(
+                (gsil[g][0 if f else 1], (x, y))
+                for g, x, y, f in zip(o_gids[a0:a1], o_gx[a0:a1], o_gy[a0:a1], o_fog[a0:a1])
+            )
+
+        # Entités et props : ordre iso (i+j, i), entités avant le prop de la tuile.
+        order = np.lexsort((ii, ii + jj))
+        entity_map = area.entity_map if area.draw_entities else None
+        props = area.arrays["prop"][rr, cc]
+        objects = area.arrays["override"][rr, cc] & OV_OBJECT
+        candidates = (props != 0) | (objects != 0) if area.draw_props else np.zeros(props.shape, dtype=bool)
+        if entity_map:
+            on_tile = np.zeros(drawable.shape, dtype=bool)
+            for i, j in entity_map:
+                if area.i0 <= i <= area.i1 and area.j0 <= j <= area.j1:
+                    on_tile[j - area.j0, i - area.i0] = True
+            has_entity = on_tile[rr, cc]
+            candidates = candidates | has_entity
+        alpha0 = view.transparent_prop_alpha if view.props_transparent else view.default_prop_alpha
+        for k in np.flatnonzero(candidates[order]).tolist():
+            t = int(order[k])
+            i, j = int(ii[t]), int(jj[t])
+            side = 0 if fogged[t] else 1
+            if entity_map:
+                for e in entity_map.get((i, j), ()):
+                    drawn = view._entity_sprite(e)
+                    if drawn is not None:
+                        stamps.append((self.silhouettes(drawn[0])[1], (drawn[1].x - clip.x, drawn[1].y - clip.y)))
+            if not area.draw_props:
+                continue
+            cell = world.get_overlay(i, j) if objects[t] else int(props[t])
+            pid = cell.get("pid") if isinstance(cell, dict) else cell
+            if not pid:
+                continue
+            alpha = alpha0
+            if isinstance(cell, dict) and cell.get("state") == "building":
+                alpha = int(alpha * 0.65)
+            pimg = view._get_scaled_prop(pid, alpha=alpha)
+            if not pimg:
+                continue
+            surface_y = sy[t] - (gh[t] - dy * 2)
+            psx = int(sx[t]) - pimg.get_width() // 2
+            psy = math.floor(surface_y - (pimg.get_height() - dy * 2))
+            if side == 0 and first is None:
+                first = len(stamps)
+            stamps.append((self.silhouettes(pimg)[side], (psx, psy)))
+
+        if first is None:
+            return False
+        mask, dim, keep, _gray = self._buffers(clip.size)
+        mask.fill(0)
+        mask.blits(stamps[first:], doreturn=False)
+        # Deux lectures du masque par palette : dim (hors de vue -> niveau d'assombrissement,
+        # sinon noir) et keep (hors de vue -> noir, sinon blanc).
+        level = int(round(255 * self.dim))
+        # (la sous-surface a sa propre copie de palette, recréée à chaque passe)
+        mask.set_palette([(0, 0, 0)] * 255 + [(level, level, level)])
+        dim.blit(mask, (0, 0))
+        mask.set_palette([(255, 255, 255)] * 255 + [(0, 0, 0)])
+        keep.blit(mask, (0, 0))
+
+        self._clip = clip
+        self.passes += 1
+        self.stamps += len(stamps)
+        self.time_s += time.perf_counter() - t0
+        return True
+
+    def composite(self, target: pygame.Surface, rect: pygame.Rect) -> None:
+        """world = world * (1 - m) + gris(world) * dim * m sur `rect` (après son dessin)."""
+        clip = self._clip
+        if clip is None:
+            return
+        rect = rect.clip(clip)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        t0 = time.perf_counter()
+        local = rect.move(-clip.x, -clip.y)
+        region = target.subsurface(rect)
+        gray = self._gray_buf.subsurface(pygame.Rect((0, 0), rect.size))
+        pygame.transform.grayscale(region, gray)
+        gray.blit(self._dim_buf, (0, 0), local, special_flags=pygame.BLEND_RGB_MULT)
+        region.blit(self._keep_buf, (0, 0), local, special_flags=pygame.BLEND_RGB_MULT)
+        region.blit(gray, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        self.time_s += time.perf_counter() - t0
+
+    def _block(self, world, cache, bx: int, by: int, b: int, cs: int, zkey: int, area):
+        """(GroundBlock, hors de vue) si le bloc est pré-rendu et dans un seul état, sinon None."""
+        ccx, ccy = (bx * b) // cs, (by * b) // cs
+        if not world.has_chunk(ccx, ccy):
+            return None
+        blk = cache.peek((bx, by, zkey), world.chunk_ground_revision(ccx, ccy))
+        if blk is None:
+            return None
+        visible, explored = area.fog
+        ys = slice(max(area.j0, by * b) - area.j0, min(area.j1, by * b + b - 1) - area.j0 + 1)
+        xs = slice(max(area.i0, bx * b) - area.i0, min(area.i1, bx * b + b - 1) - area.i0 + 1)
+        if not explored[ys, xs].all():
+            return None
+        vis = visible[ys, xs]
+        if vis.all():
+            return blk, False
+        if not vis.any():
+            return blk, True
+        return None
+
+    # ------------------- stats -------------------
+
+    def stats(self) -> dict:
+        return {
+            "passes": self.passes,
+            "stamps": self.stamps,
+            "silhouettes": len(self._silhouettes),
+            "ms_avg": 1000.0 * self.time_s / max(1, self.passes),
+        }
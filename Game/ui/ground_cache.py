@@ -0,0 +1,175 @@
+# ground_cache.py
+# Sol pré-rendu par blocs de chunk pour IsoMapView.
+#
+# Principe :
+# - Le sol statique (sprite de tuile + murs de niveau) d'un bloc de B x B tuiles d'un chunk
+#   est dessiné une fois dans une grande surface, par (bloc, zoom). Le brouillard est
+#   composité par-dessus par la vue (fog_composite), il n'y a pas de variante grise.
+# - B dépend du zoom pour garder des surfaces de taille raisonnable (~target_px de large) :
+#   chunk entier au zoom minimal, sous-blocs de 8 tuiles au zoom max.
+# - Invalidation : world.chunk_ground_revision(cx, cy) (override sol/biome, rechargement,
+#   lissage des jonctions). Les props/constructions ne déclenchent jamais de rebake.
+# - LRU borné en octets ; nombre de bakes par frame limité par un budget de temps,
+#   les blocs pas encore prêts sont dessinés tuile par tuile par le rendu.
+#
+# Positions : la tuile (i, j) est placée en floor((i-j)*dx), floor((i+j)*dy - z*wall_h)
+# relativement à l'origine entière floor(view.cx - cam_x), floor(view.cy - cam_y),
+# ce qui rend les blocs jointifs quelle que soit la position de la caméra.
+
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pygame
+
+class GroundBlock:
+    __slots__ = ("surface", "ox", "oy", "rev", "nbytes")
+
+    def __init__(self, surface: pygame.Surface, ox: int, oy: int, rev: int):
+        self.surface = surface
+        self.ox = ox
+        self.oy = oy
+        self.rev = rev
+        self.nbytes = surface.get_width() * surface.get_height() * 4
+
+
+class ChunkGroundCache:
+    def __init__(self, view, budget_mb: float = 96.0, bake_budget_ms: float = 4.0, target_px: int = 1024):
+        self.view = view
+        self.budget_bytes = int(max(1.0, float(budget_mb)) * 1024 * 1024)
+        self.bake_budget_ms = max(0.0, float(bake_budget_ms))
+        self.target_px = max(64, int(target_px))
+        self.enabled = True
+
+        self._blocks: "OrderedDict[tuple, GroundBlock]" = OrderedDict()
+        self._bytes = 0
+        self._frame_deadline = 0.0
+        self._frame_bakes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.bakes = 0
+        self.evictions = 0
+        self.bake_time_s = 0.0
+
+    def reset(self) -> None:
+        self._blocks.clear()
+        self._bytes = 0
+
+    # ------------------- géométrie -------------------
+
+    def block_tiles(self, dx: float, chunk_size: int) -> int:
+        """Côté d'un bloc en tuiles : puissance de 2 divisant chunk_size, surface ~target_px."""
+        side = max(1, int(self.target_px // max(1.0, 2.0 * dx)))
+        b = 8
+        while b * 2 <= side and b * 2 <= chunk_size:
+            b *= 2
+        return min(b, chunk_size)
+
+    # ------------------- frame -------------------
+
+    def begin_frame(self) -> None:
+        self._frame_deadline = time.perf_counter() + self.bake_budget_ms / 1000.0
+        self._frame_bakes = 0
+
+    def get(self, key: tuple, rev: int) -> Optional[GroundBlock]:
+        """Bloc en cache s'il est à jour (key = (bx, by, zoom_key))."""
+        blk = self._blocks.get(key)
+        if blk is None or blk.rev != rev:
+            return None
+        self._blocks.move_to_end(key)
+        self.hits += 1
+        return blk
+
+    def peek(self, key: tuple, rev: int) -> Optional[GroundBlock]:
+        """Comme get, sans compter d'accès ni changer l'ordre LRU (passes annexes)."""
+        blk = self._blocks.get(key)
+        if blk is None or blk.rev != rev:
+            return None
+        return blk
+
+    def can_bake(self) -> bool:
+        # Au moins un bake par frame pour garantir la progression.
+        return self._frame_bakes == 0 or time.perf_counter() < self._frame_deadline
+
+    def bake(self, key: tuple, rev: int, x0: int, y0: int, w: int, h: int, dx: float, dy: float, wall_h: float):
+        """Pré-rend le sol des tuiles [x0, x0+w) x [y0, y0+h) (chunk déjà en mémoire)."""
+        self.misses += 1
+        t0 = time.perf_counter()
+        view = self.view
+        reg = view.world.get_region(x0, y0, w, h, fields=("levels", "ground"), generate=False)
+
+        jj, ii = np.mgrid[y0:y0 + h, x0:x0 + w]
+        # Ordre iso (i+j croissant, puis i) : même empilement que le rendu tuile par tuile.
+        order = np.lexsort((ii.ravel(), (ii + jj).ravel()))
+        ii = ii.ravel()[order]
+        jj = jj.ravel()[order]
+        zz = reg["levels"].ravel()[order].astype(np.float64)
+        gids = reg["ground"].ravel()[order]
+
+        sprites = {}
+        sw = np.empty(gids.shape, dtype=np.int64)
+        sh = np.empty(gids.shape, dtype=np.int64)
+        for gid in np.unique(gids).tolist():
+            img = view._get_scaled_ground(gid)
+            sprites[gid] = img
+            sel = gids == gid
+            sw[sel] = img.get_width()
+            sh[sel] = img.get_height()
+
+        px = np.floor((ii - jj) * dx).astype(np.int64) - sw // 2
+        py = np.floor(np.floor((ii + jj) * dy - zz * wall_h) - sh + dy * 2).astype(np.int64)
+        ox = int(px.min())
+        oy = int(py.min())
+        bw = int((px + sw).max()) - ox
+        bh = int((py + sh).max()) - oy
+
+        surf = pygame.Surface((max(1, bw), max(1, bh)), pygame.SRCALPHA)
+        surf.blits(
+            [(sprites[g], (x, y)) for g, x, y in zip(gids.tolist(), (px - ox).tolist(), (py - oy).tolist())],
+            doreturn=False,
+        )
+
+        blk = GroundBlock(surf, ox, oy, rev)
+        old = self._blocks.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        self._blocks[key] = blk
+        self._bytes += blk.nbytes
+        self._evict()
+
+        self._frame_bakes += 1
+        self.bakes += 1
+        self.bake_time_s += time.perf_counter() - t0
+        return blk
+
+    def _evict(self) -> None:
+        while self._bytes > self.budget_bytes and len(self._blocks) > 1:
+            _key, blk = self._blocks.popitem(last=False)
+            self._bytes -= blk.nbytes
+            self.evictions += 1
+
+    # ------------------- stats -------------------
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "blocks": len(self._blocks),
+            "bytes": self._bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": 1.0 if lookups == 0 else self.hits / lookups,
+            "bakes": self.bakes,
+            "evictions": self.evictions,
+            "bake_ms_avg": 1000.0 * self.bake_time_s / max(1, self.bakes),
+        }
+
+
+def ground_origin(view) -> tuple[int, int]:
+    """Origine écran entière commune aux blocs pré-rendus et au sol tuile par tuile."""
+    return math.floor(view.cx - view.cam_x), math.floor(view.cy - view.cam_y)
@@ -2,8 +2,17 @@
 from __future__ import annotations
 import pygame
 import math
+import numpy as np
 from typing import Optional, Tuple
 from Game.world.tiles import get_ground_sprite_name
+from Game.ui.chunk_prefetch import ChunkPrefetcher
+from Game.ui.fog_composite import FogCompositor
+from Game.ui.ground_cache import ChunkGroundCache, ground_origin
+from Game.ui.picking import HitGrid
+from Game.ui.scroll_layer import ScrollLayer
+from Game.ui.sprite_cache import shared_sprite_cache, zoom_levels
+import weakref
+from Game.world.world_gen import OV_OBJECT
 
 
 def get_prop_sprite_name(pid: int):
@@ -59,6 +68,14 @@ def get_prop_sprite_name(pid: int):
     
     return mapping.get(pid, "placeholder")
 
+class _FrameArea:
+    """Zone de rendu d'une frame : région monde (tableaux + listes), brouillard, entités, projection."""
+    __slots__ = (
+        "i0", "i1", "j0", "j1", "arrays", "drawable", "fog", "entity_map",
+        "origin", "dx", "dy", "wall_h", "draw_props", "draw_entities",
+    )
+
+
 class IsoMapView:
     def __init__(self, assets, screen_size: Tuple[int,int],zoom_step=0.1):
         self.assets = assets
@@ -69,6 +86,13 @@ class IsoMapView:
         self.base_dy = 16.0
         self.base_dz = 24.0
 
+        # Sprites mis à l'échelle : cache partagé, par niveau de zoom discret
+        self.sprite_cache = shared_sprite_cache()
+        self.sprite_cache.register("ground", self._ground_base, finish=self._finish_scaled_ground)
+        self.sprite_cache.register("prop", self._prop_base, finish=self._finish_scaled_prop)
+        self._prescaled_level = None
+        self._zoom_dir = 1
+
         self.zoom = 1.0
         self.zoom_step = zoom_step
 
@@ -77,6 +101,10 @@ class IsoMapView:
         self.zoom = 1.5
         self.min_zoom = 1.0
         self.max_zoom = 5.0
+        # Crans de molette = niveaux discrets (même facteur 1 + zoom_step qu'avant)
+        self.zoom_levels = zoom_levels(self.min_zoom, self.max_zoom, self.zoom_step)
+        self.sprite_cache.set_zoom_levels(self.zoom_levels)
+        self.zoom = self._zoom
 
         # métriques écran (fallback si display pas encore créé)
         try:
@@ -91,14 +119,25 @@ class IsoMapView:
 
         self.world = None
         self.max_levels = 6
+        # Service de génération asynchrone (ChunkGenerationService) ; None = génération synchrone
+        self.chunk_service = None
+        self._placeholder_cache: dict[int, pygame.Surface] = {}
+        # Préchargement prédictif des chunks selon le mouvement de la caméra
+        self.prefetcher = ChunkPrefetcher(self)
+        # Sol statique pré-rendu par blocs de chunk (et par zoom)
+        self.ground_cache = ChunkGroundCache(self)
+        # Réutilisation de la frame précédente au défilement (couche monde hors écran)
+        self.scroll_reuse = True
+        self.scroll_layer = ScrollLayer()
+        # Brouillard : masque composité après le monde (plus de variantes grises des sprites)
+        self.fog_compositor = FogCompositor(self)
+        self.background_color = (10, 12, 18)
 
-        self._ground_cache = {}
-        self._prop_cache   = {}
-        self._gray_ground_cache = {}
-        self._gray_prop_cache = {}
         self._missing_ground_ids: set[int] = set()
         self._missing_ground_sprites: set[str] = set()
         self._missing_prop_sprites: set[str] = set()
+        # Plus grand sprite de prop (px, zoom 1) : marges des zones à redessiner
+        self._max_prop_base = (40, 48)
 
         self.pan_keys_speed = 600
         self.mouse_pan_active = False
@@ -109,8 +148,16 @@ class IsoMapView:
         self.cull_prop_extra_tiles = 3   # marge pour la hauteur des props
         self.cull_screen_margin_px = None 
 
-        self._hit_stack = []      # pile (kind, payload, rect, mask) pour le picking
-        self._mask_cache = {}     # cache de pygame.Mask par Surface (id)
+        # Picking : tuiles résolues analytiquement (_tile_hit_at), sprites dans des grilles de seaux.
+        # Props : relatifs à l'origine du sol (restent valides quand la frame est décalée).
+        self.prop_hits = HitGrid()
+        self.entity_hits = HitGrid()   # espace écran, vidé à chaque frame
+        self._entity_seq = 0
+        self._pick_origin = None
+        self._entity_draws = {}   # id(entité) -> (entité, (sprite, rect) | None), vidé à chaque render
+        self._prop_hits_cap = 4096
+        self._diamond_bits = None # (w, h, tableau bool) du mask losange
+        self._mask_cache = weakref.WeakKeyDictionary()  # pygame.Mask par Surface (suit les évictions du cache)
         self._diamond_mask = None # mask losange pour la surface des tuiles
 
         # Transparence des props
@@ -142,33 +189,13 @@ class IsoMapView:
             # garde les defaults si l'image n'existe pas
             pass
     
-    def _make_gray(self, surf):
-        # convertir en array RGB
-        arr = pygame.surfarray.pixels3d(surf).copy()
-
-        # gris foncé (40% du niveau de luminosité)
-        avg = ((arr[:,:,0] * 0.3 + arr[:,:,1] * 0.59 + arr[:,:,2] * 0.11) * 0.4).astype(arr.dtype)
-
-        arr[:,:,0] = avg
-        arr[:,:,1] = avg
-        arr[:,:,2] = avg
-
-        # créer surface et réinjecter alpha
-        gray = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-        pygame.surfarray.blit_array(gray, arr)
-
-        # récupérer alpha original
-        alpha = pygame.surfarray.pixels_alpha(surf)
-        pygame.surfarray.pixels_alpha(gray)[:] = alpha
-
-        return gray
-
-
-
     # ---------- State ----------
     def set_world(self, world) -> None:
         self.world = world
         self.max_levels = int(getattr(world, "tiles_levels", 6) or 6)
+        self.prefetcher.reset()
+        self.ground_cache.reset()
+        self.scroll_layer.reset()
 
         sx, sy = self.world_to_screen(world.spawn[0], world.spawn[1], 0)
         self.cam_x, self.cam_y = sx, sy
@@ -264,15 +291,15 @@ class IsoMapView:
     
         # ---------- Picking: pile de hit ----------
     def begin_hitframe(self):
-        """À appeler au début du frame (avant tout dessin) pour vider la pile."""
-        self._hit_stack.clear()
+        """À appeler au début du frame (avant tout dessin) pour vider les hits d'entités."""
+        self.entity_hits.clear()
+        self._entity_seq = 0
 
     def _mask_for_surface(self, surf: pygame.Surface) -> pygame.mask.Mask:
-        key = id(surf)
-        m = self._mask_cache.get(key)
+        m = self._mask_cache.get(surf)
         if m is None:
             m = pygame.mask.from_surface(surf)
-            self._mask_cache[key] = m
+            self._mask_cache[surf] = m
         return m
 
     def _diamond_mask_for(self, w: int, h: int) -> pygame.mask.Mask:
@@ -283,23 +310,137 @@ class IsoMapView:
             self._diamond_mask = pygame.mask.from_surface(tmp)
         return self._diamond_mask
 
+    def _diamond_bits_for(self, w: int, h: int) -> np.ndarray:
+        """Mask losange (w,h) en tableau bool [x, y] pour les tests vectorisés."""
+        bits = self._diamond_bits
+        if bits is None or bits[0] != (w, h):
+            mask = self._diamond_mask_for(w, h)
+            arr = np.zeros((max(1, w), max(1, h)), dtype=bool)
+            for x in range(w):
+                for y in range(h):
+                    arr[x, y] = bool(mask.get_at((x, y)))
+            bits = self._diamond_bits = ((w, h), arr)
+        return bits[1]
+
     def push_hit(self, kind: str, payload, rect: pygame.Rect, mask: pygame.mask.Mask | None):
-        """Empile un 'objet cliquable' dessiné à l'écran, dans l'ordre de dessin."""
-        self._hit_stack.append((kind, payload, rect, mask))
+        """Inscrit un 'objet cliquable' dessiné à l'écran, par-dessus tout ce qui précède."""
+        seq = self._entity_seq
+        self._entity_seq = seq + 1
+        self.entity_hits.add(seq, kind, payload, pygame.Rect(rect), mask, (math.inf, seq, 0))
 
     def pick_at(self, x: int, y: int):
-        """Retourne (kind, payload) du premier objet sous (x,y), en partant du haut."""
-        for kind, payload, rect, mask in reversed(self._hit_stack):
-            if not rect.collidepoint(x, y):
+        """Retourne (kind, payload) de l'objet dessiné en dernier sous (x,y)."""
+        best = None
+        for _key, kind, payload, order in self.entity_hits.query(x, y):
+            if best is None or order > best[0]:
+                best = (order, kind, payload)
+        if best is not None:
+            return best[1], best[2]
+        if self.world is None:
+            return None
+
+        origin = self._pick_origin or ground_origin(self)
+        ox, oy = origin
+        for key, kind, payload, order in self.prop_hits.query(x - ox, y - oy):
+            if not self._prop_hit_valid(payload):
+                self.prop_hits.discard(key)   # prop retiré depuis son dessin
                 continue
-            if mask is None:
-                return kind, payload
-            lx, ly = x - rect.x, y - rect.y
-            if 0 <= lx < rect.w and 0 <= ly < rect.h:
-                if lx < mask.get_size()[0] and ly < mask.get_size()[1]:
-                    if mask.get_at((lx, ly)):
-                        return kind, payload
-        return None
+            if best is None or order > best[0]:
+                best = (order, kind, payload)
+        tile = self._tile_hit_at(x, y, origin)
+        if tile is not None and (best is None or tile[0] > best[0]):
+            return "tile", tile[1]
+        return (best[1], best[2]) if best is not None else None
+
+    def _prop_hit_valid(self, payload) -> bool:
+        """Le prop inscrit est-il toujours celui de la tuile ? (sans générer de chunk)"""
+        i, j, pid = payload
+        world = self.world
+        has_chunk = getattr(world, "has_chunk", None)
+        if has_chunk is not None:
+            size = getattr(world, "chunk_size", 64)
+            if not has_chunk(i // size, j // size):
+                return False
+        cell = world.get_overlay(i, j) if hasattr(world, "get_overlay") else world.overlay[j][i]
+        cur = cell.get("pid") if isinstance(cell, dict) else cell
+        return cur == pid
+
+    def _tile_hit_at(self, x: int, y: int, origin):
+        """
+        Tuile dont le plateau losange est sous (x, y), résolue depuis la projection et les
+        niveaux (mêmes rect / mask que le dessin). Renvoie (ordre, (i, j)) ou None.
+        Seules les tuiles dessinables comptent (chunk chargé, explorée si brouillard).
+        """
+        world = self.world
+        W, H = world.width, world.height
+        dx, dy, wall_h = self._proj_consts()
+        ox, oy = origin
+        mw, mh = int(dx), int(dy)
+        if mw <= 0 or mh <= 0:
+            return None
+        dy2 = int(dy * 2)
+
+        # u = i - j fixé par x (±1) ; s = i + j borné par y et l'altitude max (plateau au-dessus du sol).
+        u_c = (x - ox) / dx
+        u_lo, u_hi = math.floor(u_c) - 1, math.ceil(u_c) + 1
+        s_lo = math.floor((y - oy) / dy) - 3
+        s_hi = math.ceil((y - oy + (self.max_levels + 3) * wall_h) / dy) + 3
+        i_lo = max(0, (s_lo + u_lo) // 2)
+        i_hi = min(W - 1, (s_hi + u_hi) // 2 + 1)
+        j_lo = max(0, (s_lo - u_hi) // 2)
+        j_hi = min(H - 1, (s_hi - u_lo) // 2 + 1)
+        if i_hi < i_lo or j_hi < j_lo:
+            return None
+
+        # Candidats (i, j) du losange de recherche, lus en une région.
+        uu, ss = np.meshgrid(np.arange(u_lo, u_hi + 1), np.arange(s_lo, s_hi + 1))
+        uu, ss = uu.ravel(), ss.ravel()
+        keep = ((uu + ss) & 1) == 0
+        ii = (uu[keep] + ss[keep]) // 2
+        jj = (ss[keep] - uu[keep]) // 2
+        keep = (ii >= i_lo) & (ii <= i_hi) & (jj >= j_lo) & (jj <= j_hi)
+        ii, jj = ii[keep], jj[keep]
+        if ii.size == 0:
+            return None
+        w, h = i_hi - i_lo + 1, j_hi - j_lo + 1
+        if hasattr(world, "get_region"):
+            reg = world.get_region(i_lo, j_lo, w, h, fields=("levels", "ground", "loaded"), generate=False)
+            z_all, g_all, drawable = reg["levels"], reg["ground"], reg["loaded"]
+        else:
+            z_all = np.array([[world.levels[j][i] if world.levels else 0 for i in range(i_lo, i_hi + 1)] for j in range(j_lo, j_hi + 1)])
+            g_all = np.array([[world.ground_id[j][i] for i in range(i_lo, i_hi + 1)] for j in range(j_lo, j_hi + 1)])
+            drawable = np.ones((h, w), dtype=bool)
+        fog = self._read_fog(i_lo, i_hi, j_lo, j_hi)
+        if fog is not None:
+            drawable = drawable & fog[1]
+        r, c = jj - j_lo, ii - i_lo
+        sel = drawable[r, c]
+        if not sel.any():
+            return None
+        ii, jj, r, c = ii[sel], jj[sel], r[sel], c[sel]
+        z = z_all[r, c].astype(np.int64)
+        gids = g_all[r, c]
+        gh = np.zeros(ii.shape, dtype=np.int64)
+        for gid in np.unique(gids).tolist():
+            gh[gids == gid] = self._get_scaled_ground(int(gid)).get_height()
+
+        # Même arrondi que _render_objects (origine entière + floor), rect centré sur le plateau.
+        sx = ox + np.floor((ii - jj) * dx).astype(np.int64)
+        sy = oy + np.floor((ii + jj) * dy - z * wall_h).astype(np.int64)
+        lx = x - (sx - mw // 2)
+        ly = y - ((sy - (gh - dy2)) - mh // 2)
+        inside = (lx >= 0) & (lx < mw) & (ly >= 0) & (ly < mh)
+        if not inside.any():
+            return None
+        ii, jj, lx, ly = ii[inside], jj[inside], lx[inside], ly[inside]
+        hit = self._diamond_bits_for(mw, mh)[lx, ly]
+        if not hit.any():
+            return None
+        ii, jj = ii[hit], jj[hit]
+        # Dernière tuile dessinée : (i+j) max puis i max
+        k = int(np.argmax((ii + jj) * (W + 1) + ii))
+        i, j = int(ii[k]), int(jj[k])
+        return (i + j, i, 0), (i, j)
 
     def tile_surface_poly(self, i: int, j: int) -> list[tuple[int,int]]:
         """Retourne les 4 points écran (losange) de la surface de la tuile (i,j)."""
@@ -350,14 +491,49 @@ class IsoMapView:
             entity_map.setdefault(key, []).append(e)
         return entity_map
 
-    def _build_fog_cache(self, i_min: int, i_max: int, j_min: int, j_max: int):
+    def _read_fog(self, i_min: int, i_max: int, j_min: int, j_max: int):
+        """(visible, explored) de la zone en une lecture, None sans brouillard."""
         if not (hasattr(self, "fog") and self.fog):
             return None
-        fog_cache: dict[tuple[int, int], tuple[bool, bool]] = {}
-        for j in range(j_min, j_max + 1):
-            for i in range(i_min, i_max + 1):
-                fog_cache[(i, j)] = (self.fog.is_visible(i, j), self.fog.is_explored(i, j))
-        return fog_cache
+        return self.fog.get_region(i_min, j_min, i_max - i_min + 1, j_max - j_min + 1)
+
+    def _entity_sprite(self, e):
+        """
+        (sprite, rect écran) d'une entité si son renderer l'expose, sinon None.
+        Mémorisé pour la frame : zones sales, brouillard, dessin et hits partagent le calcul.
+        """
+        memo = self._entity_draws.get(id(e))
+        if memo is not None and memo[0] is e:
+            return memo[1]
+        drawn = self._compute_entity_sprite(e)
+        self._entity_draws[id(e)] = (e, drawn)
+        return drawn
+
+    def _compute_entity_sprite(self, e):
+        renderer = getattr(e, "renderer", None)
+        if renderer is None and hasattr(e, "espece"):
+            renderer = getattr(e.espece, "renderer", None)
+        if renderer is None or not hasattr(renderer, "get_draw_surface_and_rect"):
+            return None
+        try:
+            sprite, rect = renderer.get_draw_surface_and_rect(self, self.world, e.x, e.y)
+        except Exception:
+            return None
+        if sprite is None or rect is None:
+            return None
+        return sprite, rect
+
+    def _get_placeholder_tile(self, dx: float, dy: float) -> pygame.Surface:
+        """Losange neutre affiché tant que le chunk est en cours de génération."""
+        key = self._zoom_key()
+        surf = self._placeholder_cache.get(key)
+        if surf is None:
+            w = max(2, int(dx * 2))
+            h = max(2, int(dy * 2))
+            surf = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.polygon(surf, (46, 50, 58), [(w // 2, 0), (w - 1, h // 2), (w // 2, h - 1), (0, h // 2)])
+            self._placeholder_cache[key] = surf
+        return surf
 
     def _build_visible_bands(self, i_min: int, i_max: int, j_min: int, j_max: int):
         bands = []
@@ -367,6 +543,150 @@ class IsoMapView:
             bands.append((i0, i1, s))
         return bands
 
+    def _ground_blocks(self, i_min: int, i_max: int, j_min: int, j_max: int, b: int):
+        """Blocs (bx, by) couvrant la zone visible, dans l'ordre iso (bx+by croissant)."""
+        blocks = [
+            (bx, by)
+            for by in range(j_min // b, j_max // b + 1)
+            for bx in range(i_min // b, i_max // b + 1)
+        ]
+        blocks.sort(key=lambda k: (k[0] + k[1], k[0]))
+        return blocks
+
+    def _render_ground(self, screen, i_min, i_max, j_min, j_max, dx, dy, wall_h, requested_chunks, clip=None, area=None):
+        """
+        Passe sol : blocs pré-rendus (ChunkGroundCache) quand le bloc est entièrement
+        exploré, sinon tuile par tuile (le brouillard est composité ensuite).
+        Les tuiles des blocs non pré-rendus sont projetées en NumPy sur les bandes iso
+        (_band_tiles), puis chaque bloc ou tuile est dessiné par un blit, en ordre iso.
+        clip : zone écran à redessiner (par défaut l'écran entier).
+        area : région déjà lue pour la frame (_FrameArea), évite les lectures par tuile.
+        """
+        world = self.world
+        W, H = world.width, world.height
+        cs = int(getattr(world, "chunk_size", 64) or 64)
+        cache = self.ground_cache
+        cache.begin_frame()
+        b = cache.block_tiles(dx, cs)
+        zkey = self._zoom_key()
+        origin = ground_origin(self)
+        use_cache = cache.enabled and hasattr(world, "chunk_ground_revision") and hasattr(world, "get_region")
+        # Marges écran d'un bloc : demi-tuile en x, sprite + murs (niveau max) en y.
+        top_margin = self.max_levels * wall_h + 4 * dy
+        if clip is None:
+            clip = pygame.Rect(0, 0, self.screen_w, self.screen_h)
+        if area is None:
+            area = self._frame_area(i_min, i_max, j_min, j_max, None, dx, dy, wall_h)
+        fog = area.fog
+
+        for bx, by in self._ground_blocks(i_min, i_max, j_min, j_max, b):
+            bi0 = max(i_min, bx * b)
+            bi1 = min(i_max, bx * b + b - 1)
+            bj0 = max(j_min, by * b)
+            bj1 = min(j_max, by * b + b - 1)
+            if bi0 > bi1 or bj0 > bj1:
+                continue
+            # Bloc entièrement hors écran (les bornes visibles sont larges) : rien à dessiner.
+            left = origin[0] + (bi0 - bj1) * dx - dx
+            right = origin[0] + (bi1 - bj0) * dx + dx
+            top = origin[1] + (bi0 + bj0) * dy - top_margin
+            bottom = origin[1] + (bi1 + bj1) * dy + 4 * dy
+            if right < clip.left or left > clip.right or bottom < clip.top or top > clip.bottom:
+                continue
+
+            whole = True
+            if fog is not None:
+                exp_blk = fog[1][bj0 - area.j0:bj1 - area.j0 + 1, bi0 - area.i0:bi1 - area.i0 + 1]
+                if not exp_blk.any():
+                    continue  # jamais vu → noir total
+                whole = bool(exp_blk.all())
+
+            ccx, ccy = (bx * b) // cs, (by * b) // cs
+            if use_cache and whole and world.has_chunk(ccx, ccy):
+                x0, y0 = bx * b, by * b
+                rev = world.chunk_ground_revision(ccx, ccy)
+                key = (bx, by, zkey)
+                blk = cache.get(key, rev)
+                if blk is None and cache.can_bake():
+                    w = min(b, W - x0)
+                    h = min(b, H - y0)
+                    blk = cache.bake(key, rev, x0, y0, w, h, dx, dy, wall_h)
+                if blk is not None:
+                    screen.blit(blk.surface, (origin[0] + blk.ox, origin[1] + blk.oy))
+                    continue
+
+            # Tuile par tuile (bloc mixte, pas encore pré-rendu ou chunk pas prêt), ordre iso.
+            bands = self._rect_bands(clip, origin, bi0, bi1, bj0, bj1, dx, dy, wall_h, (dx + 2, 2, 2))
+            self._ground_tiles(screen, bands, area, origin, requested_chunks)
+
+    @staticmethod
+    def _band_tiles(bands):
+        """(ii, jj) des tuiles des bandes iso (i0, i1, s), dans l'ordre de dessin."""
+        if not bands:
+            return None
+        b = np.asarray(bands, dtype=np.int64).reshape(-1, 3)
+        lengths = b[:, 1] - b[:, 0] + 1
+        b, lengths = b[lengths > 0], lengths[lengths > 0]
+        if not lengths.size:
+            return None
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        ii = np.arange(int(lengths.sum()), dtype=np.int64) - starts + np.repeat(b[:, 0], lengths)
+        jj = np.repeat(b[:, 2], lengths) - ii
+        return ii, jj
+
+    def _ground_tiles(self, screen, bands, area, origin, requested_chunks) -> None:
+        """Dessine le sol tuile par tuile des bandes (projection vectorisée)."""
+        tiles = self._band_tiles(bands)
+        if tiles is None:
+            return
+        ii, jj = tiles
+        sel = (ii >= area.i0) & (ii <= area.i1) & (jj >= area.j0) & (jj <= area.j1)
+        ii, jj = ii[sel], jj[sel]
+        r, c = jj - area.j0, ii - area.i0
+        if area.fog is not None:
+            sel = area.fog[1][r, c]     # jamais vu → noir total
+            ii, jj, r, c = ii[sel], jj[sel], r[sel], c[sel]
+        if not ii.size:
+            return
+        dx, dy, wall_h = area.dx, area.dy, area.wall_h
+        ox, oy = origin
+        loaded = area.arrays["loaded"][r, c]
+        zz = area.arrays["levels"][r, c].astype(np.int64)
+        gids = area.arrays["ground"][r, c]
+        sx = ox + np.floor((ii - jj) * dx).astype(np.int64)
+
+        service = self.chunk_service
+        if service is not None and not loaded.all():
+            # Chunk pas encore prêt : on le demande au pool et on dessine un placeholder.
+            cs = int(getattr(self.world, "chunk_size", 64) or 64)
+            pimg = self._get_placeholder_tile(dx, dy)
+            for i, j in zip(ii[~loaded].tolist(), jj[~loaded].tolist()):
+                ckey = (i // cs, j // cs)
+                if ckey not in requested_chunks:
+                    requested_chunks.add(ckey)
+                    service.request_chunk(*ckey)
+
+        gw = np.zeros(gids.shape, dtype=np.int64)
+        gh = np.zeros(gids.shape, dtype=np.int64)
+        imgs = {}
+        for gid in np.unique(gids[loaded]).tolist():
+            gimg = imgs[gid] = self._get_scaled_ground(gid)
+            sel = gids == gid
+            gw[sel] = gimg.get_width()
+            gh[sel] = gimg.get_height()
+        x = sx - gw // 2
+        y = oy + np.floor(np.floor((ii + jj) * dy - zz * wall_h) - gh + dy * 2).astype(np.int64)
+        py = oy + np.floor((ii + jj) * dy).astype(np.int64) - int(wall_h)
+        for ok, gid, px, pyy, psx, ppy in zip(loaded.tolist(), gids.tolist(), x.tolist(), y.tolist(), sx.tolist(), py.tolist()):
+            if ok:
+                screen.blit(imgs[gid], (px, pyy))
+            elif service is not None:
+                screen.blit(pimg, (psx - pimg.get_width() // 2, ppy))
+
+    def covers_screen(self, after_tile_cb=None) -> bool:
+        """True si render() recouvre tout l'écran (couche de défilement opaque) : fond inutile."""
+        return bool(self.scroll_reuse and after_tile_cb is None and self.world is not None and hasattr(self.world, "get_region"))
+
     def render(self, screen, after_tile_cb=None,world_entities=None):
         if not self.world: return
         W, H = self.world.width, self.world.height
@@ -379,87 +699,342 @@ class IsoMapView:
 
         if not self.world:
             return
+        service = self.chunk_service
+        if service is not None:
+            service.poll_ready()
+        requested_chunks: set[tuple[int, int]] = set()
+        self.prefetcher.note_visible(i_min, i_max, j_min, j_max)
+
+        self._entity_draws.clear()
         entity_map = self._build_entity_index(world_entities)
-        fog_cache = self._build_fog_cache(i_min, i_max, j_min, j_max)
-        draw_props = self.zoom >= self.lod_props_min_zoom
-        draw_entities = self.zoom >= self.lod_entities_min_zoom
-
-        # ORDRE ISO: (i+j) croissant pour empilements corrects
-        for i0, i1, s in self._build_visible_bands(i_min, i_max, j_min, j_max):
-            for i in range(i0, i1 + 1):
-                j = s - i
-                # on vérifie qu’on reste dans la carte
-                if not (0 <= i < W and 0 <= j < H):
-                    continue
+        area = self._frame_area(i_min, i_max, j_min, j_max, entity_map, dx, dy, wall_h)
 
-                if fog_cache is not None:
-                    visible, explored = fog_cache.get((i, j), (True, True))
-                else:
-                    visible = True
-                    explored = True
+        if self.covers_screen(after_tile_cb):
+            # Couche monde de la frame précédente décalée, seules les zones changées sont redessinées.
+            self._render_scrolled(screen, area, requested_chunks)
+        else:
+            self.prop_hits.clear()
+            # 1) Sol statique (blocs pré-rendus / tuiles), ordre iso par bloc.
+            self._render_ground(screen, i_min, i_max, j_min, j_max, dx, dy, wall_h, requested_chunks, area=area)
+            # 2) Props et entités par-dessus, ORDRE ISO: (i+j) croissant pour empilements corrects.
+            bands = self._build_visible_bands(i_min, i_max, j_min, j_max)
+            self._render_objects(screen, bands, area, after_tile_cb=after_tile_cb)
+            # 3) Brouillard : tuiles explorées hors de vue assombries en une passe.
+            self.fog_compositor.apply(screen, area)
+        self._pick_origin = area.origin
+        self._trim_prop_hits(area.origin)
+
+        # Le temps restant de la frame sert à préparer les chunks de la zone à venir.
+        self.prefetcher.update()
+        self._prescale_neighbours()
+
+    def _frame_area(self, i_min, i_max, j_min, j_max, entity_map, dx, dy, wall_h) -> "_FrameArea":
+        """
+        Données de la zone [i_min, i_max] x [j_min, j_max] pour la passe objets.
+        drawable : tuiles chargées (et explorées avec brouillard) ; avec brouillard, seules les
+        entités des tuiles visibles sont conservées.
+        """
+        area = _FrameArea()
+        area.i0, area.j0 = i_min, j_min
+        area.i1, area.j1 = i_max, j_max
+        area.arrays = None
+        area.drawable = None
+        # Une lecture par région (niveaux, sol, props) au lieu d'un snapshot par tuile.
+        # Sans service de génération, les chunks manquants sont générés ici (avant la passe sol).
+        area.fog = self._read_fog(i_min, i_max, j_min, j_max)
+        if hasattr(self.world, "get_region"):
+            area.arrays = self.world.get_region(
+                i_min, j_min, i_max - i_min + 1, j_max - j_min + 1,
+                fields=("levels", "ground", "prop", "override", "loaded"), generate=self.chunk_service is None,
+            )
+        else:
+            area.arrays = self._legacy_region(i_min, j_min, i_max - i_min + 1, j_max - j_min + 1)
+        area.drawable = area.arrays["loaded"]
+        if area.fog is not None:
+            area.drawable = area.drawable & area.fog[1]
+        if area.fog is not None and entity_map:
+            visible = area.fog[0]
+            entity_map = {
+                (i, j): ents for (i, j), ents in entity_map.items()
+                if i_min <= i <= i_max and j_min <= j <= j_max and visible[j - j_min, i - i_min]
+            }
+        area.entity_map = entity_map
+        area.origin = ground_origin(self)
+        area.dx, area.dy, area.wall_h = dx, dy, wall_h
+        area.draw_props = self.zoom >= self.lod_props_min_zoom
+        area.draw_entities = self.zoom >= self.lod_entities_min_zoom
+        return area
+
+    def _legacy_region(self, x0: int, y0: int, w: int, h: int) -> dict:
+        """Mêmes champs que get_region pour un monde à listes (levels / ground_id / overlay)."""
+        world = self.world
+        levels = np.zeros((h, w), dtype=np.int64)
+        ground = np.zeros((h, w), dtype=np.int64)
+        prop = np.zeros((h, w), dtype=np.int64)
+        override = np.zeros((h, w), dtype=np.uint8)
+        for r in range(h):
+            j = y0 + r
+            for c in range(w):
+                i = x0 + c
+                if world.levels:
+                    levels[r, c] = world.levels[j][i]
+                ground[r, c] = world.ground_id[j][i]
+                cell = world.overlay[j][i]
+                if isinstance(cell, dict):
+                    override[r, c] = OV_OBJECT
+                elif cell:
+                    prop[r, c] = cell
+        return {"levels": levels, "ground": ground, "prop": prop, "override": override,
+                "loaded": np.ones((h, w), dtype=bool)}
+
+    def _render_objects(self, target, bands, area, after_tile_cb=None):
+        """
+        Props et entités des tuiles de `bands`, ORDRE ISO.
+        Tuiles et positions écran projetées en NumPy sur les bandes iso (culling compris),
+        puis un blit par sprite (entité ou prop), tuile par tuile ; after_tile_cb et les
+        entités sans sprite exposé dessinent elles-mêmes à leur rang.
+        Chaque prop dessiné est inscrit dans prop_hits (tuiles : picking analytique).
+        """
+        world = self.world
+        tiles = self._band_tiles(bands)
+        if tiles is None:
+            return
+        W, H = world.width, world.height
+        dx, dy, wall_h = area.dx, area.dy, area.wall_h
+        ox, oy = area.origin
+        entity_map = area.entity_map
+        draw_props = area.draw_props
+        draw_entities = area.draw_entities and bool(entity_map)
+        prop_hits = self.prop_hits
+        get_overlay = getattr(world, "get_overlay", None)
+
+        # Tuiles de la carte et de la zone, dessinables (le sol a déjà demandé les chunks manquants).
+        ii, jj = tiles
+        sel = (ii >= max(0, area.i0)) & (ii <= min(W - 1, area.i1)) & (jj >= max(0, area.j0)) & (jj <= min(H - 1, area.j1))
+        ii, jj = ii[sel], jj[sel]
+        r, c = jj - area.j0, ii - area.i0
+        sel = area.drawable[r, c]
+        if after_tile_cb is None:
+            # Sans callback, une tuile sans prop ni entité n'a rien à dessiner ici.
+            content = np.zeros(ii.shape, dtype=bool)
+            if draw_props:
+                content |= (area.arrays["prop"][r, c] != 0) | ((area.arrays["override"][r, c] & OV_OBJECT) != 0)
+            if draw_entities:
+                occupied = np.zeros(area.drawable.shape, dtype=bool)
+                for (i, j) in entity_map:
+                    if area.i0 <= i <= area.i1 and area.j0 <= j <= area.j1:
+                        occupied[j - area.j0, i - area.i0] = True
+                content |= occupied[r, c]
+            sel &= content
+        ii, jj, r, c = ii[sel], jj[sel], r[sel], c[sel]
+        if not ii.size:
+            return
 
-                if not explored:
-                    continue  # jamais vu → noir total
+        # Mêmes arrondis que le sol pré-rendu (origine entière) : stable au défilement.
+        zz = area.arrays["levels"][r, c].astype(np.int64)
+        sx = ox + np.floor((ii - jj) * dx).astype(np.int64)
+        sy = oy + np.floor((ii + jj) * dy - zz * wall_h).astype(np.int64)
+        sel = (sx >= -200) & (sx <= self.screen_w + 200) & (sy >= -300) & (sy <= self.screen_h + 300)
+        ii, jj, r, c, sx, sy = ii[sel], jj[sel], r[sel], c[sel], sx[sel], sy[sel]
+        gids = area.arrays["ground"][r, c]
+        pids = area.arrays["prop"][r, c]
+        objs = (area.arrays["override"][r, c] & OV_OBJECT) != 0
+
+        alpha0 = self.transparent_prop_alpha if self.props_transparent else self.default_prop_alpha
+        gheights = {}
+        for i, j, x, y, gid, cell, obj in zip(ii.tolist(), jj.tolist(), sx.tolist(), sy.tolist(),
+                                              gids.tolist(), pids.tolist(), objs.tolist()):
+            if callable(after_tile_cb):
+                after_tile_cb(i, j, x, y, dx, dy, wall_h)
+            if draw_entities:
+                for e in entity_map.get((i, j), ()):
+                    # entité insérée dans le pipeline iso, au même rang que sa tuile
+                    drawn = self._entity_sprite(e)
+                    if drawn is None:
+                        e.draw(target, self, world)
+                    else:
+                        target.blit(drawn[0], drawn[1])
+
+            # --- PROP DE LA TUILE ---
+            if not draw_props:
+                continue
+            if obj:
+                cell = get_overlay(i, j) if get_overlay is not None else world.overlay[j][i]
+            pid = cell.get("pid") if isinstance(cell, dict) else cell
+            if not pid:
+                continue
+            alpha = alpha0
+            if isinstance(cell, dict) and cell.get("state") == "building":
+                alpha = int(alpha * 0.65)
+            pimg = self._get_scaled_prop(pid, alpha=alpha)
+            if not pimg:
+                continue
+            gh = gheights.get(gid)
+            if gh is None:
+                gh = gheights[gid] = self._get_scaled_ground(gid).get_height()
+            surface_y = y - (gh - dy * 2)
+            psx = x - pimg.get_width() // 2
+            # floor (et non la troncature de blit) : même pixel avant / après défilement
+            psy = math.floor(surface_y - (pimg.get_height() - dy * 2))
+            target.blit(pimg, (psx, psy))
+            prop_rect = pygame.Rect(psx - ox, psy - oy, pimg.get_width(), pimg.get_height())
+            prop_hits.add((i, j), "prop", (i, j, pid), prop_rect, self._mask_for_surface(pimg), (i + j, i, 1))
+
+    # ---------- Réutilisation au défilement ----------
+    def _sprite_extents(self, dx, dy, wall_h, entity_boxes=()):
+        """
+        Débord maximal (demi-largeur, au-dessus du sol, en dessous) d'un sprite dessiné pour
+        une tuile, relativement à son ancrage : sol, props (taille max connue), entités.
+        """
+        pw = self._max_prop_base[0] * self.zoom
+        ph = self._max_prop_base[1] * self.zoom
+        hw = max(dx, pw / 2)
+        up = max(0.0, ph - 2 * dy)
+        down = 0.0
+        for rect, ax, ay in entity_boxes:
+            hw = max(hw, ax - rect.left, rect.right - ax)
+            up = max(up, (ay - wall_h) - rect.top)
+            down = max(down, rect.bottom - (ay + 2 * dy))
+        return hw + 2, up + 2, down + 2
+
+    def _rect_bands(self, rect, origin, i_min, i_max, j_min, j_max, dx, dy, wall_h, ext):
+        """Bandes iso (i0, i1, s) des tuiles dont les sprites peuvent toucher `rect` (écran)."""
+        hw, up, down = ext
+        u0 = math.floor((rect.left - origin[0] - hw) / dx) - 1
+        u1 = math.ceil((rect.right - origin[0] + hw) / dx) + 1
+        v0 = math.floor((rect.top - origin[1] - 2 * dy - down) / dy) - 1
+        v1 = math.ceil((rect.bottom - origin[1] + (self.max_levels + 1) * wall_h + up) / dy) + 1
+        bands = []
+        for s in range(max(v0, i_min + j_min), min(v1, i_max + j_max) + 1):
+            # i - j = u dans [u0, u1] et i + j = s
+            i0 = max(i_min, s - j_max, -((-(s + u0)) // 2))
+            i1 = min(i_max, s - j_min, (s + u1) // 2)
+            if i0 <= i1:
+                bands.append((i0, i1, s))
+        return bands
 
-                
-                
-
-                if hasattr(self.world, "get_tile_snapshot"):
-                    tile_snap = self.world.get_tile_snapshot(i, j, generate=True)
-                    if tile_snap is None:
-                        continue
-                    z, gid, cell, _bid = tile_snap
-                else:
-                    z = self.world.levels[j][i] if self.world.levels else 0
-                    gid = self.world.ground_id[j][i]
-                    cell = self.world.overlay[j][i]
-                sx, sy = self._world_to_screen(i, j, z, dx, dy, wall_h)
-
-                if sx < -200 or sx > self.screen_w + 200 or sy < -300 or sy > self.screen_h + 300:
+    def _tile_dirty_rect(self, i, j, z_lo, z_hi, origin, dx, dy, wall_h, ext) -> pygame.Rect:
+        """Zone écran couverte par la tuile (i, j) et son prop, pour des niveaux dans [z_lo, z_hi]."""
+        hw, up, down = ext
+        sx = origin[0] + math.floor((i - j) * dx)
+        base = (i + j) * dy + origin[1]
+        top = math.floor(base - z_hi * wall_h - wall_h - up)
+        bottom = math.ceil(base - z_lo * wall_h + 2 * dy + down)
+        return pygame.Rect(int(sx - hw), top, int(2 * hw) + 1, bottom - top + 1)
+
+    def _entity_boxes(self, area):
+        """(rect, ancrage x, ancrage y) des entités dessinées dans la zone (visibles, LOD)."""
+        if not (area.draw_entities and area.entity_map):
+            return []
+        dx, dy, wall_h = area.dx, area.dy, area.wall_h
+        ox, oy = area.origin
+        boxes = []
+        for (i, j), ents in area.entity_map.items():
+            if not (area.i0 <= i <= area.i1 and area.j0 <= j <= area.j1):
+                continue
+            r, c = j - area.j0, i - area.i0
+            if not area.drawable[r, c]:
+                continue
+            z = int(area.arrays["levels"][r, c])
+            ax = ox + math.floor((i - j) * dx)
+            ay = oy + math.floor((i + j) * dy - z * wall_h)
+            for e in ents:
+                drawn = self._entity_sprite(e)
+                rect = drawn[1] if drawn is not None else None
+                if rect is None:
+                    # Rendu inconnu : boîte large autour de la tuile.
+                    rect = pygame.Rect(int(ax - 2 * dx), int(ay - 4 * wall_h - 4 * dy), int(4 * dx), int(4 * wall_h + 6 * dy))
+                boxes.append((pygame.Rect(rect), ax, ay))
+        return boxes
+
+    def _render_scrolled(self, screen, area, requested_chunks):
+        layer = self.scroll_layer
+        dx, dy, wall_h = area.dx, area.dy, area.wall_h
+        origin = area.origin
+        i_min, i_max, j_min, j_max = area.i0, area.i1, area.j0, area.j1
+        state = (
+            self._zoom_key(), id(self.world), id(getattr(self, "fog", None)), self.max_levels,
+            self.props_transparent, self.transparent_prop_alpha, area.draw_props, area.draw_entities,
+            self._max_prop_base,
+        )
+        layer.begin(screen.get_size(), origin, state)
+
+        entity_boxes = self._entity_boxes(area)
+        ext = self._sprite_extents(dx, dy, wall_h, entity_boxes)
+
+        # Tuiles dont les données monde / brouillard ont changé depuis la frame précédente.
+        arrays = dict(area.arrays)
+        if area.fog is not None:
+            arrays["visible"], arrays["explored"] = area.fog
+        changed = layer.changed_tiles(i_min, j_min, arrays)
+        if changed is None:
+            layer.invalidate()
+        else:
+            ii, jj, prev = changed
+            if ii.size:
+                z_new = area.arrays["levels"][jj - j_min, ii - i_min]
+                z_old = prev["levels"]
+                for i, j, za, zb in zip(ii.tolist(), jj.tolist(), z_old.tolist(), z_new.tolist()):
+                    layer.mark_rect(self._tile_dirty_rect(i, j, min(za, zb), max(za, zb), origin, dx, dy, wall_h, ext))
+
+        # Constructions (overlay dict) : l'état change sans que l'id de prop change.
+        objects = {}
+        rr, cc = np.nonzero(area.arrays["override"] & OV_OBJECT)
+        for r, c in zip(rr.tolist(), cc.tolist()):
+            cell = self.world.get_overlay(i_min + c, j_min + r)
+            if isinstance(cell, dict):
+                objects[(i_min + c, j_min + r)] = (cell.get("pid"), cell.get("state"))
+        for i, j in layer.changed_objects(objects):
+            z = int(area.arrays["levels"][j - j_min, i - i_min]) if (i_min <= i <= i_max and j_min <= j <= j_max) else 0
+            layer.mark_rect(self._tile_dirty_rect(i, j, z, z, origin, dx, dy, wall_h, ext))
+
+        # Entités : position précédente + position actuelle (animations).
+        for rect in layer.entity_rects:
+            layer.mark_rect(rect)
+        for rect, _ax, _ay in entity_boxes:
+            layer.mark_rect(rect)
+
+        target = layer.surface
+        rects = layer.dirty_rects()
+        if rects is None:
+            self.prop_hits.clear()
+            target.fill(self.background_color)
+            self._render_ground(target, i_min, i_max, j_min, j_max, dx, dy, wall_h, requested_chunks, area=area)
+            bands = self._build_visible_bands(i_min, i_max, j_min, j_max)
+            self._render_objects(target, bands, area)
+            self.fog_compositor.apply(target, area)
+        else:
+            # Masque de brouillard des zones (état seul), composité après le dessin de chaque zone.
+            fog = self.fog_compositor
+            fog_ready = fog.build(area, rects, target.get_rect())
+            for rect in rects:
+                bands = self._rect_bands(rect, origin, i_min, i_max, j_min, j_max, dx, dy, wall_h, ext)
+                if not bands:
+                    target.fill(self.background_color, rect)
                     continue
-
-                # sol
-                # sol
-                gray = (not visible)
-                gimg = self._get_scaled_ground(gid, gray=gray)
-                
-                if gimg:
-                    screen.blit(gimg, (sx - gimg.get_width() // 2, sy - gimg.get_height() + dy * 2))
-                
-                # --- HIT: tuile (surface losange) ---
-                surface_y = sy - (gimg.get_height() - int(dy * 2))     # y du plateau losange
-                tile_mask = self._diamond_mask_for(int(dx), int(dy))
-                mw, mh = tile_mask.get_size()
-                tile_rect = pygame.Rect(int(sx - mw//2), int(surface_y - mh//2), mw, mh)
-                self.push_hit("tile", (i, j), tile_rect, tile_mask)
-
-
-                if callable(after_tile_cb):
-                    after_tile_cb(i, j, sx, sy, dx, dy, wall_h)
-                # props
-                if draw_entities and entity_map and visible:
-                    for e in entity_map.get((i, j), []):
-                        # dessiner l’entité maintenant => insérée dans le pipeline iso
-                        e.draw(screen, self, self.world)
-
-                # --- PROP DE LA TUILE ---
-                if draw_props:
-                    pid = cell.get("pid") if isinstance(cell, dict) else cell
-                    if pid:
-                        gray = (not visible)
-                        alpha = self.transparent_prop_alpha if self.props_transparent else self.default_prop_alpha
-                        if isinstance(cell, dict) and cell.get("state") == "building":
-                            alpha = int(alpha * 0.65)
-                        pimg = self._get_scaled_prop(pid, gray=gray, alpha=alpha)
-                        if pimg:
-                            surface_y = sy - (gimg.get_height() - dy * 2)
-                            psx = sx - pimg.get_width() // 2
-                            psy = surface_y - (pimg.get_height() - dy * 2)
-                            screen.blit(pimg, (psx, psy))
-                            prop_rect = pygame.Rect(psx, psy, pimg.get_width(), pimg.get_height())
-                            prop_mask = self._mask_for_surface(pimg)
-                            self.push_hit("prop", (i, j, pid), prop_rect, prop_mask)
-
+                bi0 = min(b[0] for b in bands)
+                bi1 = max(b[1] for b in bands)
+                bj0 = min(b[2] - b[1] for b in bands)
+                bj1 = max(b[2] - b[0] for b in bands)
+                target.set_clip(rect)
+                target.fill(self.background_color, rect)
+                self._render_ground(target, bi0, bi1, bj0, bj1, dx, dy, wall_h, requested_chunks, clip=rect, area=area)
+                self._render_objects(target, bands, area)
+                if fog_ready:
+                    fog.composite(target, rect)
+            target.set_clip(None)
+        layer.entity_rects = [rect for rect, _ax, _ay in entity_boxes]
+        layer.end(rects)
+        screen.blit(target, (0, 0))
+
+    def _trim_prop_hits(self, origin) -> None:
+        """Borne prop_hits : au-delà du seuil, retire les props sortis de l'écran."""
+        hits = self.prop_hits
+        if len(hits) <= self._prop_hits_cap:
+            return
+        ox, oy = origin
+        hits.prune(pygame.Rect(-ox, -oy, self.screen_w, self.screen_h))
+        self._prop_hits_cap = max(4096, 2 * len(hits))
 
     # ---------- Projection ----------
     def world_to_screen(self, x: float, y: float, z: float,
@@ -473,6 +1048,15 @@ class IsoMapView:
         return sx, sy
 
     # ---------- Zoom ----------
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, value: float) -> None:
+        # Toujours un niveau discret : les sprites mis à l'échelle restent en nombre borné.
+        self._zoom = self.sprite_cache.quantize(value)
+
     def _apply_zoom(self, wheel_dir: int) -> None:
         """
         wheel_dir > 0  : zoom avant
@@ -483,19 +1067,19 @@ class IsoMapView:
         mx, my = pygame.mouse.get_pos()
         i0, j0 = self._screen_to_world_floor(mx, my, dx, dy)
 
-        # 2) calcule le nouveau zoom avec un facteur
-        #    ex: step=0.1 -> facteur = 1.1 ; dézoom = 1/1.1
-        factor = 1.0 + float(self.zoom_step)
-        if wheel_dir > 0:
-            new_zoom = min(self.zoom * factor, self.max_zoom)
-        else:
-            new_zoom = max(self.zoom / factor, self.min_zoom)
+        # 2) niveau voisin (facteur 1 + zoom_step, borné par min_zoom / max_zoom)
+        new_zoom = self.sprite_cache.neighbour_level(self.zoom, wheel_dir)
 
         # si rien ne change (déjà à la borne), on quitte
-        if abs(new_zoom - self.zoom) < 1e-6:
+        if new_zoom is None or abs(new_zoom - self.zoom) < 1e-6:
             return
 
+        old_zoom = self.zoom
         self.zoom = new_zoom
+        # Le cran suivant dans le même sens est préparé en arrière-plan (sprites du niveau quitté).
+        self.sprite_cache.prescale([self.sprite_cache.neighbour_level(new_zoom, wheel_dir)], old_zoom)
+        self._prescaled_level = None
+        self._zoom_dir = 1 if wheel_dir > 0 else -1
 
         # 3) recalcule les constantes proj APRÈS zoom
         dx2, dy2, _ = self._proj_consts()
@@ -505,20 +1089,29 @@ class IsoMapView:
         self.cam_x += (sx0 - mx)
         self.cam_y += (sy0 - my)
 
+    def _prescale_neighbours(self) -> None:
+        """
+        Après le rendu, une fois par niveau : prépare les deux niveaux voisins à partir des
+        sprites du niveau courant (le sens du dernier cran en premier).
+        """
+        cache = self.sprite_cache
+        cache.poll()
+        if self._prescaled_level == self.zoom:
+            return
+        self._prescaled_level = self.zoom
+        d = self._zoom_dir
+        cache.prescale([cache.neighbour_level(self.zoom, d), cache.neighbour_level(self.zoom, -d)], self.zoom)
+
 
     # ---------- Assets ----------
     def _zoom_key(self) -> int:
         return int(round(self.zoom * 100))
 
-   
-    def _get_scaled_ground(self, gid: int, gray=False):
-        key = (gid, self._zoom_key(), gray)
-        cache = self._gray_ground_cache if gray else self._ground_cache
-
-        surf = cache.get(key)
-        if surf:
-            return surf
+    def _get_scaled_ground(self, gid: int):
+        return self.sprite_cache.get("ground", gid, self.zoom)
 
+    def _ground_base(self, gid: int) -> pygame.Surface:
+        """Image de sol à mettre à l'échelle (thread principal : assets, sprites manquants)."""
         try:
             name = get_ground_sprite_name(gid)
         except Exception:
@@ -533,27 +1126,20 @@ class IsoMapView:
                 print(f"[Tiles] Sprite sol manquant: {name} -> fallback tile_grass")
                 self._missing_ground_sprites.add(name)
             base = self.assets.get_image("tile_grass")
-        scale = (int(base.get_width()*self.zoom), int(base.get_height()*self.zoom))
-        surf = pygame.transform.scale(base, scale).convert_alpha()
-
-        if gray:
-            surf = self._make_gray(surf)
-
-        cache[key] = surf
-        return surf
+        return base
 
+    @staticmethod
+    def _finish_scaled_ground(surf: pygame.Surface, _gid: int) -> pygame.Surface:
+        return surf.convert_alpha()
 
-
-    def _get_scaled_prop(self, pid: int, gray=False, alpha: int | None = None) -> Optional[pygame.Surface]:
+    def _get_scaled_prop(self, pid: int, alpha: int | None = None) -> Optional[pygame.Surface]:
         if alpha is None:
             alpha = self.default_prop_alpha
-        key = (pid, self._zoom_key(), gray, alpha)
-        cache = self._gray_prop_cache if gray else self._prop_cache
-
-        surf = cache.get(key)
-        if surf is not None:
-            return surf
+        return self.sprite_cache.get("prop", (pid, int(alpha)), self.zoom)
 
+    def _prop_base(self, src) -> pygame.Surface:
+        """Image de prop à mettre à l'échelle (thread principal : assets, _max_prop_base)."""
+        pid, _alpha = src
         name = get_prop_sprite_name(pid)
         try:
             base = self.assets.get_image(name)
@@ -566,14 +1152,15 @@ class IsoMapView:
             except Exception:
                 base = self.assets.get_image("prop_tree_2")
 
-        scale = (int(base.get_width() * self.zoom), int(base.get_height() * self.zoom))
-        surf = pygame.transform.scale(base, scale).convert_alpha()
-
-        if gray:
-            surf = self._make_gray(surf)
+        if base.get_width() > self._max_prop_base[0] or base.get_height() > self._max_prop_base[1]:
+            # Pris en compte par la couche réutilisée (clé d'état) à la frame suivante.
+            self._max_prop_base = (max(self._max_prop_base[0], base.get_width()), max(self._max_prop_base[1], base.get_height()))
+        return base
 
-        surf.set_alpha(alpha)
-        cache[key] = surf
+    @staticmethod
+    def _finish_scaled_prop(surf: pygame.Surface, src) -> pygame.Surface:
+        surf = surf.convert_alpha()
+        surf.set_alpha(src[1])
         return surf
 
 
@@ -599,50 +1186,50 @@ class IsoMapView:
         j_min = max(0, j0 - r)
         j_max = min(H - 1, j0 + r)
 
-        picked = None  # on garde la DERNIÈRE tuile touchée (celle dessinée au-dessus)
-
-        # Parcours dans le même ordre que le rendu (painter’s algorithm)
-        for s in range(i_min + j_min, i_max + j_max + 1):
-            i_start = max(i_min, s - j_max)
-            i_end   = min(i_max, s - j_min)
-            for i in range(i_start, i_end + 1):
-                j = s - i
-                if not (0 <= j < H):
-                    continue
-
-                z = self.world.levels[j][i] if self.world.levels else 0
-                cx, cy = self._world_to_screen(i, j, z, dx, dy, wall_h)
-
-                # Sprite du sol tel qu'il est réellement blitté
-                gid  = self.world.ground_id[j][i]
-                gimg = self._get_scaled_ground(gid)
-                if not gimg:
-                    continue
-
-                w, h = gimg.get_width(), gimg.get_height()
-
-                # Top-left de l'image au blit (même formule que render)
-                tlx = cx - w // 2
-                tly = cy - h + int(dy * 2)
-                rect = pygame.Rect(tlx, tly, w, h)
-
-                # Si le pixel n'est pas dans le rectangle de l'image → skip rapide
-                if not rect.collidepoint(sx, sy):
-                    continue
-
-                # Centre du losange (surface), identique à ce que le rendu utilise
-                surface_y = cy - (h - int(dy * 2))  # ≈ cy - wall_h
-
-                # Test précis sur la surface losange OU sur le mur vertical :
-                # - Losange: |dx|/DX + |dy|/DY <= 1
-                in_top = (abs(sx - cx) / max(dx, 1e-6) + abs(sy - surface_y) / max(dy, 1e-6)) <= 1.0
-                # - Mur: rectangle entre la surface et la base (zone "noire"/opaque)
-                in_wall = (surface_y < sy <= cy and abs(sx - cx) <= dx)
+        if i_max < i_min or j_max < j_min:
+            return None
 
-                if in_top or in_wall:
-                    picked = (i, j)  # on continue pour garder la *dernière* (au-dessus)
+        # Lecture de la fenêtre en une passe puis tests vectorisés (mêmes formules que render)
+        if hasattr(self.world, "get_region"):
+            reg = self.world.get_region(i_min, j_min, i_max - i_min + 1, j_max - j_min + 1, fields=("levels", "ground"))
+            z = reg["levels"].astype(np.int64)
+            gids = reg["ground"]
+        else:
+            z = np.array([[self.world.levels[j][i] for i in range(i_min, i_max + 1)] for j in range(j_min, j_max + 1)], dtype=np.int64)
+            gids = np.array([[self.world.ground_id[j][i] for i in range(i_min, i_max + 1)] for j in range(j_min, j_max + 1)], dtype=np.int64)
+
+        # Taille réelle du sprite de sol blitté (par id de sol)
+        img_w = np.zeros(gids.shape, dtype=np.int64)
+        img_h = np.zeros(gids.shape, dtype=np.int64)
+        for gid in np.unique(gids):
+            gimg = self._get_scaled_ground(int(gid))
+            if gimg:
+                sel = gids == gid
+                img_w[sel] = gimg.get_width()
+                img_h[sel] = gimg.get_height()
+
+        jj, ii = np.mgrid[j_min:j_max + 1, i_min:i_max + 1]
+        # _world_to_screen tronque vers zéro (int())
+        cx = np.trunc(self.cx + (ii - jj) * dx - self.cam_x).astype(np.int64)
+        cy = np.trunc(self.cy + (ii + jj) * dy - self.cam_y - z * wall_h).astype(np.int64)
+
+        dy2 = int(dy * 2)
+        tlx = cx - img_w // 2
+        tly = cy - img_h + dy2
+        in_rect = (img_w > 0) & (tlx <= sx) & (sx < tlx + img_w) & (tly <= sy) & (sy < tly + img_h)
+
+        # Centre du losange (surface) ; test losange |dx|/DX + |dy|/DY <= 1 ou mur vertical
+        surface_y = cy - (img_h - dy2)
+        in_top = (np.abs(sx - cx) / max(dx, 1e-6) + np.abs(sy - surface_y) / max(dy, 1e-6)) <= 1.0
+        in_wall = (surface_y < sy) & (sy <= cy) & (np.abs(sx - cx) <= dx)
+        hit = in_rect & (in_top | in_wall)
+        if not hit.any():
+            return None
 
-        return picked
+        # Painter's algorithm : la dernière tuile dessinée = (i+j) max, puis i max
+        order = np.where(hit, (ii + jj) * (W + 1) + ii, -1)
+        r, c = np.unravel_index(int(np.argmax(order)), order.shape)
+        return (int(ii[r, c]), int(jj[r, c]))
 
     def place_craft(self, i: int, j: int, pid: int):
         """Place directement un prop-id sur la tuile (i,j)."""
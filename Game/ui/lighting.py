@@ -0,0 +1,171 @@
+# lighting.py
+# Éclairage jour/nuit composité sans allocation par frame pour Phase1.
+#
+# Principe :
+# - L'ancien enchaînement (luminosité en multiplication, voile noir alpha, teinte ambiante
+#   alpha) se réduit par pixel à : c * k + teinte. k (gris) et la teinte additive sont
+#   précalculés par niveau de lumière et appliqués par deux blits (MULT puis ADD) depuis
+#   des tampons écran unis persistants, remplis seulement quand la couleur change
+#   (un fill avec special_flags n'a pas de chemin SIMD, le blit si).
+# - Lumières locales (feux de camp) : sprites de dégradé radial mis en cache par palier de
+#   rayon et d'intensité, tamponnés (MAX) dans un tampon écran persistant (recréé au
+#   redimensionnement seulement), puis ajoutés à l'écran sur la zone éclairée uniquement.
+#   L'atténuation de la teinte ambiante est intégrée aux sprites (ajout avant la teinte).
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+import pygame
+
+# Anneaux de l'ancien éclairage (rayon relatif, force), du centre vers le bord.
+_LIGHT_RINGS = ((0.25, 1.0), (0.45, 0.65), (0.70, 0.4225), (1.0, 0.274625))
+_LIGHT_COLOR = (255, 200, 120)
+
+
+class DayNightLighting:
+    def __init__(self, tint_alpha: int = 35, night_alpha_max: float = 180.0,
+                 radius_step: int = 8, intensity_steps: int = 16, max_sprites: int = 48):
+        self.tint_alpha = max(0, min(255, int(tint_alpha)))
+        self.night_alpha_max = float(night_alpha_max)
+        self.radius_step = max(1, int(radius_step))
+        self.intensity_steps = max(1, int(intensity_steps))
+        self.max_sprites = max(1, int(max_sprites))
+
+        self._layer: Optional[pygame.Surface] = None
+        # Tampons unis : [surface, couleur de remplissage actuelle]
+        self._mult: list = [None, None]
+        self._add: list = [None, None]
+        self._levels: dict[tuple, tuple] = {}
+        self._sprites: "OrderedDict[tuple[int, int], pygame.Surface]" = OrderedDict()
+
+        self.frames = 0
+        self.lights_drawn = 0
+        self.sprite_builds = 0
+
+    # ------------------- précalculs -------------------
+
+    def level_colors(self, light: float, ambient) -> tuple[tuple, tuple, float]:
+        """
+        (couleur MULT, couleur ADD, facteur conservé par la teinte) pour un niveau de lumière.
+        Clé : luminosité et voile quantifiés sur 8 bits + couleur ambiante.
+        """
+        light = max(0.0, min(1.0, float(light)))
+        m = int(255 * light)
+        night_alpha = int(max(0.0, min(self.night_alpha_max, (1.0 - light) * self.night_alpha_max)))
+        r, g, b = (int(v) for v in ambient)
+        key = (m, night_alpha, r, g, b)
+        colors = self._levels.get(key)
+        if colors is None:
+            keep = 1.0 - self.tint_alpha / 255.0
+            k = int(round(255 * (m / 255.0) * (1.0 - night_alpha / 255.0) * keep))
+            a = self.tint_alpha / 255.0
+            add = (int(round(r * a)), int(round(g * a)), int(round(b * a)))
+            if len(self._levels) > 1024:
+                self._levels.clear()
+            colors = self._levels[key] = ((k, k, k), add, keep)
+        return colors
+
+    def light_sprite(self, radius: int, strength: float) -> pygame.Surface:
+        """Dégradé radial (couleur des feux) de rayon ~radius, mis en cache par palier."""
+        step = self.radius_step
+        rb = max(step, int(round(radius / step)) * step)
+        sb = max(1, min(self.intensity_steps, int(round(float(strength) * self.intensity_steps))))
+        key = (rb, sb)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+
+        # Force par distance : interpolation entre les anneaux, nulle au bord.
+        size = 2 * rb + 1
+        yy, xx = np.mgrid[-rb:rb + 1, -rb:rb + 1]
+        d = np.sqrt(xx * xx + yy * yy) / float(rb)
+        radii = [0.0] + [r for r, _s in _LIGHT_RINGS] + [1.0 + 1e-6]
+        forces = [_LIGHT_RINGS[0][1]] + [s for _r, s in _LIGHT_RINGS] + [0.0]
+        profile = np.interp(d, radii, forces) * (sb / self.intensity_steps)
+        rgb = np.empty((size, size, 3), dtype=np.uint8)
+        for ch, base in enumerate(_LIGHT_COLOR):
+            rgb[:, :, ch] = np.clip(base * profile, 0, 255).astype(np.uint8).T
+        sprite = pygame.surfarray.make_surface(rgb)
+        if pygame.display.get_surface():
+            sprite = sprite.convert()
+
+        self._sprites[key] = sprite
+        self.sprite_builds += 1
+        while len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    @staticmethod
+    def _new_buffer(size: tuple[int, int]) -> pygame.Surface:
+        surf = pygame.Surface(size)
+        return surf.convert() if pygame.display.get_surface() else surf
+
+    def _light_layer(self, size: tuple[int, int]) -> pygame.Surface:
+        if self._layer is None or self._layer.get_size() != size:
+            self._layer = self._new_buffer(size)
+            self._layer.fill((0, 0, 0))
+        return self._layer
+
+    def _solid(self, slot: list, size: tuple[int, int], color: tuple) -> pygame.Surface:
+        """Tampon uni de `slot`, recréé au redimensionnement, rempli si la couleur change."""
+        if slot[0] is None or slot[0].get_size() != size:
+            slot[0] = self._new_buffer(size)
+            slot[1] = None
+        if slot[1] != color:
+            slot[0].fill(color)
+            slot[1] = color
+        return slot[0]
+
+    # ------------------- frame -------------------
+
+    def apply(self, surface: pygame.Surface, light: float, ambient,
+              lights: Iterable[tuple[int, int]] = (), radius: int = 48, intensity: float = 1.0) -> None:
+        """
+        Assombrit / teinte `surface` pour le niveau `light`, avec des lumières locales centrées
+        sur `lights` (pixels écran), de rayon `radius` et d'intensité `intensity` (0..~1.2).
+        """
+        self.frames += 1
+        mult, add, keep = self.level_colors(light, ambient)
+        size = surface.get_size()
+        if mult != (255, 255, 255):
+            surface.blit(self._solid(self._mult, size, mult), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+
+        lights = list(lights)
+        if lights and intensity > 0.0:
+            self._add_lights(surface, lights, radius, intensity * keep)
+
+        if add != (0, 0, 0):
+            surface.blit(self._solid(self._add, size, add), (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    def _add_lights(self, surface: pygame.Surface, lights, radius: int, strength: float) -> None:
+        sprite = self.light_sprite(radius, strength)
+        half = sprite.get_width() // 2
+        screen_rect = surface.get_rect()
+        layer = self._light_layer(surface.get_size())
+
+        rects = []
+        for cx, cy in lights:
+            rect = pygame.Rect(int(cx) - half, int(cy) - half, sprite.get_width(), sprite.get_height())
+            if rect.colliderect(screen_rect):
+                rects.append(rect)
+        if not rects:
+            return
+        zone = rects[0].unionall(rects[1:]).clip(screen_rect)
+        # Seule la zone éclairée du tampon est remise à zéro puis ajoutée à l'écran.
+        layer.fill((0, 0, 0), zone)
+        layer.blits([(sprite, rect.topleft, None, pygame.BLEND_RGB_MAX) for rect in rects], doreturn=False)
+        surface.blit(layer, zone.topleft, zone, special_flags=pygame.BLEND_RGB_ADD)
+        self.lights_drawn += len(rects)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "lights": self.lights_drawn,
+            "sprites": len(self._sprites),
+            "sprite_builds": self.sprite_builds,
+            "levels": len(self._levels),
+        }
@@ -5,6 +5,7 @@ import time
 
 from Game.core.config import WIDTH, HEIGHT
 from Game.world.world_gen import ChunkedWorld, WorldGenerator, load_world_params_from_preset, make_final_seed
+from Game.world.chunk_service import create_chunk_service
 
 
 class LoadingState:
@@ -38,6 +39,7 @@ class LoadingState:
         self._save_path = None
         self._tutorial_mode = False
         self._perf_logs_enabled = True
+        self._chunk_service = None
 
     def _set_progress(self, value: float, label: str | None = None):
         self.progress = max(0.0, min(1.0, float(value)))
@@ -97,6 +99,13 @@ class LoadingState:
                 selected.append(c)
         return selected[:3]
 
+    def _prewarm(self, coords, progress, phase_label: str) -> None:
+        """Préchargement via le pool de workers si disponible, sinon synchrone."""
+        if self._chunk_service is not None:
+            self._chunk_service.prewarm(coords, progress=progress, phase_label=phase_label)
+        else:
+            self._world.prewarm_chunk_coords(coords, progress=progress, phase_label=phase_label)
+
     def _all_chunk_coords(self, world) -> list[tuple[int, int]]:
         if not world:
             return []
@@ -207,6 +216,7 @@ class LoadingState:
         self.failed = None
         self._world = None
         self._params = None
+        self._shutdown_chunk_service()
         self._tutorial_mode = bool(kwargs.get("tutorial_mode", False))
         self._save_path = None if self._tutorial_mode else kwargs.get("save_path")
         self._perf_logs_enabled = bool(self.app.settings.get("debug.perf_logs", True))
@@ -229,6 +239,14 @@ class LoadingState:
                 seed = kwargs.get("seed", None)
                 log_step(f"Debut generation world (preset={preset}, seed={seed})")
                 overrides = {"seed": seed} if seed is not None else None
+                chunk_backend = self.app.settings.get("world.chunk_backend", None)
+                if chunk_backend:
+                    overrides = dict(overrides or {})
+                    overrides["chunk_backend"] = chunk_backend
+                overrides = dict(overrides or {})
+                overrides["disk_cache"] = bool(self.app.settings.get("world.disk_cache", True))
+                overrides["disk_cache_mb"] = self.app.settings.get("world.disk_cache_mb", 512)
+                overrides["smooth_chunk_seams"] = bool(self.app.settings.get("world.smooth_chunk_seams", False))
                 if self._tutorial_mode:
                     overrides = dict(overrides or {})
                     overrides.setdefault("world_size", 48)
@@ -263,6 +281,11 @@ class LoadingState:
                     log_step(f"Lancement generate_planet (rng_seed={rng_seed})")
                     self._world = gen.generate_planet(self._params, rng_seed=rng_seed, progress=on_progress)
                     log_step("Monde genere")
+                cache_mb = self.app.settings.get("world.chunk_cache_mb", 128)
+                try:
+                    self._world.set_cache_budget(int(float(cache_mb) * 1024 * 1024))
+                except (TypeError, ValueError):
+                    pass
                 try:
                     # Evite que la generation lazy des chunks ecrase la progression UI.
                     self._world._progress = None
@@ -270,6 +293,14 @@ class LoadingState:
                 except Exception:
                     pass
 
+                # Pool de génération (pas pour le tutoriel : monde minuscule).
+                if not self._tutorial_mode:
+                    self._chunk_service = create_chunk_service(
+                        self._world, self.app.settings.get("world.chunk_workers", -1)
+                    )
+                    if self._chunk_service is not None:
+                        log_step(f"Pool de generation de chunks ({self._chunk_service.max_workers} workers)")
+
                 # Stage 2: prechargement (full monde pour petite taille, sinon juste le rendu initial).
                 def on_render_progress(p, label):
                     self._set_progress(
@@ -280,9 +311,9 @@ class LoadingState:
                 if not self._tutorial_mode and self._should_full_prewarm(self._world):
                     chunk_targets = self._all_chunk_coords(self._world)
                     if chunk_targets:
-                        self._world.cache_chunks = max(int(getattr(self._world, "cache_chunks", 0) or 0), len(chunk_targets))
+                        self._world.ensure_cache_capacity(len(chunk_targets))
                         log_step(f"Prechargement monde complet (chunks={len(chunk_targets)})")
-                        self._world.prewarm_chunk_coords(
+                        self._prewarm(
                             chunk_targets,
                             progress=on_render_progress,
                             phase_label="Prechargement monde complet...",
@@ -294,7 +325,7 @@ class LoadingState:
                     chunk_targets = self._initial_render_chunk_coords(self._world)
                     if chunk_targets:
                         log_step(f"Prechargement rendu (chunks={len(chunk_targets)})")
-                        self._world.prewarm_chunk_coords(
+                        self._prewarm(
                             chunk_targets,
                             progress=on_render_progress,
                             phase_label="Prechargement rendu...",
@@ -311,7 +342,7 @@ class LoadingState:
                 final_chunk_targets = self._initial_render_chunk_coords(self._world)
                 missing_targets = [c for c in final_chunk_targets if c not in chunk_targets]
                 if missing_targets:
-                    self._world.prewarm_chunk_coords(
+                    self._prewarm(
                         missing_targets,
                         progress=None,
                         phase_label="Prechargement rendu final...",
@@ -328,6 +359,15 @@ class LoadingState:
         self._thread = threading.Thread(target=worker, daemon=True)
         self._thread.start()
 
+    def _shutdown_chunk_service(self):
+        if self._chunk_service is not None:
+            self._chunk_service.shutdown()
+            self._chunk_service = None
+
+    def leave(self):
+        # Si le service n'a pas été transmis à PHASE1 (annulation / échec), on ferme le pool.
+        self._shutdown_chunk_service()
+
     def handle_input(self, events):
         for e in events:
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
@@ -343,12 +383,14 @@ class LoadingState:
             # Passe a PHASE1 avec le world deja pret
             if self._perf_logs_enabled:
                 print("[Perf][Loading] Transition vers PHASE1 (debut)")
+            chunk_service, self._chunk_service = self._chunk_service, None
             self.app.change_state(
                 "PHASE1",
                 world=self._world,
                 params=self._params,
                 save_path=self._save_path,
                 tutorial_mode=self._tutorial_mode,
+                chunk_service=chunk_service,
             )
             if self._perf_logs_enabled:
                 print("[Perf][Loading] Transition vers PHASE1 (fin)")
@@ -14,6 +14,8 @@ import json
 import os 
 import math
 import random
+import numpy as np
+from Game.world.noise import fbm_perlin
 
 def _trim_sprite(surface: pygame.Surface) -> pygame.Surface:
     try:
@@ -265,6 +267,7 @@ class OptionsMenu(BaseMenu):
             ("Mode inspection", "controls.inspect_mode"),
             ("Focus individu proche", "controls.focus_nearest"),
             ("Afficher mini-map", "controls.map_toggle"),
+            ("Carte de la planète", "controls.planet_map"),
         ]
         bind_style = self.themed_button_style(self.info_font)
         self.rebind_buttons = {
@@ -800,6 +803,7 @@ class TutorialIntroMenu(BaseMenu):
             self._control_line("Inspection", "controls.inspect_mode", pygame.K_i),
             self._control_line("Focus individu proche", "controls.focus_nearest", pygame.K_SPACE),
             self._control_line("Afficher mini-map", "controls.map_toggle", pygame.K_m),
+            self._control_line("Carte de la planète", "controls.planet_map", pygame.K_p),
             "Déplacement caméra : flèches ou clic molette",
             "Zoom caméra : molette",
             "Ordres : clic droit",
@@ -1350,9 +1354,8 @@ class WorldCreationMenu(BaseMenu):
 
         # Globe (points)
         self.N_POINTS = 30000   # 40k peut être lourd selon les PC
-        self.N_HOTSPOTS = 50
-        self.SPREAD_MIN = 0.03
-        self.SPREAD_MAX = 0.12
+        self.GLOBE_NOISE_SCALE = 1.6
+        self.GLOBE_NOISE_OCTAVES = 4
         self._rot_step = 0.0
 
         self.globe_radius = 120
@@ -1607,23 +1610,25 @@ class WorldCreationMenu(BaseMenu):
     # ----------------- Globe -----------------
 
     def _generate_hotspot_globe(self):
-        self.hotspots = []
-        for _ in range(self.N_HOTSPOTS):
-            lat = random.uniform(-math.pi / 2, math.pi / 2)
-            lon = random.uniform(-math.pi, math.pi)
-            spread = random.uniform(self.SPREAD_MIN, self.SPREAD_MAX)
-            self.hotspots.append((lat, lon, spread))
-
-        self.globe_points = []
-        for _ in range(self.N_POINTS):
-            h_lat, h_lon, spread = random.choice(self.hotspots)
-            lat = h_lat + random.gauss(0, spread)
-            lon = h_lon + random.gauss(0, spread)
-            if lon > math.pi:
-                lon -= 2 * math.pi
-            if lon < -math.pi:
-                lon += 2 * math.pi
-            self.globe_points.append([lat, lon])
+        # Continents tirés du moteur de bruit partagé (float32, un seul lot) :
+        # on tire des points uniformes sur la sphère et on garde les plus "hauts".
+        rng = np.random.default_rng()
+        seed = int(rng.integers(0, 2**32))
+        n = self.N_POINTS * 2
+        lat = np.arcsin(rng.uniform(-1.0, 1.0, n))
+        lon = rng.uniform(-math.pi, math.pi, n)
+
+        # Bruit 2D projeté sur deux plans (cos/sin de la longitude) : pas de couture à ±pi.
+        k = self.GLOBE_NOISE_SCALE
+        px = np.cos(lat) * np.cos(lon) * k
+        py = np.cos(lat) * np.sin(lon) * k
+        pz = np.sin(lat) * k
+        octaves = self.GLOBE_NOISE_OCTAVES
+        field = fbm_perlin(px, pz, seed, octaves, dtype=np.float32)
+        field += fbm_perlin(py + 17.0, pz, seed + 1, octaves, dtype=np.float32)
+
+        keep = np.argsort(-field)[: self.N_POINTS]
+        self.globe_points = np.stack([lat[keep], lon[keep]], axis=1).tolist()
 
     def update(self, dt):
         self._rot_step = 0.40 * dt
@@ -0,0 +1,106 @@
+# picking.py
+# Index spatial des sprites cliquables pour IsoMapView (props, entités).
+#
+# Principe :
+# - Les tuiles ne sont pas indexées : elles se résolvent analytiquement depuis la projection
+#   iso et les niveaux (IsoMapView._tile_hit_at).
+# - Props et entités : grille de seaux écran (cell_px). Un sprite est inscrit dans les seaux
+#   couverts par son rect au moment où il est dessiné ; une requête ne teste que les
+#   entrées du seau sous le curseur (coût proportionnel aux objets sous le curseur).
+# - Chaque entrée porte une clé (remplacement à la réinscription, ex. le prop d'une tuile)
+#   et un ordre de dessin comparable entre tuiles, props et entités.
+# - Les coordonnées sont celles de l'espace fourni par l'appelant : la vue inscrit les props
+#   relativement à l'origine du sol, ce qui les garde valides quand la frame est décalée.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pygame
+
+
+class HitGrid:
+    def __init__(self, cell_px: int = 64):
+        self.cell_px = max(8, int(cell_px))
+        # clé -> (kind, payload, rect, mask, order, cellules)
+        self._entries: dict = {}
+        self._buckets: dict[tuple[int, int], set] = {}
+        self.queries = 0
+        self.tested = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+
+    def _cells(self, rect: pygame.Rect) -> list[tuple[int, int]]:
+        c = self.cell_px
+        x0, x1 = rect.left // c, (rect.right - 1) // c
+        y0, y1 = rect.top // c, (rect.bottom - 1) // c
+        return [(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def add(self, key, kind: str, payload, rect: pygame.Rect, mask: Optional[pygame.mask.Mask], order) -> None:
+        """Inscrit (ou remplace) l'entrée `key`."""
+        if key in self._entries:
+            self.discard(key)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        cells = self._cells(rect)
+        self._entries[key] = (kind, payload, rect, mask, order, cells)
+        buckets = self._buckets
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if bucket is None:
+                bucket = buckets[cell] = set()
+            bucket.add(key)
+
+    def discard(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        buckets = self._buckets
+        for cell in entry[5]:
+            bucket = buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[cell]
+
+    def prune(self, keep: pygame.Rect) -> int:
+        """Retire les entrées hors de `keep` (même espace que les rects) ; renvoie leur nombre."""
+        stale = [key for key, entry in self._entries.items() if not entry[2].colliderect(keep)]
+        for key in stale:
+            self.discard(key)
+        return len(stale)
+
+    def query(self, x: int, y: int) -> list[tuple]:
+        """Entrées (key, kind, payload, order) dont le sprite couvre (x, y) (rect puis mask)."""
+        self.queries += 1
+        c = self.cell_px
+        bucket = self._buckets.get((x // c, y // c))
+        if not bucket:
+            return []
+        out = []
+        entries = self._entries
+        for key in bucket:
+            kind, payload, rect, mask, order, _cells = entries[key]
+            self.tested += 1
+            if not rect.collidepoint(x, y):
+                continue
+            if mask is not None:
+                lx, ly = x - rect.x, y - rect.y
+                mw, mh = mask.get_size()
+                if not (lx < mw and ly < mh and mask.get_at((lx, ly))):
+                    continue
+            out.append((key, kind, payload, order))
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "queries": self.queries,
+            "tested_per_query": self.tested / max(1, self.queries),
+        }
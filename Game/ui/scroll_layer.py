@@ -0,0 +1,223 @@
+# scroll_layer.py
+# Réutilisation de la frame précédente au défilement de la caméra pour IsoMapView.
+#
+# Principe :
+# - La couche monde (sol + props + entités) est rendue dans une surface hors écran de la
+#   taille de l'écran, puis copiée à l'écran.
+# - Frame suivante : si le zoom / l'écran / l'état de rendu n'ont pas changé, la surface
+#   est décalée de l'écart d'origine entière (Surface.scroll) et seules sont redessinées :
+#     * les bandes nouvellement exposées sur les bords,
+#     * les zones "sales" : tuiles dont les données monde / brouillard ont changé
+#       (comparaison des tableaux de région avec la frame précédente), entités (position
+#       précédente + actuelle, les animations changent à chaque frame).
+# - Les zones sales sont agrégées sur une grille grossière (cell_px) pour borner le
+#   nombre de passes ; au-delà de max_dirty_ratio de l'écran, on redessine tout.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pygame
+
+
+class ScrollLayer:
+    def __init__(self, cell_px: int = 64, max_dirty_ratio: float = 0.5, max_changed_tiles: int = 512):
+        self.cell_px = max(8, int(cell_px))
+        self.max_dirty_ratio = float(max_dirty_ratio)
+        self.max_changed_tiles = max(1, int(max_changed_tiles))
+
+        self.surface: Optional[pygame.Surface] = None
+        self.origin: Optional[tuple[int, int]] = None
+        self.state_key = None
+        self._strips: list[pygame.Rect] = []
+        self._cells: Optional[np.ndarray] = None
+        self._full = True
+
+        # Frame précédente : tableaux de région (bornes + champs), objets, rects d'entités
+        self._prev_bounds: Optional[tuple[int, int, int, int]] = None
+        self._prev_arrays: dict[str, np.ndarray] = {}
+        self._prev_objects: dict[tuple[int, int], tuple] = {}
+        self.entity_rects: list[pygame.Rect] = []
+
+        self.frames = 0
+        self.full_redraws = 0
+        self.repainted_px = 0
+        self.last_rects = 0
+
+    def reset(self) -> None:
+        self.surface = None
+        self.origin = None
+        self.state_key = None
+        self._prev_bounds = None
+        self._prev_arrays = {}
+        self._prev_objects = {}
+        self.entity_rects = []
+
+    # ------------------- frame -------------------
+
+    def begin(self, size: tuple[int, int], origin: tuple[int, int], state_key) -> bool:
+        """
+        Prépare la couche pour une frame. Renvoie True si elle doit être entièrement
+        redessinée, sinon la surface a été décalée et les bandes exposées sont marquées.
+        """
+        self.frames += 1
+        w, h = size
+        full = (
+            self.surface is None
+            or self.surface.get_size() != (w, h)
+            or self.origin is None
+            or self.state_key != state_key
+        )
+        sdx = sdy = 0
+        if not full:
+            sdx = origin[0] - self.origin[0]
+            sdy = origin[1] - self.origin[1]
+            full = abs(sdx) >= w or abs(sdy) >= h
+        if self.surface is None or self.surface.get_size() != (w, h):
+            self.surface = pygame.Surface((w, h)).convert() if pygame.display.get_surface() else pygame.Surface((w, h))
+
+        self.origin = origin
+        self.state_key = state_key
+        self._strips = []
+        self._cells = np.zeros(((h + self.cell_px - 1) // self.cell_px, (w + self.cell_px - 1) // self.cell_px), dtype=bool)
+        self._full = full
+        if full:
+            self.entity_rects = []
+            return True
+
+        if sdx or sdy:
+            self.surface.scroll(sdx, sdy)
+            for r in self.entity_rects:
+                r.move_ip(sdx, sdy)
+            if sdx > 0:
+                self._strips.append(pygame.Rect(0, 0, sdx, h))
+            elif sdx < 0:
+                self._strips.append(pygame.Rect(w + sdx, 0, -sdx, h))
+            if sdy > 0:
+                self._strips.append(pygame.Rect(0, 0, w, sdy))
+            elif sdy < 0:
+                self._strips.append(pygame.Rect(0, h + sdy, w, -sdy))
+        return False
+
+    def invalidate(self) -> None:
+        """Force un rendu complet à la frame en cours (trop de changements)."""
+        self._full = True
+
+    @property
+    def full(self) -> bool:
+        return self._full
+
+    def mark_rect(self, rect: pygame.Rect) -> None:
+        if self._full or self._cells is None:
+            return
+        c = self.cell_px
+        rows, cols = self._cells.shape
+        x0 = max(0, rect.left // c)
+        x1 = min(cols - 1, (rect.right - 1) // c)
+        y0 = max(0, rect.top // c)
+        y1 = min(rows - 1, (rect.bottom - 1) // c)
+        if x0 <= x1 and y0 <= y1:
+            self._cells[y0:y1 + 1, x0:x1 + 1] = True
+
+    def dirty_rects(self) -> Optional[list[pygame.Rect]]:
+        """Zones à redessiner (bandes exposées + cellules sales fusionnées) ; None = tout."""
+        if self._full:
+            return None
+        w, h = self.surface.get_size()
+        c = self.cell_px
+        cells = self._cells
+        if cells.mean() > self.max_dirty_ratio:
+            self._full = True
+            return None
+
+        # Cellules -> segments par ligne, fusionnés verticalement quand ils sont identiques.
+        rects: list[pygame.Rect] = []
+        open_runs: dict[tuple[int, int], pygame.Rect] = {}
+        for row in range(cells.shape[0]):
+            line = cells[row]
+            runs = set()
+            if line.any():
+                padded = np.concatenate(([False], line, [False]))
+                edges = np.flatnonzero(padded[1:] != padded[:-1])
+                runs = set(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+            for run in list(open_runs):
+                if run not in runs:
+                    rects.append(open_runs.pop(run))
+            for a, b in runs:
+                r = open_runs.get((a, b))
+                if r is None:
+                    open_runs[(a, b)] = pygame.Rect(a * c, row * c, (b - a) * c, c)
+                else:
+                    r.height += c
+        rects.extend(open_runs.values())
+
+        screen_rect = pygame.Rect(0, 0, w, h)
+        out = [r.clip(screen_rect) for r in self._strips + rects]
+        return [r for r in out if r.width > 0 and r.height > 0]
+
+    def end(self, rects: Optional[list[pygame.Rect]]) -> None:
+        w, h = self.surface.get_size()
+        if rects is None:
+            self.full_redraws += 1
+            self.repainted_px += w * h
+            self.last_rects = 1
+        else:
+            self.repainted_px += sum(r.width * r.height for r in rects)
+            self.last_rects = len(rects)
+
+    # ------------------- détection des changements -------------------
+
+    def changed_tiles(self, i0: int, j0: int, arrays: dict[str, np.ndarray]):
+        """
+        Compare les tableaux de région (mêmes champs, bornes i0/j0 + forme) avec la frame
+        précédente sur la zone commune. Renvoie (ii, jj, prev) où prev donne les anciennes
+        valeurs des tuiles changées, ou None si le nombre de changements dépasse le seuil.
+        """
+        h, w = next(iter(arrays.values())).shape
+        prev_bounds = self._prev_bounds
+        prev_arrays = self._prev_arrays
+        self._prev_bounds = (i0, j0, w, h)
+        self._prev_arrays = arrays
+        if prev_bounds is None or set(prev_arrays) != set(arrays):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), {}
+
+        pi0, pj0, pw, ph = prev_bounds
+        a0 = max(i0, pi0)
+        a1 = min(i0 + w, pi0 + pw)
+        b0 = max(j0, pj0)
+        b1 = min(j0 + h, pj0 + ph)
+        if a0 >= a1 or b0 >= b1:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), {}
+
+        cur_sl = (slice(b0 - j0, b1 - j0), slice(a0 - i0, a1 - i0))
+        prev_sl = (slice(b0 - pj0, b1 - pj0), slice(a0 - pi0, a1 - pi0))
+        diff = None
+        for name, cur in arrays.items():
+            d = cur[cur_sl] != prev_arrays[name][prev_sl]
+            diff = d if diff is None else (diff | d)
+        rr, cc = np.nonzero(diff)
+        if rr.size > self.max_changed_tiles:
+            return None
+        prev = {name: arr[prev_sl][rr, cc] for name, arr in prev_arrays.items()}
+        return cc + a0, rr + b0, prev
+
+    def changed_objects(self, objects: dict[tuple[int, int], tuple]) -> list[tuple[int, int]]:
+        """Constructions (overlay dict) dont la signature (pid, état...) a changé."""
+        prev = self._prev_objects
+        self._prev_objects = objects
+        if not prev and not objects:
+            return []
+        return [k for k in set(prev) | set(objects) if prev.get(k) != objects.get(k)]
+
+    # ------------------- stats -------------------
+
+    def stats(self) -> dict:
+        size = self.surface.get_size() if self.surface is not None else (0, 0)
+        screen_px = max(1, size[0] * size[1])
+        return {
+            "frames": self.frames,
+            "full_redraws": self.full_redraws,
+            "repaint_ratio": self.repainted_px / (screen_px * max(1, self.frames)),
+            "last_rects": self.last_rects,
+        }
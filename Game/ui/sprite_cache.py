@@ -0,0 +1,274 @@
+# sprite_cache.py
+# Cache partagé des sprites mis à l'échelle (sol, props, entités), par niveau de zoom discret.
+#
+# Principe :
+# - Le zoom de la vue est ramené à une échelle de niveaux discrets (zoom_levels) :
+#   min_zoom * (1 + step)^k jusqu'à max_zoom. Une clé de cache = (espace, source, niveau),
+#   le nombre de variantes par sprite est donc borné, quelle que soit la molette.
+# - LRU borné en octets (w * h * 4 par surface) + statistiques hits / misses / évictions.
+# - Chaque espace ("ground", "prop", "smooth"...) a trois étapes : base(source) (image de
+#   départ, thread principal), scale(base, zoom) (mise à l'échelle pure) et finish(surface,
+#   source) (convert_alpha, alpha... thread principal).
+#   prescale(zoom) prépare en arrière-plan les sprites du niveau courant pour un autre
+#   niveau : au prochain cran de molette, ils sont déjà prêts. Le thread ne fait que scale
+#   sur des bases lues par le thread principal ; finish et l'insertion dans le LRU ont lieu
+#   dans poll(), sur le thread principal, jamais en concurrence avec les lectures.
+
+from __future__ import annotations
+
+import bisect
+import queue
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+import pygame
+
+_shared: Optional["ScaledSpriteCache"] = None
+
+
+def zoom_levels(min_zoom: float, max_zoom: float, step: float) -> list[float]:
+    """Niveaux de zoom discrets : min_zoom * (1 + step)^k, bornés par max_zoom (inclus)."""
+    lo = float(min_zoom)
+    hi = max(lo, float(max_zoom))
+    factor = 1.0 + max(0.01, float(step))
+    levels = [lo]
+    while levels[-1] * factor < hi - 1e-9:
+        levels.append(levels[-1] * factor)
+    if hi - levels[-1] > 1e-9:
+        levels.append(hi)
+    return [round(z, 6) for z in levels]
+
+
+def scale_surface(base: pygame.Surface, zoom: float) -> pygame.Surface:
+    """Étape scale par défaut : taille de base * zoom (tronquée), sans lissage."""
+    return pygame.transform.scale(base, (int(base.get_width() * zoom), int(base.get_height() * zoom)))
+
+
+def _identity_base(source):
+    return source
+
+
+def _no_finish(surf: pygame.Surface, _source) -> pygame.Surface:
+    return surf
+
+
+def _smoothscale(src, zoom: float) -> pygame.Surface:
+    """Étape scale de l'espace "smooth" : source = (surface, facteur), échelle = zoom * facteur."""
+    surf, factor = src
+    scale = zoom * factor
+    if abs(scale - 1.0) < 1e-6:
+        return surf
+    w, h = surf.get_size()
+    return pygame.transform.smoothscale(surf, (max(1, int(w * scale)), max(1, int(h * scale))))
+
+
+class ScaledSpriteCache:
+    def __init__(self, budget_mb: float = 64.0):
+        self.budget_bytes = int(max(1.0, float(budget_mb)) * 1024 * 1024)
+        self._levels: list[float] = []
+        # espace -> (base, scale, finish)
+        self._builders: dict[str, tuple[Callable, Callable, Callable]] = {
+            "smooth": (_identity_base, _smoothscale, _no_finish),
+        }
+        self._entries: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._bytes = 0
+        self._last_zoom = None
+        self._last_level = None
+
+        # Pré-mise à l'échelle en arrière-plan
+        self._jobs: "queue.Queue[tuple]" = queue.Queue()
+        self._ready: deque = deque()
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prescaled = 0
+
+    # ------------------- configuration -------------------
+
+    def register(
+        self,
+        namespace: str,
+        base: Callable,
+        scale: Callable = scale_surface,
+        finish: Callable = _no_finish,
+    ) -> None:
+        """
+        base(source) -> image de départ et finish(surface, source) -> Surface : thread
+        principal uniquement ; scale(base, zoom) -> Surface : aussi appelé par le thread de
+        pré-mise à l'échelle, ne doit rien faire d'autre que transformer la base.
+        """
+        self._builders[namespace] = (base, scale, finish)
+
+    def set_zoom_levels(self, levels) -> None:
+        self._levels = sorted(float(z) for z in levels)
+        self._last_zoom = self._last_level = None
+
+    def quantize(self, zoom: float) -> float:
+        """Niveau discret le plus proche de zoom (zoom lui-même si aucun niveau n'est défini)."""
+        zoom = float(zoom)
+        if zoom == self._last_zoom:
+            return self._last_level
+        levels = self._levels
+        if not levels:
+            level = round(zoom, 4)
+        else:
+            k = bisect.bisect_left(levels, zoom)
+            if k <= 0:
+                level = levels[0]
+            elif k >= len(levels):
+                level = levels[-1]
+            else:
+                lo, hi = levels[k - 1], levels[k]
+                level = lo if (zoom - lo) <= (hi - zoom) else hi
+        self._last_zoom, self._last_level = zoom, level
+        return level
+
+    def neighbour_level(self, zoom: float, direction: int) -> Optional[float]:
+        """Niveau voisin (direction > 0 : plus grand), None en bout d'échelle."""
+        levels = self._levels
+        if not levels:
+            return None
+        k = levels.index(self.quantize(zoom)) + (1 if direction > 0 else -1)
+        return levels[k] if 0 <= k < len(levels) else None
+
+    # ------------------- accès -------------------
+
+    def get(self, namespace: str, source, zoom: float) -> pygame.Surface:
+        level = self.quantize(zoom)
+        key = (namespace, source, level)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        if self._ready:
+            self.poll()
+            surf = self._entries.get(key)
+            if surf is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return surf
+        self.misses += 1
+        base, scale, finish = self._builders[namespace]
+        surf = finish(scale(base(source), level), source)
+        self._insert(key, surf)
+        return surf
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        self._generation += 1
+        if namespace is None:
+            self._entries.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._entries if k[0] == namespace]:
+            self._bytes -= self._nbytes(self._entries.pop(key))
+
+    @staticmethod
+    def _nbytes(surf: pygame.Surface) -> int:
+        return surf.get_width() * surf.get_height() * 4
+
+    def _insert(self, key: tuple, surf: pygame.Surface) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= self._nbytes(old)
+        self._entries[key] = surf
+        self._bytes += self._nbytes(surf)
+        while self._bytes > self.budget_bytes and len(self._entries) > 1:
+            _k, victim = self._entries.popitem(last=False)
+            self._bytes -= self._nbytes(victim)
+            self.evictions += 1
+
+    # ------------------- pré-mise à l'échelle -------------------
+
+    def prescale(self, targets, from_zoom: float) -> int:
+        """
+        Met en file (thread) les sprites utilisés au niveau de from_zoom pour chaque niveau
+        de `targets` (dans l'ordre de priorité). Les demandes précédentes sont abandonnées.
+        """
+        current = self.quantize(from_zoom)
+        sources = [(k[0], k[1]) for k in self._entries if k[2] == current]
+        self._generation += 1
+        gen = self._generation
+        queued = 0
+        bases: dict[tuple, object] = {}
+        for target in targets:
+            if target is None:
+                continue
+            level = self.quantize(target)
+            if level == current:
+                continue
+            for ns, src in sources:
+                if (ns, src, level) in self._entries:
+                    continue
+                builder = self._builders.get(ns)
+                if builder is None:
+                    continue
+                # Image de départ lue ici (thread principal) : le thread ne fait que scale.
+                base = bases.get((ns, src))
+                if base is None:
+                    try:
+                        base = bases[(ns, src)] = builder[0](src)
+                    except Exception:
+                        continue
+                self._jobs.put((gen, ns, src, level, base, builder[1]))
+                queued += 1
+        if queued:
+            self._ensure_thread()
+        return queued
+
+    def poll(self) -> None:
+        """Termine (finish) et insère dans le LRU les sprites mis à l'échelle par le thread (thread principal uniquement)."""
+        while self._ready:
+            gen, key, surf = self._ready.popleft()
+            if gen != self._generation or key in self._entries:
+                continue
+            builder = self._builders.get(key[0])
+            if builder is None:
+                continue
+            self._insert(key, builder[2](surf, key[1]))
+            self.prescaled += 1
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._worker, name="sprite-prescale", daemon=True)
+        self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            gen, ns, src, level, base, scale = self._jobs.get()
+            if gen != self._generation:
+                continue  # demande périmée (nouveau cran de zoom entre-temps)
+            try:
+                surf = scale(base, level)
+            except Exception:
+                continue
+            self._ready.append((gen, (ns, src, level), surf))
+
+    # ------------------- stats -------------------
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": 1.0 if lookups == 0 else self.hits / lookups,
+            "evictions": self.evictions,
+            "prescaled": self.prescaled,
+            "pending": self._jobs.qsize(),
+        }
+
+
+def shared_sprite_cache() -> ScaledSpriteCache:
+    """Instance partagée par la vue iso et les renderers d'entités."""
+    global _shared
+    if _shared is None:
+        _shared = ScaledSpriteCache()
+    return _shared
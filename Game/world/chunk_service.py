@@ -0,0 +1,259 @@
+# chunk_service.py
+# Génération de chunks en arrière-plan sur un pool de processus.
+#
+# Objectifs :
+# - Ne plus bloquer la boucle de rendu quand la caméra entre dans une zone inexplorée.
+# - Répartir la génération sur tous les cœurs (préchargement LoadingState + runtime).
+#
+# Fonctionnement :
+# - Chaque worker reconstruit un ChunkedWorld "générateur" (sans recherche de spawn)
+#   à partir de (seed, params, dimensions) puis renvoie les chunks sous forme d'octets.
+# - Le thread principal appelle poll_ready() pour insérer les chunks terminés dans le cache
+#   du monde ; en attendant, le rendu dessine un placeholder.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from Game.world.world_gen import ChunkedWorld, ProgressCb, _Chunk
+
+# Cache des mondes générateurs côté worker : clé de spec -> ChunkedWorld
+_WORKER_WORLDS: Dict[str, ChunkedWorld] = {}
+
+
+def _world_spec(world: ChunkedWorld) -> Tuple[str, tuple]:
+    params = world.params
+    spec = (
+        int(world.width),
+        int(world.height),
+        int(world.seed),
+        params,
+        int(world.tiles_levels),
+        int(world.chunk_size),
+    )
+    key = repr((spec[0], spec[1], spec[2], sorted(params.to_dict().items()), spec[4], spec[5]))
+    return key, spec
+
+
+def _worker_generate_chunk(key: str, spec: tuple, cx: int, cy: int) -> Tuple[int, int, bytes]:
+    world = _WORKER_WORLDS.get(key)
+    if world is None:
+        width, height, seed, params, tiles_levels, chunk_size = spec
+        world = ChunkedWorld(
+            width=width,
+            height=height,
+            seed=seed,
+            params=params,
+            tiles_levels=tiles_levels,
+            chunk_size=chunk_size,
+            cache_chunks=1,
+            find_spawn=False,
+        )
+        if len(_WORKER_WORLDS) >= 2:
+            _WORKER_WORLDS.clear()
+        _WORKER_WORLDS[key] = world
+    ch = world._generate_chunk(int(cx), int(cy))
+    return int(cx), int(cy), ch.to_bytes()
+
+
+def create_chunk_service(world: Optional[ChunkedWorld], workers: Any = -1) -> Optional["ChunkGenerationService"]:
+    """
+    Fabrique depuis le réglage `world.chunk_workers` :
+    -1 (ou "auto") = nb cœurs - 1, 0 = désactivé (génération synchrone).
+    """
+    if world is None:
+        return None
+    try:
+        n = int(workers)
+    except (TypeError, ValueError):
+        n = -1
+    if n == 0:
+        return None
+    return ChunkGenerationService(world, max_workers=None if n < 0 else n)
+
+
+class ChunkGenerationService:
+    """
+    Service de génération asynchrone :
+      - request_chunk(cx, cy) : non bloquant, True si le chunk est déjà en cache.
+      - poll_ready() : insère dans le monde les chunks terminés (thread principal).
+      - prewarm(coords) : génération parallèle bloquante (écran de chargement).
+    """
+
+    def __init__(self, world: ChunkedWorld, max_workers: Optional[int] = None):
+        self.world = world
+        self.max_workers = max(1, int(max_workers or self.default_workers()))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Tuple[int, int], Future] = {}
+        self._submitted_at: Dict[Tuple[int, int], float] = {}
+        self._spec_key, self._spec = _world_spec(world)
+        self.enabled = True
+
+        self.requested = 0
+        self.installed = 0
+        self.failed = 0
+        self._latency_total = 0.0
+
+    @staticmethod
+    def default_workers() -> int:
+        return max(1, (os.cpu_count() or 2) - 1)
+
+    # ------------------- pool -------------------
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if not self.enabled:
+            return None
+        if self._executor is None:
+            try:
+                # "spawn" : les workers ne doivent pas hériter de l'état pygame/SDL du parent.
+                ctx = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            except Exception as e:
+                print(f"[ChunkService] Pool indisponible, génération synchrone: {e}")
+                self.enabled = False
+                return None
+        return self._executor
+
+    def _disable(self, reason: Any) -> None:
+        print(f"[ChunkService] Pool désactivé ({reason}), génération synchrone")
+        self.enabled = False
+        for fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self._submitted_at.clear()
+
+    def shutdown(self) -> None:
+        ex = self._executor
+        self._executor = None
+        self._pending.clear()
+        self._submitted_at.clear()
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------- requests -------------------
+
+    def _norm_key(self, cx: int, cy: int) -> Optional[Tuple[int, int]]:
+        cs = self.world.chunk_size
+        if cy < 0 or cy * cs >= self.world.height:
+            return None
+        max_cx = (self.world.width + cs - 1) // cs
+        return (int(cx) % max_cx, int(cy))
+
+    def is_pending(self, cx: int, cy: int) -> bool:
+        key = self._norm_key(cx, cy)
+        return key is not None and key in self._pending
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def request_chunk(self, cx: int, cy: int) -> bool:
+        """Demande un chunk sans bloquer. Retourne True s'il est déjà disponible."""
+        key = self._norm_key(cx, cy)
+        if key is None:
+            return True
+        if key in self._pending:
+            return False
+        if self.world.load_stored_chunk(*key):
+            return True
+
+        ex = self._get_executor()
+        if ex is None:
+            self.world.ensure_chunk_at(key[0] * self.world.chunk_size, key[1] * self.world.chunk_size)
+            return True
+        try:
+            fut = ex.submit(_worker_generate_chunk, self._spec_key, self._spec, key[0], key[1])
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._disable(e)
+            self.world.ensure_chunk_at(key[0] * self.world.chunk_size, key[1] * self.world.chunk_size)
+            return True
+        self._pending[key] = fut
+        self._submitted_at[key] = time.perf_counter()
+        self.requested += 1
+        return False
+
+    def _install_result(self, key: Tuple[int, int], fut: Future) -> bool:
+        submitted = self._submitted_at.pop(key, None)
+        try:
+            cx, cy, payload = fut.result()
+        except BrokenProcessPool as e:
+            self._disable(e)
+            return False
+        except Exception as e:
+            self.failed += 1
+            print(f"[ChunkService] Échec génération chunk {key}: {e}")
+            return False
+        ch = _Chunk.from_bytes(cx, cy, self.world.chunk_size, payload)
+        inserted = self.world.install_chunk(ch)
+        if inserted:
+            self.installed += 1
+        if submitted is not None:
+            self._latency_total += time.perf_counter() - submitted
+        return inserted
+
+    def poll_ready(self, max_items: Optional[int] = None) -> list[Tuple[int, int]]:
+        """Insère les chunks terminés dans le cache du monde ; retourne leurs clés."""
+        if not self._pending:
+            return []
+        done = [key for key, fut in self._pending.items() if fut.done()]
+        if max_items is not None:
+            done = done[: max(0, int(max_items))]
+        installed: list[Tuple[int, int]] = []
+        for key in done:
+            fut = self._pending.pop(key, None)
+            if fut is None:
+                continue
+            if self._install_result(key, fut):
+                installed.append(key)
+        return installed
+
+    def prewarm(
+        self,
+        chunk_coords: list[tuple[int, int]],
+        progress: ProgressCb = None,
+        phase_label: str = "Préchargement rendu…",
+    ) -> None:
+        """Génère en parallèle (bloquant) la liste de chunks demandée."""
+        keys = []
+        for cx, cy in chunk_coords:
+            key = self._norm_key(cx, cy)
+            if key is not None and key not in keys:
+                keys.append(key)
+        total = max(1, len(keys))
+        done_count = 0
+        for key in keys:
+            if self.request_chunk(*key):
+                done_count += 1
+        if progress and done_count:
+            progress(done_count / total, f"{phase_label} ({done_count}/{total})")
+
+        futures = {fut: key for key, fut in list(self._pending.items()) if key in keys}
+        for fut in as_completed(futures):
+            key = futures[fut]
+            if self._pending.pop(key, None) is not None:
+                self._install_result(key, fut)
+            done_count += 1
+            if progress:
+                progress(done_count / total, f"{phase_label} ({done_count}/{total})")
+            if not self.enabled:
+                break
+
+        # Pool tombé en cours de route : on termine en synchrone.
+        if not self.enabled:
+            cs = self.world.chunk_size
+            for cx, cy in keys:
+                self.world.ensure_chunk_at(cx * cs, cy * cs)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.max_workers if self.enabled else 0,
+            "pending": len(self._pending),
+            "requested": self.requested,
+            "installed": self.installed,
+            "failed": self.failed,
+            "avg_latency_ms": 1000.0 * self._latency_total / max(1, self.installed),
+        }
@@ -0,0 +1,267 @@
+# chunk_store.py
+# Cache disque persistant des chunks générés (un fichier par monde, mappé en mémoire).
+#
+# Format du fichier :
+#   [en-tête fixe][table d'index : 1 u32 par chunk du monde][enregistrements de taille fixe]
+#   - en-tête : magic, version de format, version du générateur, seed finale, dimensions...
+#   - index[slot] = numéro d'enregistrement + 1 (0 = chunk absent), slot = cy * max_cx + cx
+#   - enregistrement = _Chunk.to_bytes() (height/temp/moist/levels/ground/overlay/biome)
+#
+# Invalidation : le nom du fichier dépend de la seed finale (make_final_seed) et l'en-tête
+# contient la version du générateur ; toute différence => le fichier est recréé.
+# Seule la génération procédurale est stockée : les modifications du joueur (overrides)
+# restent dans la sauvegarde.
+#
+# Taille : la somme des fichiers du dossier est bornée (max_total_bytes). À l'ouverture d'un
+# monde, sa date de modification est rafraîchie puis les fichiers les moins récemment
+# utilisés (hors fichiers ouverts) sont supprimés jusqu'à repasser sous le budget.
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Optional
+
+_MAGIC = b"EVOCHNK1"
+_FORMAT_VERSION = 1
+# magic, format, générateur, seed, width, height, chunk_size, tiles_levels, slots, record_size
+_HEADER = struct.Struct("<8sIIQIIIIII")
+_HEADER_SIZE = 64
+_GROW_RECORDS = 64
+
+CHUNK_CACHE_DIR = os.path.join("Game", "save", "chunk_cache")
+DEFAULT_MAX_TOTAL_BYTES = 512 * 1024 * 1024
+_SUFFIX = ".chunks"
+
+# Un seul ChunkStore par fichier dans le process (plusieurs mondes peuvent partager la même seed).
+_OPEN_STORES: dict = {}
+
+
+class ChunkStore:
+    """
+    Fichier de chunks mappé en mémoire :
+      - get(cx, cy) -> bytes | None : lecture directe dans le mmap.
+      - put(cx, cy, payload) : ajoute l'enregistrement (jamais réécrit ensuite).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        seed: int,
+        width: int,
+        height: int,
+        chunk_size: int,
+        tiles_levels: int,
+        record_size: int,
+        generator_version: int,
+    ):
+        self.path = path
+        self.chunk_size = int(chunk_size)
+        self.max_cx = (int(width) + self.chunk_size - 1) // self.chunk_size
+        self.max_cy = (int(height) + self.chunk_size - 1) // self.chunk_size
+        self.slots = self.max_cx * self.max_cy
+        self.record_size = int(record_size)
+        self._header = _HEADER.pack(
+            _MAGIC,
+            _FORMAT_VERSION,
+            int(generator_version),
+            int(seed) & 0xFFFF_FFFF_FFFF_FFFF,
+            int(width),
+            int(height),
+            self.chunk_size,
+            int(tiles_levels),
+            self.slots,
+            self.record_size,
+        )
+        self._data_start = _HEADER_SIZE + 4 * self.slots
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._index: Optional[memoryview] = None
+        self._capacity = 0   # nb d'enregistrements que le fichier peut contenir
+        self._count = 0      # nb d'enregistrements écrits
+        self._open()
+
+    @staticmethod
+    def path_for(
+        seed: int, width: int, height: int, chunk_size: int, tiles_levels: int, directory: str = CHUNK_CACHE_DIR
+    ) -> str:
+        name = (
+            f"{int(seed) & 0xFFFF_FFFF_FFFF_FFFF:016x}_{int(width)}x{int(height)}"
+            f"_c{int(chunk_size)}_l{int(tiles_levels)}{_SUFFIX}"
+        )
+        return os.path.join(directory, name)
+
+    # ------------------- fichier -------------------
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        valid = False
+        if os.path.isfile(self.path):
+            with open(self.path, "rb") as f:
+                valid = f.read(_HEADER.size) == self._header
+        if not valid:
+            # Absent, autre version du générateur ou autres paramètres : on repart de zéro.
+            with open(self.path, "wb") as f:
+                f.write(self._header.ljust(_HEADER_SIZE, b"\0"))
+                f.write(b"\0" * (4 * self.slots))
+                f.truncate(self._data_start + _GROW_RECORDS * self.record_size)
+
+        self._file = open(self.path, "r+b")
+        size = os.fstat(self._file.fileno()).st_size
+        self._capacity = max(0, (size - self._data_start) // self.record_size)
+        self._map()
+        # Les enregistrements sont ajoutés dans l'ordre : le plus grand index = dernier écrit.
+        self._count = max(self._index.tolist(), default=0)
+        if self._count > self._capacity:
+            # Fichier tronqué (arrêt brutal pendant un agrandissement) : on ignore les entrées hors fichier.
+            for slot in range(self.slots):
+                if self._index[slot] > self._capacity:
+                    self._index[slot] = 0
+            self._count = max(self._index.tolist(), default=0)
+
+    def _map(self) -> None:
+        self._unmap()
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._index = memoryview(self._mm)[_HEADER_SIZE:self._data_start].cast("I")
+
+    def _unmap(self) -> None:
+        if self._index is not None:
+            self._index.release()
+            self._index = None
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+
+    def _grow(self) -> None:
+        # Démappage avant truncate (obligatoire sous Windows).
+        self._unmap()
+        self._capacity += max(_GROW_RECORDS, self._capacity // 2)
+        self._file.truncate(self._data_start + self._capacity * self.record_size)
+        self._map()
+
+    def close(self) -> None:
+        self._unmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------- accès -------------------
+
+    def _slot(self, cx: int, cy: int) -> int:
+        if not (0 <= cx < self.max_cx and 0 <= cy < self.max_cy):
+            return -1
+        return int(cy) * self.max_cx + int(cx)
+
+    def __contains__(self, key) -> bool:
+        slot = self._slot(*key)
+        return slot >= 0 and self._index is not None and self._index[slot] != 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, cx: int, cy: int) -> Optional[bytes]:
+        slot = self._slot(cx, cy)
+        if slot < 0 or self._mm is None:
+            return None
+        rec = self._index[slot]
+        if rec == 0:
+            return None
+        off = self._data_start + (rec - 1) * self.record_size
+        return self._mm[off:off + self.record_size]
+
+    def put(self, cx: int, cy: int, payload: bytes) -> bool:
+        slot = self._slot(cx, cy)
+        if slot < 0 or self._mm is None or len(payload) != self.record_size:
+            return False
+        if self._index[slot] != 0:
+            return False
+        if self._count >= self._capacity:
+            self._grow()
+        off = self._data_start + self._count * self.record_size
+        self._mm[off:off + self.record_size] = payload
+        self._count += 1
+        # L'index est écrit après les données : une entrée n'est jamais visible avant son contenu.
+        self._index[slot] = self._count
+        return True
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+
+
+def prune_chunk_cache(directory: str = CHUNK_CACHE_DIR, max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES) -> int:
+    """
+    Supprime les fichiers de chunks les moins récemment utilisés jusqu'à ce que le dossier
+    tienne dans max_total_bytes ; les fichiers ouverts dans le process sont conservés.
+    Retourne le nombre d'octets libérés.
+    """
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith(_SUFFIX)]
+    except OSError:
+        return 0
+    in_use = {key for key, store in _OPEN_STORES.items() if store._mm is not None}
+    files = []
+    total = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        total += st.st_size
+        files.append((st.st_mtime, st.st_size, path))
+    freed = 0
+    for _mtime, size, path in sorted(files):
+        if total <= max_total_bytes:
+            break
+        if os.path.abspath(path) in in_use:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        freed += size
+    return freed
+
+
+def open_chunk_store(
+    seed: int,
+    width: int,
+    height: int,
+    chunk_size: int,
+    tiles_levels: int,
+    record_size: int,
+    generator_version: int,
+    directory: str = CHUNK_CACHE_DIR,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+) -> Optional[ChunkStore]:
+    """
+    Ouvre (ou réutilise) le cache disque d'un monde ; None si le disque est indisponible
+    ou si max_total_bytes vaut 0 (cache désactivé).
+    """
+    if max_total_bytes <= 0:
+        return None
+    path = ChunkStore.path_for(seed, width, height, chunk_size, tiles_levels, directory)
+    key = os.path.abspath(path)
+    store = _OPEN_STORES.get(key)
+    if store is not None and store._mm is not None:
+        if store.record_size == int(record_size) and store._header == _HEADER.pack(
+            _MAGIC, _FORMAT_VERSION, int(generator_version), int(seed) & 0xFFFF_FFFF_FFFF_FFFF,
+            int(width), int(height), int(chunk_size), int(tiles_levels), store.slots, int(record_size),
+        ):
+            return store
+        store.close()
+    try:
+        store = ChunkStore(path, seed, width, height, chunk_size, tiles_levels, record_size, generator_version)
+        os.utime(path)  # date d'utilisation pour l'éviction LRU
+    except (OSError, ValueError) as e:
+        print(f"[ChunkStore] Cache disque indisponible ({path}): {e}")
+        return None
+    _OPEN_STORES[key] = store
+    freed = prune_chunk_cache(directory, max_total_bytes)
+    if freed:
+        print(f"[ChunkStore] Cache disque : {freed / (1024 * 1024):.1f} Mo de mondes anciens supprimés")
+    return store
@@ -1,3 +1,17 @@
+import zlib
+
+import numpy as np
+
+# Format de sauvegarde de la couche "explorée" (export_state) :
+#   1 : "explored_chunks" = [(cx, cy, bitset brut)] (anciennes sauvegardes, toujours relues)
+#   2 : "explored_full" = [(cx, cy)] chunks entièrement explorés (un simple drapeau),
+#       "explored_zlib" = [(cx, cy, zlib(bitset))] ; les chunks vides ne sont pas écrits.
+# Au chargement, les chunks restent encodés et ne sont décodés qu'au premier accès
+# (rendu, is_explored, exploration) ; un chunk non modifié depuis est réécrit tel quel.
+_FOG_STATE_FORMAT = 2
+_ZLIB_LEVEL = 6
+
+
 class _RowProxy:
     def __init__(self, fog, y: int, kind: str):
         self.fog = fog
@@ -21,49 +35,131 @@ class _GridProxy:
 
 class FogOfWar:
     """
-    Fog scalable :
-    - visible : set de tuiles visibles (reset chaque recompute)
-    - explored : bitset par chunk (persistant, progressif tuile par tuile)
+    Fog scalable, deux couches par chunk (ndarray (cs, cs), [ly, lx]) :
+    - visible : compteur uint16 d'observateurs par tuile (visible si > 0)
+    - explored : bool, persistante, progressive (sauvegardée compressée par chunk,
+      décodée à la demande)
+    Les observateurs sont tamponnés avec un masque de disque précalculé par rayon (ajout
+    vectorisé par chunk couvert) : le coût suit le nombre d'observateurs, pas le rayon².
+    Incrémental : seul un observateur qui change de tuile ou de rayon est retiré (disque
+    soustrait) puis retamponné ; recalcul complet quand la lumière quantifiée change.
     """
+    LIGHT_STEPS = 64
+
     def __init__(self, width: int, height: int, chunk_size: int = 32, wrap_x: bool = False):
         self.width = int(width)
         self.height = int(height)
         self.chunk_size = int(chunk_size)
         self.wrap_x = bool(wrap_x)
 
-        self._visible = set()          # {(x,y), ...}
-        self._explored_chunks = {}     # (cx,cy) -> bytearray bitset
+        self._visible_chunks = {}      # (cx,cy) -> ndarray uint16 (cs, cs)
+        self._explored_chunks = {}     # (cx,cy) -> ndarray bool (cs, cs)
+        self._explored_encoded = {}    # (cx,cy) -> (codec, données) : chargé, pas encore décodé
+        self._explored_saved = {}      # (cx,cy) -> (codec, données) : encodage à jour d'un chunk décodé
+        self._explored_dirty = set()   # chunks explorés depuis leur dernier encodage
+        self._free_layers = []         # tableaux "visible" recyclés
+        self._disks = {}               # rayon -> masque bool (2r+1, 2r+1)
+        self._stamps = {}              # id(observateur) -> (x, y, r) tamponné
+        self._light_q = None           # lumière quantifiée du dernier recalcul complet
+        self.restamped = 0             # observateurs retamponnés au dernier recompute
 
         # compat iso_render : fog.visible[y][x] et fog.explored[y][x]
         self.visible = _GridProxy(self, "visible")
         self.explored = _GridProxy(self, "explored")
 
+    def _encode_layer(self, layer: np.ndarray):
+        """(codec, données) d'un chunk exploré ; None si rien n'y est exploré."""
+        if layer.all():
+            return ("full", b"")
+        if not layer.any():
+            return None
+        bits = np.packbits(layer.reshape(-1), bitorder="little")
+        return ("zlib", zlib.compress(bits.tobytes(), _ZLIB_LEVEL))
+
+    def _decode_layer(self, codec: str, data) -> np.ndarray | None:
+        cs = self.chunk_size
+        n = cs * cs
+        if codec == "full":
+            return np.ones((cs, cs), dtype=np.bool_)
+        try:
+            raw = zlib.decompress(data) if codec == "zlib" else bytes(data)
+            bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+        except Exception:
+            return None
+        if bits.size < n:
+            return None
+        return bits[:n].astype(np.bool_).reshape(cs, cs)
+
     def export_state(self) -> dict:
-        chunks = []
-        for (cx, cy), data in self._explored_chunks.items():
-            chunks.append((int(cx), int(cy), bytes(data)))
+        full = []
+        packed = []
+        encoded = dict(self._explored_encoded)
+        saved = self._explored_saved
+        for key, layer in self._explored_chunks.items():
+            enc = saved.get(key)
+            if enc is None or key in self._explored_dirty:
+                enc = self._encode_layer(layer)
+                saved[key] = enc
+            encoded[key] = enc
+        self._explored_dirty.clear()
+        for (cx, cy), enc in encoded.items():
+            if enc is None:
+                continue
+            codec, data = enc
+            if codec == "full":
+                full.append((int(cx), int(cy)))
+            elif codec == "zlib":
+                packed.append((int(cx), int(cy), data))
+            else:
+                # Chunk d'une ancienne sauvegarde jamais décodé : recompressé à l'écriture.
+                layer = self._decode_layer(codec, data)
+                enc = self._encode_layer(layer) if layer is not None else None
+                if enc is not None and enc[0] == "full":
+                    full.append((int(cx), int(cy)))
+                elif enc is not None:
+                    packed.append((int(cx), int(cy), enc[1]))
         return {
             "width": self.width,
             "height": self.height,
             "chunk_size": self.chunk_size,
             "wrap_x": self.wrap_x,
-            "explored_chunks": chunks,
+            "format": _FOG_STATE_FORMAT,
+            "explored_full": full,
+            "explored_zlib": packed,
         }
 
     def import_state(self, state: dict) -> None:
-        chunks = state.get("explored_chunks") or []
-        restored = {}
-        for cx, cy, data in chunks:
-            try:
-                restored[(int(cx), int(cy))] = bytearray(data)
-            except Exception:
-                continue
-        self._explored_chunks = restored
+        encoded = {}
+        for cx, cy, data in state.get("explored_chunks") or []:
+            encoded[(int(cx), int(cy))] = ("raw", data)
+        for cx, cy, data in state.get("explored_zlib") or []:
+            encoded[(int(cx), int(cy))] = ("zlib", data)
+        for cx, cy in state.get("explored_full") or []:
+            encoded[(int(cx), int(cy))] = ("full", b"")
+        self._explored_chunks = {}
+        self._explored_encoded = encoded
+        self._explored_saved = {}
+        self._explored_dirty = set()
         if "wrap_x" in state:
             self.wrap_x = bool(state.get("wrap_x"))
 
+    def _explored_get(self, key) -> np.ndarray | None:
+        """Couche explorée d'un chunk (décodée au premier accès), None si rien n'y est exploré."""
+        layer = self._explored_chunks.get(key)
+        if layer is None and key in self._explored_encoded:
+            enc = self._explored_encoded.pop(key)
+            layer = self._decode_layer(*enc)
+            if layer is not None:
+                self._explored_chunks[key] = layer
+                if enc[0] != "raw":
+                    self._explored_saved[key] = enc
+        return layer
+
     def clear_visible(self):
-        self._visible.clear()
+        self._free_layers.extend(self._visible_chunks.values())
+        self._visible_chunks = {}
+        self._stamps = {}
+        self._light_q = None
 
     def _norm_x(self, x: int) -> int:
         if self.wrap_x:
@@ -74,25 +170,44 @@ class FogOfWar:
         cs = self.chunk_size
         cx = x // cs
         cy = y // cs
-        lx = x - cx * cs
-        ly = y - cy * cs
-        return (cx, cy), (lx + ly * cs)
-
-    def _get_bitset(self, cx: int, cy: int, create: bool) -> bytearray | None:
-        key = (cx, cy)
-        b = self._explored_chunks.get(key)
-        if b is None and create:
-            size_bits = self.chunk_size * self.chunk_size
-            b = bytearray((size_bits + 7) // 8)
-            self._explored_chunks[key] = b
-        return b
+        return (cx, cy), x - cx * cs, y - cy * cs
+
+    def _new_layer(self, dtype=np.bool_) -> np.ndarray:
+        cs = self.chunk_size
+        return np.zeros((cs, cs), dtype=dtype)
+
+    def _visible_layer(self, key) -> np.ndarray:
+        layer = self._visible_chunks.get(key)
+        if layer is None:
+            if self._free_layers:
+                layer = self._free_layers.pop()
+                layer.fill(0)
+            else:
+                layer = self._new_layer(np.uint16)
+            self._visible_chunks[key] = layer
+        return layer
+
+    def _explored_layer(self, key) -> np.ndarray:
+        """Couche explorée modifiable d'un chunk (créée si besoin)."""
+        layer = self._explored_get(key)
+        if layer is None:
+            layer = self._explored_chunks[key] = self._new_layer()
+        return layer
+
+    def _mark_explored(self, key, dst, mask) -> None:
+        """Marque exploré `mask` dans la zone `dst` du chunk ; à réencoder seulement si des cases s'ajoutent."""
+        layer = self._explored_layer(key)
+        region = layer[dst]
+        if (mask & ~region).any():
+            region |= mask
+            self._explored_dirty.add(key)
 
     def _set_explored(self, x: int, y: int):
-        (cx, cy), idx = self._chunk_key(x, y)
-        b = self._get_bitset(cx, cy, create=True)
-        bi = idx >> 3
-        bm = 1 << (idx & 7)
-        b[bi] |= bm
+        key, lx, ly = self._chunk_key(x, y)
+        layer = self._explored_layer(key)
+        if not layer[ly, lx]:
+            layer[ly, lx] = True
+            self._explored_dirty.add(key)
 
     def is_explored(self, x: int, y: int) -> bool:
         if not (0 <= y < self.height):
@@ -100,26 +215,120 @@ class FogOfWar:
         x = self._norm_x(x)
         if not (0 <= x < self.width):
             return False
-
-        (cx, cy), idx = self._chunk_key(x, y)
-        b = self._get_bitset(cx, cy, create=False)
-        if b is None:
-            return False
-        bi = idx >> 3
-        bm = 1 << (idx & 7)
-        return (b[bi] & bm) != 0
+        key, lx, ly = self._chunk_key(x, y)
+        layer = self._explored_get(key)
+        return layer is not None and bool(layer[ly, lx])
 
     def is_visible(self, x: int, y: int) -> bool:
         if not (0 <= y < self.height):
             return False
         x = self._norm_x(x)
-        return (x, y) in self._visible
+        if not (0 <= x < self.width):
+            return False
+        key, lx, ly = self._chunk_key(x, y)
+        layer = self._visible_chunks.get(key)
+        return layer is not None and layer[ly, lx] > 0
 
-    def recompute(self, observers, get_radius, light_level: float):
-        self.clear_visible()
+    def get_region(self, x0: int, y0: int, w: int, h: int):
+        """
+        Lecture d'un rectangle en une passe : (visible, explored), deux ndarray bool (h, w).
+        Mêmes règles de bord que is_visible / is_explored.
+        """
+        w = max(0, int(w))
+        h = max(0, int(h))
+        visible = np.zeros((h, w), dtype=np.bool_)
+        explored = np.zeros((h, w), dtype=np.bool_)
+        if not w or not h:
+            return visible, explored
+
+        xs = int(x0) + np.arange(w, dtype=np.int64)
+        if self.wrap_x:
+            xs %= self.width
+        ys = int(y0) + np.arange(h, dtype=np.int64)
+        col_ok = (xs >= 0) & (xs < self.width)
+        row_ok = (ys >= 0) & (ys < self.height)
+
+        cs = self.chunk_size
+        col_cx = np.where(col_ok, xs // cs, -1)
+        row_cy = np.where(row_ok, ys // cs, -1)
+        col_groups = [(int(cx), np.nonzero(col_cx == cx)[0]) for cx in np.unique(col_cx) if cx >= 0]
+        for cy in np.unique(row_cy):
+            if cy < 0:
+                continue
+            cy = int(cy)
+            rows = np.nonzero(row_cy == cy)[0]
+            ly = ys[rows] - cy * cs
+            for cx, cols in col_groups:
+                src = None
+                for layer, out in (
+                    (self._visible_chunks.get((cx, cy)), visible),
+                    (self._explored_get((cx, cy)), explored),
+                ):
+                    if layer is None:
+                        continue
+                    if src is None:
+                        src = np.ix_(ly, xs[cols] - cx * cs)
+                    out[np.ix_(rows, cols)] = layer[src] != 0
+        return visible, explored
+
+    def _disk(self, r: int) -> np.ndarray:
+        disk = self._disks.get(r)
+        if disk is None:
+            d = np.arange(-r, r + 1)
+            disk = self._disks[r] = (d[None, :] ** 2 + d[:, None] ** 2) <= r * r
+        return disk
 
+    def _x_spans(self, x0: int, x1: int):
+        """Intervalles [a, b) de colonnes réelles couverts par [x0, x1), avec leur décalage dans le masque."""
+        if not self.wrap_x:
+            a, b = max(0, x0), min(self.width, x1)
+            if a < b:
+                yield a, b, a - x0
+            return
+        x = x0
+        while x < x1:
+            a = x % self.width
+            b = min(self.width, a + (x1 - x))
+            yield a, b, x - x0
+            x += b - a
+
+    def _stamp(self, cx: int, cy: int, r: int, add: bool = True) -> None:
+        """
+        Ajoute (add=True, et marque exploré) ou retire le disque de rayon r centré en
+        (cx, cy) des compteurs "visible" des chunks couverts.
+        """
+        disk = self._disk(r)
+        cs = self.chunk_size
+        y0 = max(0, cy - r)
+        y1 = min(self.height, cy + r + 1)
+        if y0 >= y1:
+            return
+        for a, b, off in self._x_spans(cx - r, cx + r + 1):
+            for ky in range(y0 // cs, (y1 - 1) // cs + 1):
+                ya, yb = max(y0, ky * cs), min(y1, ky * cs + cs)
+                for kx in range(a // cs, (b - 1) // cs + 1):
+                    xa, xb = max(a, kx * cs), min(b, kx * cs + cs)
+                    mask = disk[ya - (cy - r):yb - (cy - r), xa - a + off:xb - a + off]
+                    dst = (slice(ya - ky * cs, yb - ky * cs), slice(xa - kx * cs, xb - kx * cs))
+                    layer = self._visible_layer((kx, ky))
+                    if add:
+                        layer[dst] += mask
+                        self._mark_explored((kx, ky), dst, mask)
+                    else:
+                        layer[dst] -= mask
+
+    def recompute(self, observers, get_radius, light_level: float):
         light = max(0.0, min(1.0, float(light_level)))
+        light_q = int(round(light * self.LIGHT_STEPS))
+        if light_q != self._light_q:
+            # Nouveau palier de lumière (jour/nuit, météo) : tous les rayons changent.
+            self.clear_visible()
+            self._light_q = light_q
+        scale = 1.0 + light_q / self.LIGHT_STEPS
 
+        old = self._stamps
+        stamps = {}
+        restamped = 0
         for ent in observers:
             cx, cy = int(ent.x), int(ent.y)
             if not (0 <= cy < self.height):
@@ -129,26 +338,20 @@ class FogOfWar:
                 continue
 
             base_radius = int(get_radius(ent))
-            r = max(1, int(round(base_radius * (1.0 + light))))
-            r2 = r * r
-
-            y0 = max(0, cy - r)
-            y1 = min(self.height - 1, cy + r)
-
-            for y in range(y0, y1 + 1):
-                dy = y - cy
-                dy2 = dy * dy
-                x0 = cx - r
-                x1 = cx + r
-
-                for x in range(x0, x1 + 1):
-                    dx = x - cx
-                    if dx * dx + dy2 > r2:
-                        continue
-
-                    xx = self._norm_x(x)
-                    if not (0 <= xx < self.width):
-                        continue
+            r = max(1, int(round(base_radius * scale)))
+            key = id(ent)
+            stamp = (cx, cy, r)
+            stamps[key] = stamp
+            prev = old.pop(key, None)
+            if prev == stamp:
+                continue
+            if prev is not None:
+                self._stamp(*prev, add=False)
+            self._stamp(cx, cy, r)
+            restamped += 1
 
-                    self._visible.add((xx, y))
-                    self._set_explored(xx, y)
+        # Observateurs disparus (ou sortis de la carte) : leur disque est retiré.
+        for prev in old.values():
+            self._stamp(*prev, add=False)
+        self._stamps = stamps
+        self.restamped = restamped
@@ -0,0 +1,209 @@
+# noise.py
+# Moteur de bruit déterministe par lots : tableaux de coordonnées en entrée, tableaux en sortie.
+#
+# Partagé par la génération de chunks (backend NumPy), la recherche de spawn, l'aperçu
+# du globe à la création de monde, et tout futur champ (météo...).
+#
+# Mêmes formules, bit pour bit (en float64), que les versions scalaires de world_gen :
+#   _hash_u32, _val_noise_2d, _perlin_noise_2d, _fbm, _fbm_perlin
+#
+# Optimisations :
+# - Le hash d'un point du réseau vaut hash(seed ^ hash(ix * 0x9E37) ^ hash(iy * 0x85EB)) :
+#   les deux hash internes ne dépendent que d'un axe. On les calcule une fois par colonne /
+#   ligne du rectangle couvert par la requête, puis une seule fois par point du réseau
+#   (au lieu de 3 hash x 4 coins par échantillon).
+# - Les tables (axe, et réseau par seed) sont mises en cache : les octaves basse fréquence
+#   retombent sur les mêmes cellules d'un chunk à l'autre.
+# - dtype=np.float32 en option pour les usages visuels (aperçus, météo). Le float64 par
+#   défaut est obligatoire pour la génération du monde (sauvegardes reproductibles).
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+_MASK32 = np.uint64(0xFFFF_FFFF)
+_HX = 0x9E37
+_HY = 0x85EB
+
+# Au-delà de ce ratio (points du réseau / échantillons), la table ne vaut plus le coup.
+_TABLE_MAX_RATIO = 4
+_SEED_TABLE_CACHE_SIZE = 256
+_SEED_TABLE_MAX_CELLS = 64 * 64
+
+_seed_tables: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+
+# --------------------------------------------------------------------------------------
+# Hash
+# --------------------------------------------------------------------------------------
+
+def hash_u32(x: np.ndarray) -> np.ndarray:
+    """_hash_u32 sur un tableau (int64 ou uint64), résultat uint64 dans [0, 2^32)."""
+    x = np.asarray(x).astype(np.uint64, copy=False) & _MASK32
+    x = x ^ (x >> np.uint64(16))
+    x = (x * np.uint64(0x7FEB_352D)) & _MASK32
+    x = x ^ (x >> np.uint64(15))
+    x = (x * np.uint64(0x846C_A68B)) & _MASK32
+    x = x ^ (x >> np.uint64(16))
+    return x
+
+
+def rand01(u: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """Entier 32 bits -> flottant dans [0, 1)."""
+    return (u.astype(np.float64) / 0x1_0000_0000).astype(dtype, copy=False)
+
+
+@lru_cache(maxsize=1024)
+def _axis_hash(lo: int, n: int, mul: int) -> np.ndarray:
+    """hash(i * mul) pour i dans [lo, lo + n) (indépendant de la seed)."""
+    out = hash_u32(np.arange(lo, lo + n, dtype=np.int64) * mul)
+    out.flags.writeable = False
+    return out
+
+
+def _seed_table(seed32: int, ix0: int, iy0: int, nx: int, ny: int) -> np.ndarray:
+    """Hash des points du réseau [ix0, ix0+nx) x [iy0, iy0+ny) pour une seed, forme (ny, nx)."""
+    key = (seed32, ix0, iy0, nx, ny)
+    table = _seed_tables.get(key)
+    if table is not None:
+        _seed_tables.move_to_end(key)
+        return table
+    hx = _axis_hash(ix0, nx, _HX)
+    hy = _axis_hash(iy0, ny, _HY)
+    table = hash_u32(np.uint64(seed32) ^ hy[:, None] ^ hx[None, :])
+    if nx * ny <= _SEED_TABLE_MAX_CELLS:
+        table.flags.writeable = False
+        _seed_tables[key] = table
+        if len(_seed_tables) > _SEED_TABLE_CACHE_SIZE:
+            _seed_tables.popitem(last=False)
+    return table
+
+
+def lattice_corners(xi: np.ndarray, yi: np.ndarray, seed: int):
+    """
+    Hash des 4 coins (ix, iy), (ix+1, iy), (ix, iy+1), (ix+1, iy+1) de chaque échantillon.
+    Passe par une table du rectangle couvert quand elle est compacte, sinon hash direct.
+    """
+    seed32 = int(seed) & 0xFFFF_FFFF
+    if xi.size == 0:
+        empty = np.zeros(xi.shape, dtype=np.uint64)
+        return empty, empty, empty, empty
+
+    ix0 = int(xi.min())
+    iy0 = int(yi.min())
+    nx = int(xi.max()) - ix0 + 2
+    ny = int(yi.max()) - iy0 + 2
+    if nx * ny <= max(16, _TABLE_MAX_RATIO * xi.size):
+        table = _seed_table(seed32, ix0, iy0, nx, ny)
+        c = xi - ix0
+        r = yi - iy0
+        return table[r, c], table[r, c + 1], table[r + 1, c], table[r + 1, c + 1]
+
+    s = np.uint64(seed32)
+    hx0 = hash_u32(xi * _HX)
+    hx1 = hash_u32((xi + 1) * _HX)
+    hy0 = hash_u32(yi * _HY)
+    hy1 = hash_u32((yi + 1) * _HY)
+    return (
+        hash_u32(s ^ hx0 ^ hy0),
+        hash_u32(s ^ hx1 ^ hy0),
+        hash_u32(s ^ hx0 ^ hy1),
+        hash_u32(s ^ hx1 ^ hy1),
+    )
+
+
+def clear_caches() -> None:
+    _seed_tables.clear()
+    _axis_hash.cache_clear()
+
+
+# --------------------------------------------------------------------------------------
+# Bruits de base
+# --------------------------------------------------------------------------------------
+
+def val_noise_2d(x: np.ndarray, y: np.ndarray, seed: int, dtype=np.float64) -> np.ndarray:
+    """value noise ~[-1,1] (int() = troncature vers zéro, comme la version scalaire)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    xt = np.trunc(x)
+    yt = np.trunc(y)
+    xf = (x - xt).astype(dtype, copy=False)
+    yf = (y - yt).astype(dtype, copy=False)
+
+    u = xf * xf * (3.0 - 2.0 * xf)
+    v = yf * yf * (3.0 - 2.0 * yf)
+
+    h00, h10, h01, h11 = lattice_corners(xt.astype(np.int64), yt.astype(np.int64), seed)
+    n00 = rand01(h00, dtype) * 2.0 - 1.0
+    n10 = rand01(h10, dtype) * 2.0 - 1.0
+    n01 = rand01(h01, dtype) * 2.0 - 1.0
+    n11 = rand01(h11, dtype) * 2.0 - 1.0
+
+    nx0 = n00 + (n10 - n00) * u
+    nx1 = n01 + (n11 - n01) * u
+    return nx0 + (nx1 - nx0) * v
+
+
+def _perlin_grad(h: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    h = h & np.uint64(7)
+    low = h < 4
+    u = np.where(low, x, y)
+    v = np.where(low, y, x)
+    u = np.where((h & np.uint64(1)) == 0, u, -u)
+    v = np.where((h & np.uint64(2)) == 0, v, -v)
+    return u + v
+
+
+def perlin_noise_2d(x: np.ndarray, y: np.ndarray, seed: int, dtype=np.float64) -> np.ndarray:
+    """Perlin gradient noise ~[-1,1]."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    xfl = np.floor(x)
+    yfl = np.floor(y)
+    xf = (x - xfl).astype(dtype, copy=False)
+    yf = (y - yfl).astype(dtype, copy=False)
+
+    u = xf * xf * xf * (xf * (xf * 6.0 - 15.0) + 10.0)
+    v = yf * yf * yf * (yf * (yf * 6.0 - 15.0) + 10.0)
+
+    h00, h10, h01, h11 = lattice_corners(xfl.astype(np.int64), yfl.astype(np.int64), seed)
+    n00 = _perlin_grad(h00, xf, yf)
+    n10 = _perlin_grad(h10, xf - 1.0, yf)
+    n01 = _perlin_grad(h01, xf, yf - 1.0)
+    n11 = _perlin_grad(h11, xf - 1.0, yf - 1.0)
+
+    nx0 = n00 + (n10 - n00) * u
+    nx1 = n01 + (n11 - n01) * u
+    return nx0 + (nx1 - nx0) * v
+
+
+# --------------------------------------------------------------------------------------
+# fBm
+# --------------------------------------------------------------------------------------
+
+def _fbm_generic(noise, x, y, seed: int, octaves: int, dtype) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    val = np.zeros(x.shape, dtype=dtype)
+    amp = 1.0
+    freq = 1.0
+    norm = 0.0
+    for _ in range(max(1, int(octaves))):
+        val += amp * noise(x * freq, y * freq, seed, dtype)
+        norm += amp
+        amp *= 0.5
+        freq *= 2.0
+    return val / (norm if norm > 1e-9 else 1.0)
+
+
+def fbm(x: np.ndarray, y: np.ndarray, seed: int, octaves: int = 5, dtype=np.float64) -> np.ndarray:
+    """fractal brownian motion (value noise) ~[-1,1]."""
+    return _fbm_generic(val_noise_2d, x, y, seed, octaves, dtype)
+
+
+def fbm_perlin(x: np.ndarray, y: np.ndarray, seed: int, octaves: int = 5, dtype=np.float64) -> np.ndarray:
+    """fractal brownian motion Perlin ~[-1,1]."""
+    return _fbm_generic(perlin_noise_2d, x, y, seed, octaves, dtype)
@@ -0,0 +1,340 @@
+# planet_overview.py
+# Carte d'ensemble de la planète (biome + niveau), basse résolution, sans générer de chunk.
+#
+# Principe :
+# - Raster de ceil(H / s) x ceil(W / s) pixels, s = tiles_per_pixel (16 par défaut) :
+#   le pixel (px, py) représente la tuile (px * s + s // 2, py * s + s // 2).
+# - Un thread le calcule directement depuis le bruit (world_gen_numpy.sample_overview), par
+#   passes de pas décroissant (8, 4, 2, 1 pixels) : une image grossière complète existe dès
+#   la première passe, puis s'affine. Chaque passe ne calcule que les pixels pas encore
+#   échantillonnés, par bandes de lignes (le verrou n'est tenu que pour l'écriture).
+# - Qualité par pixel : 0 inconnu, 1 estimé (bloc d'une passe grossière), 2 bruit,
+#   3 exact (lu dans un chunk généré). Le thread n'écrase jamais une qualité supérieure.
+# - Chunks générés / modifiés : le monde prévient l'aperçu (add_chunk_listener) ; poll(),
+#   sur le thread principal, relit leurs pixels dans le cache de chunks sans rien générer.
+#   Le sol procédural y devient "exact" ; les biomes modifiés par le joueur sont gardés à part
+#   (masque + biome) et n'entrent pas dans le cache disque, partagé par toutes les parties
+#   de la même seed.
+# - Cache disque par seed finale (npz compressé, écriture atomique) : raster + qualités,
+#   écrit à la fin du calcul puis à la fermeture si des chunks exacts ont été fusionnés.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from Game.world.world_gen import CHUNK_GENERATOR_VERSION, OV_BIOME
+from Game.world.world_gen_numpy import sample_overview
+
+OVERVIEW_CACHE_DIR = os.path.join("Game", "save", "overview_cache")
+_FORMAT_VERSION = 1
+
+Q_UNKNOWN = 0
+Q_ESTIMATED = 1
+Q_NOISE = 2
+Q_EXACT = 3
+
+_PASSES = (8, 4, 2, 1)
+
+
+class PlanetOverview:
+    """
+    Aperçu de planète progressif :
+      - start() : charge le cache disque puis lance le calcul en arrière-plan si besoin.
+      - poll() : fusionne les chunks générés / modifiés (thread principal).
+      - sample(xs, ys) / biome_level() : lecture (biomes du joueur appliqués).
+      - close() : arrête le thread et écrit le cache disque.
+    """
+
+    def __init__(
+        self,
+        world,
+        tiles_per_pixel: int = 16,
+        directory: str = OVERVIEW_CACHE_DIR,
+        disk_cache: Optional[bool] = None,
+        band_pixels: int = 4096,
+    ):
+        self.world = world
+        self.scale = max(1, int(tiles_per_pixel))
+        self.directory = directory
+        if disk_cache is None:
+            disk_cache = bool(getattr(getattr(world, "params", None), "disk_cache", True))
+        self.disk_cache = bool(disk_cache)
+        self.band_pixels = max(64, int(band_pixels))
+
+        s = self.scale
+        self.width = (int(world.width) + s - 1) // s
+        self.height = (int(world.height) + s - 1) // s
+        shape = (self.height, self.width)
+        self.biome = np.zeros(shape, dtype=np.uint8)
+        self.level = np.zeros(shape, dtype=np.uint8)
+        self.quality = np.zeros(shape, dtype=np.uint8)
+        # Biomes modifiés par le joueur (jamais écrits dans le cache disque)
+        self._ovr_mask = np.zeros(shape, dtype=bool)
+        self._ovr_biome = np.zeros(shape, dtype=np.uint8)
+
+        # Tuile représentée par chaque colonne / ligne, et son chunk
+        cs = max(1, int(world.chunk_size))
+        self._tile_x = np.minimum(np.arange(self.width, dtype=np.int64) * s + s // 2, int(world.width) - 1)
+        self._tile_y = np.minimum(np.arange(self.height, dtype=np.int64) * s + s // 2, int(world.height) - 1)
+        self._col_chunk = self._tile_x // cs
+        self._row_chunk = self._tile_y // cs
+
+        self._lock = threading.Lock()
+        self._pending: set[tuple[int, int]] = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listening = False
+        self._dirty = False
+        self.complete = False
+
+        # Incrémenté à chaque écriture : les vues ne redessinent que si elle a changé.
+        self.revision = 0
+        self.noise_pixels = 0
+        self.merged_chunks = 0
+        self.loaded_from_disk = False
+
+    # ------------------- cycle de vie -------------------
+
+    def start(self) -> "PlanetOverview":
+        if not self._listening and hasattr(self.world, "add_chunk_listener"):
+            self.world.add_chunk_listener(self.note_chunk)
+            self._listening = True
+            self._note_resident_chunks()
+        if not self.complete and not self.loaded_from_disk:
+            self._load_cache()
+        if not self.complete and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._worker, name="planet-overview", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._listening:
+            remove = getattr(self.world, "remove_chunk_listener", None)
+            if callable(remove):
+                remove(self.note_chunk)
+            self._listening = False
+        if self._dirty:
+            self._save_cache()
+
+    def progress(self) -> float:
+        """Part des pixels calculés au moins depuis le bruit (0..1)."""
+        with self._lock:
+            return float(np.count_nonzero(self.quality >= Q_NOISE)) / max(1, self.quality.size)
+
+    # ------------------- calcul depuis le bruit -------------------
+
+    def _worker(self) -> None:
+        try:
+            for stride in _PASSES:
+                if not self._run_pass(stride):
+                    return
+            self.complete = True
+            self._save_cache()
+        except Exception as e:
+            print(f"[PlanetOverview] Calcul interrompu: {e}")
+
+    def _run_pass(self, stride: int) -> bool:
+        cols = np.arange(0, self.width, stride)
+        rows = np.arange(0, self.height, stride)
+        band = max(1, self.band_pixels // max(1, len(cols)))
+        xs = self._tile_x[cols][None, :]
+        for r0 in range(0, len(rows), band):
+            if self._stop.is_set():
+                return False
+            rr = rows[r0:r0 + band]
+            sel = np.ix_(rr, cols)
+            with self._lock:
+                todo = self.quality[sel] < Q_NOISE
+            if not todo.any():
+                continue
+            biome, level = sample_overview(self.world, xs, self._tile_y[rr][:, None])
+            with self._lock:
+                self._write_band(rr, cols, stride, biome, level)
+            # Laisse la main au thread principal entre deux bandes.
+            time.sleep(0)
+        return True
+
+    def _write_band(self, rows: np.ndarray, cols: np.ndarray, stride: int, biome: np.ndarray, level: np.ndarray) -> None:
+        sel = np.ix_(rows, cols)
+        write = self.quality[sel] < Q_NOISE
+        self.biome[sel] = np.where(write, biome, self.biome[sel])
+        self.level[sel] = np.where(write, level, self.level[sel])
+        self.quality[sel] = np.where(write, Q_NOISE, self.quality[sel])
+        self.noise_pixels += int(np.count_nonzero(write))
+        if stride > 1:
+            # Blocs stride x stride autour des échantillons : seulement les pixels encore inconnus.
+            y0 = int(rows[0])
+            y1 = min(self.height, int(rows[-1]) + stride)
+            block = (slice(y0, y1), slice(0, self.width))
+            h, w = y1 - y0, self.width
+            fill = self.quality[block] == Q_UNKNOWN
+            if fill.any():
+                up_b = np.repeat(np.repeat(biome, stride, axis=0), stride, axis=1)[:h, :w]
+                up_l = np.repeat(np.repeat(level, stride, axis=0), stride, axis=1)[:h, :w]
+                self.biome[block] = np.where(fill, up_b, self.biome[block])
+                self.level[block] = np.where(fill, up_l, self.level[block])
+                self.quality[block] = np.where(fill, Q_ESTIMATED, self.quality[block])
+        self.revision += 1
+
+    # ------------------- chunks exacts -------------------
+
+    def note_chunk(self, cx: int, cy: int) -> None:
+        """Écouteur du monde : chunk (re)chargé ou sol / biome modifié (tout thread)."""
+        with self._pending_lock:
+            self._pending.add((int(cx), int(cy)))
+
+    def _note_resident_chunks(self) -> None:
+        chunks = getattr(self.world, "_chunks", None)
+        if chunks:
+            with self._pending_lock:
+                self._pending.update(list(chunks.keys()))
+
+    def poll(self, max_chunks: int = 64) -> int:
+        """Fusionne jusqu'à max_chunks chunks notifiés ; renvoie le nombre fusionné."""
+        if not self._pending:
+            return 0
+        with self._pending_lock:
+            batch = [self._pending.pop() for _ in range(min(max_chunks, len(self._pending)))]
+        merged = 0
+        for cx, cy in batch:
+            if self._merge_chunk(cx, cy):
+                merged += 1
+        return merged
+
+    def _merge_chunk(self, cx: int, cy: int) -> bool:
+        world = self.world
+        ch = world._chunks.get((cx, cy))
+        if ch is None:
+            return False  # évincé entre-temps : le pixel garde sa valeur de bruit
+        cols = np.nonzero(self._col_chunk == cx)[0]
+        rows = np.nonzero(self._row_chunk == cy)[0]
+        if not len(cols) or not len(rows):
+            return False
+        cs = int(world.chunk_size)
+        src = np.ix_(self._tile_y[rows] - cy * cs, self._tile_x[cols] - cx * cs)
+        biome = np.frombuffer(ch.biome_u8, dtype=np.uint8).reshape(cs, cs)[src]
+        level = np.frombuffer(ch.levels_u8, dtype=np.uint8).reshape(cs, cs)[src]
+
+        ovr = world._chunk_overrides.get((cx, cy))
+        ovr_mask = None
+        if ovr is not None and ovr.count:
+            ovr_mask = (np.frombuffer(ovr.mask, dtype=np.uint8).reshape(cs, cs)[src] & OV_BIOME) != 0
+            ovr_biome = np.frombuffer(ovr.biome, dtype=np.uint8).reshape(cs, cs)[src]
+
+        sel = np.ix_(rows, cols)
+        with self._lock:
+            self.biome[sel] = biome
+            self.level[sel] = level
+            self.quality[sel] = Q_EXACT
+            if ovr_mask is None:
+                self._ovr_mask[sel] = False
+            else:
+                self._ovr_mask[sel] = ovr_mask
+                self._ovr_biome[sel] = ovr_biome
+            self.revision += 1
+            self._dirty = True
+        self.merged_chunks += 1
+        return True
+
+    # ------------------- lecture -------------------
+
+    def sample(self, xs, ys):
+        """(biome, niveau, qualité) [ligne, colonne] aux tuiles xs (colonnes) x ys (lignes)."""
+        s = self.scale
+        cols = np.clip((np.asarray(xs, dtype=np.int64) % int(self.world.width)) // s, 0, self.width - 1)
+        rows = np.clip(np.asarray(ys, dtype=np.int64) // s, 0, self.height - 1)
+        sel = np.ix_(rows, cols)
+        with self._lock:
+            biome = np.where(self._ovr_mask[sel], self._ovr_biome[sel], self.biome[sel])
+            return biome, self.level[sel], self.quality[sel]
+
+    def biome_level(self):
+        """Copies (biome, niveau, qualité) du raster complet, biomes du joueur appliqués."""
+        with self._lock:
+            biome = np.where(self._ovr_mask, self._ovr_biome, self.biome)
+            return biome, self.level.copy(), self.quality.copy()
+
+    # ------------------- cache disque -------------------
+
+    def _cache_path(self) -> str:
+        w = self.world
+        name = (
+            f"{int(w.seed) & 0xFFFF_FFFF_FFFF_FFFF:016x}_{int(w.width)}x{int(w.height)}"
+            f"_l{int(w.tiles_levels)}_s{self.scale}.npz"
+        )
+        return os.path.join(self.directory, name)
+
+    def _meta(self) -> np.ndarray:
+        return np.array(
+            [_FORMAT_VERSION, CHUNK_GENERATOR_VERSION, self.width, self.height, self.scale], dtype=np.int64
+        )
+
+    def _load_cache(self) -> bool:
+        if not self.disk_cache:
+            return False
+        path = self._cache_path()
+        if not os.path.isfile(path):
+            return False
+        try:
+            with np.load(path) as data:
+                if not np.array_equal(data["meta"], self._meta()):
+                    return False
+                biome, level, quality = data["biome"], data["level"], data["quality"]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[PlanetOverview] Cache illisible ({path}): {e}")
+            return False
+        if biome.shape != self.biome.shape:
+            return False
+        with self._lock:
+            # Les chunks déjà fusionnés restent prioritaires.
+            keep = self.quality >= quality
+            self.biome[:] = np.where(keep, self.biome, biome)
+            self.level[:] = np.where(keep, self.level, level)
+            self.quality[:] = np.maximum(self.quality, quality)
+            self.complete = bool((self.quality >= Q_NOISE).all())
+            self.revision += 1
+        self.loaded_from_disk = True
+        return True
+
+    def _save_cache(self) -> None:
+        if not self.disk_cache:
+            return
+        with self._lock:
+            biome, level, quality = self.biome.copy(), self.level.copy(), self.quality.copy()
+            self._dirty = False
+        path = self._cache_path()
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, meta=self._meta(), biome=biome, level=level, quality=quality)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[PlanetOverview] Cache non écrit ({path}): {e}")
+
+    # ------------------- stats -------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = np.bincount(self.quality.ravel(), minlength=Q_EXACT + 1)
+        return {
+            "pixels": int(self.quality.size),
+            "estimated": int(counts[Q_ESTIMATED]),
+            "noise": int(counts[Q_NOISE]),
+            "exact": int(counts[Q_EXACT]),
+            "complete": self.complete,
+            "merged_chunks": self.merged_chunks,
+            "pending_chunks": len(self._pending),
+            "from_disk": self.loaded_from_disk,
+        }
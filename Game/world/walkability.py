@@ -0,0 +1,207 @@
+# walkability.py
+# Cartes de praticabilité par chunk pour le pathfinding.
+#
+# Principe :
+# - Une couche = 1 octet par tuile du chunk (bytes immuables, indexation directe depuis
+#   Python) : 0 = bloqué (overlay), 1 = eau (praticable seulement pour les marcheurs sur
+#   l'eau), 2 = terre. Une case est praticable si couche[k] >= seuil (1 ou 2).
+# - Construite en NumPy à partir du chunk généré et de ses overrides (mêmes règles que
+#   ChunkedWorld.get_tile_snapshot), les overlays ne sont évalués qu'une fois par valeur
+#   distincte du chunk.
+# - Invalidée seulement quand la révision d'overrides ou la révision de sol du chunk change
+#   (construction, récolte, sol / biome modifié, chunk rechargé).
+# - Tant que le compteur global de modifications du monde (_change_epoch) ne bouge pas, les
+#   couches déjà validées sont rendues sans relire les révisions du chunk.
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from Game.world.tiles import get_ground_sprite_name
+from Game.world.world_gen import OV_BIOME, OV_GROUND, OV_OVERLAY
+
+BLOCKED = 0
+WATER = 1
+LAND = 2
+
+_WATER_GROUND_TOKENS = ("water", "ocean", "sea", "lake", "river")
+
+
+def walk_threshold(water_walker: bool) -> int:
+    """Valeur minimale de couche praticable pour un marcheur (sur l'eau ou non)."""
+    return WATER if water_walker else LAND
+
+
+class WalkabilityCache:
+    def __init__(
+        self,
+        world,
+        water_biome_ids: Iterable[int],
+        passable_overlay: Callable[[object], bool],
+        max_chunks: int = 1024,
+    ):
+        self.world = world
+        self.chunk_size = int(world.chunk_size)
+        self.width = int(world.width)
+        self.height = int(world.height)
+        self.passable_overlay = passable_overlay
+        self.max_chunks = max(1, int(max_chunks))
+
+        self._water_biome = np.zeros(256, dtype=np.bool_)
+        for bid in water_biome_ids:
+            if 0 <= int(bid) < 256:
+                self._water_biome[int(bid)] = True
+        # gid -> sol "aquatique" d'après le nom de sprite (anciens IDs / tuiles)
+        self._water_ground: dict[int, bool] = {}
+        # (cx, cy) -> (révision overrides, révision sol, couche)
+        self._layers: "OrderedDict[tuple[int, int], tuple[int, int, bytes]]" = OrderedDict()
+        # Couches validées depuis la dernière modification du monde (époque _epoch)
+        self._fresh: dict[tuple[int, int], bytes] = {}
+        self._epoch = -1
+
+        self.builds = 0
+
+    # ------------------- couches -------------------
+
+    def layer(self, cx: int, cy: int, generate: bool = False) -> Optional[bytes]:
+        """
+        Couche du chunk (cx, cy), reconstruite si ses révisions ont changé.
+        None si le chunk n'est pas disponible sans génération (generate=False).
+        """
+        w = self.world
+        key = (cx, cy)
+        if w._change_epoch != self._epoch:
+            self._fresh.clear()
+            self._epoch = w._change_epoch
+        else:
+            data = self._fresh.get(key)
+            if data is not None:
+                return data
+        rev = w.chunk_override_revision(cx, cy)
+        grev = w.chunk_ground_revision(cx, cy)
+        entry = self._layers.get(key)
+        if entry is not None and entry[0] == rev and entry[1] == grev:
+            self._layers.move_to_end(key)
+            self._fresh[key] = entry[2]
+            return entry[2]
+
+        cs = self.chunk_size
+        if generate:
+            ch, _, _ = w._get_chunk(cx * cs, cy * cs)
+        else:
+            ch = w._peek_chunk(cx, cy)
+            if ch is None:
+                return None
+        # Le chargement du chunk a pu faire avancer sa révision de sol.
+        data = self._build(ch)
+        self._layers[key] = (w.chunk_override_revision(cx, cy), w.chunk_ground_revision(cx, cy), data)
+        self._layers.move_to_end(key)
+        while len(self._layers) > self.max_chunks:
+            self._fresh.pop(self._layers.popitem(last=False)[0], None)
+        if w._change_epoch != self._epoch:
+            # Chargement / lissage des jonctions : d'autres révisions ont pu changer.
+            self._fresh.clear()
+            self._epoch = w._change_epoch
+        self._fresh[key] = data
+        return data
+
+    def get(self, i: int, j: int, generate: bool = False) -> int:
+        """Valeur de couche de la tuile (i, j), BLOCKED hors carte ou chunk indisponible."""
+        if i < 0 or j < 0 or i >= self.width or j >= self.height:
+            return BLOCKED
+        cs = self.chunk_size
+        cx = i // cs
+        cy = j // cs
+        data = self.layer(cx, cy, generate)
+        if data is None:
+            return BLOCKED
+        return data[(j - cy * cs) * cs + (i - cx * cs)]
+
+    def is_walkable(self, i: int, j: int, water_walker: bool = False, generate: bool = False) -> bool:
+        return self.get(i, j, generate) >= (WATER if water_walker else LAND)
+
+    def probe(self, water_walker: bool = False, generate: bool = False) -> Callable[[int, int], bool]:
+        """
+        Test (i, j) -> praticable pour une recherche (A*, ligne de vue...) : les couches
+        déjà lues sont mémorisées sans revalidation, à ne pas garder au-delà de la recherche.
+        """
+        cs = self.chunk_size
+        width = self.width
+        height = self.height
+        need = WATER if water_walker else LAND
+        layer = self.layer
+        seen: dict[tuple[int, int], Optional[bytes]] = {}
+
+        def walkable(i: int, j: int) -> bool:
+            if i < 0 or j < 0 or i >= width or j >= height:
+                return False
+            cx = i // cs
+            cy = j // cs
+            key = (cx, cy)
+            data = seen.get(key, False)
+            if data is False:
+                data = seen[key] = layer(cx, cy, generate)
+            return data is not None and data[(j - cy * cs) * cs + (i - cx * cs)] >= need
+
+        return walkable
+
+    def invalidate(self, cx: Optional[int] = None, cy: Optional[int] = None) -> None:
+        if cx is None or cy is None:
+            self._layers.clear()
+            self._fresh.clear()
+        else:
+            self._layers.pop((int(cx), int(cy)), None)
+            self._fresh.pop((int(cx), int(cy)), None)
+
+    # ------------------- construction -------------------
+
+    def _is_water_ground(self, gid: int) -> bool:
+        flag = self._water_ground.get(gid)
+        if flag is None:
+            try:
+                name = get_ground_sprite_name(gid)
+            except Exception:
+                name = None
+            low = name.lower() if name else ""
+            flag = self._water_ground[gid] = any(token in low for token in _WATER_GROUND_TOKENS)
+        return flag
+
+    def _build(self, ch) -> bytes:
+        self.builds += 1
+        overlay = np.frombuffer(ch.overlay_obj, dtype=np.uint16)
+        ground = np.frombuffer(ch.ground_u16, dtype=np.uint16)
+        biome = np.frombuffer(ch.biome_u8, dtype=np.uint8)
+
+        ovr = ch.ovr
+        objs = None
+        if ovr is not None and ovr.count:
+            mask = np.frombuffer(ovr.mask, dtype=np.uint8)
+            overlay = np.where(mask & OV_OVERLAY, np.frombuffer(ovr.overlay_pid, dtype=np.uint16), overlay)
+            ground = np.where(mask & OV_GROUND, np.frombuffer(ovr.ground, dtype=np.uint16), ground)
+            biome = np.where(mask & OV_BIOME, np.frombuffer(ovr.biome, dtype=np.uint8), biome)
+            objs = ovr.overlay_objs
+
+        water = self._water_biome[biome]
+        for gid in np.unique(ground).tolist():
+            if self._is_water_ground(int(gid)):
+                water |= ground == gid
+        out = np.where(water, np.uint8(WATER), np.uint8(LAND))
+
+        blocked = overlay != 0
+        if blocked.any():
+            for pid in np.unique(overlay[blocked]).tolist():
+                if self.passable_overlay(int(pid)):
+                    blocked &= overlay != pid
+        if objs:
+            # Overlays non entiers (constructions en dict...) : évalués case par case.
+            passable = self.passable_overlay
+            for k, value in objs.items():
+                blocked[k] = bool(value) and not passable(value)
+        out[blocked] = BLOCKED
+        return out.tobytes()
+
+    def stats(self) -> dict:
+        return {"chunks": len(self._layers), "builds": self.builds}
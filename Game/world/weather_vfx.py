@@ -3,27 +3,72 @@ from __future__ import annotations
 import math
 import random
 
+import numpy as np
 import pygame
 
 
+class _ParticlePool:
+    """Particules d'un type en tableaux NumPy (position, vitesse, taille, phase, forme de sprite)."""
+
+    FIELDS = ("x", "y", "vx", "vy", "size", "phase", "shape")
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self) -> int:
+        return int(self.x.shape[0])
+
+    def clear(self) -> None:
+        for name in self.FIELDS:
+            setattr(self, name, np.empty(0, dtype=np.int64 if name == "shape" else np.float64))
+
+    def resize(self, count: int, spawn) -> None:
+        """Tronque ou complète à `count` particules ; spawn(n) -> dict des champs des nouvelles."""
+        count = max(0, int(count))
+        n = len(self)
+        if count < n:
+            for name in self.FIELDS:
+                setattr(self, name, getattr(self, name)[:count])
+        elif count > n:
+            fresh = spawn(count - n)
+            for name in self.FIELDS:
+                setattr(self, name, np.concatenate((getattr(self, name), fresh[name])))
+
+
 class WeatherVFXController:
     """Gère l'état et le rendu des effets visuels météo."""
 
+    # Voile de couleur par condition (la pluie forte / orage assombrissent, etc.)
+    TINTS = {
+        "heavy_rain": (16, 24, 36, 28),
+        "storm": (10, 14, 24, 44),
+        "blizzard": (210, 220, 235, 40),
+        "sandstorm": (165, 120, 65, 58),
+        "fog": (208, 220, 228, 74),
+        "heatwave": (255, 188, 118, 22),
+        "cloudy": (86, 96, 112, 18),
+    }
+
     def __init__(self):
-        self.particles: dict[str, list[dict]] = {
-            "rain": [],
-            "snow": [],
-            "sand": [],
+        self.particles: dict[str, _ParticlePool] = {
+            "rain": _ParticlePool(),
+            "snow": _ParticlePool(),
+            "sand": _ParticlePool(),
         }
         self.time = 0.0
         self.flash_timer = 0.0
         self.flash_alpha = 0
         self.last_condition_id: str | None = None
+        self._rng = np.random.default_rng()
+
+        # Rendu : sprites pré-dessinés (traînées, flocons) et surfaces persistantes
+        self._sprites: dict[tuple, tuple[pygame.Surface, int, int]] = {}
+        self._solids: dict[tuple[int, int, int], pygame.Surface] = {}
+        self._overlay: pygame.Surface | None = None
 
     def reset(self):
-        self.particles["rain"].clear()
-        self.particles["snow"].clear()
-        self.particles["sand"].clear()
+        for pool in self.particles.values():
+            pool.clear()
         self.time = 0.0
         self.flash_timer = 0.0
         self.flash_alpha = 0
@@ -33,12 +78,49 @@ class WeatherVFXController:
         if condition_id == self.last_condition_id:
             return
         self.last_condition_id = condition_id
-        self.particles["rain"].clear()
-        self.particles["snow"].clear()
-        self.particles["sand"].clear()
+        for pool in self.particles.values():
+            pool.clear()
         self.flash_timer = 0.0
         self.flash_alpha = 0
 
+    # ------------------- apparition -------------------
+
+    def _spawn_rain(self, n: int, w: int, h: int) -> dict:
+        rng = self._rng
+        vx = rng.uniform(-140.0, -40.0, n)
+        vy = rng.uniform(620.0, 980.0, n)
+        length = rng.uniform(8.0, 20.0, n)
+        width = rng.choice((1, 1, 1, 2), n)
+        # Forme = (longueur, décalage x de la traînée, épaisseur), figée pour la vie de la goutte
+        slant = np.rint(-(vx / vy) * length).astype(np.int64)
+        shape = length.astype(np.int64) * 100 + slant * 10 + width
+        return {
+            "x": rng.uniform(-w * 0.2, w * 1.2, n), "y": rng.uniform(-h, 0, n),
+            "vx": vx, "vy": vy, "size": length, "phase": np.zeros(n), "shape": shape,
+        }
+
+    def _spawn_snow(self, n: int, w: int, h: int) -> dict:
+        rng = self._rng
+        radius = rng.uniform(1.5, 3.8, n)
+        return {
+            "x": rng.uniform(0, w, n), "y": rng.uniform(-h, 0, n),
+            "vx": rng.uniform(-30.0, 30.0, n), "vy": rng.uniform(30.0, 80.0, n),
+            "size": radius, "phase": rng.uniform(0.0, math.tau, n),
+            "shape": np.maximum(1, radius.astype(np.int64)),
+        }
+
+    def _spawn_sand(self, n: int, w: int, h: int) -> dict:
+        rng = self._rng
+        length = rng.uniform(10.0, 18.0, n)
+        shape = length.astype(np.int64) * 10 + (length * 0.06).astype(np.int64)
+        return {
+            "x": rng.uniform(-w, 0, n), "y": rng.uniform(0, h, n),
+            "vx": rng.uniform(260.0, 440.0, n), "vy": rng.uniform(-20.0, 20.0, n),
+            "size": length, "phase": np.zeros(n), "shape": shape,
+        }
+
+    # ------------------- mise à jour -------------------
+
     def update(self, dt: float, weather_system, screen_size: tuple[int, int]):
         if not weather_system:
             return
@@ -68,73 +150,46 @@ class WeatherVFXController:
         elif condition_id == "sandstorm":
             sand_target = int(220 * area_scale)
 
-        rain_particles = self.particles["rain"]
-        while len(rain_particles) < rain_target:
-            rain_particles.append(
-                {
-                    "x": random.uniform(-w * 0.2, w * 1.2),
-                    "y": random.uniform(-h, 0),
-                    "vx": random.uniform(-140.0, -40.0),
-                    "vy": random.uniform(620.0, 980.0),
-                    "length": random.uniform(8.0, 20.0),
-                    "width": random.choice((1, 1, 1, 2)),
-                }
-            )
-        del rain_particles[rain_target:]
-
-        for p in rain_particles:
-            p["x"] += p["vx"] * dt
-            p["y"] += p["vy"] * dt
-            if p["y"] > h + 24 or p["x"] < -w * 0.3:
-                p["x"] = random.uniform(-w * 0.2, w * 1.2)
-                p["y"] = random.uniform(-h * 0.35, -8.0)
-
-        snow_particles = self.particles["snow"]
-        while len(snow_particles) < snow_target:
-            snow_particles.append(
-                {
-                    "x": random.uniform(0, w),
-                    "y": random.uniform(-h, 0),
-                    "vx": random.uniform(-30.0, 30.0),
-                    "vy": random.uniform(30.0, 80.0),
-                    "radius": random.uniform(1.5, 3.8),
-                    "phase": random.uniform(0.0, math.tau),
-                }
-            )
-        del snow_particles[snow_target:]
-
-        for p in snow_particles:
-            p["x"] += (p["vx"] + math.sin(self.time * 1.6 + p["phase"]) * 18.0) * dt
-            p["y"] += p["vy"] * dt
-            if p["y"] > h + 8:
-                p["y"] = random.uniform(-h * 0.3, -6.0)
-                p["x"] = random.uniform(0, w)
-            elif p["x"] < -12:
-                p["x"] = w + 12
-            elif p["x"] > w + 12:
-                p["x"] = -12
-
-        sand_particles = self.particles["sand"]
-        while len(sand_particles) < sand_target:
-            sand_particles.append(
-                {
-                    "x": random.uniform(-w, 0),
-                    "y": random.uniform(0, h),
-                    "vx": random.uniform(260.0, 440.0),
-                    "vy": random.uniform(-20.0, 20.0),
-                    "length": random.uniform(10.0, 18.0),
-                }
-            )
-        del sand_particles[sand_target:]
-
-        for p in sand_particles:
-            p["x"] += p["vx"] * dt
-            p["y"] += p["vy"] * dt
-            if p["x"] > w + 20:
-                p["x"] = random.uniform(-w * 0.35, -8.0)
-                p["y"] = random.uniform(0, h)
-            elif p["y"] < -8 or p["y"] > h + 8:
-                p["y"] = random.uniform(0, h)
+        rng = self._rng
+
+        rain = self.particles["rain"]
+        rain.resize(rain_target, lambda n: self._spawn_rain(n, w, h))
+        if len(rain):
+            rain.x += rain.vx * dt
+            rain.y += rain.vy * dt
+            out = (rain.y > h + 24) | (rain.x < -w * 0.3)
+            k = int(out.sum())
+            if k:
+                rain.x[out] = rng.uniform(-w * 0.2, w * 1.2, k)
+                rain.y[out] = rng.uniform(-h * 0.35, -8.0, k)
+
+        snow = self.particles["snow"]
+        snow.resize(snow_target, lambda n: self._spawn_snow(n, w, h))
+        if len(snow):
+            snow.x += (snow.vx + np.sin(self.time * 1.6 + snow.phase) * 18.0) * dt
+            snow.y += snow.vy * dt
+            fallen = snow.y > h + 8
+            k = int(fallen.sum())
+            if k:
+                snow.y[fallen] = rng.uniform(-h * 0.3, -6.0, k)
+                snow.x[fallen] = rng.uniform(0, w, k)
+            snow.x[~fallen & (snow.x < -12)] = w + 12
+            snow.x[~fallen & (snow.x > w + 12)] = -12
+
+        sand = self.particles["sand"]
+        sand.resize(sand_target, lambda n: self._spawn_sand(n, w, h))
+        if len(sand):
+            sand.x += sand.vx * dt
+            sand.y += sand.vy * dt
+            gone = sand.x > w + 20
+            k = int(gone.sum())
+            if k:
+                sand.x[gone] = rng.uniform(-w * 0.35, -8.0, k)
+                sand.y[gone] = rng.uniform(0, h, k)
+            drift = ~gone & ((sand.y < -8) | (sand.y > h + 8))
+            k = int(drift.sum())
+            if k:
+                sand.y[drift] = rng.uniform(0, h, k)
 
         if condition_id == "storm":
             if self.flash_timer > 0.0:
@@ -147,6 +202,83 @@ class WeatherVFXController:
             self.flash_timer = 0.0
             self.flash_alpha = 0
 
+    # ------------------- rendu -------------------
+
+    def _sprite(self, kind: str, shape: int, alpha: int) -> tuple[pygame.Surface, int, int]:
+        """(sprite, décalage x, décalage y) d'une forme de particule, dessiné une seule fois."""
+        key = (kind, shape, alpha)
+        cached = self._sprites.get(key)
+        if cached is not None:
+            return cached
+        if kind == "rain":
+            length, slant, width = shape // 100, (shape // 10) % 10, shape % 10
+            pad = width
+            surf = pygame.Surface((slant + 1 + 2 * pad, length + 1 + 2 * pad), pygame.SRCALPHA)
+            pygame.draw.line(surf, (160, 185, 220, alpha), (pad + slant, pad), (pad, pad + length), width)
+            cached = (surf, -(slant + pad), -pad)
+        elif kind == "snow":
+            r = shape
+            surf = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (245, 248, 255, alpha), (r, r), r)
+            cached = (surf, -r, -r)
+        else:
+            length, rise = shape // 10, shape % 10
+            surf = pygame.Surface((length + 3, rise + 3), pygame.SRCALPHA)
+            pygame.draw.line(surf, (225, 185, 120, alpha), (1, 1), (1 + length, 1 + rise), 2)
+            cached = (surf, -1, -1)
+        self._sprites[key] = cached
+        return cached
+
+    def _blit_particles(self, screen: pygame.Surface, kind: str, alpha: int) -> None:
+        pool = self.particles[kind]
+        if not len(pool):
+            return
+        shapes, inverse = np.unique(pool.shape, return_inverse=True)
+        sprites = [self._sprite(kind, int(s), alpha) for s in shapes.tolist()]
+        ox = np.array([s[1] for s in sprites], dtype=np.int64)[inverse]
+        oy = np.array([s[2] for s in sprites], dtype=np.int64)[inverse]
+        px = pool.x.astype(np.int64) + ox
+        py = pool.y.astype(np.int64) + oy
+        screen.blits(
+            [(sprites[k][0], (x, y)) for k, x, y in zip(inverse.tolist(), px.tolist(), py.tolist())],
+            doreturn=False,
+        )
+
+    def _solid(self, size: tuple[int, int], color: tuple[int, int, int]) -> pygame.Surface:
+        """Surface unie persistante, recréée seulement au redimensionnement."""
+        surf = self._solids.get(color)
+        if surf is None or surf.get_size() != size:
+            if surf is not None:
+                self._solids.clear()  # redimensionnement
+            surf = pygame.Surface(size)
+            if pygame.display.get_surface():
+                surf = surf.convert()
+            surf.fill(color)
+            self._solids[color] = surf
+        return surf
+
+    def _veil(self, screen: pygame.Surface, color: tuple[int, int, int, int]) -> None:
+        """
+        Voile uni (r, g, b, a) : dst * (1 - a) + couleur * a, en deux blits MULT / ADD
+        (chemins SIMD) au lieu d'un mélange alpha plein écran.
+        """
+        r, g, b, a = color
+        if a <= 0:
+            return
+        size = screen.get_size()
+        keep = 255 - a
+        screen.blit(self._solid(size, (keep, keep, keep)), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        add = (r * a // 255, g * a // 255, b * a // 255)
+        if add != (0, 0, 0):
+            screen.blit(self._solid(size, add), (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    def _shape_overlay(self, size: tuple[int, int], color: tuple[int, int, int, int]) -> pygame.Surface:
+        """Calque SRCALPHA persistant, rempli de `color` (remplacé, pas réalloué)."""
+        if self._overlay is None or self._overlay.get_size() != size:
+            self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self._overlay.fill(color)
+        return self._overlay
+
     def draw(self, screen: pygame.Surface, weather_system):
         if not weather_system:
             return
@@ -156,41 +288,11 @@ class WeatherVFXController:
             return
 
         w, h = screen.get_size()
-        fx = pygame.Surface((w, h), pygame.SRCALPHA)
-
-        if condition_id in ("rain", "heavy_rain", "storm"):
-            rain_color = (160, 185, 220, 150 if condition_id == "rain" else 180)
-            for p in self.particles["rain"]:
-                x0 = int(p["x"])
-                y0 = int(p["y"])
-                x1 = int(p["x"] + (p["vx"] / max(p["vy"], 1.0)) * p["length"])
-                y1 = int(p["y"] + p["length"])
-                pygame.draw.line(fx, rain_color, (x0, y0), (x1, y1), int(p["width"]))
-            if condition_id in ("heavy_rain", "storm"):
-                fx.fill((16, 24, 36, 28), special_flags=pygame.BLEND_RGBA_ADD)
-
-        if condition_id in ("snow", "blizzard"):
-            for p in self.particles["snow"]:
-                pygame.draw.circle(
-                    fx,
-                    (245, 248, 255, 190 if condition_id == "blizzard" else 160),
-                    (int(p["x"]), int(p["y"])),
-                    max(1, int(p["radius"])),
-                )
-            if condition_id == "blizzard":
-                fx.fill((210, 220, 235, 40))
-
-        if condition_id == "sandstorm":
-            fx.fill((165, 120, 65, 58))
-            for p in self.particles["sand"]:
-                x0 = int(p["x"])
-                y0 = int(p["y"])
-                x1 = int(p["x"] + p["length"])
-                y1 = int(p["y"] + p["length"] * 0.06)
-                pygame.draw.line(fx, (225, 185, 120, 140), (x0, y0), (x1, y1), 2)
+        size = (w, h)
+        tint = self.TINTS.get(condition_id)
 
         if condition_id == "fog":
-            fx.fill((208, 220, 228, 74))
+            fx = self._shape_overlay(size, tint)
             for i in range(4):
                 y = int((i + 0.2) * (h / 4) + math.sin(self.time * 0.35 + i * 0.9) * 24)
                 band_h = int(h * 0.22)
@@ -199,22 +301,26 @@ class WeatherVFXController:
                     (228, 236, 242, 36),
                     (-int(w * 0.12), y, int(w * 1.25), band_h),
                 )
-
-        if condition_id == "heatwave":
-            fx.fill((255, 188, 118, 22))
+            screen.blit(fx, (0, 0))
+        elif condition_id == "heatwave":
+            fx = self._shape_overlay(size, tint)
             for y in range(0, h, 7):
                 shift = int(math.sin(self.time * 4.0 + y * 0.028) * 4)
                 pygame.draw.line(fx, (255, 218, 165, 18), (0 + shift, y), (w + shift, y), 1)
+            screen.blit(fx, (0, 0))
+        elif tint is not None:
+            # Voile d'abord, particules par-dessus
+            self._veil(screen, tint)
 
-        if condition_id == "cloudy":
-            fx.fill((86, 96, 112, 18))
-
-        if condition_id == "storm":
-            fx.fill((10, 14, 24, 44))
-
-        screen.blit(fx, (0, 0))
+        if condition_id in ("rain", "heavy_rain", "storm"):
+            self._blit_particles(screen, "rain", 150 if condition_id == "rain" else 180)
+        elif condition_id in ("snow", "blizzard"):
+            self._blit_particles(screen, "snow", 190 if condition_id == "blizzard" else 160)
+        elif condition_id == "sandstorm":
+            self._blit_particles(screen, "sand", 140)
 
         if self.flash_alpha > 0:
-            flash = pygame.Surface((w, h), pygame.SRCALPHA)
-            flash.fill((236, 244, 255, self.flash_alpha))
+            # Alpha variable à chaque frame : une surface unie persistante, alpha de surface
+            flash = self._solid(size, (236, 244, 255))
+            flash.set_alpha(self.flash_alpha)
             screen.blit(flash, (0, 0))
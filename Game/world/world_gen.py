@@ -25,11 +25,15 @@ import json
 import math
 import os
 import random
+import time
 from array import array
 from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from typing import Any, Callable, Dict, Optional, Tuple
 
+import numpy as np
+
+from Game.world.chunk_store import open_chunk_store
 from Game.world.tiles import get_tile_id
 
 ProgressCb = Optional[Callable[[float, str], None]]
@@ -148,6 +152,17 @@ _GRAVITY_LABEL_TO_CANON = {
     "haute": "Forte",
 }
 
+# Backends de génération de chunk (même sortie, vitesse différente)
+_CHUNK_BACKENDS = {
+    "numpy": "numpy",
+    "np": "numpy",
+    "python": "python",
+    "py": "python",
+}
+
+# À incrémenter dès que la sortie de _generate_chunk change : invalide les caches disque.
+CHUNK_GENERATOR_VERSION = 1
+
 _TEMPERATURE_BIAS = {
     "Glaciaire": -0.35,
     "Froid": -0.20,
@@ -213,6 +228,17 @@ def _normalize_tectonic(raw: Any) -> str:
 def _normalize_gravity(raw: Any) -> str:
     return _GRAVITY_LABEL_TO_CANON.get(_norm_label(raw), "Moyenne")
 
+
+def _normalize_chunk_backend(raw: Any) -> str:
+    return _CHUNK_BACKENDS.get(_norm_label(raw), "numpy")
+
+
+def _parse_disk_cache_mb(raw: Any) -> int:
+    try:
+        return max(0, int(float(raw)))
+    except (TypeError, ValueError):
+        return 512
+
 # --------------------------------------------------------------------------------------
 # World parameters
 # --------------------------------------------------------------------------------------
@@ -231,6 +257,15 @@ class WorldParams:
     world_name: str = "Nouveau Monde"
 
     chunk_noise_step: int = 16
+    # "numpy" (vectorisé) ou "python" (référence) : n'influence pas le contenu généré
+    chunk_backend: str = "numpy"
+    # Cache disque des chunks générés (Game/save/chunk_cache) : n'influence pas le contenu
+    disk_cache: bool = True
+    # Taille totale maximale des fichiers du cache disque (Mo), les moins récents supprimés
+    disk_cache_mb: int = 512
+    # Lissage des niveaux aux jonctions avec les chunks déjà en mémoire (cosmétique :
+    # le résultat dépend de l'ordre de chargement, le cache disque garde la version brute)
+    smooth_chunk_seams: bool = False
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "WorldParams":
@@ -258,6 +293,10 @@ class WorldParams:
             gravity=_normalize_gravity(raw_gravity),
             world_name=str(d.get("world_name", "Nouveau Monde")),
             chunk_noise_step=noise_step,
+            chunk_backend=_normalize_chunk_backend(d.get("chunk_backend", "numpy")),
+            disk_cache=bool(d.get("disk_cache", True)),
+            disk_cache_mb=_parse_disk_cache_mb(d.get("disk_cache_mb", 512)),
+            smooth_chunk_seams=bool(d.get("smooth_chunk_seams", False)),
         )
 
 
@@ -363,6 +402,66 @@ def _clamp_lat_y(y: int, height: int) -> int:
     return y
 
 
+def _noise_axis(length: int, noise_step: int):
+    """
+    Points d'échantillonnage d'un axe de chunk (0..length, bord inclus) et LUT
+    d'interpolation : pour chaque coordonnée locale, index de l'échantillon
+    de gauche et fraction vers le suivant.
+    """
+    samples = list(range(0, length + 1, noise_step))
+    if samples[-1] != length:
+        samples.append(length)
+    n = len(samples)
+
+    idx0 = [0] * length
+    frac = [0.0] * length
+    si = 0
+    for lc in range(length):
+        while si + 1 < n - 1 and samples[si + 1] <= lc:
+            si += 1
+        idx0[lc] = si
+        denom = samples[si + 1] - samples[si]
+        frac[lc] = 0.0 if denom <= 0 else (lc - samples[si]) / denom
+    return samples, idx0, frac
+
+
+def _relax_rows(o: "np.ndarray", missing: "Optional[np.ndarray]" = None) -> "np.ndarray":
+    """
+    Un balayage gauche -> droite de la relaxation "écart max de 1 entre voisins", sur
+    chaque ligne, identique à la boucle séquentielle historique :
+      - à l'étape x, si L[x] > L[x+1] + 1 : L[x] = L[x+1] + 1 (pas de retour en arrière),
+      - si L[x+1] > L[x] + 1 : L[x+1] = L[x] + 1 (se propage vers la droite).
+    => f[x] = min_{k<=x}(o[k] + x - k) (min préfixe), puis g[x] = min(f[x], o[x+1] + 1).
+
+    missing (optionnel) : cases absentes, qui coupent la ligne en segments indépendants
+    (le min préfixe ne les traverse pas) et restent à 255 en sortie.
+    """
+    idx = np.arange(o.shape[1], dtype=o.dtype)
+    if missing is None:
+        f = np.minimum.accumulate(o - idx, axis=1) + idx
+    else:
+        # Min préfixe par segment : chaque case absente franchie pénalise les k situés
+        # avant elle d'une constante qui dépasse tout écart de niveaux.
+        seg = np.cumsum(missing, axis=1, dtype=np.int32)
+        penalty = (seg[:, -1:] - seg) * np.int32(1024)
+        acc = np.minimum.accumulate(o.astype(np.int32) - idx + penalty, axis=1)
+        f = (acc - penalty + idx).astype(o.dtype)
+    f[:, :-1] = np.minimum(f[:, :-1], o[:, 1:] + 1)
+    if missing is not None:
+        f[missing] = 255
+    return f
+
+
+def _smooth_levels_pass(lv: "np.ndarray", missing: "Optional[np.ndarray]" = None) -> "np.ndarray":
+    """
+    Une itération complète : voisins horizontaux puis verticaux (grille int16).
+    Les cases `missing` ne transmettent aucune contrainte, dans chaque balayage.
+    """
+    if missing is None:
+        return _relax_rows(_relax_rows(lv).T).T
+    return _relax_rows(_relax_rows(lv, missing).T, missing.T).T
+
+
 # --------------------------------------------------------------------------------------
 # Simple value noise / fbm (deterministic)
 # --------------------------------------------------------------------------------------
@@ -553,6 +652,18 @@ _GID_CORRUPT = _safe_ground_gid("corrupt")
 _BIOME_TO_GROUND_GID = {bid: _safe_ground_gid(name) for bid, name in _BIOME_TO_GROUND_NAME.items()}
 
 
+_NUMPY_CHUNK_GENERATOR: Any = None
+
+
+def _numpy_chunk_generator():
+    """Import paresseux du backend NumPy (world_gen_numpy importe ce module)."""
+    global _NUMPY_CHUNK_GENERATOR
+    if _NUMPY_CHUNK_GENERATOR is None:
+        from Game.world.world_gen_numpy import generate_chunk_numpy
+        _NUMPY_CHUNK_GENERATOR = generate_chunk_numpy
+    return _NUMPY_CHUNK_GENERATOR
+
+
 # --------------------------------------------------------------------------------------
 # Grid proxies (compat world.xxx[y][x])
 # --------------------------------------------------------------------------------------
@@ -600,6 +711,7 @@ class _Chunk:
         "cx", "cy", "cs",
         "height_u8", "temp_u8", "moist_u8",
         "levels_u8", "ground_u16", "overlay_obj", "biome_u8",
+        "ovr",
     )
 
     def __init__(self, cx: int, cy: int, chunk_size: int):
@@ -615,16 +727,155 @@ class _Chunk:
         # overlay peut contenir int prop_id (base) mais aussi 0
         self.overlay_obj = array("H", [0]) * n
         self.biome_u8 = array("B", [0]) * n
+        # Modifications du joueur (_ChunkOverrides), rattachées par le ChunkedWorld
+        self.ovr = None
 
     def idx(self, lx: int, ly: int) -> int:
         return int(ly) * self.cs + int(lx)
 
+    # Sérialisation compacte (process workers / cache disque) : champs bout à bout.
+    _FIELDS = ("height_u8", "temp_u8", "moist_u8", "levels_u8", "ground_u16", "overlay_obj", "biome_u8")
+
+    @staticmethod
+    def byte_size(chunk_size: int) -> int:
+        n = int(chunk_size) * int(chunk_size)
+        return n * 5 + n * 2 * 2  # 5 champs u8 + 2 champs u16
+
+    def to_bytes(self) -> bytes:
+        return b"".join(getattr(self, name).tobytes() for name in self._FIELDS)
+
+    @classmethod
+    def from_bytes(cls, cx: int, cy: int, chunk_size: int, buf) -> "_Chunk":
+        ch = cls.__new__(cls)
+        ch.cx = int(cx)
+        ch.cy = int(cy)
+        ch.cs = int(chunk_size)
+        ch.ovr = None
+        n = ch.cs * ch.cs
+        mv = memoryview(buf)
+        off = 0
+        for name in cls._FIELDS:
+            arr = array("H" if name in ("ground_u16", "overlay_obj") else "B")
+            size = n * arr.itemsize
+            arr.frombytes(mv[off:off + size])
+            setattr(ch, name, arr)
+            off += size
+        return ch
+
+
+# Drapeaux du masque d'overrides (par tuile) ; OV_OBJECT n'apparaît que dans get_region
+# (overlay non entier : dict de construction, None...)
+OV_OVERLAY = 1
+OV_GROUND = 2
+OV_BIOME = 4
+OV_OBJECT = 8
+
+# Champs disponibles pour get_region / sample_grid
+REGION_FIELDS = ("levels", "ground", "biome", "prop", "override", "loaded")
+_REGION_DTYPES = {
+    "levels": np.uint8,
+    "ground": np.uint16,
+    "biome": np.uint8,
+    "prop": np.uint16,
+    "override": np.uint8,
+    "loaded": np.bool_,
+}
+
+
+class _ChunkOverrides:
+    """
+    Modifications d'un chunk (constructions, récoltes, corruption...), stockage creux :
+      - mask : 1 octet par tuile (drapeaux _OV_*)
+      - ground / biome / overlay_pid : tableaux compacts, lus seulement si le drapeau est posé
+      - overlay_objs : dict local uniquement pour les overlays non entiers (dict, None...)
+      - rev : incrémenté à chaque modification (invalidation des caches de rendu)
+    Indépendant du cache de chunks : survit à l'éviction du chunk généré.
+    """
+    __slots__ = ("cs", "mask", "ground", "biome", "overlay_pid", "overlay_objs", "count", "rev")
+
+    def __init__(self, chunk_size: int):
+        self.cs = int(chunk_size)
+        n = self.cs * self.cs
+        self.mask = bytearray(n)
+        self.ground = array("H", [0]) * n
+        self.biome = array("B", [0]) * n
+        self.overlay_pid = array("H", [0]) * n
+        self.overlay_objs: Dict[int, Any] = {}
+        self.count = 0
+        self.rev = 0
+
+    def _flag(self, k: int, flag: int) -> None:
+        m = self.mask[k]
+        if not m:
+            self.count += 1
+        self.mask[k] = m | flag
+        self.rev += 1
+
+    def set_overlay(self, k: int, value: Any) -> None:
+        if type(value) is int and 0 <= value <= 0xFFFF:
+            self.overlay_pid[k] = value
+            self.overlay_objs.pop(k, None)
+        else:
+            self.overlay_objs[k] = value
+        self._flag(k, OV_OVERLAY)
+
+    def get_overlay(self, k: int, default: Any) -> Any:
+        if not (self.mask[k] & OV_OVERLAY):
+            return default
+        objs = self.overlay_objs
+        if objs and k in objs:
+            return objs[k]
+        return self.overlay_pid[k]
+
+    def set_ground(self, k: int, gid: int) -> None:
+        self.ground[k] = int(gid)
+        self._flag(k, OV_GROUND)
+
+    def set_biome(self, k: int, bid: int) -> None:
+        self.biome[k] = int(bid)
+        self._flag(k, OV_BIOME)
+
+    def items(self, flag: int):
+        """Itère (k, valeur) sur les tuiles portant le drapeau donné."""
+        mask = self.mask
+        for k in range(len(mask)):
+            if mask[k] & flag:
+                if flag == OV_OVERLAY:
+                    yield k, self.get_overlay(k, None)
+                elif flag == OV_GROUND:
+                    yield k, int(self.ground[k])
+                else:
+                    yield k, int(self.biome[k])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "overlay": [(k, v) for k, v in self.items(OV_OVERLAY)],
+            "ground": [(k, v) for k, v in self.items(OV_GROUND)],
+            "biome": [(k, v) for k, v in self.items(OV_BIOME)],
+        }
+
+    @classmethod
+    def from_dict(cls, chunk_size: int, blob: Dict[str, Any]) -> "_ChunkOverrides":
+        ovr = cls(chunk_size)
+        n = ovr.cs * ovr.cs
+        for k, v in blob.get("overlay", []) or []:
+            if 0 <= int(k) < n:
+                ovr.set_overlay(int(k), v)
+        for k, v in blob.get("ground", []) or []:
+            if 0 <= int(k) < n:
+                ovr.set_ground(int(k), int(v))
+        for k, v in blob.get("biome", []) or []:
+            if 0 <= int(k) < n:
+                ovr.set_biome(int(k), int(v))
+        return ovr
+
 
 class ChunkedWorld:
     """
     Monde énorme mais généré en chunks à la demande.
 
-    - Cache LRU des chunks (cache_chunks).
+    - Cache LRU des chunks borné en octets (cache_bytes, sinon cache_chunks * taille d'un chunk),
+      les chunks "épinglés" (autour des entités / de la caméra) ne sont jamais évincés.
     - overlay modifiable via overrides.
     """
     def __init__(
@@ -637,6 +888,8 @@ class ChunkedWorld:
         chunk_size: int = 64,
         cache_chunks: int = 2048,
         progress: ProgressCb = None,   # <-- nouveau
+        find_spawn: bool = True,
+        cache_bytes: Optional[int] = None,
     ):
 
         self.width = int(width)
@@ -652,14 +905,25 @@ class ChunkedWorld:
 
         self.sea_level = self._sea_level_from_params(params)
 
-        # LRU cache chunks
+        # LRU cache chunks (budget mémoire en octets)
         self._chunks: "OrderedDict[Tuple[int,int], _Chunk]" = OrderedDict()
+        self._chunk_bytes = _Chunk.byte_size(self.chunk_size)
+        self.cache_bytes = int(cache_bytes) if cache_bytes else self.cache_chunks * self._chunk_bytes
+        self._resident_bytes = 0
+        self._pinned_chunks: set[Tuple[int, int]] = set()
+        self._cache_stats = self._new_cache_stats()
 
-        # overlay overrides: ne stocke que les modifications
+        # overrides : ne stocke que les modifications, par chunk (survivent à l'éviction)
         self._NO = object()
-        self._overlay_overrides: Dict[Tuple[int, int], Any] = {}
-        self._ground_overrides: Dict[Tuple[int, int], int] = {}
-        self._biome_overrides: Dict[Tuple[int, int], int] = {}
+        self._chunk_overrides: Dict[Tuple[int, int], _ChunkOverrides] = {}
+        # Révision "sol" par chunk (niveaux / sol / biome) pour les caches de rendu
+        self._ground_revs: Dict[Tuple[int, int], int] = {}
+        self._ground_epoch = 0
+        # Compteur global : avance à chaque modification d'override ou de révision "sol"
+        # (tant qu'il ne bouge pas, aucune révision de chunk n'a changé)
+        self._change_epoch = 0
+        # Écouteurs (cx, cy) appelés à chaque changement de révision "sol" (jamais picklés)
+        self._chunk_listeners: list = []
 
         # Proxies pour compat (world.ground_id[y][x], etc.)
         self.heightmap = _GridProxy(self.width, self.height, self.get_height01)
@@ -673,14 +937,25 @@ class ChunkedWorld:
         self._progress = progress
         self._progress_phases_reported: set[str] = set()
 
-        # Spawn (déterminé rapidement)
-        self.spawn = self._find_spawn(progress=progress)
+        # Cache disque (ouvert à la demande, jamais picklé)
+        self._disk_store = None
+        self._disk_store_ready = False
+
+        # Spawn (déterminé rapidement) ; find_spawn=False pour un monde "générateur" seul (workers)
+        if find_spawn:
+            self.spawn = self._find_spawn(progress=progress)
+        else:
+            self.spawn = (self.width // 2, self.height // 2)
 
     def __getstate__(self):
         # Empêche de sérialiser un callback local (non picklable).
         state = dict(self.__dict__)
         state["_progress"] = None
         state["_progress_phases_reported"] = set()
+        state["_disk_store"] = None
+        state["_disk_store_ready"] = False
+        state["_pinned_chunks"] = set()
+        state["_chunk_listeners"] = []
         return state
 
     def __setstate__(self, state):
@@ -689,14 +964,40 @@ class ChunkedWorld:
             self._progress = None
         if "_progress_phases_reported" not in self.__dict__:
             self._progress_phases_reported = set()
+        self._disk_store = None
+        self._disk_store_ready = False
+        if "_chunk_bytes" not in self.__dict__:
+            # Ancienne sauvegarde : budget dérivé de cache_chunks.
+            self._chunk_bytes = _Chunk.byte_size(self.chunk_size)
+            self.cache_bytes = int(self.cache_chunks) * self._chunk_bytes
+        self._resident_bytes = len(self._chunks) * self._chunk_bytes
+        self._pinned_chunks = set()
+        self._chunk_listeners = []
+        self._cache_stats = self._new_cache_stats()
         if "_NO" not in self.__dict__:
             self._NO = object()
-        if "_overlay_overrides" not in self.__dict__:
-            self._overlay_overrides = {}
-        if "_ground_overrides" not in self.__dict__:
-            self._ground_overrides = {}
-        if "_biome_overrides" not in self.__dict__:
-            self._biome_overrides = {}
+        if "_ground_revs" not in self.__dict__:
+            self._ground_revs = {}
+            self._ground_epoch = 0
+        if "_change_epoch" not in self.__dict__:
+            self._change_epoch = 0
+        if "_chunk_overrides" not in self.__dict__:
+            # Ancienne sauvegarde : dicts globaux (x, y) -> valeur, convertis en overrides par chunk.
+            self._chunk_overrides = {}
+            old_overlay = self.__dict__.pop("_overlay_overrides", None) or {}
+            old_ground = self.__dict__.pop("_ground_overrides", None) or {}
+            old_biome = self.__dict__.pop("_biome_overrides", None) or {}
+            for (x, y), v in old_overlay.items():
+                ovr, k = self._ovr_at(int(x), int(y), create=True)
+                ovr.set_overlay(k, v)
+            for (x, y), v in old_ground.items():
+                ovr, k = self._ovr_at(int(x), int(y), create=True)
+                ovr.set_ground(k, int(v))
+            for (x, y), v in old_biome.items():
+                ovr, k = self._ovr_at(int(x), int(y), create=True)
+                ovr.set_biome(k, int(v))
+        for key, ch in self._chunks.items():
+            ch.ovr = self._chunk_overrides.get(key)
 
 
     # ------------------- tile ids safe -------------------
@@ -751,12 +1052,29 @@ class ChunkedWorld:
 
     # ------------------- overlay (writable) -------------------
 
+    def _ovr_at(self, x: int, y: int, create: bool = False):
+        """(overrides du chunk ou None, index local) pour une tuile déjà normalisée."""
+        cs = self.chunk_size
+        cx = x // cs
+        cy = y // cs
+        key = (cx, cy)
+        ovr = self._chunk_overrides.get(key)
+        if ovr is None and create:
+            ovr = _ChunkOverrides(cs)
+            self._chunk_overrides[key] = ovr
+            ch = self._chunks.get(key)
+            if ch is not None:
+                ch.ovr = ovr
+        return ovr, (y - cy * cs) * cs + (x - cx * cs)
+
     def get_overlay(self, x: int, y: int):
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        v = self._overlay_overrides.get((x, y), self._NO)
-        if v is not self._NO:
-            return v  # peut être None, int, dict...
+        ovr, k = self._ovr_at(x, y)
+        if ovr is not None:
+            v = ovr.get_overlay(k, self._NO)
+            if v is not self._NO:
+                return v  # peut être None, int, dict...
         ch, lx, ly = self._get_chunk(x, y)
         pid = int(ch.overlay_obj[ch.idx(lx, ly)])
         return None if pid == 0 else pid
@@ -764,21 +1082,113 @@ class ChunkedWorld:
     def set_overlay(self, x: int, y: int, value):
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        self._overlay_overrides[(x, y)] = value
+        ovr, k = self._ovr_at(x, y, create=True)
+        ovr.set_overlay(k, value)
+        self._change_epoch += 1
         return value
 
     def set_ground_id(self, x: int, y: int, gid: int) -> int:
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        self._ground_overrides[(x, y)] = int(gid)
+        ovr, k = self._ovr_at(x, y, create=True)
+        ovr.set_ground(k, int(gid))
+        self._bump_ground_revision(x // self.chunk_size, y // self.chunk_size)
         return int(gid)
 
     def set_biome_id(self, x: int, y: int, bid: int) -> int:
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        self._biome_overrides[(x, y)] = int(bid)
+        ovr, k = self._ovr_at(x, y, create=True)
+        ovr.set_biome(k, int(bid))
+        self._bump_ground_revision(x // self.chunk_size, y // self.chunk_size)
         return int(bid)
 
+    # ------------------- overrides par chunk -------------------
+
+    def chunk_override_revision(self, cx: int, cy: int) -> int:
+        """Compteur de modifications d'un chunk (0 = jamais modifié)."""
+        ovr = self._chunk_overrides.get((int(cx), int(cy)))
+        return 0 if ovr is None else ovr.rev
+
+    def chunk_ground_revision(self, cx: int, cy: int) -> int:
+        """
+        Révision du "sol" d'un chunk : change quand ses niveaux, sols ou biomes peuvent
+        avoir changé (override sol/biome, (re)chargement, lissage des jonctions).
+        Les changements d'overlay (props, constructions) ne la modifient pas.
+        """
+        return self._ground_revs.get((int(cx), int(cy)), 0)
+
+    def _bump_ground_revision(self, cx: int, cy: int) -> None:
+        self._ground_epoch += 1
+        self._change_epoch += 1
+        self._ground_revs[(int(cx), int(cy))] = self._ground_epoch
+        for listener in self._chunk_listeners:
+            listener(int(cx), int(cy))
+
+    def add_chunk_listener(self, listener) -> None:
+        """listener(cx, cy) : appelé quand un chunk est (re)chargé ou que son sol / biome change."""
+        if listener not in self._chunk_listeners:
+            self._chunk_listeners.append(listener)
+
+    def remove_chunk_listener(self, listener) -> None:
+        if listener in self._chunk_listeners:
+            self._chunk_listeners.remove(listener)
+
+    def export_chunk_overrides(self, cx: int, cy: int) -> Optional[Dict[str, Any]]:
+        """Modifications d'un chunk sous forme sérialisable (indices locaux), None si aucune."""
+        ovr = self._chunk_overrides.get((int(cx), int(cy)))
+        if ovr is None or ovr.count == 0:
+            return None
+        return ovr.to_dict()
+
+    def import_chunk_overrides(self, cx: int, cy: int, blob: Optional[Dict[str, Any]]) -> None:
+        """Remplace les modifications d'un chunk par celles de blob (cf. export_chunk_overrides)."""
+        key = (int(cx), int(cy))
+        if not blob:
+            self.drop_chunk_overrides(*key)
+            return
+        ovr = _ChunkOverrides.from_dict(self.chunk_size, blob)
+        old = self._chunk_overrides.get(key)
+        if old is not None:
+            ovr.rev = old.rev + 1
+        self._chunk_overrides[key] = ovr
+        self._bump_ground_revision(*key)
+        ch = self._chunks.get(key)
+        if ch is not None:
+            ch.ovr = ovr
+
+    def drop_chunk_overrides(self, cx: int, cy: int) -> bool:
+        """Oublie toutes les modifications d'un chunk (retour à la génération procédurale)."""
+        key = (int(cx), int(cy))
+        ovr = self._chunk_overrides.pop(key, None)
+        if ovr is not None:
+            self._bump_ground_revision(*key)
+        ch = self._chunks.get(key)
+        if ch is not None:
+            ch.ovr = None
+        return ovr is not None
+
+    def overridden_chunks(self) -> list[Tuple[int, int]]:
+        return [key for key, ovr in self._chunk_overrides.items() if ovr.count]
+
+    def count_biome_overrides(self, bid: int) -> int:
+        """Nombre de tuiles dont le biome a été forcé à bid (ex : corruption)."""
+        bid = int(bid)
+        total = 0
+        for ovr in self._chunk_overrides.values():
+            for _k, v in ovr.items(OV_BIOME):
+                if v == bid:
+                    total += 1
+        return total
+
+    def _iter_overrides(self, flag: int):
+        cs = self.chunk_size
+        for (cx, cy), ovr in self._chunk_overrides.items():
+            x0 = cx * cs
+            y0 = cy * cs
+            for k, v in ovr.items(flag):
+                yield x0 + k % cs, y0 + k // cs, v
+
     def set_tile_corrupt(self, x: int, y: int, clear_natural_props: bool = True) -> bool:
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
@@ -797,6 +1207,118 @@ class ChunkedWorld:
 
         return True
 
+    # ------------------- lecture par région (NumPy) -------------------
+
+    def get_region(
+        self,
+        x0: int,
+        y0: int,
+        w: int,
+        h: int,
+        fields=("levels", "ground", "biome", "prop"),
+        generate: bool = True,
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Lit un rectangle de tuiles (plusieurs chunks) en une passe :
+        renvoie {champ: ndarray (h, w)} avec overrides appliqués.
+          - x boucle (longitude), y est borné comme les getters unitaires.
+          - "prop" : id de prop effectif (0 = rien ; pid du dict pour une construction).
+          - "override" : drapeaux OV_* par tuile (OV_OBJECT = overlay dict/objet non None) ;
+            "loaded" : chunk disponible.
+        generate=False : les chunks absents ne sont pas générés (valeurs à 0, loaded=False).
+        """
+        w = max(0, int(w))
+        h = max(0, int(h))
+        xs = (int(x0) + np.arange(w, dtype=np.int64)) % self.width
+        ys = np.clip(int(y0) + np.arange(h, dtype=np.int64), 0, self.height - 1)
+        return self._gather_grid(xs, ys, fields, generate)
+
+    def sample_grid(self, xs, ys, fields=("levels", "ground", "biome", "prop"), generate: bool = True):
+        """
+        Comme get_region mais sur une grille quelconque : out[r, c] = tuile (xs[c], ys[r]).
+        Utile pour sous-échantillonner une grande zone (minimap).
+        """
+        xs = np.asarray(xs, dtype=np.int64) % self.width
+        ys = np.clip(np.asarray(ys, dtype=np.int64), 0, self.height - 1)
+        return self._gather_grid(xs, ys, fields, generate)
+
+    def _gather_grid(self, xs: "np.ndarray", ys: "np.ndarray", fields, generate: bool):
+        fields = tuple(fields)
+        for f in fields:
+            if f not in _REGION_DTYPES:
+                raise ValueError(f"Champ de région inconnu: {f!r} (attendus: {REGION_FIELDS})")
+        shape = (len(ys), len(xs))
+        out = {f: np.zeros(shape, dtype=_REGION_DTYPES[f]) for f in fields}
+        if not len(xs) or not len(ys):
+            return out
+
+        cs = self.chunk_size
+        need_ovr = any(f in fields for f in ("ground", "biome", "prop", "override"))
+        base_attr = {"levels": "levels_u8", "ground": "ground_u16", "biome": "biome_u8", "prop": "overlay_obj"}
+        base_dtype = {"levels": np.uint8, "ground": np.uint16, "biome": np.uint8, "prop": np.uint16}
+
+        col_cx = xs // cs
+        row_cy = ys // cs
+        col_groups = [(int(cx), np.nonzero(col_cx == cx)[0]) for cx in np.unique(col_cx)]
+        for cy in np.unique(row_cy):
+            cy = int(cy)
+            rows = np.nonzero(row_cy == cy)[0]
+            ly = ys[rows] - cy * cs
+            for cx, cols in col_groups:
+                lx = xs[cols] - cx * cs
+                if generate:
+                    ch, _, _ = self._get_chunk(cx * cs, cy * cs)
+                else:
+                    ch = self._peek_chunk(cx, cy)
+                    if ch is None:
+                        continue
+                sel = np.ix_(rows, cols)
+                src = np.ix_(ly, lx)
+                if "loaded" in out:
+                    out["loaded"][sel] = True
+                for f in fields:
+                    attr = base_attr.get(f)
+                    if attr is not None:
+                        arr = np.frombuffer(getattr(ch, attr), dtype=base_dtype[f]).reshape(cs, cs)
+                        out[f][sel] = arr[src]
+
+                ovr = self._chunk_overrides.get((cx, cy)) if need_ovr else None
+                if ovr is None or not ovr.count:
+                    continue
+                mask = np.frombuffer(ovr.mask, dtype=np.uint8).reshape(cs, cs)[src]
+                if not mask.any():
+                    continue
+                if "ground" in out:
+                    g = np.frombuffer(ovr.ground, dtype=np.uint16).reshape(cs, cs)[src]
+                    out["ground"][sel] = np.where(mask & OV_GROUND, g, out["ground"][sel])
+                if "biome" in out:
+                    b = np.frombuffer(ovr.biome, dtype=np.uint8).reshape(cs, cs)[src]
+                    out["biome"][sel] = np.where(mask & OV_BIOME, b, out["biome"][sel])
+                if "prop" in out:
+                    p = np.frombuffer(ovr.overlay_pid, dtype=np.uint16).reshape(cs, cs)[src]
+                    out["prop"][sel] = np.where(mask & OV_OVERLAY, p, out["prop"][sel])
+                obj_mask = None
+                if ovr.overlay_objs and ("prop" in out or "override" in out):
+                    obj_mask = np.zeros(mask.shape, dtype=np.uint8)
+                    for k, v in ovr.overlay_objs.items():
+                        r = np.nonzero(ly == k // cs)[0]
+                        c = np.nonzero(lx == k % cs)[0]
+                        if not len(r) or not len(c):
+                            continue
+                        if v is not None:
+                            obj_mask[np.ix_(r, c)] = OV_OBJECT
+                        if "prop" in out:
+                            pid = 0
+                            if isinstance(v, dict):
+                                try:
+                                    pid = max(0, min(0xFFFF, int(v.get("pid", 0) or 0)))
+                                except (TypeError, ValueError):
+                                    pid = 0
+                            out["prop"][rows[r][:, None], cols[c][None, :]] = pid
+                if "override" in out:
+                    out["override"][sel] = mask if obj_mask is None else (mask | obj_mask)
+        return out
+
     # ------------------- getters (read-only) -------------------
 
     def get_height01(self, x: int, y: int) -> float:
@@ -818,18 +1340,18 @@ class ChunkedWorld:
     def get_ground_id(self, x: int, y: int) -> int:
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        ov = self._ground_overrides.get((x, y), self._NO)
-        if ov is not self._NO:
-            return int(ov)
+        ovr, k = self._ovr_at(x, y)
+        if ovr is not None and ovr.mask[k] & OV_GROUND:
+            return int(ovr.ground[k])
         ch, lx, ly = self._get_chunk(x, y)
         return int(ch.ground_u16[ch.idx(lx, ly)])
 
     def get_biome_id(self, x: int, y: int) -> int:
         x = _wrap_lon_x(int(x), self.width)
         y = _clamp_lat_y(int(y), self.height)
-        ov = self._biome_overrides.get((x, y), self._NO)
-        if ov is not self._NO:
-            return int(ov)
+        ovr, k = self._ovr_at(x, y)
+        if ovr is not None and ovr.mask[k] & OV_BIOME:
+            return int(ovr.biome[k])
         ch, lx, ly = self._get_chunk(x, y)
         return int(ch.biome_u8[ch.idx(lx, ly)])
 
@@ -848,12 +1370,87 @@ class ChunkedWorld:
         return self._get_chunk(x, y)
 
     def _peek_chunk(self, cx: int, cy: int) -> Optional[_Chunk]:
+        # Sondage sans génération (snapshots, pathfinding...) : hors statistiques hits/misses,
+        # qui ne comptent que les accès de _get_chunk.
         key = (int(cx), int(cy))
         ch = self._chunks.get(key)
         if ch is not None:
             self._chunks.move_to_end(key)
+            return ch
+        # Pas en mémoire : une lecture disque reste "sans génération".
+        ch = self._read_stored_chunk(key[0], key[1])
+        if ch is not None:
+            self._store_chunk(key, ch)
         return ch
 
+    # ------------------- cache disque -------------------
+
+    def _chunk_store(self):
+        if not self._disk_store_ready:
+            self._disk_store_ready = True
+            if bool(getattr(self.params, "disk_cache", True)):
+                self._disk_store = open_chunk_store(
+                    seed=self.seed,
+                    width=self.width,
+                    height=self.height,
+                    chunk_size=self.chunk_size,
+                    tiles_levels=self.tiles_levels,
+                    record_size=_Chunk.byte_size(self.chunk_size),
+                    generator_version=CHUNK_GENERATOR_VERSION,
+                    max_total_bytes=int(getattr(self.params, "disk_cache_mb", 512)) * 1024 * 1024,
+                )
+        return self._disk_store
+
+    def apply_runtime_settings(
+        self,
+        chunk_backend: Optional[str] = None,
+        disk_cache: Optional[bool] = None,
+        disk_cache_mb: Any = None,
+        smooth_chunk_seams: Optional[bool] = None,
+    ) -> None:
+        """
+        Réglages propres à la machine (backend, cache disque, lissage des jonctions) : ils
+        sont picklés avec params mais doivent suivre les réglages courants, pas ceux de la
+        partie sauvegardée. À appeler avant de créer le pool de génération (copie de params).
+        """
+        p = self.params
+        if chunk_backend is not None:
+            p.chunk_backend = _normalize_chunk_backend(chunk_backend)
+        if smooth_chunk_seams is not None:
+            p.smooth_chunk_seams = bool(smooth_chunk_seams)
+        disk = (p.disk_cache, p.disk_cache_mb)
+        if disk_cache is not None:
+            p.disk_cache = bool(disk_cache)
+        if disk_cache_mb is not None:
+            p.disk_cache_mb = _parse_disk_cache_mb(disk_cache_mb)
+        if (p.disk_cache, p.disk_cache_mb) != disk:
+            # Rouvert (ou non) à la prochaine lecture, avec le nouveau plafond de taille.
+            self._disk_store = None
+            self._disk_store_ready = False
+
+    def _read_stored_chunk(self, cx: int, cy: int) -> Optional[_Chunk]:
+        store = self._chunk_store()
+        if store is None:
+            return None
+        payload = store.get(cx, cy)
+        if payload is None:
+            return None
+        self._cache_stats["disk_reads"] += 1
+        return _Chunk.from_bytes(cx, cy, self.chunk_size, payload)
+
+    def _write_stored_chunk(self, ch: _Chunk) -> None:
+        store = self._chunk_store()
+        if store is not None and (ch.cx, ch.cy) not in store:
+            store.put(ch.cx, ch.cy, ch.to_bytes())
+
+    def load_stored_chunk(self, cx: int, cy: int) -> bool:
+        """Charge un chunk depuis le cache disque s'il y est ; True si le chunk est en mémoire."""
+        return self._peek_chunk(cx, cy) is not None
+
+    def flush_disk_cache(self) -> None:
+        if self._disk_store is not None:
+            self._disk_store.flush()
+
     def get_tile_snapshot(self, x: int, y: int, generate: bool = True):
         """
         Retourne un snapshot compact d'une tuile:
@@ -875,19 +1472,18 @@ class ChunkedWorld:
                 return None
             ch, _, _ = self._get_chunk(x, y)
 
-        k = ch.idx(lx, ly)
-        ov = self._overlay_overrides.get((x, y), self._NO)
-        if ov is self._NO:
-            pid = int(ch.overlay_obj[k])
-            overlay = None if pid == 0 else pid
+        k = ly * cs + lx
+        ovr = ch.ovr
+        m = ovr.mask[k] if ovr is not None else 0
+        if m & OV_OVERLAY:
+            overlay = ovr.get_overlay(k, None)
         else:
-            overlay = ov
-        g_ov = self._ground_overrides.get((x, y), self._NO)
-        b_ov = self._biome_overrides.get((x, y), self._NO)
-        ground = int(ch.ground_u16[k]) if g_ov is self._NO else int(g_ov)
-        biome = int(ch.biome_u8[k]) if b_ov is self._NO else int(b_ov)
+            pid = ch.overlay_obj[k]
+            overlay = None if pid == 0 else pid
+        ground = ovr.ground[k] if m & OV_GROUND else ch.ground_u16[k]
+        biome = ovr.biome[k] if m & OV_BIOME else ch.biome_u8[k]
         return (
-            int(ch.levels_u8[k]),
+            ch.levels_u8[k],
             ground,
             overlay,
             biome,
@@ -913,6 +1509,101 @@ class ChunkedWorld:
             if progress:
                 progress((idx + 1) / total, f"{phase_label} ({idx + 1}/{total})")
 
+    def has_chunk(self, cx: int, cy: int) -> bool:
+        return (int(cx), int(cy)) in self._chunks
+
+    def install_chunk(self, ch: _Chunk) -> bool:
+        """
+        Insère un chunk généré ailleurs (process worker, cache...).
+        Ne remplace jamais un chunk déjà présent ; retourne True si inséré.
+        """
+        key = (int(ch.cx), int(ch.cy))
+        if key in self._chunks:
+            return False
+        self._write_stored_chunk(ch)
+        self._store_chunk(key, ch)
+        self._cache_stats["installed"] += 1
+        return True
+
+    def _store_chunk(self, key: Tuple[int, int], ch: _Chunk) -> None:
+        ch.ovr = self._chunk_overrides.get(key)
+        self._bump_ground_revision(*key)
+        if bool(getattr(self.params, "smooth_chunk_seams", False)):
+            self._smooth_chunk_seams(ch)
+        if key not in self._chunks:
+            self._resident_bytes += self._chunk_bytes
+        self._chunks[key] = ch
+        self._chunks.move_to_end(key)
+        if self._resident_bytes > self.cache_bytes:
+            self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        """Évince les chunks les moins récents (hors épinglés) jusqu'à repasser sous le budget."""
+        excess = self._resident_bytes - self.cache_bytes
+        pinned = self._pinned_chunks
+        victims = []
+        for key in self._chunks:
+            if excess <= 0:
+                break
+            if key in pinned:
+                continue
+            victims.append(key)
+            excess -= self._chunk_bytes
+        for key in victims:
+            del self._chunks[key]
+        self._resident_bytes -= len(victims) * self._chunk_bytes
+        self._cache_stats["evictions"] += len(victims)
+
+    # ------------------- budget / télémétrie du cache -------------------
+
+    @staticmethod
+    def _new_cache_stats() -> Dict[str, Any]:
+        return {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_reads": 0,
+            "generated": 0,
+            "installed": 0,
+            "gen_time_s": 0.0,
+        }
+
+    def set_cache_budget(self, budget_bytes: int) -> None:
+        """Change le budget mémoire du cache de chunks (au moins un chunk)."""
+        self.cache_bytes = max(self._chunk_bytes, int(budget_bytes))
+        self.cache_chunks = max(1, self.cache_bytes // self._chunk_bytes)
+        if self._resident_bytes > self.cache_bytes:
+            self._evict_over_budget()
+
+    def ensure_cache_capacity(self, chunk_count: int) -> None:
+        """Garantit que le budget peut contenir au moins chunk_count chunks."""
+        needed = int(chunk_count) * self._chunk_bytes
+        if needed > self.cache_bytes:
+            self.set_cache_budget(needed)
+
+    def set_pinned_chunks(self, keys) -> None:
+        """Chunks à ne jamais évincer (autour des entités vivantes et de la caméra)."""
+        self._pinned_chunks = set(keys)
+
+    def chunk_cache_stats(self) -> Dict[str, Any]:
+        st = dict(self._cache_stats)
+        generated = max(1, st["generated"])
+        lookups = st["hits"] + st["misses"]
+        st.update(
+            {
+                "hit_rate": 1.0 if lookups == 0 else st["hits"] / lookups,
+                "gen_time_ms_avg": 1000.0 * st["gen_time_s"] / generated,
+                "resident_chunks": len(self._chunks),
+                "resident_bytes": self._resident_bytes,
+                "budget_bytes": self.cache_bytes,
+                "pinned": len(self._pinned_chunks),
+            }
+        )
+        return st
+
+    def reset_cache_stats(self) -> None:
+        self._cache_stats = self._new_cache_stats()
+
     def _get_chunk(self, x: int, y: int):
         cs = self.chunk_size
         cx = x // cs
@@ -922,12 +1613,17 @@ class ChunkedWorld:
         ch = self._chunks.get(key)
         if ch is not None:
             self._chunks.move_to_end(key)
+            self._cache_stats["hits"] += 1
         else:
-            ch = self._generate_chunk(cx, cy)
-            self._chunks[key] = ch
-            self._chunks.move_to_end(key)
-            if len(self._chunks) > self.cache_chunks:
-                self._chunks.popitem(last=False)
+            self._cache_stats["misses"] += 1
+            ch = self._read_stored_chunk(cx, cy)
+            if ch is None:
+                t0 = time.perf_counter()
+                ch = self._generate_chunk(cx, cy)
+                self._cache_stats["gen_time_s"] += time.perf_counter() - t0
+                self._cache_stats["generated"] += 1
+                self._write_stored_chunk(ch)
+            self._store_chunk(key, ch)
 
         lx = x - cx * cs
         ly = y - cy * cs
@@ -935,7 +1631,21 @@ class ChunkedWorld:
 
     # ------------------- chunk generation -------------------
 
+    def _chunk_noise_step(self) -> int:
+        raw_step = getattr(self.params, "chunk_noise_step", 8)
+        try:
+            noise_step = int(raw_step) if raw_step is not None else 8
+        except Exception:
+            noise_step = 8
+        return max(1, min(self.chunk_size, noise_step))
+
     def _generate_chunk(self, cx: int, cy: int) -> _Chunk:
+        backend = _normalize_chunk_backend(getattr(self.params, "chunk_backend", "numpy"))
+        if backend == "numpy":
+            return _numpy_chunk_generator()(self, cx, cy)
+        return self._generate_chunk_python(cx, cy)
+
+    def _generate_chunk_python(self, cx: int, cy: int) -> _Chunk:
         cs = self.chunk_size
         ch = _Chunk(cx, cy, cs)
 
@@ -981,44 +1691,15 @@ class ChunkedWorld:
         coast_var_scale = 0.0035
         coast_var_amp   = 0.030  # +/- 0.03 sur la hauteur de mer
 
-        raw_step = getattr(self.params, "chunk_noise_step", 8)
-        try:
-            noise_step = int(raw_step) if raw_step is not None else 8
-        except Exception:
-            noise_step = 8
-        noise_step = max(1, min(cs, noise_step))
+        noise_step = self._chunk_noise_step()
 
         # Points d'échantillonnage (0..actual_w / 0..actual_h, + bord pour interpolation)
-        xs = list(range(0, actual_w + 1, noise_step))
-        if xs[-1] != actual_w:
-            xs.append(actual_w)
-        ys = list(range(0, actual_h + 1, noise_step))
-        if ys[-1] != actual_h:
-            ys.append(actual_h)
+        # + LUT interpolation par coordonnée locale (évite divisions dans la boucle principale)
+        xs, x0_idx, x_frac = _noise_axis(actual_w, noise_step)
+        ys, y0_idx, y_frac = _noise_axis(actual_h, noise_step)
         nx = len(xs)
         ny = len(ys)
 
-        # LUT interpolation par coordonnée locale (évite divisions dans la boucle principale)
-        x0_idx = [0] * actual_w
-        x_frac = [0.0] * actual_w
-        xi = 0
-        for lx in range(actual_w):
-            while xi + 1 < nx - 1 and xs[xi + 1] <= lx:
-                xi += 1
-            x0_idx[lx] = xi
-            denom = xs[xi + 1] - xs[xi]
-            x_frac[lx] = 0.0 if denom <= 0 else (lx - xs[xi]) / denom
-
-        y0_idx = [0] * actual_h
-        y_frac = [0.0] * actual_h
-        yi = 0
-        for ly in range(actual_h):
-            while yi + 1 < ny - 1 and ys[yi + 1] <= ly:
-                yi += 1
-            y0_idx[ly] = yi
-            denom = ys[yi + 1] - ys[yi]
-            y_frac[ly] = 0.0 if denom <= 0 else (ly - ys[yi]) / denom
-
         # Échantillons bruités (valeurs "brutes" interpolables)
         n_samp = nx * ny
         height_s = [0.0] * n_samp
@@ -1336,41 +2017,75 @@ class ChunkedWorld:
         height: int,
         iterations: int = 3,
     ) -> None:
+        """
+        Limite à 1 l'écart de niveau entre voisins (horizontal puis vertical, "iterations"
+        passes max), sur tout le chunk d'un coup. Même résultat que l'ancienne double boucle.
+        """
         if width <= 1 or height <= 1:
             return
+        view = np.frombuffer(levels, dtype=np.uint8).reshape(-1, stride)[:height, :width]
+        lv = view.astype(np.int16)
         for _ in range(iterations):
-            changed = False
-            # horizontal neighbors
-            for y in range(height):
-                row = y * stride
-                for x in range(width - 1):
-                    idx = row + x
-                    nidx = idx + 1
-                    a = int(levels[idx])
-                    b = int(levels[nidx])
-                    if a - b > 1:
-                        levels[idx] = b + 1
-                        changed = True
-                    elif b - a > 1:
-                        levels[nidx] = a + 1
-                        changed = True
-            # vertical neighbors
-            for y in range(height - 1):
-                row = y * stride
-                next_row = row + stride
-                for x in range(width):
-                    idx = row + x
-                    nidx = next_row + x
-                    a = int(levels[idx])
-                    b = int(levels[nidx])
-                    if a - b > 1:
-                        levels[idx] = b + 1
-                        changed = True
-                    elif b - a > 1:
-                        levels[nidx] = a + 1
-                        changed = True
-            if not changed:
+            nxt = _smooth_levels_pass(lv)
+            if np.array_equal(nxt, lv):
                 break
+            lv = nxt
+        view[...] = lv
+
+    def _smooth_chunk_seams(self, ch: _Chunk, band: int = 8, iterations: int = 3) -> None:
+        """
+        Lisse les niveaux à la jonction entre ch et ses voisins déjà en mémoire : même
+        relaxation que _smooth_chunk_levels, sur ch + une bande de "band" tuiles autour.
+        Les voisins absents ne sont ni chargés ni générés (ils ne contraignent rien).
+        """
+        cs = self.chunk_size
+        if self.width < 3 * cs:
+            return
+        x0 = ch.cx * cs
+        y0 = ch.cy * cs
+        aw = min(cs, self.width - x0)
+        ah = min(cs, self.height - y0)
+        if aw <= 0 or ah <= 0:
+            return
+
+        xs = np.arange(x0 - band, x0 + aw + band, dtype=np.int64) % self.width
+        ys = np.arange(max(0, y0 - band), min(self.height, y0 + ah + band), dtype=np.int64)
+        col_cx = xs // cs
+        row_cy = ys // cs
+
+        blocks = []
+        lv = np.full((len(ys), len(xs)), 255, dtype=np.int16)
+        missing = np.ones(lv.shape, dtype=bool)
+        for cy in np.unique(row_cy).tolist():
+            rows = np.nonzero(row_cy == cy)[0]
+            for cx in np.unique(col_cx).tolist():
+                other = ch if (cx, cy) == (ch.cx, ch.cy) else self._chunks.get((cx, cy))
+                if other is None:
+                    continue
+                cols = np.nonzero(col_cx == cx)[0]
+                view = np.frombuffer(other.levels_u8, dtype=np.uint8).reshape(cs, cs)
+                sel = np.ix_(ys[rows] - cy * cs, xs[cols] - cx * cs)
+                dst = np.ix_(rows, cols)
+                lv[dst] = view[sel]
+                missing[dst] = False
+                blocks.append(((cx, cy), view, sel, dst))
+        if len(blocks) <= 1:
+            return
+
+        before = lv.copy()
+        for _ in range(iterations):
+            # Les cases absentes restent "infiniment hautes" et coupent chaque balayage :
+            # aucune contrainte ne traverse un voisin non chargé.
+            nxt = _smooth_levels_pass(lv, missing)
+            if np.array_equal(nxt, lv):
+                break
+            lv = nxt
+        if np.array_equal(lv, before):
+            return
+        for key, view, sel, dst in blocks:
+            if not np.array_equal(view[sel], lv[dst]):
+                view[sel] = lv[dst]
+                self._bump_ground_revision(*key)
 
     # ------------------- spawn -------------------
 
@@ -1487,10 +2202,40 @@ class ChunkedWorld:
         score -= abs(h01 - 0.62) * 6.0
         return score
 
+    def estimate_spawn_scores(self, xs, ys) -> "np.ndarray":
+        """
+        Version par lots de _estimate_spawn_score : xs/ys sont des tableaux (ou listes)
+        de coordonnées entières de même forme ; renvoie un tableau float64 de scores,
+        NaN là où la case n'est pas adaptée. Aucun chunk n'est généré.
+        Réutilisable pour toute recherche de "bonne case" sans génération.
+        """
+        from Game.world.world_gen_numpy import estimate_spawn_scores
+
+        return estimate_spawn_scores(self, xs, ys)
+
+    def best_spawn_candidate(self, xs, ys, penalty=None, min_score: float = -1e9):
+        """
+        Meilleure case parmi (xs, ys) au sens de estimate_spawn_scores (- penalty éventuelle).
+        Renvoie (x, y, score) ou None si aucun score ne dépasse strictement min_score.
+        En cas d'égalité, la première case (ordre des tableaux) gagne.
+        """
+        ix, iy = np.broadcast_arrays(np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64))
+        if ix.size == 0:
+            return None
+        scores = self.estimate_spawn_scores(ix, iy)
+        if penalty is not None:
+            scores = scores - penalty
+        scores = np.where(np.isnan(scores), -np.inf, scores).ravel()
+        k = int(np.argmax(scores))
+        if not scores[k] > min_score:
+            return None
+        return int(ix.ravel()[k]), int(iy.ravel()[k]), float(scores[k])
+
     def _find_spawn(self, progress: ProgressCb = None) -> Tuple[int, int]:
         """
         Recherche rapide de spawn sans générer de chunk.
         Évite le gros pic CPU avant l'écran de chargement complet.
+        Chaque passe (grossière puis raffinage) est évaluée en un seul lot vectorisé.
         """
         mid_x = self.width // 2
         mid_y = self.height // 2
@@ -1510,23 +2255,16 @@ class ChunkedWorld:
         y0 = max(0, mid_y - span_y)
         y1 = min(self.height - 1, mid_y + span_y)
 
-        xs = list(range(x0, x1 + 1, coarse_step))
-        ys = list(range(y0, y1 + 1, coarse_step))
-        total_samples = max(1, len(xs) * len(ys))
-        sample_idx = 0
-
-        for wy in ys:
-            for wx in xs:
-                score = self._estimate_spawn_score(wx, wy)
-                if score is not None and score > best_score:
-                    best_score = score
-                    best = (wx, wy)
-                sample_idx += 1
-            if progress:
-                progress(
-                    0.15 + 0.65 * (sample_idx / total_samples),
-                    f"Recherche du point de départ… ({sample_idx}/{total_samples})",
-                )
+        gx, gy = np.meshgrid(np.arange(x0, x1 + 1, coarse_step), np.arange(y0, y1 + 1, coarse_step))
+        total_samples = max(1, gx.size)
+        if progress:
+            progress(0.15, f"Recherche du point de départ… (0/{total_samples})")
+        found = self.best_spawn_candidate(gx, gy, min_score=best_score)
+        if found is not None:
+            bx, by, best_score = found
+            best = (bx, by)
+        if progress:
+            progress(0.80, f"Recherche du point de départ… ({total_samples}/{total_samples})")
 
         # passe de raffinement locale autour du meilleur candidat
         bx, by = best
@@ -1537,27 +2275,14 @@ class ChunkedWorld:
         ry0 = max(0, by - refine_radius)
         ry1 = min(self.height - 1, by + refine_radius)
 
-        rxs = list(range(rx0, rx1 + 1, refine_step))
-        rys = list(range(ry0, ry1 + 1, refine_step))
-        total_refine = max(1, len(rxs) * len(rys))
-        refine_idx = 0
-        for wy in rys:
-            for wx in rxs:
-                score = self._estimate_spawn_score(wx, wy)
-                if score is None:
-                    refine_idx += 1
-                    continue
-                dist_penalty = 0.002 * (abs(wx - mid_x) + abs(wy - mid_y))
-                final_score = score - dist_penalty
-                if final_score > best_score:
-                    best_score = final_score
-                    best = (wx, wy)
-                refine_idx += 1
-            if progress:
-                progress(
-                    0.80 + 0.20 * (refine_idx / total_refine),
-                    f"Recherche du point de départ… (raffinage {refine_idx}/{total_refine})",
-                )
+        gx, gy = np.meshgrid(np.arange(rx0, rx1 + 1, refine_step), np.arange(ry0, ry1 + 1, refine_step))
+        total_refine = max(1, gx.size)
+        dist_penalty = 0.002 * (np.abs(gx - mid_x) + np.abs(gy - mid_y))
+        found = self.best_spawn_candidate(gx, gy, penalty=dist_penalty, min_score=best_score)
+        if found is not None:
+            best = (found[0], found[1])
+        if progress:
+            progress(1.0, f"Recherche du point de départ… (raffinage {total_refine}/{total_refine})")
 
         if progress:
             progress(1.0, "Spawn validé")
@@ -1574,15 +2299,9 @@ class ChunkedWorld:
         """
         # On ne sauvegarde PAS les chunks (re-générables).
         # On sauvegarde les modifications seulement.
-        ov = []
-        for (x, y), v in self._overlay_overrides.items():
-            ov.append((int(x), int(y), v))
-        gov = []
-        for (x, y), v in self._ground_overrides.items():
-            gov.append((int(x), int(y), int(v)))
-        bov = []
-        for (x, y), v in self._biome_overrides.items():
-            bov.append((int(x), int(y), int(v)))
+        ov = [(int(x), int(y), v) for x, y, v in self._iter_overrides(OV_OVERLAY)]
+        gov = [(int(x), int(y), int(v)) for x, y, v in self._iter_overrides(OV_GROUND)]
+        bov = [(int(x), int(y), int(v)) for x, y, v in self._iter_overrides(OV_BIOME)]
         return {
             "seed": self.seed,
             "params": self.params.to_dict(),
@@ -1592,28 +2311,24 @@ class ChunkedWorld:
         }
 
     def apply_world_state_minimal(self, blob: Dict[str, Any]) -> None:
-        ov = blob.get("overlay_overrides", []) or []
-        self._overlay_overrides.clear()
-        for item in ov:
+        for key in list(self._chunk_overrides):
+            self.drop_chunk_overrides(*key)
+        for item in blob.get("overlay_overrides", []) or []:
             try:
                 x, y, v = item
-                self._overlay_overrides[(int(x), int(y))] = v
+                self.set_overlay(int(x), int(y), v)
             except Exception:
                 continue
-        gov = blob.get("ground_overrides", []) or []
-        self._ground_overrides.clear()
-        for item in gov:
+        for item in blob.get("ground_overrides", []) or []:
             try:
                 x, y, v = item
-                self._ground_overrides[(int(x), int(y))] = int(v)
+                self.set_ground_id(int(x), int(y), int(v))
             except Exception:
                 continue
-        bov = blob.get("biome_overrides", []) or []
-        self._biome_overrides.clear()
-        for item in bov:
+        for item in blob.get("biome_overrides", []) or []:
             try:
                 x, y, v = item
-                self._biome_overrides[(int(x), int(y))] = int(v)
+                self.set_biome_id(int(x), int(y), int(v))
             except Exception:
                 continue
 
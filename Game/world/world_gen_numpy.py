@@ -0,0 +1,510 @@
+# world_gen_numpy.py
+# Backend NumPy de génération de chunk (alternative vectorisée à ChunkedWorld._generate_chunk_python).
+#
+# Objectifs :
+# - Même sortie, octet pour octet, que le backend Python pour une seed donnée
+#   (les sauvegardes existantes se rechargent à l'identique).
+# - Grille de bruit grossière, interpolation bilinéaire, température/humidité,
+#   biomes, props et niveaux calculés en opérations sur tableaux entiers.
+#
+# Notes :
+# - Toutes les opérations flottantes suivent exactement l'ordre du code Python
+#   (float64 IEEE des deux côtés) : ne pas "simplifier" les expressions.
+# - Les bruits (hash, value/Perlin, fbm) viennent du moteur partagé Game.world.noise.
+
+from __future__ import annotations
+
+from array import array
+
+import numpy as np
+
+from Game.world.world_gen import (
+    BIOME_ALPINE,
+    BIOME_DESERT,
+    BIOME_FOREST,
+    BIOME_LAKE,
+    BIOME_MANGROVE,
+    BIOME_MYSTIC,
+    BIOME_PLAINS,
+    BIOME_RAINFOREST,
+    BIOME_RIVER,
+    BIOME_ROCK,
+    BIOME_SAVANNA,
+    BIOME_SNOW,
+    BIOME_SWAMP,
+    BIOME_TAIGA,
+    BIOME_TUNDRA,
+    BIOME_VOLCANIC,
+    _BIODIVERSITY_MUL,
+    _BIOME_TO_GROUND_GID,
+    _GID_GRASS,
+    _GID_LAKE,
+    _GID_RIVER,
+    _PROP_ID_MAP,
+    _RESOURCE_MUL,
+    _TECTONIC_RUGGED,
+    _TEMPERATURE_BIAS,
+    _Chunk,
+    _noise_axis,
+)
+from Game.world.noise import fbm, fbm_perlin, hash_u32, rand01
+
+
+# --------------------------------------------------------------------------------------
+# Helpers vectorisés
+# --------------------------------------------------------------------------------------
+
+def _clamp01(v: np.ndarray) -> np.ndarray:
+    return np.minimum(np.maximum(v, 0.0), 1.0)
+
+
+def tile_randoms(gx: np.ndarray, gy: np.ndarray, seed: int):
+    """(r0, r1, r2) par tuile, identiques au RNG par tuile du backend Python."""
+    seed32 = np.uint64(int(seed) & 0xFFFF_FFFF)
+    tile_seed = hash_u32(seed32 ^ hash_u32(gx * 912367) ^ hash_u32(gy * 972541))
+    r0 = rand01(tile_seed)
+    r1 = rand01(hash_u32(tile_seed ^ np.uint64(0xA5A5A5A5)))
+    r2 = rand01(hash_u32(tile_seed ^ np.uint64(0xC3C3C3C3)))
+    return r0, r1, r2
+
+
+# --------------------------------------------------------------------------------------
+# LUT biome -> sol / probabilité de props
+# --------------------------------------------------------------------------------------
+
+def _ground_lut() -> np.ndarray:
+    lut = np.full(256, _GID_GRASS, dtype=np.uint16)
+    for bid, gid in _BIOME_TO_GROUND_GID.items():
+        lut[int(bid)] = int(gid)
+    lut[BIOME_LAKE] = _GID_LAKE
+    lut[BIOME_RIVER] = _GID_RIVER
+    return lut
+
+
+def _base_prop_lut(biodiv_mul: float) -> np.ndarray:
+    lut = np.empty(256, dtype=np.float64)
+    for bid in range(256):
+        base_p = 0.02 * biodiv_mul
+        if bid in (BIOME_FOREST, BIOME_RAINFOREST, BIOME_TAIGA):
+            base_p *= 2.2
+        elif bid == BIOME_SAVANNA:
+            base_p *= 1.2
+        elif bid == BIOME_PLAINS:
+            base_p *= 0.9
+        elif bid in (BIOME_SNOW, BIOME_TUNDRA):
+            base_p *= 0.35
+        elif bid == BIOME_DESERT:
+            base_p *= 0.25
+        lut[bid] = base_p
+    return lut
+
+
+_GROUND_LUT = _ground_lut()
+
+
+def _pick3(r: np.ndarray, a: int, b: int, c: int, t0: float, t1: float) -> np.ndarray:
+    return np.where(r < t0, a, np.where(r < t1, b, c))
+
+
+def _natural_props(bid: np.ndarray, r1: np.ndarray, r2: np.ndarray) -> np.ndarray:
+    """Prop "naturel" (hors minerais) selon le biome, même arbre de décision que le backend Python."""
+    p = _PROP_ID_MAP
+
+    desert = np.where(r1 < 0.55, p["cactus"], np.where(r1 < 0.8, p["boulder"], p["rock"]))
+    cold = np.where(r1 < 0.55, p["rock"], p["boulder"])
+    trees = _pick3(r2, p["tree_1"], p["tree_2"], p["tree_3"], 0.33, 0.66)
+    mushrooms = _pick3(r2, p["mushroom1"], p["mushroom2"], p["mushroom3"], 0.34, 0.67)
+    woods = np.where(
+        r1 < 0.55, trees,
+        np.where(r1 < 0.78, mushrooms, np.where(r1 < 0.9, p["log"], p["stump"])),
+    )
+    savanna = np.where(r1 < 0.45, p["cactus"], np.where(r1 < 0.8, p["bush"], p["tree_dead"]))
+    flowers = _pick3(r2, p["flower"], p["flower2"], p["flower3"], 0.34, 0.67)
+    berries = np.where(r2 < 0.5, p["berry_bush"], p["blueberry_bush"])
+    plains = np.where(r1 < 0.6, flowers, np.where(r1 < 0.85, p["bush"], berries))
+    rocky = np.where(r1 < 0.65, p["rock"], p["boulder"])
+    wet = np.where(r1 < 0.6, p["reeds"], p["bush"])
+    other = np.where(r1 < 0.6, p["bush"], p["flower"])
+
+    return np.select(
+        [
+            bid == BIOME_DESERT,
+            (bid == BIOME_TUNDRA) | (bid == BIOME_SNOW),
+            (bid == BIOME_FOREST) | (bid == BIOME_RAINFOREST) | (bid == BIOME_TAIGA),
+            bid == BIOME_SAVANNA,
+            bid == BIOME_PLAINS,
+            (bid == BIOME_ROCK) | (bid == BIOME_ALPINE) | (bid == BIOME_VOLCANIC),
+            (bid == BIOME_SWAMP) | (bid == BIOME_MANGROVE),
+        ],
+        [desert, cold, woods, savanna, plains, rocky, wet],
+        default=other,
+    )
+
+
+# --------------------------------------------------------------------------------------
+# Génération d'un chunk
+# --------------------------------------------------------------------------------------
+
+def _noise_fields(world, gx: np.ndarray, gy: np.ndarray) -> dict:
+    """
+    Champs de bruit bruts (hauteur, crêtes, température, humidité, lacs, rivières) aux
+    points (gx, gy) en float64 : grille grossière d'un chunk ou points isolés d'un aperçu.
+    """
+    params = world.params
+    water_v = float(getattr(params, "Niveau_des_océans", 50))
+    water_bias = (water_v - 50.0) / 100.0
+    rugged = _TECTONIC_RUGGED.get(str(getattr(params, "tectonic_activity", "Stable")), 1.0)
+
+    base = int(world.seed)
+
+    cont_scale = 0.0011 * rugged
+    detail_scale = 0.0100 * rugged
+    macro_scale = 0.00035 * rugged
+    macro_amp = 0.55 * rugged
+    warp_amp = 140.0 * rugged
+    warp_scale = 0.0009
+    peak_scale = 0.0045 * rugged
+    micro_scale = 0.025
+    coast_var_scale = 0.0035
+    coast_var_amp = 0.030
+
+    wx = gx + warp_amp * fbm_perlin(gx * warp_scale, gy * warp_scale, base + 90001, octaves=3)
+    wy = gy + warp_amp * fbm_perlin((gx + 1337.0) * warp_scale, (gy - 7331.0) * warp_scale, base + 90002, octaves=3)
+
+    h1 = fbm_perlin(wx * cont_scale, wy * cont_scale, base + 11, octaves=5)
+    h2 = fbm_perlin(wx * detail_scale, wy * detail_scale, base + 97, octaves=4)
+    base_h = 0.72 * h1 + 0.28 * h2
+    macro = fbm_perlin(wx * macro_scale, wy * macro_scale, base + 4001, octaves=3)
+
+    height_s = (base_h + macro * macro_amp) / (1.0 + macro_amp)
+    height_s = height_s - world.sea_level
+    height_s = height_s + coast_var_amp * fbm_perlin(wx * coast_var_scale, wy * coast_var_scale, base + 9991, octaves=2)
+    h01_s = _clamp01((height_s + 1.0) * 0.5)
+
+    n = fbm_perlin(wx * peak_scale, wy * peak_scale, base + 7777, octaves=4)
+    peak_s = _clamp01(1.0 - np.abs(n))
+    peak_s = peak_s * peak_s
+    mount_mask = _clamp01((h01_s - 0.50) / 0.50)
+    height_s = height_s + (0.38 * rugged) * peak_s * (mount_mask * mount_mask)
+    micro = fbm_perlin(wx * micro_scale, wy * micro_scale, base + 4242, octaves=3)
+    height_s = height_s + 0.05 * micro
+    height_s = height_s - 0.06 * water_bias
+
+    return {
+        "height": height_s,
+        "peak": peak_s,
+        "tnoise": fbm(wx * 0.003, wy * 0.003, base + 201, octaves=3),
+        "mnoise": fbm(wx * 0.004, wy * 0.004, base + 333, octaves=4),
+        "lake_noise": 1.0 - np.abs(fbm(wx * 0.0065, wy * 0.0065, base + 6060, octaves=3)),
+        "lake_mod": fbm(wx * 0.0016, wy * 0.0016, base + 6061, octaves=2),
+        "river_noise": np.abs(fbm(wx * 0.008, wy * 0.008, base + 7070, octaves=3)),
+    }
+
+
+def _classify_tiles(world, f: dict, gx_t: np.ndarray, gy_t: np.ndarray) -> dict:
+    """
+    Biome, niveau, température / humidité et tirages par tuile depuis les champs de bruit
+    `f` (même forme que les coordonnées entières gx_t, gy_t).
+    """
+    params = world.params
+    temp_bias = _TEMPERATURE_BIAS.get(str(getattr(params, "Climat", "Tempéré")), 0.0)
+    water_v = float(getattr(params, "Niveau_des_océans", 50))
+    water_bias = (water_v - 50.0) / 100.0
+
+    height = f["height"]
+    peak = f["peak"]
+    tnoise = f["tnoise"]
+    mnoise = f["mnoise"]
+    lake_noise = f["lake_noise"]
+    lake_mod = f["lake_mod"]
+    river_noise = f["river_noise"]
+
+    lake_level = 0.07 + 0.04 * water_bias
+    lake_level = max(0.03, min(0.14, lake_level))
+    lake_cut_base = 0.62 - 0.10 * water_bias
+    lake_cut_base = max(0.45, min(0.85, lake_cut_base))
+    river_th = 0.032 + 0.014 * max(0.0, water_bias)
+
+    inv_hm1 = 1.0 / max(1.0, float(world.height - 1))
+    lat_abs = np.abs((gy_t.astype(np.float64) * inv_hm1) * 2.0 - 1.0)
+
+    t01 = _clamp01((1.0 - lat_abs) + 0.25 * tnoise + temp_bias)
+    m01 = _clamp01((mnoise + 1.0) * 0.5)
+    m01 = _clamp01(m01 - 0.45 * np.maximum(0.0, height))
+
+    r0, r1, r2 = tile_randoms(gx_t, gy_t, int(world.seed))
+
+    h01 = _clamp01((height + 1.0) * 0.5)
+
+    # -------- eau douce --------
+    lake_cut = np.maximum(0.45, np.minimum(0.85, lake_cut_base + 0.08 * lake_mod))
+    is_lake = (lake_noise > lake_cut) & (height < lake_level) & (height >= 0.0)
+    is_river = (river_noise < river_th) & (height < 0.55) & (height >= 0.0)
+
+    # -------- biome --------
+    high = (h01 > 0.84) | (peak > 0.84)
+    high_bid = np.select(
+        [t01 < 0.22, t01 < 0.32, (t01 > 0.62) & (peak > 0.86) & (r1 < 0.35)],
+        [BIOME_SNOW, BIOME_ALPINE, BIOME_VOLCANIC],
+        default=BIOME_ROCK,
+    )
+    wet = (m01 > 0.74) & (h01 < 0.42)
+    wet_bid = np.where(
+        (lake_noise > (lake_cut - 0.04)) & (h01 < 0.30) & (r2 < 0.70),
+        BIOME_MANGROVE,
+        BIOME_SWAMP,
+    )
+    mystic = (tnoise < -0.45) & (mnoise > 0.55) & (r0 < 0.03)
+    climate_bid = np.select(
+        [
+            (t01 < 0.22) | ((h01 > 0.78) & (t01 < 0.32)),
+            t01 < 0.34,
+            m01 < 0.22,
+            m01 < 0.42,
+            m01 < 0.58,
+        ],
+        [
+            BIOME_SNOW,
+            np.where(m01 > 0.35, BIOME_TAIGA, BIOME_TUNDRA),
+            np.where(t01 > 0.45, BIOME_DESERT, BIOME_TUNDRA),
+            np.where(t01 > 0.45, BIOME_SAVANNA, BIOME_PLAINS),
+            np.where(t01 < 0.62, BIOME_PLAINS, BIOME_FOREST),
+        ],
+        default=np.where(t01 > 0.62, BIOME_RAINFOREST, BIOME_FOREST),
+    )
+    bid = np.select(
+        [is_lake, is_river, high, wet, mystic],
+        [BIOME_LAKE, BIOME_RIVER, high_bid, wet_bid, BIOME_MYSTIC],
+        default=climate_bid,
+    ).astype(np.int64)
+    water = is_lake | is_river
+
+    # -------- niveau --------
+    inner = max(1, world.tiles_levels - 1)
+    land01 = _clamp01(height / 1.0)
+    jitter = r2 * 2.0 - 1.0
+    land01 = _clamp01(land01 + 0.03 * jitter)
+    level = 1 + np.rint(land01 * inner).astype(np.int64)
+    level = np.where((peak > 0.78) & (level < world.tiles_levels), level + 1, level)
+    level = np.clip(level, 1, world.tiles_levels)
+    level = np.where(water, 0, level)
+
+    return {
+        "bid": bid,
+        "level": level,
+        "water": water,
+        "t01": t01,
+        "m01": m01,
+        "r0": r0,
+        "r1": r1,
+        "r2": r2,
+    }
+
+
+def generate_chunk_numpy(world, cx: int, cy: int) -> _Chunk:
+    """Équivalent vectorisé de ChunkedWorld._generate_chunk_python (sortie identique)."""
+    cs = world.chunk_size
+    ch = _Chunk(cx, cy, cs)
+
+    start_x = cx * cs
+    start_y = cy * cs
+    actual_w = min(cs, max(0, world.width - start_x))
+    actual_h = min(cs, max(0, world.height - start_y))
+    if actual_w <= 0 or actual_h <= 0:
+        return ch
+
+    params = world.params
+    biodiv_mul = _BIODIVERSITY_MUL.get(str(getattr(params, "biodiversity", "Moyenne")), 1.0)
+    res_mul = _RESOURCE_MUL.get(str(getattr(params, "Ressources", "Moyenne")), 1.0)
+
+    noise_step = world._chunk_noise_step()
+    xs, x0_idx, x_frac = _noise_axis(actual_w, noise_step)
+    ys, y0_idx, y_frac = _noise_axis(actual_h, noise_step)
+
+    # -------- grille grossière de bruit (ny, nx) --------
+    gxs = np.minimum(start_x + np.asarray(xs, dtype=np.int64), world.width - 1).astype(np.float64)
+    gys = np.minimum(start_y + np.asarray(ys, dtype=np.int64), world.height - 1).astype(np.float64)
+    gxf, gyf = np.meshgrid(gxs, gys)
+    coarse = _noise_fields(world, gxf, gyf)
+
+    # -------- interpolation bilinéaire vers (actual_h, actual_w) --------
+    iy0 = np.asarray(y0_idx, dtype=np.intp)[:, None]
+    ix0 = np.asarray(x0_idx, dtype=np.intp)[None, :]
+    fx = np.asarray(x_frac, dtype=np.float64)[None, :]
+    fy = np.asarray(y_frac, dtype=np.float64)[:, None]
+
+    def lerp2(s: np.ndarray) -> np.ndarray:
+        v00 = s[iy0, ix0]
+        v10 = s[iy0, ix0 + 1]
+        v01 = s[iy0 + 1, ix0]
+        v11 = s[iy0 + 1, ix0 + 1]
+        vx0 = v00 + (v10 - v00) * fx
+        vx1 = v01 + (v11 - v01) * fx
+        return vx0 + (vx1 - vx0) * fy
+
+    fields = {name: lerp2(values) for name, values in coarse.items()}
+    height = fields["height"]
+
+    gx_t = (start_x + np.arange(actual_w, dtype=np.int64))[None, :]
+    gy_t = (start_y + np.arange(actual_h, dtype=np.int64))[:, None]
+    gx_t, gy_t = np.broadcast_arrays(gx_t, gy_t)
+    tiles = _classify_tiles(world, fields, gx_t, gy_t)
+    bid = tiles["bid"]
+    level = tiles["level"]
+    water = tiles["water"]
+    r0, r1, r2 = tiles["r0"], tiles["r1"], tiles["r2"]
+
+    gid = _GROUND_LUT[bid]
+
+    # -------- props --------
+    base_p = _base_prop_lut(biodiv_mul)[bid]
+    ore_p_base = 0.0045 * res_mul
+    ore_p = np.where(level >= 4, ore_p_base * 1.25, ore_p_base)
+    ore = np.where(
+        (level >= 5) & (r1 < 0.18),
+        _PROP_ID_MAP["ore_gold"],
+        np.where(r1 < 0.55, _PROP_ID_MAP["ore_iron"], _PROP_ID_MAP["ore_copper"]),
+    )
+    prop = np.select(
+        [water, r0 < ore_p, r0 < ore_p + base_p],
+        [0, ore, _natural_props(bid, r1, r2)],
+        default=0,
+    )
+
+    # -------- écriture chunk --------
+    def full(values: np.ndarray, dtype) -> np.ndarray:
+        out = np.zeros((cs, cs), dtype=dtype)
+        out[:actual_h, :actual_w] = values
+        return out
+
+    def to_array(typecode: str, values: np.ndarray) -> array:
+        a = array(typecode)
+        a.frombytes(values.tobytes())
+        return a
+
+    ch.height_u8 = to_array("B", full((_clamp01((height + 1.0) * 0.5) * 255.0).astype(np.uint8), np.uint8))
+    ch.temp_u8 = to_array("B", full((_clamp01(tiles["t01"]) * 255.0).astype(np.uint8), np.uint8))
+    ch.moist_u8 = to_array("B", full((_clamp01(tiles["m01"]) * 255.0).astype(np.uint8), np.uint8))
+    ch.levels_u8 = to_array("B", full(level.astype(np.uint8), np.uint8))
+    ch.ground_u16 = to_array("H", full(gid.astype(np.uint16), np.uint16))
+    ch.overlay_obj = to_array("H", full(prop.astype(np.uint16), np.uint16))
+    ch.biome_u8 = to_array("B", full(bid.astype(np.uint8), np.uint8))
+
+    world._smooth_chunk_levels(ch.levels_u8, cs, actual_w, actual_h, iterations=3)
+    return ch
+
+
+# --------------------------------------------------------------------------------------
+# Aperçu de planète (points isolés, sans chunk)
+# --------------------------------------------------------------------------------------
+
+def sample_overview(world, xs, ys) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (biome, niveau) en uint8 aux tuiles entières (xs, ys), calculés directement depuis le
+    bruit, sans générer de chunk. Même classification que la génération ; seules
+    l'interpolation de la grille grossière et le lissage des niveaux du chunk diffèrent,
+    l'écart reste local (bords de biome, niveaux à ±1).
+    """
+    ix, iy = np.broadcast_arrays(np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64))
+    fields = _noise_fields(world, ix.astype(np.float64), iy.astype(np.float64))
+    tiles = _classify_tiles(world, fields, ix, iy)
+    return tiles["bid"].astype(np.uint8), tiles["level"].astype(np.uint8)
+
+
+# --------------------------------------------------------------------------------------
+# Score de spawn par lots
+# --------------------------------------------------------------------------------------
+
+def estimate_spawn_scores(world, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Équivalent vectorisé de ChunkedWorld._estimate_spawn_score sur des tableaux de
+    coordonnées entières (même forme) : score float64, NaN si la case n'est pas adaptée.
+    """
+    knobs = world._knobs()
+    rugged = float(knobs.get("rugged", 1.0))
+    temp_bias = float(knobs.get("temp_bias", 0.0))
+    water_bias = float(knobs.get("water_bias", 0.0))
+    biodiv_mul = float(knobs.get("biodiv_mul", 1.0))
+    res_mul = float(knobs.get("res_mul", 1.0))
+    base = int(world.seed)
+
+    cont_scale = 0.0011 * rugged
+    detail_scale = 0.0100 * rugged
+    macro_scale = 0.00035 * rugged
+    macro_amp = 0.55 * rugged
+    warp_amp = 140.0 * rugged
+    warp_scale = 0.0009
+    coast_var_scale = 0.0035
+    coast_var_amp = 0.030
+
+    ix, iy = np.broadcast_arrays(np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64))
+    gx = ix.astype(np.float64)
+    gy = iy.astype(np.float64)
+
+    wxp = gx + warp_amp * fbm_perlin(gx * warp_scale, gy * warp_scale, base + 90001, octaves=2)
+    wyp = gy + warp_amp * fbm_perlin((gx + 1337.0) * warp_scale, (gy - 7331.0) * warp_scale, base + 90002, octaves=2)
+
+    h1 = fbm_perlin(wxp * cont_scale, wyp * cont_scale, base + 11, octaves=5)
+    h2 = fbm_perlin(wxp * detail_scale, wyp * detail_scale, base + 97, octaves=4)
+    macro = fbm_perlin(wxp * macro_scale, wyp * macro_scale, base + 4001, octaves=3)
+
+    height = (0.72 * h1 + 0.28 * h2 + macro * macro_amp) / (1.0 + macro_amp)
+    height = height - world.sea_level
+    height = height + coast_var_amp * fbm_perlin(wxp * coast_var_scale, wyp * coast_var_scale, base + 9991, octaves=2)
+
+    ridged = 1.0 - np.abs(fbm_perlin(wxp * (0.0045 * rugged), wyp * (0.0045 * rugged), base + 7777, octaves=4))
+    ridged = _clamp01(ridged)
+    ridged = ridged * ridged
+    mount_mask = _clamp01((_clamp01((height + 1.0) * 0.5) - 0.50) / 0.50)
+    height = height + (0.38 * rugged) * ridged * (mount_mask * mount_mask)
+    micro = fbm_perlin(wxp * 0.025, wyp * 0.025, base + 4242, octaves=3)
+    height = height + 0.05 * micro
+    height = height - 0.06 * water_bias
+    h01 = _clamp01((height + 1.0) * 0.5)
+
+    lake_level = 0.07 + 0.04 * water_bias
+    lake_level = max(0.03, min(0.14, lake_level))
+    lake_noise = 1.0 - np.abs(fbm(wxp * 0.0065, wyp * 0.0065, base + 6060, octaves=3))
+    lake_mod = fbm(wxp * 0.0016, wyp * 0.0016, base + 6061, octaves=2)
+    lake_cut_base = 0.62 - 0.10 * water_bias
+    lake_cut_base = max(0.45, min(0.85, lake_cut_base))
+    lake_cut = np.maximum(0.45, np.minimum(0.85, lake_cut_base + 0.08 * lake_mod))
+    is_lake = (lake_noise > lake_cut) & (height < lake_level) & (height >= 0.0)
+
+    river_noise = np.abs(fbm(wxp * 0.008, wyp * 0.008, base + 7070, octaves=3))
+    river_th = 0.032 + 0.014 * max(0.0, water_bias)
+    is_river = (river_noise < river_th) & (height < 0.55) & (height >= 0.0)
+
+    lat_abs = np.abs((iy / max(1, world.height - 1)) * 2.0 - 1.0)
+    tnoise = fbm(wxp * 0.003, wyp * 0.003, base + 201, octaves=3)
+    t01 = _clamp01((1.0 - lat_abs) + 0.25 * tnoise + temp_bias)
+    mnoise = fbm(wxp * 0.004, wyp * 0.004, base + 333, octaves=4)
+    m01 = _clamp01((mnoise + 1.0) * 0.5 - 0.45 * np.maximum(0.0, height))
+
+    bid = np.select(
+        [t01 < 0.18, t01 < 0.32, m01 < 0.22, m01 < 0.42, m01 < 0.58],
+        [
+            BIOME_SNOW,
+            np.where(m01 > 0.35, BIOME_TAIGA, BIOME_TUNDRA),
+            np.where(t01 > 0.45, BIOME_DESERT, BIOME_TUNDRA),
+            np.where(t01 > 0.45, BIOME_SAVANNA, BIOME_PLAINS),
+            np.where(t01 < 0.62, BIOME_PLAINS, BIOME_FOREST),
+        ],
+        default=np.where(t01 > 0.62, BIOME_RAINFOREST, BIOME_FOREST),
+    ).astype(np.int64)
+
+    # Case occupée par un prop (même tirage que la génération) => inadaptée.
+    r0, _r1, _r2 = tile_randoms(ix, iy, base)
+    has_prop = r0 < (0.0045 * res_mul + _base_prop_lut(biodiv_mul)[bid])
+
+    score = np.select(
+        [
+            (bid == BIOME_PLAINS) | (bid == BIOME_FOREST),
+            bid == BIOME_SAVANNA,
+            (bid == BIOME_DESERT) | (bid == BIOME_SNOW) | (bid == BIOME_TUNDRA),
+        ],
+        [3.0, 1.0, -4.0],
+        default=0.0,
+    )
+    score = score - np.abs(h01 - 0.62) * 6.0
+    return np.where(is_lake | is_river | has_prop, np.nan, score)
@@ -0,0 +1,85 @@
+# bench_chunk_gen.py
+# Compare le débit de génération de chunks (chunks/seconde) des backends "python" et "numpy".
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_chunk_gen.py [--size Gigantesque] [--chunks 24] [--seed 1234]
+#
+# Vérifie aussi que les deux backends produisent exactement les mêmes chunks.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from Game.world.world_gen import ChunkedWorld, WorldParams, make_final_seed, PlanetWorldGenerator
+
+_FIELDS = ("height_u8", "temp_u8", "moist_u8", "levels_u8", "ground_u16", "overlay_obj", "biome_u8")
+
+
+def _build_world(size: str, seed: int) -> ChunkedWorld:
+    params = WorldParams.from_dict({"seed": seed, "world_size": size})
+    width, height = PlanetWorldGenerator()._dims_from_params(params)
+    return ChunkedWorld(width, height, make_final_seed(seed, params), params)
+
+
+def _chunk_coords(world: ChunkedWorld, count: int) -> list[tuple[int, int]]:
+    cs = world.chunk_size
+    sx, sy = world.spawn
+    cx0, cy0 = sx // cs, sy // cs
+    max_cx = (world.width + cs - 1) // cs
+    max_cy = (world.height + cs - 1) // cs
+    coords = []
+    ring = 0
+    while len(coords) < count:
+        for dy in range(-ring, ring + 1):
+            for dx in range(-ring, ring + 1):
+                if max(abs(dx), abs(dy)) != ring:
+                    continue
+                cy = cy0 + dy
+                if 0 <= cy < max_cy:
+                    coords.append(((cx0 + dx) % max_cx, cy))
+        ring += 1
+    return coords[:count]
+
+
+def _run(world: ChunkedWorld, backend: str, coords):
+    world.params.chunk_backend = backend
+    chunks = []
+    t0 = time.perf_counter()
+    for cx, cy in coords:
+        chunks.append(world._generate_chunk(cx, cy))
+    elapsed = time.perf_counter() - t0
+    return chunks, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="Gigantesque")
+    parser.add_argument("--chunks", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    world = _build_world(args.size, args.seed)
+    coords = _chunk_coords(world, max(1, args.chunks))
+    print(f"Monde {args.size} {world.width}x{world.height}, chunk {world.chunk_size}, {len(coords)} chunks")
+
+    results = {}
+    for backend in ("python", "numpy"):
+        chunks, elapsed = _run(world, backend, coords)
+        results[backend] = chunks
+        rate = len(coords) / max(elapsed, 1e-9)
+        print(f"  {backend:<6} : {elapsed:7.3f}s | {rate:8.1f} chunks/s | {1000.0 * elapsed / len(coords):7.2f} ms/chunk")
+
+    mismatches = 0
+    for a, b in zip(results["python"], results["numpy"]):
+        for field in _FIELDS:
+            if getattr(a, field) != getattr(b, field):
+                mismatches += 1
+                print(f"  [!] Chunk ({a.cx},{a.cy}) différent sur {field}")
+    print("  Sortie identique" if mismatches == 0 else f"  {mismatches} différence(s) !")
+
+
+if __name__ == "__main__":
+    main()
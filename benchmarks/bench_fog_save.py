@@ -0,0 +1,125 @@
+# bench_fog_save.py
+# Taille et temps de sauvegarde / chargement du brouillard de guerre sur une carte très explorée :
+# bitsets bruts par chunk (ancien format) contre chunks compressés, pleins en simple drapeau,
+# décodés à la demande (format actuel).
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_fog_save.py [--size Gigantesque] [--explored 0.6] [--seed 1234]
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from Game.world.fog_of_war import FogOfWar
+from Game.world.world_gen import PlanetWorldGenerator, WorldParams
+
+_CHUNK_SIZE = 64
+_VIEW = (0, 0, 256, 192)  # rectangle de tuiles lu par le rendu juste après le chargement
+
+
+class _Observer:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+def _explore(fog: FogOfWar, fraction: float, seed: int) -> None:
+    """Marches aléatoires d'observateurs jusqu'à couvrir `fraction` de la carte."""
+    rng = np.random.default_rng(seed)
+    walkers = [_Observer(int(rng.integers(fog.width)), int(rng.integers(fog.height))) for _ in range(128)]
+    target = fraction * fog.width * fog.height
+    light = 0.0
+    while True:
+        for _ in range(50):
+            for w in walkers:
+                w.x = (w.x + int(rng.integers(-10, 11))) % fog.width
+                w.y = min(fog.height - 1, max(0, w.y + int(rng.integers(-10, 11))))
+            fog.recompute(walkers, lambda _e: 20, light)
+        explored = sum(int(fog._explored_get(k).sum()) for k in list(fog._explored_chunks))
+        if explored >= target:
+            return
+        # Change de palier de lumière : repart d'une couche visible vide (marches plus longues).
+        light = 1.0 - light
+
+
+def _legacy_state(fog: FogOfWar) -> dict:
+    """export_state de l'ancien format : un bitset brut par chunk exploré."""
+    chunks = []
+    for (cx, cy), layer in fog._explored_chunks.items():
+        chunks.append((int(cx), int(cy), np.packbits(layer.reshape(-1), bitorder="little").tobytes()))
+    return {
+        "width": fog.width,
+        "height": fog.height,
+        "chunk_size": fog.chunk_size,
+        "wrap_x": fog.wrap_x,
+        "explored_chunks": chunks,
+    }
+
+
+def _legacy_import(fog: FogOfWar, state: dict) -> None:
+    """import_state de l'ancien format : tous les chunks décodés au chargement."""
+    cs = fog.chunk_size
+    n = cs * cs
+    for cx, cy, data in state["explored_chunks"]:
+        bits = np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8), bitorder="little")
+        fog._explored_chunks[(int(cx), int(cy))] = bits[:n].astype(np.bool_).reshape(cs, cs)
+
+
+def _measure(label: str, fog: FogOfWar, export, load=None) -> None:
+    t0 = time.perf_counter()
+    state = export()
+    t_export = time.perf_counter() - t0
+    blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    t0 = time.perf_counter()
+    loaded = FogOfWar(fog.width, fog.height, chunk_size=fog.chunk_size, wrap_x=fog.wrap_x)
+    if load is None:
+        loaded.import_state(pickle.loads(blob))
+    else:
+        load(loaded, pickle.loads(blob))
+    t_import = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    loaded.get_region(*_VIEW)
+    t_first = time.perf_counter() - t0
+
+    print(
+        f"  {label:<16} | {len(blob) / 1024:9.1f} Ko | export {t_export * 1000:7.1f} ms"
+        f" | import {t_import * 1000:7.1f} ms | 1er rendu {t_first * 1000:6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="Gigantesque")
+    parser.add_argument("--explored", type=float, default=0.6, help="part de la carte explorée (0..1)")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    params = WorldParams.from_dict({"seed": args.seed, "world_size": args.size})
+    width, height = PlanetWorldGenerator()._dims_from_params(params)
+    fog = FogOfWar(width, height, chunk_size=_CHUNK_SIZE, wrap_x=True)
+    _explore(fog, max(0.0, min(1.0, args.explored)), args.seed)
+
+    state = fog.export_state()
+    print(
+        f"Carte {args.size} {width}x{height}, {len(fog._explored_chunks)} chunks explorés"
+        f" ({len(state['explored_full'])} pleins, {len(state['explored_zlib'])} partiels)"
+    )
+    fog.get_region(*_VIEW)  # premiers appels NumPy hors mesure
+    print("  format           |    taille    | export           | import           | lecture")
+    _measure("bitsets bruts", fog, lambda: _legacy_state(fog), _legacy_import)
+    fog._explored_saved.clear()
+    _measure("compressé", fog, fog.export_state)
+    # Sauvegarde suivante sans nouvelle exploration : encodages réutilisés.
+    _measure("compressé (2e)", fog, fog.export_state)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# bench_iso_render.py
+# Temps de frame d'IsoMapView.render à plusieurs niveaux de zoom (frame complète et
+# réutilisation au défilement). Avec --baseline REV, le renderer de la révision git REV
+# (ex. 44ea670, avant la projection vectorisée des bandes iso) est mesuré sur le même
+# monde, pour une comparaison avant / après.
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_iso_render.py [--size Moyenne] [--frames 60] [--seed 1234] [--fog] [--baseline REV]
+#
+# Fenêtre SDL factice : aucun affichage n'est ouvert.
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+import pygame
+
+from Game.core.assets import Assets
+from Game.ui.iso_render import IsoMapView
+from Game.world.fog_of_war import FogOfWar
+from Game.world.world_gen import ChunkedWorld, WorldParams, make_final_seed, PlanetWorldGenerator
+
+_ZOOMS = (1.0, 1.25, 1.5, 2.5, 4.0)
+_SCREEN = (1280, 720)
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+
+
+def _load_baseline(rev: str):
+    """IsoMapView de Game/ui/iso_render.py à la révision git `rev` (reste du jeu : arbre courant)."""
+    src = subprocess.run(
+        ["git", "show", f"{rev}:Game/ui/iso_render.py"],
+        cwd=_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False, encoding="utf-8") as f:
+        f.write(src)
+    try:
+        spec = importlib.util.spec_from_file_location("iso_render_baseline", f.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.unlink(f.name)
+    return module.IsoMapView
+
+
+def _build_world(size: str, seed: int):
+    params = WorldParams.from_dict({"seed": seed, "world_size": size, "disk_cache": False})
+    width, height = PlanetWorldGenerator()._dims_from_params(params)
+    return ChunkedWorld(width, height, make_final_seed(seed, params), params)
+
+
+def _make_view(view_cls, assets, world, fog, zoom: float, scroll_reuse: bool) -> IsoMapView:
+    view = view_cls(assets, _SCREEN)
+    view.set_world(world)
+    view.fog = fog
+    view.scroll_reuse = scroll_reuse
+    view.zoom = zoom
+    dx, dy, _wall_h = view._proj_consts()
+    sx, sy = view.world_to_screen(world.spawn[0], world.spawn[1], 0, dx, dy, 0)
+    view.cam_x, view.cam_y = sx + 0.3, sy + 0.7
+    return view
+
+
+def _frame_ms(view: IsoMapView, frames: int, pan: bool) -> float:
+    surf = pygame.Surface(_SCREEN)
+    for _ in range(5):  # chunks générés, blocs de sol pré-rendus
+        surf.fill(view.background_color)
+        view.begin_hitframe()
+        view.render(surf)
+    t0 = time.perf_counter()
+    for k in range(frames):
+        if pan:
+            view.cam_x += 3.0 if (k // 20) % 2 == 0 else -3.0
+            view.cam_y += 1.5
+        surf.fill(view.background_color)
+        view.begin_hitframe()
+        view.render(surf)
+    return 1000.0 * (time.perf_counter() - t0) / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="Moyenne")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--fog", action="store_true", help="brouillard : zone explorée autour du spawn")
+    parser.add_argument("--baseline", metavar="REV", help="révision git du renderer de référence")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode(_SCREEN)
+    assets = Assets().load_all(os.path.join(os.path.dirname(__file__), "../Game/assets"))
+    world = _build_world(args.size, args.seed)
+    fog = None
+    if args.fog:
+        fog = FogOfWar(world.width, world.height, wrap_x=True)
+        sx, sy = world.spawn
+        for y in range(sy - 60, sy + 40):
+            for x in range(sx - 80, sx + 30):
+                fog._set_explored(x, y)
+    print(f"Monde {args.size} {world.width}x{world.height}, écran {_SCREEN[0]}x{_SCREEN[1]}, {args.frames} frames")
+    baseline = _load_baseline(args.baseline) if args.baseline else None
+    if baseline is None:
+        print("  zoom | complet ms | défilement ms")
+    else:
+        print(f"  zoom | complet ms | défilement ms | {args.baseline} ms | gain")
+
+    frames = max(1, args.frames)
+    for zoom in _ZOOMS:
+        full = _frame_ms(_make_view(IsoMapView, assets, world, fog, zoom, scroll_reuse=False), frames, pan=True)
+        scrolled = _frame_ms(_make_view(IsoMapView, assets, world, fog, zoom, scroll_reuse=True), frames, pan=True)
+        line = f"  {zoom:4.2f} | {full:10.2f} | {scrolled:13.2f}"
+        if baseline is not None:
+            before = _frame_ms(_make_view(baseline, assets, world, fog, zoom, scroll_reuse=False), frames, pan=True)
+            line += f" | {before:{len(args.baseline) + 3}.2f} | x{before / max(1e-9, full):.2f}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
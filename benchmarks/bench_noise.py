@@ -0,0 +1,70 @@
+# bench_noise.py
+# Débit du moteur de bruit par lots (échantillons/seconde) selon le nombre d'octaves.
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_noise.py [--grid 256] [--octaves 1 2 3 4 5 6] [--repeat 5] [--scalar]
+#
+# Compare value noise (fbm) et Perlin (fbm_perlin) en float64 et float32 sur une grille
+# grid x grid. --scalar ajoute la référence scalaire de world_gen (sur un échantillon réduit).
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+import numpy as np
+
+from Game.world import noise
+from Game.world.world_gen import _fbm, _fbm_perlin
+
+
+def _grid(size: int, scale: float):
+    xs = np.arange(size, dtype=np.float64) * scale + 1234.5
+    ys = np.arange(size, dtype=np.float64) * scale - 321.25
+    return np.meshgrid(xs, ys)
+
+
+def _best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grid", type=int, default=256)
+    parser.add_argument("--scale", type=float, default=0.01)
+    parser.add_argument("--octaves", type=int, nargs="+", default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scalar", action="store_true", help="inclut la référence scalaire")
+    args = parser.parse_args()
+
+    x, y = _grid(max(1, args.grid), args.scale)
+    n = x.size
+    print(f"Grille {args.grid}x{args.grid} ({n} échantillons), échelle {args.scale}, meilleur de {args.repeat}")
+
+    kinds = [("fbm", noise.fbm, _fbm), ("perlin", noise.fbm_perlin, _fbm_perlin)]
+    for name, batched, scalar in kinds:
+        print(f"  {name}")
+        for octaves in args.octaves:
+            row = f"    octaves={octaves}"
+            for dtype in (np.float64, np.float32):
+                noise.clear_caches()
+                elapsed = _best_time(lambda: batched(x, y, args.seed, octaves, dtype=dtype), args.repeat)
+                row += f" | {np.dtype(dtype).name}: {n / max(elapsed, 1e-9) / 1e6:7.2f} M/s"
+            if args.scalar:
+                k = min(n, 4096)
+                xs, ys = x.ravel()[:k].tolist(), y.ravel()[:k].tolist()
+                elapsed = _best_time(lambda: [scalar(a, b, args.seed, octaves) for a, b in zip(xs, ys)], 1)
+                row += f" | scalaire: {k / max(elapsed, 1e-9) / 1e6:7.3f} M/s"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# bench_pathfinding.py
+# Ordres de déplacement longue distance : A* sur tuiles de Phase1 (borné à 20000 nœuds /
+# 20 ms) contre itinéraire par chunks (HPA*) + affinage du premier tronçon, puis suite de
+# l'itinéraire affinée frame par frame dans le budget de Phase1 (pire appel, frames par
+# ordre), recherche d'itinéraire découpée au budget de la frame (graphe froid puis chaud),
+# ordres vers une case enclose, et mise à jour du graphe après la pose d'un mur.
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_pathfinding.py [--size Moyenne] [--chunks 10] [--orders 40] [--seed 1234]
+#
+# Fenêtre SDL factice : aucun affichage n'est ouvert.
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+import pygame
+
+pygame.init()  # polices chargées à l'import des HUD
+
+from Game.gameplay.phase1 import Phase1, _HPA_FRAME_BUDGET_SEC
+from Game.world.world_gen import ChunkedWorld, PlanetWorldGenerator, WorldParams, make_final_seed
+
+
+def _phase_for(world) -> Phase1:
+    """Phase1 sans application : seules les méthodes de pathfinding sont utilisées."""
+    phase = Phase1.__new__(Phase1)
+    phase.world = world
+    phase._walk_cache = None
+    phase._path_finders = {}
+    phase._route_deadline = 0.0
+    phase.chunk_service = None
+    return phase
+
+
+def _route(phase: Phase1, a, b):
+    """Itinéraire HPA* complet (sans échéance)."""
+    search = phase._hpa_search(a, b)
+    search.step()
+    return search.route
+
+
+def _budgeted_routes(phase: Phase1, orders) -> tuple[float, float, float]:
+    """(pire pas, moyenne de frames, ms de calcul) par itinéraire, un pas par frame dans le budget."""
+    worst = 0.0
+    frames = 0
+    total = 0.0
+    for a, b in orders:
+        search = phase._hpa_search(a, b)
+        done = False
+        while not done:
+            t0 = time.perf_counter()
+            done = search.step(t0 + _HPA_FRAME_BUDGET_SEC)
+            dt = time.perf_counter() - t0
+            worst = max(worst, dt)
+            total += dt
+            frames += 1
+    k = max(1, len(orders))
+    return 1000 * worst, frames / k, 1000 * total / k
+
+
+def _enclose(world, tile) -> None:
+    """Anneau de constructions autour de `tile` : case praticable mais inaccessible."""
+    x, y = tile
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            if max(abs(dx), abs(dy)) == 2:
+                world.set_overlay(x + dx, y + dy, {"pid": 99, "state": "building"})
+
+
+def _check_path(phase: Phase1, start, path) -> bool:
+    """Pas 8-connexes, toutes les tuiles praticables."""
+    prev = start
+    for tile in path:
+        if max(abs(tile[0] - prev[0]), abs(tile[1] - prev[1])) != 1:
+            return False
+        if not phase._is_walkable(*tile, generate=False):
+            return False
+        prev = tile
+    return True
+
+
+def _length(start, path) -> float:
+    total = 0.0
+    prev = start
+    for tile in path:
+        total += 1.41421356237 if (tile[0] != prev[0] and tile[1] != prev[1]) else 1.0
+        prev = tile
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="Moyenne")
+    parser.add_argument("--chunks", type=int, default=10, help="côté de la zone chargée, en chunks")
+    parser.add_argument("--orders", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    params = WorldParams.from_dict({"seed": args.seed, "world_size": args.size, "disk_cache": False})
+    width, height = PlanetWorldGenerator()._dims_from_params(params)
+    world = ChunkedWorld(width, height, make_final_seed(args.seed, params), params)
+    cs = world.chunk_size
+    n = max(2, args.chunks)
+    world.cache_bytes = max(world.cache_bytes, (n * n + 64) * world._chunk_bytes)
+    cx0 = max(0, world.spawn[0] // cs - n // 2)
+    cy0 = max(0, min(height // cs - n, world.spawn[1] // cs - n // 2))
+    x0, y0 = cx0 * cs, cy0 * cs
+    for cy in range(cy0, cy0 + n):
+        for cx in range(cx0, cx0 + n):
+            world.ensure_chunk_at(cx * cs, cy * cs)
+
+    phase = _phase_for(world)
+    rng = random.Random(args.seed)
+
+    def random_tile():
+        while True:
+            t = (x0 + rng.randrange(n * cs), y0 + rng.randrange(n * cs))
+            if phase._is_walkable(*t, generate=False):
+                return t
+
+    orders = []
+    while len(orders) < args.orders:
+        a, b = random_tile(), random_tile()
+        if max(abs(a[0] - b[0]), abs(a[1] - b[1])) >= n * cs // 3:
+            orders.append((a, b))
+    print(f"Monde {args.size} {width}x{height}, zone {n}x{n} chunks, {len(orders)} ordres longs")
+
+    # Recherche découpée en frames, graphe à construire (froid) puis déjà construit (chaud).
+    # Premier étiquetage (mise en route de NumPy) fait sur une Phase1 jetable.
+    _phase_for(world)._hpa_finder().prepare(cx0, cy0)
+    # Objets du monde chargé sortis du ramasse-miettes : ses passes complètes (dizaines de
+    # ms) tomberaient au hasard dans les pas mesurés.
+    gc.collect()
+    gc.freeze()
+    cold = _budgeted_routes(phase, orders[:8])
+    warm = _budgeted_routes(phase, orders[:8])
+    for label, (worst, frames, ms) in (("froid", cold), ("chaud", warm)):
+        print(
+            f"  itinéraire par frames ({label}) : pire pas {worst:.2f} ms,"
+            f" {frames:.1f} frames, {ms:.2f} ms de calcul / itinéraire"
+        )
+
+    # Graphe construit une fois (étiquettes + frontières de la zone), hors mesure.
+    for a, b in orders[:4]:
+        _route(phase, a, b)
+
+    ok_astar = 0
+    t_astar = 0.0
+    k = max(1, len(orders))
+    ok_hpa = 0
+    t_route = 0.0
+    t_first = 0.0
+    valid = 0
+    ratio = []
+    worst_call = 0.0
+    frames = 0
+    replans = 0
+    for a, b in orders:
+        t0 = time.perf_counter()
+        path = phase._astar_path(a, b, allow_partial=False, generate=False)
+        t_astar += time.perf_counter() - t0
+        ok_astar += bool(path)
+
+        t0 = time.perf_counter()
+        route = _route(phase, a, b)
+        t1 = time.perf_counter()
+        first = phase._refine_route(a, route, deadline=t1 + _HPA_FRAME_BUDGET_SEC) if route else None
+        t2 = time.perf_counter()
+        t_route += t1 - t0
+        t_first += t2 - t1
+        if not first:
+            continue
+        ok_hpa += 1
+
+        # Suite de l'itinéraire : un appel par frame, dans le budget de la frame ; tronçon
+        # sans issue -> nouvel itinéraire depuis la tuile atteinte (comme _extend_route).
+        full = list(first)
+        while route:
+            t0 = time.perf_counter()
+            seg = phase._refine_route(full[-1], route, deadline=t0 + _HPA_FRAME_BUDGET_SEC)
+            worst_call = max(worst_call, time.perf_counter() - t0)
+            frames += 1
+            if seg is None and replans < 10 * k:
+                replans += 1
+                route = _route(phase, full[-1], b) or []
+                continue
+            if not seg:
+                break
+            full.extend(seg)
+        if full and full[-1] == b and _check_path(phase, a, full):
+            valid += 1
+            best = phase._astar_path(a, b, generate=False, max_nodes=10 ** 7, time_budget_sec=None)
+            if best:
+                ratio.append(_length(a, full) / max(1e-9, _length(a, best[1:])))
+
+    print(f"  A* tuiles  : {ok_astar:3d}/{k} trouvés, {1000 * t_astar / k:7.2f} ms / ordre")
+    print(
+        f"  HPA*       : {ok_hpa:3d}/{k} trouvés, itinéraire {1000 * t_route / k:6.2f} ms"
+        f" + 1er tronçon {1000 * t_first / k:6.2f} ms / ordre"
+    )
+    print(
+        f"  affinage par frame (budget {1000 * _HPA_FRAME_BUDGET_SEC:.0f} ms) : pire appel"
+        f" {1000 * worst_call:.2f} ms, {frames / max(1, ok_hpa):.1f} appels / ordre, {replans} replanifications"
+    )
+    if ratio:
+        print(
+            f"  tracés complets valides : {valid}/{ok_hpa}, longueur / optimum :"
+            f" moy. {sum(ratio) / len(ratio):.3f}, max {max(ratio):.3f}"
+        )
+
+    # Case enclose : rejet immédiat (composante sans entrée), puis case enclose dans une
+    # zone plus grande (recherche épuisée une fois, puis réponse en cache).
+    target = random_tile()
+    _enclose(world, target)
+    t0 = time.perf_counter()
+    enclosed = [_route(phase, a, target) for a, _b in orders]
+    t_enclosed = time.perf_counter() - t0
+    wall = []
+    for dx in range(-20, 21):
+        for dy in range(-20, 21):
+            if max(abs(dx), abs(dy)) == 20:
+                wall.append((target[0] + dx, target[1] + dy))
+                world.set_overlay(target[0] + dx, target[1] + dy, {"pid": 99, "state": "building"})
+    inner = (target[0] + 10, target[1] + 10)
+    t0 = time.perf_counter()
+    first = _route(phase, orders[0][0], inner)
+    t_first_enc = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    again = [_route(phase, a, inner) for a, _b in orders]
+    t_again = time.perf_counter() - t0
+    print(
+        f"  case enclose : {sum(r is None for r in enclosed)}/{k} rejetés, {1000 * t_enclosed / k:.3f} ms / ordre ;"
+        f" enclos de 40 tuiles : 1er ordre {1000 * t_first_enc:.2f} ms ({'rejeté' if first is None else 'trouvé'}),"
+        f" suivants {1000 * t_again / k:.3f} ms ({sum(r is None for r in again)}/{k} rejetés)"
+    )
+    for x, y in wall + [(target[0] + dx, target[1] + dy) for dx in range(-2, 3) for dy in range(-2, 3)]:
+        world.set_overlay(x, y, None)
+
+    # Mur de constructions au milieu de la zone : seuls les chunks touchés sont recalculés.
+    finder = phase._path_finders[False]
+    before = dict(finder.stats())
+    wx = x0 + (n // 2) * cs + cs // 2
+    gap = y0 + rng.randrange(n * cs)
+    for y in range(y0, y0 + n * cs):
+        if abs(y - gap) > 2:
+            world.set_overlay(wx, y, {"pid": 99, "state": "building"})
+    t0 = time.perf_counter()
+    for a, b in orders:
+        _route(phase, a, b)
+    dt = time.perf_counter() - t0
+    after = finder.stats()
+    print(
+        f"  après un mur (1 colonne de chunks) : {after['label_builds'] - before['label_builds']} étiquetages,"
+        f" {after['border_builds'] - before['border_builds']} frontières recalculés,"
+        f" {1000 * dt / k:.2f} ms / itinéraire"
+    )
+
+
+if __name__ == "__main__":
+    main()
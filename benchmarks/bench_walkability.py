@@ -0,0 +1,256 @@
+# bench_walkability.py
+# Débit du test de praticabilité de Phase1 : lecture tuile par tuile (get_tile_snapshot +
+# overlay + nom de sprite, avant) contre couches par chunk mises en cache (après), avec
+# vérification que les deux donnent le même résultat. Mesures : Phase1._is_walkable, probe
+# de recherche, et A* complets de Phase1 (fenêtre indexée, couches) contre l'ancien A*
+# (dictionnaires de tuples, test tuile par tuile). Médiane de --repeat passes.
+#
+# Usage (depuis la racine du projet) :
+#   python benchmarks/bench_walkability.py [--size Moyenne] [--radius 128] [--seed 1234] [--repeat 5]
+#
+# Fenêtre SDL factice : aucun affichage n'est ouvert.
+
+import argparse
+import heapq
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+import pygame
+
+pygame.init()  # polices chargées à l'import des HUD
+
+from Game.gameplay.phase1 import Phase1
+from Game.world.tiles import get_ground_sprite_name
+from Game.world.walkability import WalkabilityCache
+from Game.world.world_gen import ChunkedWorld, PlanetWorldGenerator, WorldParams, make_final_seed
+
+# Mêmes règles que Phase1 (biomes d'eau, cadavres / tombes franchissables).
+_WATER_BIOME_IDS = {1, 3, 4}
+_CORPSE_IDS = {150, 151}
+_NEIGH = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _passable(cell) -> bool:
+    if isinstance(cell, dict):
+        if str(cell.get("state", "")).strip().lower() in {"corpse", "grave"}:
+            return True
+        try:
+            return int(cell.get("pid")) in _CORPSE_IDS
+        except Exception:
+            return False
+    if isinstance(cell, int):
+        return int(cell) in _CORPSE_IDS
+    return False
+
+
+def _legacy_walkable(world, i: int, j: int, water_walker: bool) -> bool:
+    """Ancien Phase1._is_walkable (generate=False)."""
+    if i < 0 or j < 0 or i >= world.width or j >= world.height:
+        return False
+    snap = world.get_tile_snapshot(i, j, generate=False)
+    if snap is None:
+        return False
+    _lvl, gid, overlay, bid = snap
+    if overlay and not _passable(overlay):
+        return False
+    if int(bid) in _WATER_BIOME_IDS:
+        return water_walker
+    name = get_ground_sprite_name(gid) if gid is not None else None
+    if name and any(token in name.lower() for token in ("water", "ocean", "sea", "lake", "river")):
+        return water_walker
+    return True
+
+
+def _decorate(world, x0: int, y0: int, radius: int, rng: random.Random) -> None:
+    """Constructions, cadavres et sols modifiés autour du spawn (overrides)."""
+    for _ in range(radius * 4):
+        x = x0 + rng.randint(-radius, radius)
+        y = y0 + rng.randint(-radius, radius)
+        kind = rng.random()
+        if kind < 0.4:
+            world.set_overlay(x, y, {"pid": 99, "state": "building"})
+        elif kind < 0.55:
+            world.set_overlay(x, y, {"pid": 150, "state": "corpse"})
+        elif kind < 0.7:
+            world.set_overlay(x, y, 151)
+        elif kind < 0.85:
+            world.set_overlay(x, y, None)
+        else:
+            world.set_biome_id(x, y, rng.choice((1, 2, 3, 4, 5)))
+
+
+def _phase_for(world, layers: bool) -> Phase1:
+    """Phase1 sans application ; layers=False : ancien test tuile par tuile (get_tile_snapshot)."""
+    phase = Phase1.__new__(Phase1)
+    phase.world = world
+    phase._walk_cache = None
+    phase._path_finders = {}
+    if not layers:
+        phase._walkability = lambda: None
+    return phase
+
+
+def _legacy_astar(world, start, goal, max_nodes: int):
+    """Ancien Phase1._astar_path (allow_partial, generate=False, sans limite de temps)."""
+    if not _legacy_walkable(world, *goal, False) or start == goal:
+        return []
+    sqrt2 = 1.41421356237
+    octile_k = sqrt2 - 2.0
+
+    def h(a, b):
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        return (dx + dy) + octile_k * min(dx, dy)
+
+    openh = [(h(start, goal), 0.0, start)]
+    came = {start: None}
+    gscore = {start: 0.0}
+    best, best_h = start, h(start, goal)
+    expanded = 0
+    while openh and expanded < max_nodes:
+        _f, gc, cur = heapq.heappop(openh)
+        if gc != gscore.get(cur):
+            continue
+        if cur == goal:
+            best = cur
+            break
+        expanded += 1
+        cur_h = h(cur, goal)
+        if cur_h < best_h:
+            best_h, best = cur_h, cur
+        for dx, dy in _NEIGH:
+            nx, ny = cur[0] + dx, cur[1] + dy
+            if not _legacy_walkable(world, nx, ny, False):
+                continue
+            ng = gc + (sqrt2 if (dx != 0 and dy != 0) else 1.0)
+            if ng < gscore.get((nx, ny), 1e18):
+                gscore[(nx, ny)] = ng
+                came[(nx, ny)] = cur
+                heapq.heappush(openh, (ng + h((nx, ny), goal), ng, (nx, ny)))
+    path = []
+    cur = best
+    while cur is not None and cur != start:
+        path.append(cur)
+        cur = came[cur]
+    path.reverse()
+    return path
+
+
+def _cost(start, path) -> float:
+    total, prev = 0.0, start
+    for p in path:
+        total += math.hypot(p[0] - prev[0], p[1] - prev[1])
+        prev = p
+    return total
+
+
+def _expansions(walkable, tiles) -> float:
+    """Nombre de nœuds A* "développés" par seconde (8 voisins testés par nœud)."""
+    t0 = time.perf_counter()
+    for x, y in tiles:
+        for dx, dy in _NEIGH:
+            walkable(x + dx, y + dy)
+    return len(tiles) / max(1e-9, time.perf_counter() - t0)
+
+
+def _median(measure, repeat: int) -> float:
+    return statistics.median(measure() for _ in range(max(1, repeat)))
+
+
+def _astar_ms(search, orders) -> float:
+    t0 = time.perf_counter()
+    for a, b in orders:
+        search(a, b)
+    return 1000.0 * (time.perf_counter() - t0) / max(1, len(orders))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="Moyenne")
+    parser.add_argument("--radius", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    params = WorldParams.from_dict({"seed": args.seed, "world_size": args.size, "disk_cache": False})
+    width, height = PlanetWorldGenerator()._dims_from_params(params)
+    world = ChunkedWorld(width, height, make_final_seed(args.seed, params), params)
+    sx, sy = world.spawn
+    r = max(8, args.radius)
+    rng = random.Random(args.seed)
+    for y in range(max(0, sy - r), min(height, sy + r), world.chunk_size):
+        for x in range(sx - r, sx + r, world.chunk_size):
+            world.ensure_chunk_at(x, y)
+    _decorate(world, sx, sy, r, rng)
+
+    cache = WalkabilityCache(world, _WATER_BIOME_IDS, _passable)
+    tiles = [(sx + rng.randint(-r, r), min(height - 1, max(0, sy + rng.randint(-r, r)))) for _ in range(20000)]
+
+    mismatches = 0
+    for water in (False, True):
+        probe = cache.probe(water)
+        for x, y in tiles:
+            if probe(x, y) != _legacy_walkable(world, x, y, water):
+                mismatches += 1
+    print(f"Monde {args.size} {width}x{height}, {len(tiles)} tuiles, écarts : {mismatches}")
+
+    phase = _phase_for(world, layers=True)
+    old_phase = _phase_for(world, layers=False)
+    probe = cache.probe(False)
+    rep = args.repeat
+    legacy = _median(lambda: _expansions(lambda i, j: _legacy_walkable(world, i, j, False), tiles), rep)
+    current = _median(lambda: _expansions(lambda i, j: phase._is_walkable(i, j, generate=False), tiles), rep)
+    probed = _median(lambda: _expansions(probe, tiles), rep)
+    print(f"  tuile par tuile        : {legacy:10.0f} nœuds/s")
+    print(f"  Phase1._is_walkable    : {current:10.0f} nœuds/s  (x{current / legacy:.1f})")
+    print(f"  probe de recherche     : {probed:10.0f} nœuds/s  (x{probed / legacy:.1f})")
+
+    # A* complets (4000 nœuds max) entre tuiles praticables distantes de 20 à 60 tuiles.
+    orders = []
+    while len(orders) < 40:
+        a, b = rng.choice(tiles), rng.choice(tiles)
+        d = max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+        if 20 <= d <= 60 and _legacy_walkable(world, *a, False) and _legacy_walkable(world, *b, False):
+            orders.append((a, b))
+
+
+    def search(p):
+        return lambda a, b: p._astar_path(a, b, allow_partial=True, generate=False, max_nodes=4000, time_budget_sec=None)
+
+    def legacy(a, b):
+        return _legacy_astar(world, a, b, 4000)
+
+    same = sum(search(phase)(a, b) == search(old_phase)(a, b) for a, b in orders)
+    same_cost = sum(
+        abs(_cost(a, search(phase)(a, b)) - _cost(a, legacy(a, b))) < 1e-6 for a, b in orders
+    )
+    legacy_ms = _median(lambda: _astar_ms(legacy, orders), rep)
+    old_ms = _median(lambda: _astar_ms(search(old_phase), orders), rep)
+    new_ms = _median(lambda: _astar_ms(search(phase), orders), rep)
+    print(
+        f"  A* ancien ({len(orders)} ordres, chemins de même coût {same_cost}/{len(orders)}) :"
+        f" {legacy_ms:.2f} -> {new_ms:.2f} ms / ordre (x{legacy_ms / max(1e-9, new_ms):.1f})"
+    )
+    print(
+        f"  A* Phase1 sans couches (chemins identiques {same}/{len(orders)}) :"
+        f" {old_ms:.2f} -> {new_ms:.2f} ms / ordre (x{old_ms / max(1e-9, new_ms):.1f})"
+    )
+
+    # Une construction ne reconstruit que la couche de son chunk.
+    builds = cache.builds
+    world.set_overlay(sx, sy, {"pid": 99, "state": "building"})
+    cache.probe(False)(sx, sy)
+    for x, y in tiles[:2000]:
+        cache.is_walkable(x, y)
+    print(f"  après une construction : {cache.builds - builds} couche(s) reconstruite(s)")
+
+
+if __name__ == "__main__":
+    main()